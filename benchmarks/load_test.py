@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Load test simulating a full venue night against the Music Bingo API.
+
+Actors, modelled on the real clients:
+- Host: marks one song per --song-interval via POST mark-song (HostView)
+- Players: N phones polling GET /state every 2s (PlayerView.jsx POLL_INTERVAL)
+- Host card panel: polls GET /card-statuses every 5s (CardStatusPanel.jsx)
+- Scanner: every --burst-interval, a burst of registrations and verifications
+
+The player count is stepped up (e.g. 50 100 200 400); each step runs for
+--duration seconds and reports latency percentiles per endpoint. The first
+step that misses the latency SLO, drops polls or returns errors is reported
+as the saturation point.
+
+Prerequisites:
+- musicbingo_api installed (pip install -e musicbingo_api)
+- httpx installed
+
+Usage:
+    # Spawn a local uvicorn server and step through player counts
+    python benchmarks/load_test.py --players 50 100 200 400 --duration 30
+
+    # Run against an already running server
+    python benchmarks/load_test.py --url http://192.168.1.20:8000 --players 100
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+from uuid import uuid4
+
+import httpx
+
+# Client polling intervals (seconds), matching the React apps
+PLAYER_POLL_INTERVAL = 2.0  # musicbingo_host/src/pages/PlayerView.jsx
+CARD_STATUS_POLL_INTERVAL = 5.0  # musicbingo_host/src/components/CardStatusPanel.jsx
+
+DEFAULT_SLO_MS = 250.0
+REQUEST_TIMEOUT = 10.0
+
+
+@dataclass
+class StepResult:
+    """Latency samples and counters collected during one load step."""
+
+    players: int
+    latencies: dict = field(default_factory=lambda: defaultdict(list))
+    errors: dict = field(default_factory=lambda: defaultdict(int))
+    scheduled_polls: int = 0
+    completed_polls: int = 0
+
+    def record(self, endpoint: str, seconds: float, ok: bool) -> None:
+        self.latencies[endpoint].append(seconds * 1000)
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def summary(self) -> dict:
+        """Percentiles (ms), request and error counts per endpoint."""
+        endpoints = {}
+        for endpoint, samples in sorted(self.latencies.items()):
+            samples = sorted(samples)
+            endpoints[endpoint] = {
+                "requests": len(samples),
+                "errors": self.errors.get(endpoint, 0),
+                "p50": _percentile(samples, 50),
+                "p95": _percentile(samples, 95),
+                "p99": _percentile(samples, 99),
+                "max": samples[-1] if samples else 0.0,
+            }
+        return {
+            "players": self.players,
+            "poll_completion": (
+                self.completed_polls / self.scheduled_polls if self.scheduled_polls else 1.0
+            ),
+            "endpoints": endpoints,
+        }
+
+
+def _percentile(sorted_samples: list[float], pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(pct / 100 * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def build_game(num_songs: int, num_cards: int, seed: int) -> tuple[dict, list[dict]]:
+    """Build a random playlist and card set (no card generator needed).
+
+    Returns:
+        Tuple of (create game request body, list of bulk card dicts)
+    """
+    rng = random.Random(seed)
+    playlist = [
+        {"song_id": str(uuid4()), "title": f"Load Song {i}", "artist": f"Load Artist {i}"}
+        for i in range(num_songs)
+    ]
+    positions = [(r, c) for r in range(5) for c in range(5) if (r, c) != (2, 2)]
+    cards = []
+    for number in range(1, num_cards + 1):
+        songs = rng.sample(playlist, 24)
+        cards.append({
+            "card_id": str(uuid4()),
+            "card_number": number,
+            "song_positions": {s["song_id"]: list(pos) for s, pos in zip(songs, positions)},
+        })
+    game = {"game_id": str(uuid4()), "playlist": playlist, "pattern": "five_in_a_row"}
+    return game, cards
+
+
+class VenueSimulation:
+    """Drives one load step against a prepared game."""
+
+    def __init__(self, client: httpx.AsyncClient, game: dict, cards: list[dict], args):
+        self.client = client
+        self.game_id = game["game_id"]
+        self.song_ids = [s["song_id"] for s in game["playlist"]]
+        self.cards = cards
+        self.args = args
+        self.rng = random.Random(args.seed)
+
+    async def _timed(self, result: StepResult, endpoint: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        ok = False
+        try:
+            response = await self.client.request(method, url, timeout=REQUEST_TIMEOUT, **kwargs)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            pass
+        result.record(endpoint, time.perf_counter() - start, ok)
+        return ok
+
+    async def _every(self, interval: float, deadline: float, make_request, jitter: bool = True):
+        """Fire make_request at a fixed rate like setInterval: late responses
+        don't delay the next tick, so a slow server sees overlapping polls."""
+        pending = set()
+        next_tick = time.perf_counter() + (self.rng.uniform(0, interval) if jitter else 0)
+        while True:
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if time.perf_counter() >= deadline:
+                break
+            task = asyncio.create_task(make_request())
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            next_tick += interval
+        if pending:
+            await asyncio.wait(pending, timeout=REQUEST_TIMEOUT)
+
+    async def player(self, result: StepResult, deadline: float) -> None:
+        url = f"/api/game/{self.game_id}/state"
+
+        async def poll():
+            result.scheduled_polls += 1
+            if await self._timed(result, "GET /state", "GET", url):
+                result.completed_polls += 1
+
+        await self._every(PLAYER_POLL_INTERVAL, deadline, poll)
+
+    async def card_status_panel(self, result: StepResult, deadline: float) -> None:
+        url = f"/api/game/{self.game_id}/card-statuses"
+        await self._every(
+            CARD_STATUS_POLL_INTERVAL,
+            deadline,
+            lambda: self._timed(result, "GET /card-statuses", "GET", url),
+        )
+
+    async def host(self, result: StepResult, deadline: float) -> None:
+        url = f"/api/game/{self.game_id}/mark-song"
+        order = list(self.song_ids)
+        self.rng.shuffle(order)
+        songs = iter(order)
+
+        async def mark():
+            song_id = next(songs, None)
+            if song_id is not None:
+                body = {"song_id": song_id, "played": True}
+                await self._timed(result, "POST /mark-song", "POST", url, json=body)
+
+        await self._every(self.args.song_interval, deadline, mark, jitter=False)
+
+    async def scanner(self, result: StepResult, deadline: float) -> None:
+        async def burst():
+            requests = []
+            for card in self.rng.sample(self.cards, min(self.args.burst_size, len(self.cards))):
+                if self.rng.random() < 0.5:
+                    url = f"/api/game/{self.game_id}/register-card"
+                    body = {"card_id": card["card_id"], "player_name": f"P{card['card_number']}"}
+                    requests.append(self._timed(result, "POST /register-card", "POST", url, json=body))
+                else:
+                    url = f"/api/verify/{self.game_id}/{card['card_id']}"
+                    requests.append(self._timed(result, "GET /verify", "GET", url))
+            await asyncio.gather(*requests)
+
+        await self._every(self.args.burst_interval, deadline, burst)
+
+    async def run_step(self, players: int) -> StepResult:
+        result = StepResult(players=players)
+        await self.client.post(f"/api/game/{self.game_id}/reset")
+        deadline = time.perf_counter() + self.args.duration
+        actors = [self.player(result, deadline) for _ in range(players)]
+        actors += [
+            self.card_status_panel(result, deadline),
+            self.host(result, deadline),
+            self.scanner(result, deadline),
+        ]
+        await asyncio.gather(*actors)
+        return result
+
+
+async def setup_game(client: httpx.AsyncClient, args) -> tuple[dict, list[dict]]:
+    """Create, populate, register and activate a game for the simulation."""
+    game, cards = build_game(args.songs, args.cards, args.seed)
+    response = await client.post("/api/game/start", json=game)
+    response.raise_for_status()
+    response = await client.post(f"/api/game/{game['game_id']}/cards/bulk", json={"cards": cards})
+    response.raise_for_status()
+    response = await client.post(f"/api/game/{game['game_id']}/activate")
+    response.raise_for_status()
+    # Most players register their card up front
+    for card in cards[: int(len(cards) * 0.8)]:
+        await client.post(
+            f"/api/game/{game['game_id']}/register-card",
+            json={"card_id": card["card_id"], "player_name": f"P{card['card_number']}"},
+        )
+    return game, cards
+
+
+def is_saturated(summary: dict, slo_ms: float) -> Optional[str]:
+    """Get the reason a step is saturated, or None if it kept up."""
+    if summary["poll_completion"] < 0.95:
+        return f"only {summary['poll_completion']:.0%} of player polls completed"
+    for endpoint, stats in summary["endpoints"].items():
+        if stats["requests"] and stats["errors"] / stats["requests"] > 0.01:
+            return f"{endpoint} error rate {stats['errors'] / stats['requests']:.1%}"
+        if stats["p95"] > slo_ms:
+            return f"{endpoint} p95 {stats['p95']:.0f}ms > {slo_ms:.0f}ms"
+    return None
+
+
+def print_summary(summary: dict) -> None:
+    print(f"\n  {summary['players']} players "
+          f"(poll completion {summary['poll_completion']:.1%})")
+    print(f"  {'endpoint':<24}{'reqs':>7}{'errs':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for endpoint, s in summary["endpoints"].items():
+        print(f"  {endpoint:<24}{s['requests']:>7}{s['errors']:>6}"
+              f"{s['p50']:>8.1f}m{s['p95']:>8.1f}m{s['p99']:>8.1f}m{s['max']:>8.1f}m")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_server() -> tuple[subprocess.Popen, str]:
+    """Start uvicorn with musicbingo_api.main:app on a free local port.
+
+    A single worker is used because game state lives in process memory.
+    """
+    port = _free_port()
+    cmd = [
+        sys.executable, "-m", "uvicorn", "musicbingo_api.main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--log-level", "warning",
+    ]
+    process = subprocess.Popen(cmd)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            if httpx.get(f"{url}/health", timeout=0.5).status_code == 200:
+                return process, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("uvicorn did not start within 10 seconds")
+
+
+async def run(args) -> int:
+    max_players = max(args.players)
+    limits = httpx.Limits(max_connections=max_players + 20, max_keepalive_connections=max_players + 20)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits) as client:
+        print(f"🎮 Setting up game: {args.songs} songs, {args.cards} cards...")
+        game, cards = await setup_game(client, args)
+        simulation = VenueSimulation(client, game, cards, args)
+
+        summaries = []
+        saturation = None
+        for players in sorted(args.players):
+            print(f"\n▶ Running {args.duration:.0f}s with {players} players...")
+            result = await simulation.run_step(players)
+            summary = result.summary()
+            reason = is_saturated(summary, args.slo_ms)
+            summary["saturated"] = reason
+            summaries.append(summary)
+            print_summary(summary)
+            if reason and saturation is None:
+                saturation = {"players": players, "reason": reason}
+                print(f"  ✗ Saturated: {reason}")
+                if not args.keep_going:
+                    break
+
+    print()
+    if saturation:
+        print(f"Saturation point: {saturation['players']} players ({saturation['reason']})")
+    else:
+        print(f"✓ Kept up with {max_players} players (p95 SLO {args.slo_ms:.0f}ms)")
+
+    if args.output:
+        report = {"config": {k: v for k, v in vars(args).items() if k != "output"},
+                  "steps": summaries, "saturation": saturation}
+        args.output.write_text(json.dumps(report, indent=2, default=str))
+        print(f"Results written to {args.output}")
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate a venue night against the API")
+    parser.add_argument("--url", help="API base URL (default: spawn a local uvicorn server)")
+    parser.add_argument("--players", type=int, nargs="+", default=[50, 100, 200, 400],
+                        help="Player counts to step through")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per step")
+    parser.add_argument("--songs", type=int, default=75, help="Playlist size")
+    parser.add_argument("--cards", type=int, default=200, help="Cards in the game")
+    parser.add_argument("--song-interval", type=float, default=5.0,
+                        help="Seconds between host mark-song calls (real nights: ~30-60)")
+    parser.add_argument("--burst-interval", type=float, default=10.0,
+                        help="Seconds between scanner bursts")
+    parser.add_argument("--burst-size", type=int, default=10,
+                        help="Registrations/verifications per scanner burst")
+    parser.add_argument("--slo-ms", type=float, default=DEFAULT_SLO_MS,
+                        help="p95 latency above which a step counts as saturated")
+    parser.add_argument("--keep-going", action="store_true",
+                        help="Keep stepping after the saturation point")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-o", "--output", type=Path, help="Write results JSON here")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url is None:
+        server, args.url = spawn_server()
+        print(f"🚀 Started uvicorn at {args.url}")
+    try:
+        return asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
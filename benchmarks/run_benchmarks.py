@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for card generation, rendering, verification and game loading.
+
+Times each operation and measures its peak Python memory (tracemalloc) over a
+grid of scenarios: 50/200/1000 cards x 48/200/1000 songs. Results are written
+as JSON and can be compared against a saved baseline to catch regressions.
+
+Prerequisites:
+- musicbingo_cards and musicbingo_api packages installed (pip install -e)
+
+Usage:
+    # Run everything and save results
+    python benchmarks/run_benchmarks.py -o bench.json
+
+    # Quick run on the smallest scenario only
+    python benchmarks/run_benchmarks.py --cards 50 --songs 48
+
+    # Compare against a baseline (exit code 1 on regression)
+    python benchmarks/run_benchmarks.py --compare baseline.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+from uuid import uuid4
+
+CARD_COUNTS = (50, 200, 1000)
+SONG_COUNTS = (48, 200, 1000)
+SEED = 42
+
+# A benchmark is slower than baseline if it takes this much longer (20%)
+DEFAULT_THRESHOLD = 0.20
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One point in the benchmark grid."""
+
+    num_cards: int
+    num_songs: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.num_cards}c-{self.num_songs}s"
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """A named operation.
+
+    setup(scenario, tmp_dir) does untimed preparation and returns the
+    zero-argument callable that is timed.
+    """
+
+    name: str
+    setup: Callable[[Scenario, Path], Callable[[], object]]
+
+
+# Cache of generated fixtures, shared across benchmarks for the same scenario
+_fixtures: dict = {}
+
+
+def _playlist(num_songs: int):
+    from musicbingo_cards.models import Song
+    from musicbingo_cards.playlist import Playlist
+
+    key = ("playlist", num_songs)
+    if key not in _fixtures:
+        songs = [
+            Song(title=f"Benchmark Song {i}", artist=f"Benchmark Artist {i % 97}")
+            for i in range(num_songs)
+        ]
+        _fixtures[key] = Playlist(songs, name=f"bench-{num_songs}")
+    return _fixtures[key]
+
+
+def _cards(scenario: Scenario):
+    from musicbingo_cards.generator import CardGenerator
+
+    key = ("cards", scenario)
+    if key not in _fixtures:
+        generator = CardGenerator(_playlist(scenario.num_songs), random_seed=SEED)
+        _fixtures[key] = generator.generate_cards(scenario.num_cards)
+    return _fixtures[key]
+
+
+def _game_state(scenario: Scenario):
+    """Build an API GameState with every card registered and 40% of songs played."""
+    from musicbingo_api.models import CardData, GameState, GameStatus, Song
+
+    playlist = _playlist(scenario.num_songs)
+    game_id = uuid4()
+
+    game = GameState(
+        game_id=game_id,
+        status=GameStatus.ACTIVE,
+        playlist=[Song(song_id=s.song_id, title=s.title, artist=s.artist) for s in playlist],
+    )
+    for number, card in enumerate(_cards(scenario), start=1):
+        positions = {}
+        for row in range(5):
+            for col in range(5):
+                song = card.grid.get_song(row, col)
+                if song is not None:
+                    positions[song.song_id] = (row, col)
+        card_data = CardData(
+            card_id=card.card_id,
+            game_id=game_id,
+            card_number=number,
+            song_positions=positions,
+        )
+        game.add_card(card_data)
+        game.register_card(card_data.card_id, f"Player {number}")
+
+    for song in playlist.songs[: int(len(playlist) * 0.4)]:
+        game.add_played_song(song.song_id)
+    return game
+
+
+def _setup_generate(scenario, tmp):
+    from musicbingo_cards.generator import CardGenerator
+
+    playlist = _playlist(scenario.num_songs)
+    return lambda: CardGenerator(playlist, random_seed=SEED).generate_cards(scenario.num_cards)
+
+
+def _setup_overlap(scenario, tmp):
+    from musicbingo_cards.generator import CardGenerator
+
+    cards = _cards(scenario)
+    generator = CardGenerator(_playlist(scenario.num_songs), random_seed=SEED)
+    return lambda: generator.calculate_average_overlap(cards)
+
+
+def _setup_pdf(layout: str):
+    def setup(scenario, tmp):
+        from musicbingo_cards.pdf_generator import PDFCardGenerator
+
+        cards = _cards(scenario)
+        output = tmp / f"bench-{layout}.pdf"
+        return lambda: PDFCardGenerator().generate_pdf(cards, output, layout=layout)
+
+    return setup
+
+
+def _setup_qr(scenario, tmp):
+    from musicbingo_cards.qr_code import QRCodeGenerator
+
+    cards = _cards(scenario)
+    qr = QRCodeGenerator(box_size=10, border=2)
+    return lambda: [qr.get_qr_bytes(card) for card in cards]
+
+
+def _setup_export(scenario, tmp):
+    from musicbingo_cards.exporter import CardExporter
+
+    cards = _cards(scenario)
+    output = tmp / "bench-export.json"
+    return lambda: CardExporter.save_json(cards, output)
+
+
+def _setup_load_game(scenario, tmp):
+    from musicbingo_api import game_loader
+    from musicbingo_cards.exporter import CardExporter
+
+    playlist = _playlist(scenario.num_songs)
+    data = CardExporter.to_json_dict(_cards(scenario))
+    data["name"] = "Benchmark"
+    data["playlist"] = [
+        {"song_id": str(s.song_id), "title": s.title, "artist": s.artist} for s in playlist
+    ]
+    (tmp / "bench-game.json").write_text(json.dumps(data))
+
+    def run():
+        original = game_loader.GAMES_DIR
+        game_loader.GAMES_DIR = tmp
+        try:
+            return game_loader.load_game_from_file("bench-game.json")
+        finally:
+            game_loader.GAMES_DIR = original
+
+    return run
+
+
+def _setup_verify(scenario, tmp):
+    game = _game_state(scenario)
+    card_ids = list(game.cards)
+    return lambda: [game.verify_card(card_id) for card_id in card_ids]
+
+
+def _setup_check_winners(scenario, tmp):
+    game = _game_state(scenario)
+    return game.check_registered_cards_for_winners
+
+
+BENCHMARKS = [
+    Benchmark("generate_cards", _setup_generate),
+    Benchmark("calculate_average_overlap", _setup_overlap),
+    Benchmark("pdf_single", _setup_pdf("single")),
+    Benchmark("pdf_4up", _setup_pdf("4up")),
+    Benchmark("qr_codes", _setup_qr),
+    Benchmark("export_json", _setup_export),
+    Benchmark("load_game_from_file", _setup_load_game),
+    Benchmark("verify_card", _setup_verify),
+    Benchmark("check_registered_cards_for_winners", _setup_check_winners),
+]
+
+
+def measure(fn: Callable[[], object], repeat: int) -> dict:
+    """Time fn (best of `repeat`) and measure its peak traced memory.
+
+    Memory is measured in a separate run so tracemalloc overhead does not
+    distort the timings.
+    """
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": min(timings),
+        "seconds_all": timings,
+        "peak_memory_mb": peak / (1024 * 1024),
+    }
+
+
+def run_suite(
+    card_counts: tuple[int, ...],
+    song_counts: tuple[int, ...],
+    only: Optional[list[str]],
+    repeat: int,
+) -> dict:
+    """Run selected benchmarks over the scenario grid.
+
+    Returns:
+        Results dict keyed by "<benchmark>/<scenario>"
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        for num_songs in song_counts:
+            for num_cards in card_counts:
+                scenario = Scenario(num_cards, num_songs)
+                for bench in BENCHMARKS:
+                    if only and bench.name not in only:
+                        continue
+                    key = f"{bench.name}/{scenario.key}"
+                    print(f"  {key:<60}", end="", flush=True)
+                    fn = bench.setup(scenario, tmp)
+                    result = measure(fn, repeat)
+                    results[key] = result
+                    print(f"{result['seconds'] * 1000:10.1f} ms {result['peak_memory_mb']:8.2f} MB")
+                _fixtures.clear()
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Compare results to a baseline and print a table.
+
+    Returns:
+        List of benchmark keys that regressed by more than threshold
+    """
+    regressions = []
+    print(f"\n{'benchmark':<60}{'baseline':>12}{'current':>12}{'change':>10}")
+    for key, current in results.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f"{key:<60}{'-':>12}{current['seconds'] * 1000:>10.1f}ms{'new':>10}")
+            continue
+        change = (current["seconds"] - base["seconds"]) / base["seconds"] if base["seconds"] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        print(
+            f"{key:<60}{base['seconds'] * 1000:>10.1f}ms"
+            f"{current['seconds'] * 1000:>10.1f}ms{change:>+9.0%}{flag}"
+        )
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--cards", type=int, nargs="+", default=list(CARD_COUNTS),
+                        help="Card counts to benchmark")
+    parser.add_argument("--songs", type=int, nargs="+", default=list(SONG_COUNTS),
+                        help="Playlist sizes to benchmark")
+    parser.add_argument("--only", nargs="+", choices=[b.name for b in BENCHMARKS],
+                        help="Run only these benchmarks")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark")
+    parser.add_argument("-o", "--output", type=Path, help="Write results JSON here")
+    parser.add_argument("--compare", type=Path, help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before flagging a regression (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    print(f"Running benchmarks (best of {args.repeat})...")
+    results = run_suite(tuple(args.cards), tuple(args.songs), args.only, args.repeat)
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\n✓ Results written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n✗ {len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+            return 1
+        print("\n✓ No regressions")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
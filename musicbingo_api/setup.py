@@ -15,4 +15,7 @@ setup(
         "sqlalchemy>=2.0.0",
         "python-multipart>=0.0.6",
     ],
+    extras_require={
+        "client": ["httpx>=0.25.0"],
+    },
 )
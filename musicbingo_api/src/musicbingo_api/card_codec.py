@@ -0,0 +1,256 @@
+"""Streaming card encodings for bulk ingestion.
+
+Two formats are accepted by POST /api/game/{game_id}/cards/stream:
+
+NDJSON (application/x-ndjson):
+    One AddCardRequest JSON object per line, at most MAX_LINE_BYTES long.
+
+Compact binary (application/vnd.musicbingo.cards):
+    4-byte magic b"MBC1", then fixed 68-byte records:
+        16 bytes  card_id (UUID bytes)
+        uint32    card_number (little-endian)
+        24 uint16 playlist indices (little-endian), row-major, skipping
+                  the center free space; 0xFFFF marks an empty position
+
+Both formats are decoded record by record, so the server never holds the
+whole upload in memory. The digest over canonical binary records is the
+same whichever format the cards arrived in.
+"""
+
+import hashlib
+import struct
+from typing import AsyncIterator, Iterable, Iterator, Optional
+from uuid import UUID
+
+from pydantic import ValidationError
+
+from .models import CardData
+from .schemas import AddCardRequest
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+BINARY_MEDIA_TYPE = "application/vnd.musicbingo.cards"
+
+BINARY_MAGIC = b"MBC1"
+RECORD = struct.Struct("<16sI24H")
+RECORD_SIZE = RECORD.size  # 68 bytes
+EMPTY_SLOT = 0xFFFF
+MAX_LINE_BYTES = 8192  # a full card is about 1.3 KB of NDJSON
+
+# Grid positions in record order (row-major, center free space skipped)
+POSITIONS: tuple[tuple[int, int], ...] = tuple(
+    (row, col) for row in range(5) for col in range(5) if (row, col) != (2, 2)
+)
+_POSITION_SLOT = {position: slot for slot, position in enumerate(POSITIONS)}
+
+
+class CardDecodeError(ValueError):
+    """Raised when a streamed card record is malformed."""
+
+    def __init__(self, record_number: int, message: str):
+        self.record_number = record_number
+        super().__init__(f"Record {record_number}: {message}")
+
+
+def encode_record(card_id: UUID, card_number: int, indices: list[int]) -> bytes:
+    """Pack one card as a binary record.
+
+    Args:
+        card_id: Card identifier
+        card_number: Human-readable card number
+        indices: 24 playlist indices in POSITIONS order
+
+    Returns:
+        68-byte record
+    """
+    return RECORD.pack(card_id.bytes, card_number, *indices)
+
+
+def card_to_indices(
+    song_positions: dict[UUID, tuple[int, int]], song_index: dict[UUID, int]
+) -> list[int]:
+    """Convert a song_id -> (row, col) map to 24 playlist indices in record order.
+
+    Positions without a song are EMPTY_SLOT.
+
+    Raises:
+        ValueError: If a song is not in the playlist or a position is invalid
+    """
+    indices = [EMPTY_SLOT] * len(POSITIONS)
+    for song_id, position in song_positions.items():
+        slot = _POSITION_SLOT.get(tuple(position))
+        if slot is None:
+            raise ValueError(f"Invalid position {tuple(position)}")
+        index = song_index.get(song_id)
+        if index is None:
+            raise ValueError(f"Song {song_id} not in game playlist")
+        if indices[slot] != EMPTY_SLOT:
+            raise ValueError(f"Position {tuple(position)} used twice")
+        indices[slot] = index
+    return indices
+
+
+def encode_cards(
+    cards: Iterable[dict], playlist_song_ids: list[UUID]
+) -> Iterator[bytes]:
+    """Encode export-format card dicts as a binary stream (magic + records).
+
+    Args:
+        cards: Card dicts with card_id, card_number, song_positions
+        playlist_song_ids: Song IDs in game playlist order
+
+    Yields:
+        Byte chunks suitable for a streaming request body
+    """
+    song_index = {UUID(str(song_id)): i for i, song_id in enumerate(playlist_song_ids)}
+    yield BINARY_MAGIC
+    for card in cards:
+        positions = {UUID(str(s)): tuple(p) for s, p in card["song_positions"].items()}
+        indices = card_to_indices(positions, song_index)
+        yield encode_record(UUID(str(card["card_id"])), card["card_number"], indices)
+
+
+class CardStreamDecoder:
+    """Incrementally decodes streamed cards into CardData and a running digest."""
+
+    def __init__(self, game_id: UUID, playlist_song_ids: list[UUID], media_type: str):
+        """Initialize decoder.
+
+        Args:
+            game_id: Game the cards belong to
+            playlist_song_ids: Song IDs in game playlist order
+            media_type: NDJSON_MEDIA_TYPE or BINARY_MEDIA_TYPE
+        """
+        if media_type not in (NDJSON_MEDIA_TYPE, BINARY_MEDIA_TYPE):
+            raise ValueError(f"Unsupported card stream media type: {media_type}")
+        if len(playlist_song_ids) >= EMPTY_SLOT:
+            raise ValueError(
+                f"Playlist too large for card streaming ({len(playlist_song_ids)} songs)"
+            )
+        self.game_id = game_id
+        self.playlist_song_ids = playlist_song_ids
+        self.song_index = {song_id: i for i, song_id in enumerate(playlist_song_ids)}
+        self.binary = media_type == BINARY_MEDIA_TYPE
+        self.records = 0
+        self._digest = hashlib.sha256()
+        self._buffer = bytearray()
+        self._magic_checked = False
+
+    @property
+    def digest(self) -> str:
+        """SHA-256 hex digest over the canonical binary records decoded so far."""
+        return self._digest.hexdigest()
+
+    async def decode(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[CardData]:
+        """Decode cards from an async stream of byte chunks.
+
+        Yields:
+            CardData for each record, in stream order
+
+        Raises:
+            CardDecodeError: If a record is malformed
+        """
+        async for chunk in chunks:
+            self._buffer.extend(chunk)
+            for card in self._drain(final=False):
+                yield card
+        for card in self._drain(final=True):
+            yield card
+
+    def _drain(self, final: bool) -> Iterator[CardData]:
+        if self.binary:
+            yield from self._drain_binary(final)
+        else:
+            yield from self._drain_ndjson(final)
+
+    def _drain_ndjson(self, final: bool) -> Iterator[CardData]:
+        while True:
+            newline = self._buffer.find(b"\n", 0, MAX_LINE_BYTES + 1)
+            if newline == -1:
+                # Without a line limit, a body with no newline is buffered whole
+                if len(self._buffer) > MAX_LINE_BYTES:
+                    raise CardDecodeError(
+                        self.records + 1, f"line longer than {MAX_LINE_BYTES} bytes"
+                    )
+                if not final or not self._buffer.strip():
+                    return
+                line = bytes(self._buffer)
+                self._buffer.clear()
+            else:
+                line = bytes(self._buffer[:newline])
+                del self._buffer[:newline + 1]
+            if not line.strip():
+                continue
+            yield self._decode_json_line(line)
+
+    def _decode_json_line(self, line: bytes) -> CardData:
+        record_number = self.records + 1
+        try:
+            request = AddCardRequest.model_validate_json(line)
+            indices = card_to_indices(request.song_positions, self.song_index)
+        except ValidationError as e:
+            raise CardDecodeError(record_number, f"invalid card: {e.errors()[0]['msg']}")
+        except ValueError as e:
+            raise CardDecodeError(record_number, str(e))
+        return self._accept(request.card_id, request.card_number, indices, request.song_positions)
+
+    def _drain_binary(self, final: bool) -> Iterator[CardData]:
+        if not self._magic_checked:
+            if len(self._buffer) < len(BINARY_MAGIC):
+                if final:
+                    raise CardDecodeError(0, "missing MBC1 header")
+                return
+            if bytes(self._buffer[:len(BINARY_MAGIC)]) != BINARY_MAGIC:
+                raise CardDecodeError(0, "missing MBC1 header")
+            del self._buffer[:len(BINARY_MAGIC)]
+            self._magic_checked = True
+
+        usable = len(self._buffer) - len(self._buffer) % RECORD_SIZE
+        for offset in range(0, usable, RECORD_SIZE):
+            yield self._decode_binary_record(self._buffer, offset)
+        del self._buffer[:usable]
+
+        if final and self._buffer:
+            raise CardDecodeError(
+                self.records + 1, f"truncated record ({len(self._buffer)} of {RECORD_SIZE} bytes)"
+            )
+
+    def _decode_binary_record(self, buffer: bytearray, offset: int) -> CardData:
+        record_number = self.records + 1
+        card_bytes, card_number, *indices = RECORD.unpack_from(buffer, offset)
+        song_positions = {}
+        filled = 0
+        for slot, index in enumerate(indices):
+            if index == EMPTY_SLOT:
+                continue
+            if index >= len(self.playlist_song_ids):
+                raise CardDecodeError(record_number, f"playlist index {index} out of range")
+            song_positions[self.playlist_song_ids[index]] = POSITIONS[slot]
+            filled += 1
+        if len(song_positions) != filled:
+            raise CardDecodeError(record_number, "card repeats a song")
+        return self._accept(UUID(bytes=card_bytes), card_number, indices, song_positions)
+
+    def _accept(
+        self,
+        card_id: UUID,
+        card_number: int,
+        indices: list[int],
+        song_positions: dict[UUID, tuple[int, int]],
+    ) -> CardData:
+        if not song_positions:
+            raise CardDecodeError(self.records + 1, "card has no songs")
+        if not 0 <= card_number < 2**32:
+            raise CardDecodeError(self.records + 1, f"card_number {card_number} out of range")
+        self._digest.update(encode_record(card_id, card_number, indices))
+        self.records += 1
+        return CardData(
+            card_id=card_id,
+            game_id=self.game_id,
+            card_number=card_number,
+            song_positions=song_positions,
+        )
+
+
+def media_type_of(content_type: Optional[str]) -> str:
+    """Strip parameters (e.g. charset) from a Content-Type header."""
+    return (content_type or NDJSON_MEDIA_TYPE).split(";")[0].strip().lower()
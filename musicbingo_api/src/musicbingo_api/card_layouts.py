@@ -0,0 +1,344 @@
+"""Read-only card layouts shared between API worker processes.
+
+With several uvicorn workers, each process would otherwise hold its own
+dict of CardData for every card of every loaded game. Instead, a game's
+card layouts are written once to a file in a shared directory (/dev/shm
+when available) and every worker maps it read-only, so the pages are held
+once by the OS however many workers attach.
+
+Layout file format (little-endian):
+    4 bytes   magic b"MBL1"
+    uint32    card count N
+    N x 68    card records in original card order (see card_codec.RECORD)
+    N x 4     uint32 record numbers sorted by card_id bytes (lookup index)
+
+File names include a digest of the records, so workers loading the same
+game file attach to the same segment and a changed file gets a new one.
+
+Only layouts are shared. Played songs, registrations, winners and cards
+added after loading stay in per-process state.
+
+Segments are unlinked when their game is deleted or evicted (workers that
+still map one keep a valid mapping; the next load writes a new file), and
+segments left by servers that are no longer running are swept at startup
+(see sweep_stale_segments).
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Optional
+from uuid import UUID
+
+from .card_codec import (
+    EMPTY_SLOT,
+    POSITIONS,
+    RECORD,
+    RECORD_SIZE,
+    card_to_indices,
+    encode_record,
+)
+from .models import CardData
+
+LAYOUT_MAGIC = b"MBL1"
+HEADER = struct.Struct("<4sI")
+INDEX_ENTRY = struct.Struct("<I")
+SEGMENT_SUFFIX = ".layout"
+LOCK_NAME = "workers.lock"
+
+# Decoded cards kept per game and process; enough for every registered card
+# of a busy venue, so status and winner checks decode each card once
+DECODE_CACHE_SIZE = 1024
+
+# Environment variables: "1"/"0" to force sharing on/off (default: on when
+# WEB_CONCURRENCY, uvicorn's worker count, is above 1) and the segment directory
+SHARED_LAYOUTS_ENV = "MUSICBINGO_SHARED_LAYOUTS"
+SHARED_DIR_ENV = "MUSICBINGO_SHARED_DIR"
+
+
+def shared_layouts_enabled() -> bool:
+    """Whether loaded games should use shared card layouts."""
+    setting = os.environ.get(SHARED_LAYOUTS_ENV, "").strip()
+    if setting:
+        return setting not in ("0", "false", "no")
+    try:
+        return int(os.environ.get("WEB_CONCURRENCY", "1")) > 1
+    except ValueError:
+        return False
+
+
+def shared_dir() -> Path:
+    """Directory holding layout segments (RAM-backed /dev/shm when present)."""
+    configured = os.environ.get(SHARED_DIR_ENV)
+    if configured:
+        return Path(configured)
+    if Path("/dev/shm").is_dir():
+        return Path("/dev/shm") / "musicbingo-layouts"
+    return Path(tempfile.gettempdir()) / "musicbingo-layouts"
+
+
+class CardLayoutSegment:
+    """A memory-mapped, read-only layout file."""
+
+    def __init__(self, path: Path):
+        """Map an existing layout file.
+
+        Raises:
+            ValueError: If the file is not a valid layout segment
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = HEADER.unpack_from(self._mm, 0)
+        if magic != LAYOUT_MAGIC:
+            raise ValueError(f"Not a card layout segment: {path}")
+        if len(self._mm) != HEADER.size + count * (RECORD_SIZE + INDEX_ENTRY.size):
+            raise ValueError(f"Truncated card layout segment: {path}")
+        self._count = count
+        self._index_offset = HEADER.size + count * RECORD_SIZE
+
+    @classmethod
+    def create(cls, directory: Path, game_id: UUID, records: list[bytes]) -> "CardLayoutSegment":
+        """Write a segment unless an identical one exists, then map it.
+
+        Args:
+            directory: Shared segment directory
+            game_id: Game the cards belong to
+            records: Binary card records in card order
+
+        Returns:
+            Mapped segment
+        """
+        body = b"".join(records)
+        digest = hashlib.sha256(body).hexdigest()[:16]
+        path = directory / f"{game_id}-{digest}{SEGMENT_SUFFIX}"
+        if not path.exists():
+            _write_segment(path, records, body)
+        try:
+            return cls(path)
+        except FileNotFoundError:
+            # Released by another worker in between; write a fresh copy
+            _write_segment(path, records, body)
+            return cls(path)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        """Unmap the segment."""
+        self._mm.close()
+
+    def release(self) -> None:
+        """Unmap the segment and delete its file."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def card_id(self, number: int) -> UUID:
+        """Card ID of record number."""
+        offset = HEADER.size + number * RECORD_SIZE
+        return UUID(bytes=self._mm[offset:offset + 16])
+
+    def record(self, number: int) -> tuple[bytes, int, tuple[int, ...]]:
+        """Decode record number into (card_id bytes, card_number, 24 indices)."""
+        card_bytes, card_number, *indices = RECORD.unpack_from(
+            self._mm, HEADER.size + number * RECORD_SIZE
+        )
+        return card_bytes, card_number, tuple(indices)
+
+    def find(self, card_id: UUID) -> Optional[int]:
+        """Record number of a card, by binary search over the sorted index."""
+        key = card_id.bytes
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            (number,) = INDEX_ENTRY.unpack_from(self._mm, self._index_offset + mid * 4)
+            offset = HEADER.size + number * RECORD_SIZE
+            probe = self._mm[offset:offset + 16]
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return number
+        return None
+
+
+class SharedCards(MutableMapping):
+    """card_id -> CardData view over a shared segment, with a local overlay.
+
+    CardData objects are decoded on first access and kept in a bounded
+    per-process LRU cache, so hot cards (registered cards checked on every
+    song) are decoded once. Cards added after loading are kept in a
+    per-process dict that takes precedence over the segment.
+    """
+
+    def __init__(
+        self,
+        segment: CardLayoutSegment,
+        game_id: UUID,
+        playlist_song_ids: list[UUID],
+        cache_size: int = DECODE_CACHE_SIZE,
+    ):
+        self.segment = segment
+        self.game_id = game_id
+        self.cache_size = cache_size
+        self._song_ids = playlist_song_ids
+        self._added: dict[UUID, CardData] = {}
+        self._decoded: OrderedDict[UUID, CardData] = OrderedDict()
+
+    def _find(self, card_id) -> Optional[int]:
+        return self.segment.find(card_id) if isinstance(card_id, UUID) else None
+
+    def __getitem__(self, card_id: UUID) -> CardData:
+        card = self._added.get(card_id)
+        if card is not None:
+            return card
+        card = self._decoded.get(card_id)
+        if card is not None:
+            self._decoded.move_to_end(card_id)
+            return card
+        number = self._find(card_id)
+        if number is None:
+            raise KeyError(card_id)
+        _, card_number, indices = self.segment.record(number)
+        card = CardData(
+            card_id=card_id,
+            game_id=self.game_id,
+            card_number=card_number,
+            song_positions={
+                self._song_ids[index]: POSITIONS[slot]
+                for slot, index in enumerate(indices)
+                if index != EMPTY_SLOT
+            },
+        )
+        self._decoded[card_id] = card
+        if len(self._decoded) > self.cache_size:
+            self._decoded.popitem(last=False)
+        return card
+
+    def __contains__(self, card_id) -> bool:
+        return (
+            card_id in self._added
+            or card_id in self._decoded
+            or self._find(card_id) is not None
+        )
+
+    def __setitem__(self, card_id: UUID, card: CardData) -> None:
+        self._added[card_id] = card
+
+    def __delitem__(self, card_id: UUID) -> None:
+        if card_id in self._added and self._find(card_id) is None:
+            del self._added[card_id]
+        else:
+            raise TypeError("Cards in a shared layout segment are read-only")
+
+    def __iter__(self) -> Iterator[UUID]:
+        for number in range(len(self.segment)):
+            card_id = self.segment.card_id(number)
+            if card_id not in self._added:
+                yield card_id
+        yield from self._added
+
+    def __len__(self) -> int:
+        return len(self.segment) + sum(1 for card_id in self._added if self._find(card_id) is None)
+
+    def release(self) -> None:
+        """Drop decoded cards and release the segment (game deleted or evicted)."""
+        self._decoded.clear()
+        self.segment.release()
+
+
+def _write_segment(path: Path, records: list[bytes], body: bytes) -> None:
+    order = sorted(range(len(records)), key=lambda i: records[i][:16])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(HEADER.pack(LAYOUT_MAGIC, len(records)))
+        f.write(body)
+        f.write(b"".join(INDEX_ENTRY.pack(i) for i in order))
+    os.replace(tmp_name, path)  # atomic; racing workers write identical bytes
+
+
+# Lock files held (shared) for the life of the worker process, by directory
+_worker_locks: dict[Path, IO] = {}
+
+
+def sweep_stale_segments(directory: Optional[Path] = None) -> int:
+    """Delete segments left by servers that are no longer running.
+
+    Every worker calls this once at startup and then holds a shared lock on
+    the directory's lock file until it exits. A worker that can take the
+    lock exclusively knows no other server is using the directory, so every
+    segment in it is stale.
+
+    Args:
+        directory: Segment directory (default: shared_dir())
+
+    Returns:
+        Number of files deleted
+    """
+    try:
+        import fcntl
+    except ImportError:  # no flock (Windows): cannot tell stale from live
+        return 0
+    directory = (directory or shared_dir()).resolve()
+    if directory in _worker_locks:
+        return 0
+
+    directory.mkdir(parents=True, exist_ok=True)
+    lock = open(directory / LOCK_NAME, "a")
+    deleted = 0
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        pass  # another live server owns the segments
+    else:
+        for pattern in (f"*{SEGMENT_SUFFIX}", "*.tmp"):
+            for path in directory.glob(pattern):
+                path.unlink(missing_ok=True)
+                deleted += 1
+    fcntl.flock(lock, fcntl.LOCK_SH)
+    _worker_locks[directory] = lock
+    return deleted
+
+
+def share_cards(
+    game_id: UUID,
+    playlist_song_ids: list[UUID],
+    cards: Iterable[dict],
+    directory: Optional[Path] = None,
+) -> SharedCards:
+    """Place export-format card dicts in a shared segment and map it.
+
+    Args:
+        game_id: Game the cards belong to
+        playlist_song_ids: Song IDs in game playlist order
+        cards: Card dicts with card_id, card_number, song_positions
+        directory: Segment directory (default: shared_dir())
+
+    Returns:
+        SharedCards mapping backed by the segment
+
+    Raises:
+        ValueError: If the playlist is too large, or a card is invalid or repeated
+    """
+    if len(playlist_song_ids) >= EMPTY_SLOT:
+        raise ValueError(f"Playlist too large for shared layouts ({len(playlist_song_ids)} songs)")
+    song_index = {song_id: i for i, song_id in enumerate(playlist_song_ids)}
+    records = []
+    seen: set[UUID] = set()
+    for card in cards:
+        card_id = UUID(card["card_id"])
+        if card_id in seen:
+            raise ValueError(f"Duplicate card_id {card_id}")
+        seen.add(card_id)
+        positions = {UUID(s): tuple(p) for s, p in card["song_positions"].items()}
+        indices = card_to_indices(positions, song_index)
+        records.append(encode_record(card_id, card["card_number"], indices))
+    segment = CardLayoutSegment.create(directory or shared_dir(), game_id, records)
+    return SharedCards(segment, game_id, playlist_song_ids)
@@ -0,0 +1,666 @@
+"""Python client for the Music Bingo API.
+
+Provides MusicBingoClient (sync) and AsyncMusicBingoClient (async), both
+over a single pooled keep-alive httpx connection, with typed wrappers for
+every endpoint in main.py, chunked bulk card uploads, retry with backoff,
+and a polling subscribe helper for game state changes.
+
+Requires httpx (pip install "musicbingo-api[client]").
+
+Example:
+    async with AsyncMusicBingoClient("http://localhost:8000") as client:
+        await client.setup_game(game_id, playlist, cards)
+        async for state in client.subscribe_state(game_id):
+            print(state.played_count)
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Iterable, Iterator, Optional, Union
+from uuid import UUID
+
+import httpx
+from pydantic import BaseModel
+
+from .card_codec import BINARY_MEDIA_TYPE, NDJSON_MEDIA_TYPE, encode_cards
+from .models import PatternType
+from .schemas import (
+    AddCardRequest,
+    AddCardResponse,
+    BulkAddCardsResponse,
+    CardStatusesResponse,
+    CreateGameResponse,
+    CustomPatternResponse,
+    FirstWinResponse,
+    GameListResponse,
+    GameStateResponse,
+    GenerationJobListResponse,
+    GenerationJobResponse,
+    GroupResponse,
+    GroupSongResponse,
+    LoadGameResponse,
+    MarkSongResponse,
+    NearWinLeaderboardResponse,
+    RecordSongResponse,
+    RegisterCardResponse,
+    RegisteredCardsResponse,
+    ReplayCallResponse,
+    SetPrizeResponse,
+    SongSchema,
+    StagesResponse,
+    StartGameResponse,
+    StreamAddCardsResponse,
+    VerifyCardResponse,
+)
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_CHUNK_SIZE = 200
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.2  # seconds, doubled on each retry
+
+# Gateway/overload responses worth retrying; the server did not act on them
+RETRY_STATUS_CODES = {502, 503, 504}
+
+SongLike = Union[SongSchema, dict]
+CardLike = Union[AddCardRequest, dict]
+
+
+class MusicBingoAPIError(Exception):
+    """Raised when the API returns an error response."""
+
+    def __init__(self, status_code: int, detail: Any):
+        self.status_code = status_code
+        self.detail = detail
+        super().__init__(f"API error {status_code}: {detail}")
+
+
+def _dump(item: Union[BaseModel, dict]) -> dict:
+    """Convert a schema object or plain dict to a JSON-ready dict."""
+    if isinstance(item, BaseModel):
+        return item.model_dump(mode="json")
+    return item
+
+
+def _chunks(items: list, size: int) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _raise_for_error(response: httpx.Response) -> None:
+    if response.status_code < 400:
+        return
+    try:
+        body = response.json()
+        detail = body.get("detail", body) if isinstance(body, dict) else body
+    except ValueError:
+        detail = response.text
+    raise MusicBingoAPIError(response.status_code, detail)
+
+
+def _parse(response: httpx.Response, model: Optional[type]) -> Any:
+    _raise_for_error(response)
+    if response.status_code == 204:
+        return None
+    if model is None:
+        return response.json()
+    if model is str:
+        return response.text
+    if model is bytes:
+        return response.content
+    return model.model_validate(response.json())
+
+
+def _card_stream(
+    game_id: UUID, cards: Iterable[CardLike], playlist_song_ids: Optional[list[UUID]]
+) -> tuple[str, dict, Iterator[bytes]]:
+    """Build path, headers and a lazy body for POST /api/game/{game_id}/cards/stream.
+
+    NDJSON is used unless playlist_song_ids is given, in which case cards are
+    packed as compact binary records indexed into that playlist order.
+    """
+    if playlist_song_ids is None:
+        media_type = NDJSON_MEDIA_TYPE
+        body = (json.dumps(_dump(card)).encode() + b"\n" for card in cards)
+    else:
+        media_type = BINARY_MEDIA_TYPE
+        body = encode_cards((_dump(card) for card in cards), playlist_song_ids)
+    return f"/api/game/{game_id}/cards/stream", {"Content-Type": media_type}, body
+
+
+async def _aiter(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+def _merge_bulk(game_id: UUID, responses: list[BulkAddCardsResponse]) -> BulkAddCardsResponse:
+    return BulkAddCardsResponse(
+        success=all(r.success for r in responses),
+        game_id=game_id,
+        cards_added=sum(r.cards_added for r in responses),
+        cards=[card for r in responses for card in r.cards],
+    )
+
+
+class _EndpointsMixin:
+    """Typed endpoint wrappers shared by the sync and async clients.
+
+    Each wrapper returns whatever the concrete client's _request returns:
+    the parsed response for MusicBingoClient, an awaitable of it for
+    AsyncMusicBingoClient.
+    """
+
+    def _request(self, method: str, path: str, model: Optional[type], **kwargs):
+        raise NotImplementedError
+
+    def root(self):
+        """GET / - API name and version."""
+        return self._request("GET", "/", None)
+
+    def health(self):
+        """GET /health - Health check."""
+        return self._request("GET", "/health", None)
+
+    def metrics(self):
+        """GET /metrics - Prometheus metrics text."""
+        return self._request("GET", "/metrics", str)
+
+    def network_info(self):
+        """GET /api/network/info - LAN address other devices can use."""
+        return self._request("GET", "/api/network/info", None)
+
+    def list_games(self):
+        """GET /api/games - Game files available to load."""
+        return self._request("GET", "/api/games", GameListResponse)
+
+    def load_game(self, filename: str):
+        """POST /api/games/load/{filename} - Load a game file into memory."""
+        return self._request("POST", f"/api/games/load/{filename}", LoadGameResponse)
+
+    def create_game(
+        self,
+        game_id: UUID,
+        playlist: Iterable[SongLike],
+        pattern: PatternType = PatternType.FIVE_IN_A_ROW,
+    ):
+        """POST /api/game/start - Create a game in SETUP status."""
+        body = {
+            "game_id": str(game_id),
+            "playlist": [_dump(song) for song in playlist],
+            "pattern": PatternType(pattern).value,
+        }
+        return self._request("POST", "/api/game/start", CreateGameResponse, json=body)
+
+    def add_card(self, game_id: UUID, card: CardLike):
+        """POST /api/game/{game_id}/card - Add a single card."""
+        return self._request(
+            "POST", f"/api/game/{game_id}/card", AddCardResponse, json=_dump(card)
+        )
+
+    def _bulk_add_chunk(self, game_id: UUID, cards: list[dict]):
+        return self._request(
+            "POST",
+            f"/api/game/{game_id}/cards/bulk",
+            BulkAddCardsResponse,
+            json={"cards": cards},
+        )
+
+    def activate_game(self, game_id: UUID):
+        """POST /api/game/{game_id}/activate - Start playing."""
+        return self._request("POST", f"/api/game/{game_id}/activate", StartGameResponse)
+
+    def record_played_song(self, game_id: UUID, song_id: UUID):
+        """POST /api/game/{game_id}/song-played - Record a played song."""
+        return self._request(
+            "POST",
+            f"/api/game/{game_id}/song-played",
+            RecordSongResponse,
+            json={"song_id": str(song_id)},
+        )
+
+    def mark_song(self, game_id: UUID, song_id: Union[UUID, str], played: bool = True):
+        """POST /api/game/{game_id}/mark-song - Mark or unmark a song."""
+        return self._request(
+            "POST",
+            f"/api/game/{game_id}/mark-song",
+            MarkSongResponse,
+            json={"song_id": str(song_id), "played": played},
+        )
+
+    def get_game_state(self, game_id: UUID):
+        """GET /api/game/{game_id}/state - Current game state."""
+        return self._request("GET", f"/api/game/{game_id}/state", GameStateResponse)
+
+    def verify_card(self, game_id: UUID, card_id: UUID):
+        """GET /api/verify/{game_id}/{card_id} - Check if a card is a winner."""
+        return self._request("GET", f"/api/verify/{game_id}/{card_id}", VerifyCardResponse)
+
+    def set_pattern(self, game_id: UUID, pattern: PatternType):
+        """POST /api/game/{game_id}/pattern - Change the winning pattern."""
+        return self._request(
+            "POST",
+            f"/api/game/{game_id}/pattern",
+            GameStateResponse,
+            params={"pattern": PatternType(pattern).value},
+        )
+
+    def set_custom_pattern(
+        self, game_id: UUID, name: str, definition: Any, description: str = ""
+    ):
+        """POST /api/game/{game_id}/custom-pattern - Set a custom winning pattern."""
+        return self._request(
+            "POST",
+            f"/api/game/{game_id}/custom-pattern",
+            CustomPatternResponse,
+            json={"name": name, "description": description, "definition": definition},
+        )
+
+    def create_group(self, group_id: UUID, game_ids: Iterable[UUID]):
+        """POST /api/groups - Link games that share a playlist."""
+        return self._request(
+            "POST",
+            "/api/groups",
+            GroupResponse,
+            json={"group_id": str(group_id), "game_ids": [str(g) for g in game_ids]},
+        )
+
+    def get_group(self, group_id: UUID):
+        """GET /api/groups/{group_id} - A group of linked games."""
+        return self._request("GET", f"/api/groups/{group_id}", GroupResponse)
+
+    def delete_group(self, group_id: UUID):
+        """DELETE /api/groups/{group_id} - Unlink a group; its games are kept."""
+        return self._request("DELETE", f"/api/groups/{group_id}", None)
+
+    def group_mark_song(self, group_id: UUID, song_id: Union[UUID, str], played: bool = True):
+        """POST /api/groups/{group_id}/mark-song - Mark a song in every linked game."""
+        return self._request(
+            "POST",
+            f"/api/groups/{group_id}/mark-song",
+            GroupSongResponse,
+            json={"song_id": str(song_id), "played": played},
+        )
+
+    def group_reveal_song(self, group_id: UUID, song_id: Union[UUID, str]):
+        """POST /api/groups/{group_id}/reveal/{song_id} - Reveal in every linked game."""
+        return self._request(
+            "POST", f"/api/groups/{group_id}/reveal/{song_id}", GroupSongResponse
+        )
+
+    def generate_cards(
+        self,
+        name: str,
+        playlist: Iterable[SongLike],
+        num_cards: int = 50,
+        pattern: PatternType = PatternType.FIVE_IN_A_ROW,
+        seed: Optional[int] = None,
+        layout: str = "single",
+        strategy: str = "weighted",
+        dj_contact: Optional[str] = None,
+    ):
+        """POST /api/jobs/generate - Queue a new game's cards and PDF."""
+        body = {
+            "name": name,
+            "playlist": [_dump(song) for song in playlist],
+            "num_cards": num_cards,
+            "pattern": PatternType(pattern).value,
+            "seed": seed,
+            "layout": layout,
+            "strategy": strategy,
+            "dj_contact": dj_contact,
+        }
+        return self._request("POST", "/api/jobs/generate", GenerationJobResponse, json=body)
+
+    def list_jobs(self):
+        """GET /api/jobs - Generation jobs, newest first."""
+        return self._request("GET", "/api/jobs", GenerationJobListResponse)
+
+    def get_job(self, job_id: UUID):
+        """GET /api/jobs/{job_id} - A generation job's status and progress."""
+        return self._request("GET", f"/api/jobs/{job_id}", GenerationJobResponse)
+
+    def get_job_pdf(self, job_id: UUID):
+        """GET /api/jobs/{job_id}/pdf - PDF bytes of a completed job's cards."""
+        return self._request("GET", f"/api/jobs/{job_id}/pdf", bytes)
+
+    def set_stages(self, game_id: UUID, stages: Iterable[PatternType]):
+        """POST /api/game/{game_id}/stages - Set progressive game stages."""
+        return self._request(
+            "POST",
+            f"/api/game/{game_id}/stages",
+            StagesResponse,
+            json={"stages": [PatternType(stage).value for stage in stages]},
+        )
+
+    def get_stages(self, game_id: UUID):
+        """GET /api/game/{game_id}/stages - Stages with winners per stage."""
+        return self._request("GET", f"/api/game/{game_id}/stages", StagesResponse)
+
+    def advance_stage(self, game_id: UUID):
+        """POST /api/game/{game_id}/stages/advance - Move to the next stage."""
+        return self._request("POST", f"/api/game/{game_id}/stages/advance", StagesResponse)
+
+    def reset_round(self, game_id: UUID):
+        """POST /api/game/{game_id}/reset - Clear played songs for a new round."""
+        return self._request("POST", f"/api/game/{game_id}/reset", GameStateResponse)
+
+    def reveal_song(self, game_id: UUID, song_id: Union[UUID, str]):
+        """POST /api/game/{game_id}/reveal/{song_id} - Reveal a title on player view."""
+        return self._request(
+            "POST", f"/api/game/{game_id}/reveal/{song_id}", GameStateResponse
+        )
+
+    def register_card(self, game_id: UUID, card_id: UUID, player_name: str):
+        """POST /api/game/{game_id}/register-card - Assign a card to a player."""
+        return self._request(
+            "POST",
+            f"/api/game/{game_id}/register-card",
+            RegisterCardResponse,
+            json={"card_id": str(card_id), "player_name": player_name},
+        )
+
+    def get_registered_cards(self, game_id: UUID):
+        """GET /api/game/{game_id}/registered-cards - Cards assigned to players."""
+        return self._request(
+            "GET", f"/api/game/{game_id}/registered-cards", RegisteredCardsResponse
+        )
+
+    def get_card_statuses(self, game_id: UUID):
+        """GET /api/game/{game_id}/card-statuses - Progress of registered cards."""
+        return self._request(
+            "GET", f"/api/game/{game_id}/card-statuses", CardStatusesResponse
+        )
+
+    def replay_call(self, game_id: UUID, call: int, pattern: Optional[PatternType] = None):
+        """GET /api/game/{game_id}/replay/{call} - Who had won at a call."""
+        params = {"pattern": PatternType(pattern).value} if pattern else None
+        return self._request(
+            "GET", f"/api/game/{game_id}/replay/{call}", ReplayCallResponse, params=params
+        )
+
+    def get_first_win(self, game_id: UUID, card_id: UUID):
+        """GET /api/game/{game_id}/card/{card_id}/first-win - Winning call per pattern."""
+        return self._request(
+            "GET", f"/api/game/{game_id}/card/{card_id}/first-win", FirstWinResponse
+        )
+
+    def get_near_wins(self, game_id: UUID, k: int = 10):
+        """GET /api/game/{game_id}/near-wins - Cards closest to winning."""
+        return self._request(
+            "GET", f"/api/game/{game_id}/near-wins", NearWinLeaderboardResponse, params={"k": k}
+        )
+
+    def set_prize(self, game_id: UUID, prize: str):
+        """POST /api/game/{game_id}/prize - Set the prize text."""
+        return self._request(
+            "POST", f"/api/game/{game_id}/prize", SetPrizeResponse, json={"prize": prize}
+        )
+
+
+class MusicBingoClient(_EndpointsMixin):
+    """Synchronous API client over a pooled keep-alive connection."""
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        http_client: Optional[httpx.Client] = None,
+    ):
+        """Initialize client.
+
+        Args:
+            base_url: API base URL
+            timeout: Per-request timeout in seconds
+            retries: Retries on connection errors and 502/503/504
+            backoff: Initial retry delay in seconds (doubles each retry)
+            http_client: Optional preconfigured httpx.Client (e.g. TestClient)
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self._owns_client = http_client is None
+        self._client = http_client or httpx.Client(base_url=base_url, timeout=timeout)
+
+    def __enter__(self) -> "MusicBingoClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying connection pool (if owned by this client)."""
+        if self._owns_client:
+            self._client.close()
+
+    def _request(self, method: str, path: str, model: Optional[type], **kwargs):
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            try:
+                response = self._client.request(method, path, **kwargs)
+            except httpx.TransportError:
+                if attempt == self.retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt == self.retries:
+                    return _parse(response, model)
+            time.sleep(delay)
+            delay *= 2
+
+    def bulk_add_cards(
+        self, game_id: UUID, cards: Iterable[CardLike], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> BulkAddCardsResponse:
+        """POST /api/game/{game_id}/cards/bulk, split into chunks.
+
+        Args:
+            game_id: Game identifier
+            cards: Cards to add (AddCardRequest or dicts in export format)
+            chunk_size: Maximum cards per request
+
+        Returns:
+            Combined response for all chunks
+        """
+        payload = [_dump(card) for card in cards]
+        responses = [self._bulk_add_chunk(game_id, chunk) for chunk in _chunks(payload, chunk_size)]
+        return _merge_bulk(game_id, responses)
+
+    def stream_cards(
+        self,
+        game_id: UUID,
+        cards: Iterable[CardLike],
+        playlist_song_ids: Optional[list[UUID]] = None,
+    ) -> StreamAddCardsResponse:
+        """POST /api/game/{game_id}/cards/stream as one streamed request.
+
+        Cards are serialized lazily, so a generator of cards is never held in
+        memory. The request is not retried because the body can only be sent once.
+
+        Args:
+            game_id: Game identifier
+            cards: Cards to add (AddCardRequest or dicts in export format)
+            playlist_song_ids: Game playlist order; when given, cards are sent
+                in the compact binary format instead of NDJSON
+
+        Returns:
+            Count and digest of the cards added
+        """
+        path, headers, body = _card_stream(game_id, cards, playlist_song_ids)
+        response = self._client.post(path, content=body, headers=headers)
+        return _parse(response, StreamAddCardsResponse)
+
+    def setup_game(
+        self,
+        game_id: UUID,
+        playlist: Iterable[SongLike],
+        cards: Iterable[CardLike],
+        pattern: PatternType = PatternType.FIVE_IN_A_ROW,
+        activate: bool = True,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> GameStateResponse:
+        """Create a game, upload its cards and optionally activate it.
+
+        Returns:
+            Game state after setup
+        """
+        self.create_game(game_id, playlist, pattern)
+        self.bulk_add_cards(game_id, cards, chunk_size)
+        if activate:
+            self.activate_game(game_id)
+        return self.get_game_state(game_id)
+
+    def subscribe_state(
+        self, game_id: UUID, interval: float = 2.0
+    ) -> Iterator[GameStateResponse]:
+        """Poll game state, yielding only when it changes.
+
+        Args:
+            game_id: Game identifier
+            interval: Seconds between polls
+
+        Yields:
+            GameStateResponse each time updated_at changes
+        """
+        last_updated = None
+        while True:
+            state = self.get_game_state(game_id)
+            if state.updated_at != last_updated:
+                last_updated = state.updated_at
+                yield state
+            time.sleep(interval)
+
+
+class AsyncMusicBingoClient(_EndpointsMixin):
+    """Asynchronous API client over a pooled keep-alive connection.
+
+    Endpoint methods return awaitables; run many in parallel with
+    asyncio.gather to set up several games at once.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        max_connections: int = 20,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        """Initialize client.
+
+        Args:
+            base_url: API base URL
+            timeout: Per-request timeout in seconds
+            retries: Retries on connection errors and 502/503/504
+            backoff: Initial retry delay in seconds (doubles each retry)
+            max_connections: Connection pool size (bounds request concurrency)
+            http_client: Optional preconfigured httpx.AsyncClient
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self._owns_client = http_client is None
+        self._client = http_client or httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+    async def __aenter__(self) -> "AsyncMusicBingoClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool (if owned by this client)."""
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def _request(self, method: str, path: str, model: Optional[type], **kwargs):
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self._client.request(method, path, **kwargs)
+            except httpx.TransportError:
+                if attempt == self.retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt == self.retries:
+                    return _parse(response, model)
+            await asyncio.sleep(delay)
+            delay *= 2
+
+    async def bulk_add_cards(
+        self, game_id: UUID, cards: Iterable[CardLike], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> BulkAddCardsResponse:
+        """POST /api/game/{game_id}/cards/bulk, with chunks sent concurrently.
+
+        Args:
+            game_id: Game identifier
+            cards: Cards to add (AddCardRequest or dicts in export format)
+            chunk_size: Maximum cards per request
+
+        Returns:
+            Combined response for all chunks
+        """
+        payload = [_dump(card) for card in cards]
+        responses = await asyncio.gather(
+            *(self._bulk_add_chunk(game_id, chunk) for chunk in _chunks(payload, chunk_size))
+        )
+        return _merge_bulk(game_id, list(responses))
+
+    async def stream_cards(
+        self,
+        game_id: UUID,
+        cards: Iterable[CardLike],
+        playlist_song_ids: Optional[list[UUID]] = None,
+    ) -> StreamAddCardsResponse:
+        """POST /api/game/{game_id}/cards/stream as one streamed request.
+
+        See MusicBingoClient.stream_cards.
+        """
+        path, headers, body = _card_stream(game_id, cards, playlist_song_ids)
+        response = await self._client.post(path, content=_aiter(body), headers=headers)
+        return _parse(response, StreamAddCardsResponse)
+
+    async def setup_game(
+        self,
+        game_id: UUID,
+        playlist: Iterable[SongLike],
+        cards: Iterable[CardLike],
+        pattern: PatternType = PatternType.FIVE_IN_A_ROW,
+        activate: bool = True,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> GameStateResponse:
+        """Create a game, upload its cards and optionally activate it.
+
+        Returns:
+            Game state after setup
+        """
+        await self.create_game(game_id, playlist, pattern)
+        await self.bulk_add_cards(game_id, cards, chunk_size)
+        if activate:
+            await self.activate_game(game_id)
+        return await self.get_game_state(game_id)
+
+    async def subscribe_state(
+        self, game_id: UUID, interval: float = 2.0
+    ) -> AsyncIterator[GameStateResponse]:
+        """Poll game state, yielding only when it changes.
+
+        Args:
+            game_id: Game identifier
+            interval: Seconds between polls
+
+        Yields:
+            GameStateResponse each time updated_at changes
+        """
+        last_updated = None
+        while True:
+            state = await self.get_game_state(game_id)
+            if state.updated_at != last_updated:
+                last_updated = state.updated_at
+                yield state
+            await asyncio.sleep(interval)
@@ -2,10 +2,11 @@
 
 import json
 from pathlib import Path
-from typing import Optional
 from uuid import UUID
 
-from .models import CardData, GameState, GameStatus, PatternType, Song
+from .card_layouts import share_cards, shared_layouts_enabled
+from .metrics import timed
+from .models import BingoPattern, CardData, GameState, GameStatus, PatternType, Song
 
 # Games directory at project root (relative to this file's location)
 GAMES_DIR = Path(__file__).parent.parent.parent.parent / "games"
@@ -41,6 +42,7 @@ def list_available_games() -> list[dict]:
     return sorted(games, key=lambda g: g["name"])
 
 
+@timed("load_game")
 def load_game_from_file(filename: str) -> GameState:
     """Load a game from JSON file and return GameState ready to play.
 
@@ -67,6 +69,23 @@ def load_game_from_file(filename: str) -> GameState:
     if not game_path.exists():
         raise FileNotFoundError(f"Game file not found: {filename}")
 
+    return load_game_from_path(game_path)
+
+
+def load_game_from_path(game_path: Path) -> GameState:
+    """Load a game from a JSON file anywhere on disk (see load_game_from_file).
+
+    Args:
+        game_path: Path to the game JSON file
+
+    Returns:
+        GameState ready to be registered and played
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If file has invalid format
+    """
+    filename = Path(game_path).name
     with open(game_path) as f:
         data = json.load(f)
 
@@ -99,12 +118,32 @@ def load_game_from_file(filename: str) -> GameState:
         current_pattern=PatternType(data.get("pattern", "five_in_a_row")),
     )
 
-    # Parse and add cards
+    # Optional custom pattern: {"name", "description", "definition"}
+    custom = data.get("custom_pattern")
+    if custom is not None:
+        game.custom_pattern = BingoPattern.from_definition(
+            custom.get("definition"), custom.get("name", "Custom"), custom.get("description", "")
+        )
+    game.get_pattern()  # "pattern": "custom" requires a custom_pattern
+    if data.get("stages"):
+        game.set_stages([PatternType(stage) for stage in data["stages"]])
+
+    # Cards: mapped from a segment shared by all workers, or parsed per process
+    if shared_layouts_enabled():
+        song_ids = [song.song_id for song in playlist]
+        game.cards = share_cards(game_id, song_ids, data.get("cards", []))
+        return game
+
+    song_index = game.get_song_index()
     for card_data in data.get("cards", []):
         # Parse song_positions - JSON stores as string keys
         song_positions = {}
         for song_id_str, position in card_data["song_positions"].items():
-            song_positions[UUID(song_id_str)] = tuple(position)
+            song_id = UUID(song_id_str)
+            if song_id not in song_index:
+                # Same check as share_cards, so both paths accept the same files
+                raise ValueError(f"Song {song_id} not in game playlist")
+            song_positions[song_id] = tuple(position)
 
         card = CardData(
             card_id=UUID(card_data["card_id"]),
@@ -156,6 +195,14 @@ def save_game_to_file(game: GameState, filename: str) -> None:
             for card in game.cards.values()
         ],
     }
+    if game.stages:
+        data["stages"] = [stage.value for stage in game.stages]
+    if game.custom_pattern is not None:
+        data["custom_pattern"] = {
+            "name": game.custom_pattern.name,
+            "description": game.custom_pattern.description,
+            "definition": game.custom_pattern.definition,
+        }
 
     with open(game_path, "w") as f:
         json.dump(data, f, indent=2)
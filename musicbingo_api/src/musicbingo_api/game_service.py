@@ -1,22 +1,118 @@
 """Game state management service."""
 
+import logging
+import os
+import shutil
+import tempfile
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
 from uuid import UUID
 
-from .models import CardData, GameState, GameStatus, PatternType, Song
+from .card_layouts import SharedCards
+from .metrics import REGISTRY, timed
+from .models import (
+    BingoPattern,
+    CardData,
+    GameGroup,
+    GameState,
+    GameStatus,
+    PatternType,
+    Song,
+)
+from .snapshot import clear_snapshots, load_snapshot, save_snapshot, snapshot_path
+
+logger = logging.getLogger(__name__)
+
+# Environment variables configuring the live-game cache
+MAX_GAMES_ENV = "MUSICBINGO_MAX_GAMES"
+IDLE_TTL_ENV = "MUSICBINGO_GAME_IDLE_SECONDS"
+SNAPSHOT_DIR_ENV = "MUSICBINGO_SNAPSHOT_DIR"
+
+DEFAULT_MAX_GAMES = 64
+DEFAULT_IDLE_TTL = 6 * 60 * 60  # seconds without access before a game is evicted
+
+GAMES_IN_MEMORY = REGISTRY.gauge(
+    "musicbingo_games_in_memory", "Games currently held in memory"
+)
+GAME_EVICTIONS = REGISTRY.counter(
+    "musicbingo_game_evictions_total", "Games evicted to disk snapshots", ("reason",)
+)
+GAME_REHYDRATIONS = REGISTRY.counter(
+    "musicbingo_game_rehydrations_total", "Games reloaded from disk snapshots"
+)
 
 
 class GameService:
     """Service for managing game state.
 
-    Keeps active games in memory for fast access. Can be extended with
-    database persistence layer.
+    Keeps live games in memory for fast access, bounded by max_games. Games
+    idle for longer than idle_ttl, and the least recently used games beyond
+    max_games (completed games first), are written to compact snapshots in
+    snapshot_dir and dropped from memory. get_game reloads them on the next
+    access, so eviction is invisible to callers.
+
+    Games in use by an operation that spans several lookups (group marks,
+    streamed uploads) are pinned (see pin_games) and never evicted, so
+    changes cannot land on an object that has already been snapshotted.
+    Snapshots belong to one service instance: they are not reloaded after
+    a restart.
     """
 
-    def __init__(self):
-        """Initialize game service with empty state."""
-        self._games: dict[UUID, GameState] = {}
+    def __init__(
+        self,
+        max_games: int = DEFAULT_MAX_GAMES,
+        idle_ttl: Optional[float] = DEFAULT_IDLE_TTL,
+        snapshot_dir: Optional[Path] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize game service with empty state.
+
+        Args:
+            max_games: Maximum games held in memory
+            idle_ttl: Seconds without access before a game is evicted (None: never)
+            snapshot_dir: Directory for evicted game snapshots; snapshots left
+                there by an earlier service are deleted. Default: a private
+                temporary directory, created on first eviction and removed
+                by close().
+            clock: Monotonic time source (for tests)
+        """
+        if max_games < 1:
+            raise ValueError("max_games must be at least 1")
+        self.max_games = max_games
+        self.idle_ttl = idle_ttl
+        self._snapshot_dir = None if snapshot_dir is None else Path(snapshot_dir)
+        self._private_snapshot_dir = snapshot_dir is None
+        if self._snapshot_dir is not None:
+            clear_snapshots(self._snapshot_dir)
+        self._clock = clock
+        # Live games in least-recently-used order, with last access times
+        self._games: OrderedDict[UUID, GameState] = OrderedDict()
+        self._last_access: dict[UUID, float] = {}
+        self._pins: Counter[UUID] = Counter()
+        self._groups: dict[UUID, GameGroup] = {}
+
+    @property
+    def snapshot_dir(self) -> Path:
+        """Directory holding evicted game snapshots."""
+        if self._snapshot_dir is None:
+            self._snapshot_dir = Path(tempfile.mkdtemp(prefix="musicbingo-snapshots-"))
+        return self._snapshot_dir
+
+    def close(self) -> None:
+        """Delete snapshots of evicted games and shared card layouts (call on shutdown)."""
+        for game in self._games.values():
+            _release_cards(game)
+        if self._snapshot_dir is None:
+            return
+        if self._private_snapshot_dir:
+            shutil.rmtree(self._snapshot_dir, ignore_errors=True)
+            self._snapshot_dir = None
+        else:
+            clear_snapshots(self._snapshot_dir)
 
     def create_game(
         self,
@@ -37,9 +133,12 @@ class GameService:
         Raises:
             ValueError: If game_id already exists or playlist is invalid
         """
-        if game_id in self._games:
+        if self.get_game(game_id) is not None:
             raise ValueError(f"Game {game_id} already exists")
 
+        if pattern == PatternType.CUSTOM:
+            raise ValueError("Create the game with a built-in pattern, then set a custom pattern")
+
         if len(playlist) < 24:
             raise ValueError(f"Playlist must have at least 24 songs, got {len(playlist)}")
 
@@ -50,11 +149,23 @@ class GameService:
             current_pattern=pattern,
         )
 
-        self._games[game_id] = game
+        self.register_game(game)
         return game
 
+    def register_game(self, game: GameState) -> None:
+        """Add an existing GameState (e.g. loaded from a file) to the service.
+
+        Args:
+            game: Game to hold in memory
+        """
+        self._games[game.game_id] = game
+        self._games.move_to_end(game.game_id)
+        self._last_access[game.game_id] = self._clock()
+        self._evict_over_capacity()
+        GAMES_IN_MEMORY.set(len(self._games))
+
     def get_game(self, game_id: UUID) -> Optional[GameState]:
-        """Get game by ID.
+        """Get game by ID, reloading it from its snapshot if it was evicted.
 
         Args:
             game_id: Game identifier
@@ -62,7 +173,119 @@ class GameService:
         Returns:
             GameState if found, None otherwise
         """
-        return self._games.get(game_id)
+        self._evict_idle()
+        game = self._games.get(game_id)
+        if game is None:
+            game = self._rehydrate(game_id)
+            if game is None:
+                return None
+        else:
+            self._games.move_to_end(game_id)
+            self._last_access[game_id] = self._clock()
+        return game
+
+    @contextmanager
+    def pin_games(self, game_ids: list[UUID]) -> Iterator[list[GameState]]:
+        """Get games and keep them in memory until the block exits.
+
+        Each game is pinned as soon as it is fetched, so reloading a later
+        one cannot evict an earlier one. Memory may exceed max_games while
+        games are pinned; the excess is evicted when the block exits.
+
+        Args:
+            game_ids: Game identifiers
+
+        Yields:
+            GameStates in game_ids order
+
+        Raises:
+            ValueError: If a game is not found
+        """
+        pinned = []
+        try:
+            for game_id in game_ids:
+                game = self.get_game_or_raise(game_id)
+                self._pins[game_id] += 1
+                pinned.append(game)
+            yield pinned
+        finally:
+            for game in pinned:
+                self._pins[game.game_id] -= 1
+                if not self._pins[game.game_id]:
+                    del self._pins[game.game_id]
+            self._evict_over_capacity()
+
+    def evict_game(self, game_id: UUID, reason: str = "manual") -> bool:
+        """Write a live game to its snapshot and drop it from memory.
+
+        Args:
+            game_id: Game identifier
+            reason: Metrics label
+
+        Returns:
+            True if evicted; False if not in memory, pinned, or it could not
+            be snapshotted (it then stays in memory)
+        """
+        game = self._games.get(game_id)
+        if game is None or game_id in self._pins:
+            return False
+        try:
+            save_snapshot(game, self.snapshot_dir)
+        except Exception as e:
+            # Never let a bad game break the lookup that triggered eviction
+            logger.warning("Keeping game %s in memory; snapshot failed: %s", game_id, e)
+            return False
+        del self._games[game_id]
+        del self._last_access[game_id]
+        _release_cards(game)  # the snapshot holds the cards now
+        GAME_EVICTIONS.inc(reason)
+        GAMES_IN_MEMORY.set(len(self._games))
+        return True
+
+    def _rehydrate(self, game_id: UUID) -> Optional[GameState]:
+        """Reload an evicted game from its snapshot."""
+        if self._snapshot_dir is None:
+            return None
+        game = load_snapshot(self._snapshot_dir, game_id)
+        if game is None:
+            return None
+        snapshot_path(self.snapshot_dir, game_id).unlink(missing_ok=True)
+        for group in self._groups.values():
+            if game_id in group.game_ids:
+                game._song_index = group.song_index
+        GAME_REHYDRATIONS.inc()
+        self.register_game(game)
+        return game
+
+    def _evict_idle(self) -> None:
+        """Evict games not accessed within idle_ttl (oldest first)."""
+        if self.idle_ttl is None:
+            return
+        now = self._clock()
+        while self._games:
+            game_id = next(iter(self._games))
+            if self._last_access[game_id] > now - self.idle_ttl:
+                break
+            if not self.evict_game(game_id, "idle"):
+                # Pinned or could not snapshot; retry after another idle period
+                self._games.move_to_end(game_id)
+                self._last_access[game_id] = now
+
+    def _evict_over_capacity(self) -> None:
+        """Evict least recently used games beyond max_games, completed games first."""
+        excess = len(self._games) - self.max_games
+        if excess <= 0:
+            return
+        newest = next(reversed(self._games))  # the game just added or accessed stays
+        completed, others = [], []
+        for game_id, game in self._games.items():
+            if game_id != newest and game_id not in self._pins:
+                (completed if game.status == GameStatus.COMPLETED else others).append(game_id)
+        for game_id in completed + others:
+            if excess <= 0:
+                break
+            if self.evict_game(game_id, "capacity"):
+                excess -= 1
 
     def get_game_or_raise(self, game_id: UUID) -> GameState:
         """Get game by ID or raise error.
@@ -138,6 +361,7 @@ class GameService:
         game.add_played_song(song_id)
         return game
 
+    @timed("verify_card")
     def verify_card(self, game_id: UUID, card_id: UUID) -> tuple[bool, Optional[PatternType], int, Optional[str]]:
         """Verify if a card is a winner.
 
@@ -174,22 +398,18 @@ class GameService:
             Updated Game object
 
         Raises:
-            ValueError: If game not found or invalid song_id
+            ValueError: If game not found, or song_id is invalid or not in
+                the playlist
         """
         game = self.get_game_or_raise(game_id)
-
-        # Convert string song_id to UUID
-        try:
-            song_uuid = UUID(song_id)
-        except ValueError:
-            raise ValueError(f"Invalid song_id format: {song_id}")
+        song_uuid = _playlist_song(game, song_id)
 
         if played:
             # Add to played songs if not already there
             if song_uuid not in game.played_songs:
                 game.played_songs.append(song_uuid)
                 # Check for new winners after adding a played song
-                self.check_for_new_winners(game_id, song_uuid)
+                self._record_new_winners(game, song_uuid)
         else:
             # Remove from played songs if present
             if song_uuid in game.played_songs:
@@ -209,17 +429,44 @@ class GameService:
             Updated GameState
 
         Raises:
-            ValueError: If game not found
+            ValueError: If game not found, or pattern is CUSTOM and the game
+                has no custom pattern
         """
         game = self.get_game_or_raise(game_id)
+        game.get_pattern(pattern)
+        game.stages = []  # An explicit pattern ends staged play
         game.current_pattern = pattern
         return game
 
+    def set_custom_pattern(
+        self, game_id: UUID, name: str, definition: Any, description: str = ""
+    ) -> GameState:
+        """Compile a custom pattern and make it the game's winning pattern.
+
+        Args:
+            game_id: Game identifier
+            name: Display name for the pattern
+            definition: Pattern definition (see patterns.py)
+            description: Display description
+
+        Returns:
+            Updated GameState
+
+        Raises:
+            ValueError: If game not found or the definition is invalid
+        """
+        game = self.get_game_or_raise(game_id)
+        game.custom_pattern = BingoPattern.from_definition(definition, name, description)
+        game.stages = []
+        game.current_pattern = PatternType.CUSTOM
+        game.updated_at = datetime.now()
+        return game
+
     def reset_round(self, game_id: UUID) -> GameState:
         """Reset played songs for a new round.
 
         Clears played_songs, revealed_songs, and detected_winners but keeps
-        cards, pattern, and current_prize.
+        cards, pattern, and current_prize. Staged games return to stage 0.
 
         Args:
             game_id: Game identifier
@@ -234,6 +481,8 @@ class GameService:
         game.played_songs = []
         game.revealed_songs = []
         game.detected_winners = []  # Clear winners for new round
+        if game.stages:
+            game.set_stages(game.stages)
         game.updated_at = datetime.now()
         return game
 
@@ -248,14 +497,11 @@ class GameService:
             Updated GameState
 
         Raises:
-            ValueError: If game not found or invalid song_id
+            ValueError: If game not found, or song_id is invalid or not in
+                the playlist
         """
         game = self.get_game_or_raise(game_id)
-
-        try:
-            song_uuid = UUID(song_id)
-        except ValueError:
-            raise ValueError(f"Invalid song_id format: {song_id}")
+        song_uuid = _playlist_song(game, song_id)
 
         if song_uuid not in game.revealed_songs:
             game.revealed_songs.append(song_uuid)
@@ -319,10 +565,10 @@ class GameService:
         return game
 
     def list_games(self) -> list[GameState]:
-        """Get all games.
+        """Get all games held in memory (evicted games are not reloaded).
 
         Returns:
-            List of all games
+            List of live games
         """
         return list(self._games.values())
 
@@ -335,9 +581,16 @@ class GameService:
         Raises:
             ValueError: If game not found
         """
-        if game_id not in self._games:
+        game = self.get_game(game_id)
+        if game is None:
             raise ValueError(f"Game {game_id} not found")
         del self._games[game_id]
+        del self._last_access[game_id]
+        _release_cards(game)
+        GAMES_IN_MEMORY.set(len(self._games))
+        for group in self._groups.values():
+            if game_id in group.game_ids:
+                group.game_ids.remove(game_id)
 
     def register_card(self, game_id: UUID, card_id: UUID, player_name: str) -> dict:
         """Register a card to a player.
@@ -411,8 +664,11 @@ class GameService:
         Raises:
             ValueError: If game not found
         """
-        game = self.get_game_or_raise(game_id)
+        return self._record_new_winners(self.get_game_or_raise(game_id), triggering_song_id)
 
+    @timed("check_winners")
+    def _record_new_winners(self, game: GameState, triggering_song_id: UUID) -> list[dict]:
+        """Detect new winners of a game already in hand and store them."""
         new_winners = game.check_registered_cards_for_winners()
 
         # Add triggering song_id and store in game state
@@ -422,6 +678,7 @@ class GameService:
 
         return new_winners
 
+    @timed("card_statuses")
     def get_card_statuses(self, game_id: UUID) -> dict:
         """Get status info for all registered cards.
 
@@ -446,6 +703,330 @@ class GameService:
             "winners": winners,
         }
 
+    @timed("replay_call")
+    def get_winners_at_call(
+        self, game_id: UUID, call: int, pattern: Optional[PatternType] = None
+    ) -> dict:
+        """Replay a game to a call and report who had won.
+
+        Args:
+            game_id: Game identifier
+            call: 1-based call index into the play log
+            pattern: Pattern to check (default: current pattern)
+
+        Returns:
+            Dict with game_id, call, song_id, pattern, new_winners, winners;
+            winners are dicts with card_id, card_number, player_name
+
+        Raises:
+            ValueError: If game not found or call out of range
+        """
+        game = self.get_game_or_raise(game_id)
+        result = game.get_winners_at_call(call, pattern)
+
+        def describe(card_id: UUID) -> dict:
+            registration = game.registered_cards.get(card_id, {})
+            return {
+                "card_id": card_id,
+                "card_number": game.cards[card_id].card_number,
+                "player_name": registration.get("player_name"),
+            }
+
+        return {
+            "game_id": game_id,
+            **result,
+            "new_winners": [describe(card_id) for card_id in result["new_winners"]],
+            "winners": [describe(card_id) for card_id in result["winners"]],
+        }
+
+    def get_first_win_calls(self, game_id: UUID, card_id: UUID) -> dict:
+        """Get the call at which a card first completed each pattern.
+
+        Args:
+            game_id: Game identifier
+            card_id: Card identifier
+
+        Returns:
+            Dict with game_id, card_id, card_number, played_count, first_win_calls
+
+        Raises:
+            ValueError: If game or card not found
+        """
+        game = self.get_game_or_raise(game_id)
+        first_win_calls = game.get_first_win_calls(card_id)
+
+        return {
+            "game_id": game_id,
+            "card_id": card_id,
+            "card_number": game.cards[card_id].card_number,
+            "played_count": len(game.played_songs),
+            "first_win_calls": first_win_calls,
+        }
+
+    @timed("near_win_leaderboard")
+    def get_near_win_leaderboard(self, game_id: UUID, k: int = 10) -> dict:
+        """Get registered cards closest to winning the current pattern.
+
+        Args:
+            game_id: Game identifier
+            k: Maximum number of cards to list
+
+        Returns:
+            Dict with game_id, current_pattern, away_counts, closest
+
+        Raises:
+            ValueError: If game not found
+        """
+        game = self.get_game_or_raise(game_id)
+        leaderboard = game.get_near_win_leaderboard(k)
+
+        return {
+            "game_id": game_id,
+            "current_pattern": game.current_pattern,
+            **leaderboard,
+        }
+
+    def set_stages(self, game_id: UUID, stages: list[PatternType]) -> dict:
+        """Set the ordered patterns of a progressive game.
+
+        Args:
+            game_id: Game identifier
+            stages: Patterns in play order
+
+        Returns:
+            Stage summary (see get_stages)
+
+        Raises:
+            ValueError: If game not found, stages is empty, or a stage is
+                CUSTOM without a custom pattern
+        """
+        game = self.get_game_or_raise(game_id)
+        if not stages:
+            raise ValueError("At least one stage is required")
+        game.set_stages(stages)
+        return self.get_stages(game_id)
+
+    @timed("advance_stage")
+    def advance_stage(self, game_id: UUID) -> dict:
+        """Move a progressive game to its next stage.
+
+        Cards that already complete the new stage's pattern are recorded as
+        its winners straight away, attributed to the last played song.
+
+        Args:
+            game_id: Game identifier
+
+        Returns:
+            Stage summary with new_winners for the new stage
+
+        Raises:
+            ValueError: If game not found, has no stages, or is on the last stage
+        """
+        game = self.get_game_or_raise(game_id)
+        game.advance_stage()
+
+        last_song = game.played_songs[-1] if game.played_songs else None
+        new_winners = self._record_new_winners(game, last_song)
+
+        return {**self.get_stages(game_id), "new_winners": new_winners}
+
+    def get_stages(self, game_id: UUID) -> dict:
+        """Get the stages of a progressive game with winners per stage.
+
+        Args:
+            game_id: Game identifier
+
+        Returns:
+            Dict with game_id, current_stage and stages; each stage lists its
+            detected winners and how many registered cards complete it now
+
+        Raises:
+            ValueError: If game not found or has no stages
+        """
+        game = self.get_game_or_raise(game_id)
+        tracker = game.get_stage_tracker()
+
+        stages = []
+        for index, pattern_type in enumerate(game.stages):
+            pattern = game.get_pattern(pattern_type)
+            stages.append({
+                "index": index,
+                "pattern": pattern_type,
+                "name": pattern.name,
+                "completed_count": len(tracker.winners(index)),
+                "winners": [w for w in game.detected_winners if w.get("stage") == index],
+            })
+
+        return {
+            "game_id": game_id,
+            "current_stage": game.current_stage,
+            "stages": stages,
+        }
+
+    def create_group(self, group_id: UUID, game_ids: list[UUID]) -> GameGroup:
+        """Link games (rooms) so songs are marked in all of them at once.
+
+        Args:
+            group_id: Group identifier
+            game_ids: Member games; all must use the same playlist in the
+                same order
+
+        Returns:
+            Created GameGroup
+
+        Raises:
+            ValueError: If the group exists, a game is not found or already
+                grouped, or the playlists differ
+        """
+        if group_id in self._groups:
+            raise ValueError(f"Group {group_id} already exists")
+        if not game_ids:
+            raise ValueError("A group needs at least one game")
+        if len(set(game_ids)) != len(game_ids):
+            raise ValueError("Duplicate game in group")
+
+        games = [self.get_game_or_raise(game_id) for game_id in game_ids]
+        grouped = {game_id for group in self._groups.values() for game_id in group.game_ids}
+        for game in games:
+            if game.game_id in grouped:
+                raise ValueError(f"Game {game.game_id} is already in a group")
+
+        song_ids = [song.song_id for song in games[0].playlist]
+        for game in games[1:]:
+            if [song.song_id for song in game.playlist] != song_ids:
+                raise ValueError(f"Game {game.game_id} has a different playlist")
+
+        group = GameGroup(
+            group_id=group_id,
+            game_ids=list(game_ids),
+            song_index=games[0].get_song_index(),
+        )
+        for game in games:
+            game._song_index = group.song_index
+        self._groups[group_id] = group
+        return group
+
+    def get_group_or_raise(self, group_id: UUID) -> GameGroup:
+        """Get group by ID or raise error.
+
+        Args:
+            group_id: Group identifier
+
+        Returns:
+            GameGroup
+
+        Raises:
+            ValueError: If group not found
+        """
+        group = self._groups.get(group_id)
+        if group is None:
+            raise ValueError(f"Group {group_id} not found")
+        return group
+
+    def delete_group(self, group_id: UUID) -> None:
+        """Unlink a group; member games are kept.
+
+        Args:
+            group_id: Group identifier
+
+        Raises:
+            ValueError: If group not found
+        """
+        self.get_group_or_raise(group_id)
+        del self._groups[group_id]
+
+    def _group_song(self, group_id: UUID, song_id: str) -> tuple[list[UUID], UUID]:
+        """Resolve a group's game IDs and a song before changing any game."""
+        group = self.get_group_or_raise(group_id)
+
+        try:
+            song_uuid = UUID(song_id)
+        except ValueError:
+            raise ValueError(f"Invalid song_id format: {song_id}")
+        if song_uuid not in group.song_index:
+            raise ValueError(f"Song {song_id} not in group playlist")
+        return list(group.game_ids), song_uuid
+
+    @timed("group_mark_song")
+    def group_toggle_song_played(self, group_id: UUID, song_id: str, played: bool) -> dict:
+        """Mark or unmark a song in every game of a group.
+
+        All checks run before any game changes, so the call applies to all
+        member games or to none. Winner detection is incremental per game
+        (only cards holding the song are touched), so the cost per room stays
+        small as rooms are added.
+
+        Args:
+            group_id: Group identifier
+            song_id: Song identifier (as string, converted to UUID)
+            played: True to mark as played, False to unmark
+
+        Returns:
+            Dict with group_id, song_id, played, games (game_id and
+            total_played per room) and new_winners (winner dicts with game_id)
+
+        Raises:
+            ValueError: If group or a member game is not found, or the song
+                is invalid
+        """
+        game_ids, song_uuid = self._group_song(group_id, song_id)
+        now = datetime.now()
+
+        results = []
+        new_winners = []
+        with self.pin_games(game_ids) as games:
+            for game in games:
+                if played:
+                    if song_uuid not in game.played_songs:
+                        game.played_songs.append(song_uuid)
+                        for winner in self._record_new_winners(game, song_uuid):
+                            new_winners.append({**winner, "game_id": game.game_id})
+                elif song_uuid in game.played_songs:
+                    game.played_songs.remove(song_uuid)
+                game.updated_at = now
+                results.append({"game_id": game.game_id, "total_played": len(game.played_songs)})
+
+        return {
+            "group_id": group_id,
+            "song_id": song_id,
+            "played": played,
+            "games": results,
+            "new_winners": new_winners,
+        }
+
+    def group_reveal_song(self, group_id: UUID, song_id: str) -> dict:
+        """Reveal a song title in every game of a group.
+
+        Args:
+            group_id: Group identifier
+            song_id: Song identifier (as string, converted to UUID)
+
+        Returns:
+            Dict with group_id, song_id and games (game_id and total_played)
+
+        Raises:
+            ValueError: If group or a member game is not found, or the song
+                is invalid
+        """
+        game_ids, song_uuid = self._group_song(group_id, song_id)
+        now = datetime.now()
+
+        with self.pin_games(game_ids) as games:
+            for game in games:
+                if song_uuid not in game.revealed_songs:
+                    game.revealed_songs.append(song_uuid)
+                    game.updated_at = now
+            results = [
+                {"game_id": game.game_id, "total_played": len(game.played_songs)}
+                for game in games
+            ]
+
+        return {
+            "group_id": group_id,
+            "song_id": song_id,
+            "games": results,
+        }
+
     def set_prize(self, game_id: UUID, prize: str) -> GameState:
         """Set the prize for the current game.
 
@@ -465,6 +1046,23 @@ class GameService:
         return game
 
 
+def _release_cards(game: GameState) -> None:
+    """Unlink a game's shared card layout segment, if it has one."""
+    if isinstance(game.cards, SharedCards):
+        game.cards.release()
+
+
+def _playlist_song(game: GameState, song_id: str) -> UUID:
+    """Parse a song ID and check it is in the game's playlist."""
+    try:
+        song_uuid = UUID(song_id)
+    except ValueError:
+        raise ValueError(f"Invalid song_id format: {song_id}")
+    if song_uuid not in game.get_song_index():
+        raise ValueError(f"Song {song_id} not in game playlist")
+    return song_uuid
+
+
 # Global service instance
 _game_service: Optional[GameService] = None
 
@@ -477,5 +1075,16 @@ def get_game_service() -> GameService:
     """
     global _game_service
     if _game_service is None:
-        _game_service = GameService()
+        idle_ttl = float(os.environ.get(IDLE_TTL_ENV, DEFAULT_IDLE_TTL))
+        _game_service = GameService(
+            max_games=int(os.environ.get(MAX_GAMES_ENV, DEFAULT_MAX_GAMES)),
+            idle_ttl=idle_ttl if idle_ttl > 0 else None,
+            snapshot_dir=os.environ.get(SNAPSHOT_DIR_ENV) or None,
+        )
     return _game_service
+
+
+def close_game_service() -> None:
+    """Close the global game service if it was created (call on shutdown)."""
+    if _game_service is not None:
+        _game_service.close()
@@ -0,0 +1,375 @@
+"""Background card-generation jobs.
+
+A job runs the card generator from the musicbingo-cards package (an
+optional dependency, ``pip install -e ".[generate]"``) in a worker process:
+cards are generated, rendered to PDF and collected for the game file in one
+streaming pass (see musicbingo_cards.pipeline). The event loop only awaits
+the worker's future. Workers report progress by rewriting a small
+``<job_id>.progress`` file, which status requests read. When the worker is
+done, the game file is loaded and registered in GameService and the PDF is
+kept for download. Finished jobs (and their PDFs) are forgotten after
+FINISHED_JOB_TTL or once more than MAX_FINISHED_JOBS have finished.
+
+Settings:
+    MUSICBINGO_JOBS_DIR: Directory for job output (default: games/generated)
+    MUSICBINGO_JOB_WORKERS: Worker processes (default 2)
+"""
+
+import asyncio
+import importlib.util
+import json
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+from uuid import UUID, uuid4
+
+from .game_loader import GAMES_DIR, load_game_from_path
+from .game_service import get_game_service
+from .metrics import REGISTRY
+from .models import JobStatus
+
+JOBS_DIR_ENV = "MUSICBINGO_JOBS_DIR"
+JOB_WORKERS_ENV = "MUSICBINGO_JOB_WORKERS"
+DEFAULT_JOB_WORKERS = 2
+PROGRESS_UPDATES = 100  # progress file writes per job, at most
+MAX_FINISHED_JOBS = 200
+FINISHED_JOB_TTL = timedelta(hours=24)
+
+GENERATION_JOBS = REGISTRY.counter(
+    "musicbingo_generation_jobs_total", "Card generation jobs finished", ("status",)
+)
+
+
+class GenerationError(Exception):
+    """Exception raised by a worker when generation fails (message only, so it pickles)."""
+
+    pass
+
+
+@dataclass
+class GenerationJob:
+    """State of one generation job.
+
+    Attributes:
+        job_id: Job identifier
+        game_id: Identifier of the game being generated
+        name: Game name
+        num_cards: Cards requested
+        status: Current status
+        cards_done: Cards generated and rendered so far
+        error: Failure message (failed jobs)
+        pdf_path: Rendered cards (completed jobs)
+        created_at: When the job was submitted
+        finished_at: When the job completed or failed
+    """
+
+    job_id: UUID
+    game_id: UUID
+    name: str
+    num_cards: int
+    status: JobStatus = JobStatus.QUEUED
+    cards_done: int = 0
+    error: Optional[str] = None
+    pdf_path: Optional[Path] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        f.write(text)
+    os.replace(tmp_name, path)
+
+
+def _report_progress(cards: Iterable, path: Path, total: int) -> Iterator:
+    """Pass cards through, rewriting the progress file every 1% of total."""
+    step = max(1, total // PROGRESS_UPDATES)
+    _write_atomic(path, "0")
+    for done, card in enumerate(cards, 1):
+        yield card
+        if done % step == 0 or done == total:
+            _write_atomic(path, str(done))
+
+
+def run_generation(spec: dict, output_dir: str) -> dict:
+    """Generate a game's cards, PDF and game file (runs in a worker process).
+
+    Args:
+        spec: Job parameters (see JobManager.submit), JSON-compatible
+        output_dir: Directory for <job_id>.pdf, <job_id>.json and progress
+
+    Returns:
+        Paths of the game file and PDF
+
+    Raises:
+        GenerationError: If the playlist or parameters are rejected, or rendering fails
+    """
+    from musicbingo_cards.exporter import CardExporter
+    from musicbingo_cards.generator import CardGenerator
+    from musicbingo_cards.models import Song, stable_song_id
+    from musicbingo_cards.pdf_generator import PDFCardGenerator
+    from musicbingo_cards.pipeline import run_pipeline
+    from musicbingo_cards.playlist import Playlist
+
+    output = Path(output_dir)
+    job_id = spec["job_id"]
+    game_path = output / f"{job_id}.json"
+    pdf_path = output / f"{job_id}.pdf"
+
+    try:
+        songs = [
+            Song(
+                title=s["title"],
+                artist=s["artist"],
+                album=s.get("album"),
+                duration_seconds=s.get("duration_seconds"),
+                song_id=(
+                    UUID(s["song_id"]) if s.get("song_id")
+                    else stable_song_id(s["title"], s["artist"])
+                ),
+            )
+            for s in spec["playlist"]
+        ]
+        playlist = Playlist(songs, name=spec["name"])
+        playlist.validate()
+
+        if spec["strategy"] == "design":
+            from musicbingo_cards.designs import DesignCardGenerator
+
+            generator = DesignCardGenerator(playlist, random_seed=spec["seed"])
+        else:
+            generator = CardGenerator(playlist, random_seed=spec["seed"])
+        cards = generator.iter_compact_cards(spec["num_cards"], spec["game_id"])
+
+        pdf_generator = PDFCardGenerator(dj_contact=spec["dj_contact"])
+        stages = {
+            "pdf": lambda stream: pdf_generator.generate_pdf(
+                stream, pdf_path, title=spec["name"], layout=spec["layout"]
+            ),
+            "cards": lambda stream: [
+                CardExporter.card_to_dict(card, number) for number, card in enumerate(stream, 1)
+            ],
+        }
+        progress_path = output / f"{job_id}.progress"
+        results = run_pipeline(_report_progress(cards, progress_path, spec["num_cards"]), stages)
+    except Exception as e:
+        raise GenerationError(str(e)) from None
+
+    game = {
+        "game_id": spec["game_id"],
+        "name": spec["name"],
+        "pattern": spec["pattern"],
+        "playlist": [
+            {
+                "song_id": str(song.song_id),
+                "title": song.title,
+                "artist": song.artist,
+                "album": song.album,
+                "duration_seconds": song.duration_seconds,
+            }
+            for song in songs
+        ],
+        "cards": results["cards"],
+    }
+    _write_atomic(game_path, json.dumps(game))
+    return {"game_path": str(game_path), "pdf_path": str(pdf_path)}
+
+
+def generation_available() -> bool:
+    """True if the musicbingo-cards package is installed."""
+    return importlib.util.find_spec("musicbingo_cards") is not None
+
+
+class JobManager:
+    """Runs generation jobs in a process pool and tracks their state."""
+
+    def __init__(
+        self,
+        jobs_dir: Path,
+        max_workers: int = DEFAULT_JOB_WORKERS,
+        max_finished: int = MAX_FINISHED_JOBS,
+        finished_ttl: timedelta = FINISHED_JOB_TTL,
+    ):
+        """Initialize job manager (the pool starts with the first job).
+
+        Args:
+            jobs_dir: Directory for job output
+            max_workers: Worker processes
+            max_finished: Finished jobs kept; the oldest beyond this are forgotten
+            finished_ttl: How long a finished job (and its PDF) is kept
+        """
+        self.jobs_dir = Path(jobs_dir)
+        self.max_workers = max_workers
+        self.max_finished = max_finished
+        self.finished_ttl = finished_ttl
+        self._jobs: dict[UUID, GenerationJob] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned workers do not inherit the server's threads or sockets
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def submit(
+        self,
+        name: str,
+        playlist: list[dict],
+        num_cards: int,
+        pattern: str = "five_in_a_row",
+        seed: Optional[int] = None,
+        layout: str = "single",
+        strategy: str = "weighted",
+        dj_contact: Optional[str] = None,
+    ) -> GenerationJob:
+        """Queue a generation job (call from the event loop).
+
+        Args:
+            name: Game name (PDF title)
+            playlist: Songs as dicts with title, artist and optional song_id,
+                album and duration_seconds
+            num_cards: Cards to generate (1-1000)
+            pattern: Winning pattern of the registered game
+            seed: Optional seed for reproducible cards
+            layout: PDF layout, "single" or "4up"
+            strategy: "weighted" (CardGenerator) or "design" (DesignCardGenerator)
+            dj_contact: Optional contact line printed on the cards
+
+        Returns:
+            The queued job
+
+        Raises:
+            RuntimeError: If musicbingo-cards is not installed
+        """
+        if not generation_available():
+            raise RuntimeError("Card generation requires the musicbingo-cards package")
+
+        self._expire()
+        job = GenerationJob(job_id=uuid4(), game_id=uuid4(), name=name, num_cards=num_cards)
+        spec = {
+            "job_id": str(job.job_id),
+            "game_id": str(job.game_id),
+            "name": name,
+            "playlist": playlist,
+            "num_cards": num_cards,
+            "pattern": pattern,
+            "seed": seed,
+            "layout": layout,
+            "strategy": strategy,
+            "dj_contact": dj_contact,
+        }
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self._jobs[job.job_id] = job
+        task = asyncio.get_running_loop().create_task(self._run(job, spec))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job: GenerationJob, spec: dict) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                self._get_executor(), run_generation, spec, str(self.jobs_dir)
+            )
+            game = await loop.run_in_executor(None, load_game_from_path, result["game_path"])
+            service = get_game_service()
+            if service.get_game(game.game_id) is None:
+                service.register_game(game)
+            job.pdf_path = Path(result["pdf_path"])
+            job.cards_done = job.num_cards
+            job.status = JobStatus.COMPLETED
+        except asyncio.CancelledError:
+            job.error = "Server shut down before the job ran"
+            job.status = JobStatus.FAILED
+            raise
+        except Exception as e:
+            job.error = str(e) or type(e).__name__
+            job.status = JobStatus.FAILED
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            (self.jobs_dir / f"{job.job_id}.progress").unlink(missing_ok=True)
+            GENERATION_JOBS.inc(job.status.value)
+
+    def get_job(self, job_id: UUID) -> Optional[GenerationJob]:
+        """Get a job with its progress refreshed from the worker."""
+        job = self._jobs.get(job_id)
+        if job is not None and job.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+            try:
+                done = (self.jobs_dir / f"{job_id}.progress").read_text()
+            except FileNotFoundError:
+                return job
+            job.status = JobStatus.RUNNING
+            job.cards_done = int(done or 0)
+        return job
+
+    def get_job_or_raise(self, job_id: UUID) -> GenerationJob:
+        """Get job by ID or raise ValueError ("not found")."""
+        self._expire()
+        job = self.get_job(job_id)
+        if job is None:
+            raise ValueError(f"Job {job_id} not found")
+        return job
+
+    def list_jobs(self) -> list[GenerationJob]:
+        """All jobs, newest first."""
+        self._expire()
+        return sorted(
+            (self.get_job(job_id) for job_id in list(self._jobs)),
+            key=lambda job: job.created_at,
+            reverse=True,
+        )
+
+    def _expire(self) -> None:
+        """Forget finished jobs past the TTL or beyond max_finished, and delete their PDFs."""
+        finished = sorted(
+            (job for job in self._jobs.values() if job.finished_at is not None),
+            key=lambda job: job.finished_at,
+        )
+        excess = len(finished) - self.max_finished
+        cutoff = datetime.now(timezone.utc) - self.finished_ttl
+        for i, job in enumerate(finished):
+            if i >= excess and job.finished_at > cutoff:
+                break  # sorted by finish time: the rest are newer
+            del self._jobs[job.job_id]
+            # The game file stays: the game is registered and may still be played
+            (self.jobs_dir / f"{job.job_id}.pdf").unlink(missing_ok=True)
+
+    def shutdown(self) -> None:
+        """Stop the worker pool (running jobs finish first; queued jobs are cancelled)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+_job_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """Get the global job manager instance.
+
+    Returns:
+        JobManager singleton
+    """
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager(
+            jobs_dir=Path(os.environ.get(JOBS_DIR_ENV, GAMES_DIR / "generated")),
+            max_workers=int(os.environ.get(JOB_WORKERS_ENV, DEFAULT_JOB_WORKERS)),
+        )
+    return _job_manager
+
+
+def close_job_manager() -> None:
+    """Shut down the global job manager's workers if it was created (call on shutdown)."""
+    if _job_manager is not None:
+        _job_manager.shutdown()
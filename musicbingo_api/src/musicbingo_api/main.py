@@ -1,16 +1,32 @@
 """Main FastAPI application for Music Bingo API."""
 
+import asyncio
+import hmac
 import json
+from contextlib import asynccontextmanager
+from typing import Optional
 from uuid import UUID
 
-from fastapi import FastAPI, HTTPException, Request, status
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
 
+from .card_codec import CardDecodeError, CardStreamDecoder, media_type_of
+from .card_layouts import shared_layouts_enabled, sweep_stale_segments
 from .game_loader import list_available_games, load_game_from_file
-from .game_service import get_game_service
-from .models import CardData, PatternType, Song
+from .game_service import close_game_service, get_game_service
+from .jobs import GenerationJob, close_job_manager, get_job_manager
+from .metrics import REGISTRY, MetricsMiddleware
+from .models import CardData, GameGroup, JobStatus, PatternType, Song
 from .network import get_local_ip
+from .profiler import (
+    MAX_PROFILE_SECONDS,
+    SamplingProfiler,
+    SlowRequestMiddleware,
+    SlowRequestRoute,
+    get_admin_token,
+    slow_request_log,
+)
 from .schemas import (
     AddCardRequest,
     AddCardResponse,
@@ -20,33 +36,66 @@ from .schemas import (
     CardStatusInfo,
     CreateGameRequest,
     CreateGameResponse,
+    CreateGroupRequest,
+    CustomPatternRequest,
+    CustomPatternResponse,
     DetectedWinner,
     ErrorResponse,
+    FirstWinResponse,
     GameListItem,
     GameListResponse,
     GameStateResponse,
+    GenerateCardsRequest,
+    GenerationJobListResponse,
+    GenerationJobResponse,
+    GroupGameResult,
+    GroupResponse,
+    GroupSongResponse,
+    GroupWinner,
     LoadGameResponse,
     MarkSongRequest,
     MarkSongResponse,
+    NearWinLeaderboardResponse,
     RecordSongRequest,
     RecordSongResponse,
     RegisterCardRequest,
     RegisterCardResponse,
     RegisteredCardInfo,
     RegisteredCardsResponse,
+    ReplayCallResponse,
     SetPrizeRequest,
     SetPrizeResponse,
+    SetStagesRequest,
+    SlowRequestEntry,
+    SlowRequestLogRequest,
+    SlowRequestLogResponse,
     SongInfo,
-    StartGameRequest,
+    StageInfo,
+    StagesResponse,
     StartGameResponse,
+    StreamAddCardsResponse,
     VerifyCardResponse,
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Sweep stale shared layouts on startup; release server-wide resources on shutdown."""
+    if shared_layouts_enabled():
+        sweep_stale_segments()
+    yield
+    close_job_manager()
+    close_game_service()
+
+
 app = FastAPI(
     title="Music Bingo API",
     description="Backend API for Music Bingo game management and verification",
     version="0.1.0",
+    lifespan=lifespan,
 )
+# Sync endpoints report their worker thread to the slow request log
+app.router.route_class = SlowRequestRoute
 
 # Enable CORS for web clients
 # Pattern matches localhost and private network IP ranges:
@@ -69,6 +118,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record per-route latency, request counts and in-flight requests
+app.add_middleware(MetricsMiddleware)
+
+# Capture stacks of slow requests (no-op until enabled via /api/debug)
+app.add_middleware(SlowRequestMiddleware, log=slow_request_log)
+
 
 @app.get("/")
 async def root():
@@ -86,6 +141,19 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics endpoint.
+
+    Exposes per-route request latency histograms, request counts, in-flight
+    requests and GameService operation timings in Prometheus text format.
+    """
+    return PlainTextResponse(
+        REGISTRY.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 # Default port for the server
 DEFAULT_PORT = 8000
 
@@ -150,7 +218,7 @@ async def load_game(filename: str):
             game = existing
         else:
             # New game - register it
-            service._games[game.game_id] = game
+            service.register_game(game)
 
         # Build songs list for checklist display
         songs = [
@@ -300,6 +368,57 @@ async def bulk_add_cards(game_id: UUID, request: BulkAddCardsRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.post(
+    "/api/game/{game_id}/cards/stream",
+    response_model=StreamAddCardsResponse,
+    responses={
+        400: {"model": ErrorResponse},
+        404: {"model": ErrorResponse},
+        415: {"model": ErrorResponse},
+    },
+)
+async def stream_add_cards(game_id: UUID, request: Request):
+    """Stream cards into a game as NDJSON or compact binary records.
+
+    Send Content-Type application/x-ndjson (one card object per line) or
+    application/vnd.musicbingo.cards (see card_codec). Cards are validated
+    and added one at a time as the body arrives, and the response carries
+    only a count and digest instead of echoing every card.
+
+    If a record is invalid, cards before it stay added and the error
+    detail says how many.
+    """
+    service = get_game_service()
+    if service.get_game(game_id) is None:
+        raise HTTPException(status_code=404, detail=f"Game {game_id} not found")
+
+    # Other requests run while the body arrives; keep the game from being evicted
+    with service.pin_games([game_id]) as [game]:
+        try:
+            decoder = CardStreamDecoder(
+                game_id,
+                [song.song_id for song in game.playlist],
+                media_type_of(request.headers.get("content-type")),
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=415, detail=str(e))
+
+        try:
+            async for card in decoder.decode(request.stream()):
+                game.add_card(card)
+        except CardDecodeError as e:
+            raise HTTPException(
+                status_code=400, detail=f"{e} ({decoder.records} cards added before error)"
+            )
+
+    return StreamAddCardsResponse(
+        success=True,
+        game_id=game_id,
+        cards_added=decoder.records,
+        digest=decoder.digest,
+    )
+
+
 @app.post(
     "/api/game/{game_id}/activate",
     response_model=StartGameResponse,
@@ -411,6 +530,7 @@ async def get_game_state(game_id: UUID):
             pattern=w["pattern"],
             detected_at=w["detected_at"],
             song_id=w.get("song_id"),
+            stage=w.get("stage"),
         )
         for w in game.detected_winners
     ]
@@ -462,6 +582,44 @@ async def verify_card(game_id: UUID, card_id: UUID):
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@app.get(
+    "/api/game/{game_id}/replay/{call}",
+    response_model=ReplayCallResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+)
+async def replay_call(game_id: UUID, call: int, pattern: Optional[PatternType] = None):
+    """Replay the play log to a call and list who had won.
+
+    For settling disputes: new_winners are the cards that first completed
+    the pattern on exactly this call, winners every card that had completed
+    it by then. Defaults to the current pattern.
+    """
+    try:
+        service = get_game_service()
+        result = service.get_winners_at_call(game_id, call, pattern)
+        return ReplayCallResponse(**result)
+
+    except ValueError as e:
+        if "not found" in str(e).lower():
+            raise HTTPException(status_code=404, detail=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get(
+    "/api/game/{game_id}/card/{card_id}/first-win",
+    response_model=FirstWinResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_first_win(game_id: UUID, card_id: UUID):
+    """Get the call at which a card first completed each pattern."""
+    try:
+        service = get_game_service()
+        return FirstWinResponse(**service.get_first_win_calls(game_id, card_id))
+
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
 @app.post(
     "/api/game/{game_id}/pattern",
     response_model=GameStateResponse,
@@ -492,6 +650,209 @@ async def set_pattern(game_id: UUID, pattern: PatternType):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.post(
+    "/api/game/{game_id}/custom-pattern",
+    response_model=CustomPatternResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+)
+async def set_custom_pattern(game_id: UUID, request: CustomPatternRequest):
+    """Compile a custom pattern definition and make it the winning pattern."""
+    try:
+        service = get_game_service()
+        game = service.set_custom_pattern(
+            game_id, request.name, request.definition, request.description
+        )
+        pattern = game.custom_pattern
+
+        return CustomPatternResponse(
+            game_id=game.game_id,
+            current_pattern=game.current_pattern,
+            name=pattern.name,
+            description=pattern.description,
+            shapes=len(pattern.masks),
+            total_needed=pattern.total_needed,
+        )
+
+    except ValueError as e:
+        if "not found" in str(e).lower():
+            raise HTTPException(status_code=404, detail=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _group_response(group: GameGroup) -> GroupResponse:
+    return GroupResponse(
+        group_id=group.group_id,
+        game_ids=group.game_ids,
+        playlist_size=len(group.song_index),
+        created_at=group.created_at,
+    )
+
+
+def _group_song_response(result: dict) -> GroupSongResponse:
+    return GroupSongResponse(
+        group_id=result["group_id"],
+        song_id=result["song_id"],
+        played=result.get("played"),
+        games=[GroupGameResult(**game) for game in result["games"]],
+        new_winners=[GroupWinner(**w) for w in result.get("new_winners", [])],
+    )
+
+
+@app.post(
+    "/api/groups",
+    response_model=GroupResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+)
+async def create_group(request: CreateGroupRequest):
+    """Link games (rooms) that share a playlist so one call marks them all."""
+    try:
+        service = get_game_service()
+        return _group_response(service.create_group(request.group_id, request.game_ids))
+
+    except ValueError as e:
+        if "not found" in str(e).lower():
+            raise HTTPException(status_code=404, detail=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get(
+    "/api/groups/{group_id}",
+    response_model=GroupResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_group(group_id: UUID):
+    """Get a group of linked games."""
+    try:
+        service = get_game_service()
+        return _group_response(service.get_group_or_raise(group_id))
+
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@app.delete(
+    "/api/groups/{group_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={404: {"model": ErrorResponse}},
+)
+async def delete_group(group_id: UUID):
+    """Unlink a group; its games are kept."""
+    try:
+        get_game_service().delete_group(group_id)
+
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@app.post(
+    "/api/groups/{group_id}/mark-song",
+    response_model=GroupSongResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+)
+async def group_mark_song(group_id: UUID, request: MarkSongRequest):
+    """Mark or unmark a song in every game of a group.
+
+    Applied to all games or none; new winners from every room are merged
+    into one response, each tagged with its game_id.
+    """
+    try:
+        service = get_game_service()
+        return _group_song_response(
+            service.group_toggle_song_played(group_id, request.song_id, request.played)
+        )
+
+    except ValueError as e:
+        if "not found" in str(e).lower():
+            raise HTTPException(status_code=404, detail=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post(
+    "/api/groups/{group_id}/reveal/{song_id}",
+    response_model=GroupSongResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+)
+async def group_reveal_song(group_id: UUID, song_id: str):
+    """Reveal a song title in every game of a group."""
+    try:
+        service = get_game_service()
+        return _group_song_response(service.group_reveal_song(group_id, song_id))
+
+    except ValueError as e:
+        if "not found" in str(e).lower():
+            raise HTTPException(status_code=404, detail=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _stages_response(result: dict) -> StagesResponse:
+    return StagesResponse(
+        game_id=result["game_id"],
+        current_stage=result["current_stage"],
+        stages=[StageInfo(**stage) for stage in result["stages"]],
+        new_winners=[DetectedWinner(**w) for w in result.get("new_winners", [])],
+    )
+
+
+@app.post(
+    "/api/game/{game_id}/stages",
+    response_model=StagesResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+)
+async def set_stages(game_id: UUID, request: SetStagesRequest):
+    """Set an ordered list of patterns for a progressive game.
+
+    Every stage is evaluated on each marked song, so advancing is instant.
+    Setting a single pattern via /pattern ends staged play.
+    """
+    try:
+        service = get_game_service()
+        return _stages_response(service.set_stages(game_id, request.stages))
+
+    except ValueError as e:
+        if "not found" in str(e).lower():
+            raise HTTPException(status_code=404, detail=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get(
+    "/api/game/{game_id}/stages",
+    response_model=StagesResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+)
+async def get_stages(game_id: UUID):
+    """Get stages of a progressive game with winners per stage."""
+    try:
+        service = get_game_service()
+        return _stages_response(service.get_stages(game_id))
+
+    except ValueError as e:
+        if "not found" in str(e).lower():
+            raise HTTPException(status_code=404, detail=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post(
+    "/api/game/{game_id}/stages/advance",
+    response_model=StagesResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+)
+async def advance_stage(game_id: UUID):
+    """Move to the next stage.
+
+    new_winners lists registered cards that already complete the new
+    stage's pattern; earlier stage winners are kept.
+    """
+    try:
+        service = get_game_service()
+        return _stages_response(service.advance_stage(game_id))
+
+    except ValueError as e:
+        if "not found" in str(e).lower():
+            raise HTTPException(status_code=404, detail=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.post(
     "/api/game/{game_id}/reset",
     response_model=GameStateResponse,
@@ -640,6 +1001,35 @@ async def get_card_statuses(game_id: UUID):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.get(
+    "/api/game/{game_id}/near-wins",
+    response_model=NearWinLeaderboardResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_near_wins(game_id: UUID, k: int = Query(10, ge=1, le=100)):
+    """Get registered cards closest to winning.
+
+    away_counts gives how many cards are N songs away (e.g. {1: 3} means
+    three cards are one away); closest lists the top k cards. Counts are
+    maintained incrementally as songs are marked.
+    """
+    try:
+        service = get_game_service()
+        result = service.get_near_win_leaderboard(game_id, k)
+
+        return NearWinLeaderboardResponse(
+            game_id=result["game_id"],
+            current_pattern=result["current_pattern"],
+            away_counts=result["away_counts"],
+            closest=[CardStatusInfo(**card) for card in result["closest"]],
+        )
+
+    except ValueError as e:
+        if "not found" in str(e).lower():
+            raise HTTPException(status_code=404, detail=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.post(
     "/api/game/{game_id}/prize",
     response_model=SetPrizeResponse,
@@ -666,6 +1056,184 @@ async def set_prize(game_id: UUID, request: SetPrizeRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def _job_response(job: GenerationJob) -> GenerationJobResponse:
+    return GenerationJobResponse(
+        job_id=job.job_id,
+        game_id=job.game_id,
+        name=job.name,
+        status=job.status,
+        num_cards=job.num_cards,
+        cards_done=job.cards_done,
+        progress=job.cards_done / job.num_cards,
+        error=job.error,
+        pdf_url=f"/api/jobs/{job.job_id}/pdf" if job.status == JobStatus.COMPLETED else None,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+    )
+
+
+@app.post(
+    "/api/jobs/generate",
+    response_model=GenerationJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={400: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
+)
+async def submit_generation_job(request: GenerateCardsRequest):
+    """Generate a new game's cards and PDF in a background worker.
+
+    Returns immediately with a queued job. Poll GET /api/jobs/{job_id} for
+    progress; once completed the game is registered (status SETUP) and the
+    PDF is at pdf_url.
+    """
+    if request.pattern == PatternType.CUSTOM:
+        raise HTTPException(
+            status_code=400,
+            detail="Generate the game with a built-in pattern, then set a custom pattern",
+        )
+    try:
+        job = get_job_manager().submit(
+            name=request.name,
+            playlist=[song.model_dump(mode="json") for song in request.playlist],
+            num_cards=request.num_cards,
+            pattern=request.pattern.value,
+            seed=request.seed,
+            layout=request.layout,
+            strategy=request.strategy,
+            dj_contact=request.dj_contact,
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return _job_response(job)
+
+
+@app.get("/api/jobs", response_model=GenerationJobListResponse)
+async def list_generation_jobs():
+    """List generation jobs, newest first."""
+    return GenerationJobListResponse(
+        jobs=[_job_response(job) for job in get_job_manager().list_jobs()]
+    )
+
+
+@app.get(
+    "/api/jobs/{job_id}",
+    response_model=GenerationJobResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def get_generation_job(job_id: UUID):
+    """Get a generation job's status and progress."""
+    try:
+        return _job_response(get_job_manager().get_job_or_raise(job_id))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@app.get(
+    "/api/jobs/{job_id}/pdf",
+    response_class=FileResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+)
+async def download_generation_pdf(job_id: UUID):
+    """Download the cards PDF of a completed generation job."""
+    try:
+        job = get_job_manager().get_job_or_raise(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if job.status != JobStatus.COMPLETED:
+        raise HTTPException(status_code=400, detail=f"Job {job_id} is {job.status.value}")
+    filename = "".join(c if c.isalnum() else "-" for c in job.name).strip("-") or "cards"
+    return FileResponse(job.pdf_path, media_type="application/pdf", filename=f"{filename}.pdf")
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Guard debug endpoints with the admin token.
+
+    Debug endpoints behave as if they don't exist unless MUSICBINGO_ADMIN_TOKEN
+    is set, and reject requests without a matching X-Admin-Token header.
+    """
+    token = get_admin_token()
+    if token is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+# Only one sampling profile runs at a time
+_profile_lock = asyncio.Lock()
+
+
+@app.post(
+    "/api/debug/profile",
+    dependencies=[Depends(require_admin)],
+    responses={403: {"model": ErrorResponse}, 409: {"model": ErrorResponse}},
+)
+async def run_profile(
+    seconds: float = Query(5.0, gt=0, le=MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(5.0, ge=1, le=100),
+    format: str = Query("collapsed", pattern="^(collapsed|speedscope)$"),
+):
+    """Sample the running server for a number of seconds and return the profile.
+
+    The server keeps handling requests while it is sampled, so run this
+    while the slow behaviour is happening. Returns collapsed stacks
+    (flamegraph.pl / speedscope import) or a speedscope JSON profile.
+    """
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    async with _profile_lock:
+        profiler = SamplingProfiler(interval=interval_ms / 1000.0)
+        profiler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.stop()
+
+    if format == "speedscope":
+        return JSONResponse(profiler.to_speedscope())
+    return PlainTextResponse(profiler.to_collapsed())
+
+
+def _slow_request_log_response() -> SlowRequestLogResponse:
+    return SlowRequestLogResponse(
+        enabled=slow_request_log.enabled,
+        threshold_ms=slow_request_log.threshold * 1000,
+        entries=[SlowRequestEntry(**entry) for entry in slow_request_log.entries],
+    )
+
+
+@app.get(
+    "/api/debug/slow-requests",
+    response_model=SlowRequestLogResponse,
+    dependencies=[Depends(require_admin)],
+)
+async def get_slow_requests():
+    """Get captured slow requests with the stack sampled while each was running."""
+    return _slow_request_log_response()
+
+
+@app.post(
+    "/api/debug/slow-requests/enable",
+    response_model=SlowRequestLogResponse,
+    dependencies=[Depends(require_admin)],
+)
+async def enable_slow_requests(request: SlowRequestLogRequest):
+    """Start capturing requests slower than threshold_ms."""
+    slow_request_log.enable(request.threshold_ms)
+    return _slow_request_log_response()
+
+
+@app.post(
+    "/api/debug/slow-requests/disable",
+    response_model=SlowRequestLogResponse,
+    dependencies=[Depends(require_admin)],
+)
+async def disable_slow_requests():
+    """Stop capturing slow requests and clear the log."""
+    slow_request_log.disable()
+    slow_request_log.clear()
+    return _slow_request_log_response()
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler for unhandled errors."""
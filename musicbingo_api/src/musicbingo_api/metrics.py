@@ -0,0 +1,302 @@
+"""In-process metrics with Prometheus text exposition.
+
+Tracks per-route request latency, request counts and in-flight requests,
+plus timers around hot GameService operations. Everything lives in memory
+and is rendered on demand by GET /metrics, so no extra dependency or
+background thread is needed on a venue laptop.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Iterator, Optional
+
+# Latency buckets in seconds. Tuned for a LAN server where most requests
+# finish in a few milliseconds and anything over a second is a problem.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Route label used when a request did not match any route (404s, scanners
+# probing random paths). Keeps label cardinality bounded.
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    """Format a label set as a Prometheus label string."""
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value, keeping integers free of a trailing '.0'."""
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    """Monotonically increasing counter, optionally split by labels."""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, help_text: str, label_names: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        """Increment the counter for the given label values."""
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def get(self, *label_values: str) -> float:
+        """Get the current value for the given label values."""
+        return self._values.get(label_values, 0.0)
+
+    def collect(self) -> list[str]:
+        """Render samples in Prometheus text format."""
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+            for labels, value in items
+        ]
+
+
+class Gauge(Counter):
+    """Value that can go up and down (e.g. requests in flight)."""
+
+    metric_type = "gauge"
+
+    def dec(self, *label_values: str, amount: float = 1.0) -> None:
+        """Decrement the gauge for the given label values."""
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, value: float, *label_values: str) -> None:
+        """Set the gauge for the given label values."""
+        with self._lock:
+            self._values[label_values] = float(value)
+
+
+class Histogram:
+    """Cumulative histogram of observed values, optionally split by labels."""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Record a single observation.
+
+        Only the matching bucket is incremented; cumulative counts are
+        computed at render time so the hot path stays O(log buckets).
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = [0.0] * (len(self.buckets) + 2)
+                self._series[label_values] = series
+            series[index] += 1
+            series[-1] += value
+
+    def get_count(self, *label_values: str) -> int:
+        """Get the number of observations for the given label values."""
+        series = self._series.get(label_values)
+        if series is None:
+            return 0
+        return int(sum(series[:-1]))
+
+    def collect(self) -> list[str]:
+        """Render bucket, sum and count samples in Prometheus text format."""
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+
+        lines = []
+        for labels, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = _format_labels(self.label_names, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {_format_value(cumulative)}")
+            cumulative += series[len(self.buckets)]
+            le = _format_labels(self.label_names, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {_format_value(cumulative)}")
+            label_str = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_str} {repr(series[-1])}")
+            lines.append(f"{self.name}_count{label_str} {_format_value(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together at /metrics."""
+
+    def __init__(self):
+        self._metrics: dict[str, object] = {}
+
+    def counter(self, name: str, help_text: str, label_names: tuple[str, ...] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._register(Counter(name, help_text, label_names))
+
+    def gauge(self, name: str, help_text: str, label_names: tuple[str, ...] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._register(Gauge(name, help_text, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._register(Histogram(name, help_text, label_names, buckets))
+
+    def _register(self, metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric):
+                raise ValueError(f"Metric {metric.name} already registered as another type")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format (v0.0.4)."""
+        lines = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {metric.help_text}")
+            lines.append(f"# TYPE {name} {metric.metric_type}")
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+# Global registry and the metrics the API records
+REGISTRY = MetricsRegistry()
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    "musicbingo_http_request_duration_seconds",
+    "HTTP request latency by route template and method",
+    ("method", "route"),
+)
+REQUEST_COUNT = REGISTRY.counter(
+    "musicbingo_http_requests_total",
+    "HTTP requests by route template, method and status code",
+    ("method", "route", "status"),
+)
+REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "musicbingo_http_requests_in_flight",
+    "HTTP requests currently being handled",
+    ("method",),
+)
+OPERATION_LATENCY = REGISTRY.histogram(
+    "musicbingo_operation_duration_seconds",
+    "Latency of GameService hot operations",
+    ("operation",),
+)
+
+
+@contextmanager
+def time_operation(operation: str) -> Iterator[None]:
+    """Time a block of code into the operation latency histogram.
+
+    Args:
+        operation: Operation name used as the 'operation' label
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        OPERATION_LATENCY.observe(time.perf_counter() - start, operation)
+
+
+def timed(operation: str) -> Callable:
+    """Decorator form of time_operation.
+
+    Args:
+        operation: Operation name used as the 'operation' label
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                OPERATION_LATENCY.observe(time.perf_counter() - start, operation)
+
+        return wrapper
+
+    return decorator
+
+
+def _route_label(scope: dict) -> str:
+    """Get the route template for a request (e.g. /api/game/{game_id}/state).
+
+    Using the template rather than the raw path keeps one series per
+    endpoint instead of one per game/card id.
+    """
+    route = scope.get("route")
+    path: Optional[str] = getattr(route, "path", None)
+    return path if path is not None else UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency, counts and in-flight requests.
+
+    Implemented at the ASGI level (not BaseHTTPMiddleware) so the per-request
+    cost is two perf_counter calls and three dict updates.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.dec(method)
+            route = _route_label(scope)
+            REQUEST_LATENCY.observe(elapsed, method, route)
+            REQUEST_COUNT.inc(method, route, str(status_code))
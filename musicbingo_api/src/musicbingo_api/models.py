@@ -1,11 +1,23 @@
 """Data models for Music Bingo API."""
 
+from collections.abc import MutableMapping
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID, uuid4
 
+from .near_win import NearWinTracker
+from .patterns import (
+    BUILTIN_MASKS,
+    compile_pattern,
+    mask_to_positions,
+    popcount,
+    positions_to_mask,
+)
+from .replay import ReplayIndex
+from .stages import StageTracker
+
 
 class PatternType(str, Enum):
     """Bingo winning pattern types."""
@@ -18,6 +30,7 @@ class PatternType(str, Enum):
     FULL_CARD = "full_card"
     X_PATTERN = "x_pattern"
     FRAME = "frame"
+    CUSTOM = "custom"  # Game-specific pattern compiled from a definition
 
 
 class GameStatus(str, Enum):
@@ -29,6 +42,15 @@ class GameStatus(str, Enum):
     COMPLETED = "completed"  # Game finished
 
 
+class JobStatus(str, Enum):
+    """Card generation job status."""
+
+    QUEUED = "queued"  # Waiting for a worker
+    RUNNING = "running"  # Generating and rendering cards
+    COMPLETED = "completed"  # Game registered, PDF ready
+    FAILED = "failed"  # See the job's error
+
+
 @dataclass
 class Song:
     """Represents a song in the game playlist."""
@@ -45,11 +67,52 @@ class Song:
 
 @dataclass
 class BingoPattern:
-    """Represents a winning bingo pattern."""
+    """Represents a winning bingo pattern.
+
+    Geometry is a tuple of cell masks (see patterns.py); the pattern is won
+    when every cell of any one mask is marked. Built-in patterns get their
+    masks from pattern_type; custom patterns are compiled from a definition.
+    """
 
     pattern_type: PatternType
     name: str
     description: str
+    masks: tuple[int, ...] = ()
+    definition: Optional[Any] = None  # Source definition for custom patterns
+
+    def __post_init__(self):
+        """Fill in built-in geometry."""
+        if not self.masks:
+            if self.pattern_type == PatternType.CUSTOM:
+                raise ValueError("Custom patterns need a definition")
+            self.masks = BUILTIN_MASKS[self.pattern_type.value]
+
+    @classmethod
+    def from_definition(cls, definition: Any, name: str, description: str = "") -> "BingoPattern":
+        """Compile a custom pattern.
+
+        Args:
+            definition: Pattern definition (see patterns.py)
+            name: Display name
+            description: Display description
+
+        Returns:
+            BingoPattern with PatternType.CUSTOM
+
+        Raises:
+            ValueError: If the definition is invalid
+        """
+        return cls(PatternType.CUSTOM, name, description, compile_pattern(definition), definition)
+
+    @property
+    def lines(self) -> list[frozenset[tuple[int, int]]]:
+        """Position sets for this pattern; completing any one of them wins."""
+        return [mask_to_positions(mask) for mask in self.masks]
+
+    @property
+    def total_needed(self) -> int:
+        """Cells in the smallest winning shape."""
+        return min(popcount(mask) for mask in self.masks)
 
     def check_win(self, marked_positions: set[tuple[int, int]]) -> bool:
         """Check if marked positions form this winning pattern.
@@ -60,68 +123,18 @@ class BingoPattern:
         Returns:
             True if positions form a winning pattern
         """
-        if self.pattern_type == PatternType.FIVE_IN_A_ROW:
-            # Classic bingo: any row, column, or diagonal wins
-            # Check rows
-            for row in range(5):
-                if all((row, col) in marked_positions for col in range(5)):
-                    return True
-            # Check columns
-            for col in range(5):
-                if all((row, col) in marked_positions for row in range(5)):
-                    return True
-            # Check diagonals
-            main_diagonal = all((i, i) in marked_positions for i in range(5))
-            anti_diagonal = all((i, 4 - i) in marked_positions for i in range(5))
-            if main_diagonal or anti_diagonal:
-                return True
-            return False
-
-        elif self.pattern_type == PatternType.ROW:
-            # Check all rows
-            for row in range(5):
-                if all((row, col) in marked_positions for col in range(5)):
-                    return True
-            return False
-
-        elif self.pattern_type == PatternType.COLUMN:
-            # Check all columns
-            for col in range(5):
-                if all((row, col) in marked_positions for row in range(5)):
-                    return True
-            return False
-
-        elif self.pattern_type == PatternType.DIAGONAL:
-            # Check both diagonals
-            main_diagonal = all((i, i) in marked_positions for i in range(5))
-            anti_diagonal = all((i, 4 - i) in marked_positions for i in range(5))
-            return main_diagonal or anti_diagonal
-
-        elif self.pattern_type == PatternType.FOUR_CORNERS:
-            corners = {(0, 0), (0, 4), (4, 0), (4, 4)}
-            return corners.issubset(marked_positions)
-
-        elif self.pattern_type == PatternType.X_PATTERN:
-            # Both diagonals
-            x_positions = {(i, i) for i in range(5)} | {(i, 4 - i) for i in range(5)}
-            return x_positions.issubset(marked_positions)
-
-        elif self.pattern_type == PatternType.FULL_CARD:
-            # All 24 positions (excluding center free space)
-            all_positions = {(r, c) for r in range(5) for c in range(5) if not (r == 2 and c == 2)}
-            return all_positions.issubset(marked_positions)
-
-        elif self.pattern_type == PatternType.FRAME:
-            # All edge cells (top row, bottom row, left column, right column)
-            frame_positions = set()
-            for i in range(5):
-                frame_positions.add((0, i))  # Top row
-                frame_positions.add((4, i))  # Bottom row
-                frame_positions.add((i, 0))  # Left column
-                frame_positions.add((i, 4))  # Right column
-            return frame_positions.issubset(marked_positions)
-
-        return False
+        return self.check_mask(positions_to_mask(marked_positions))
+
+    def check_mask(self, marked: int) -> bool:
+        """Check a marked-cell mask against this pattern.
+
+        Args:
+            marked: Cell mask (bit row*5+col)
+
+        Returns:
+            True if all cells of any winning shape are marked
+        """
+        return any(marked & mask == mask for mask in self.masks)
 
 
 # Default patterns
@@ -192,11 +205,15 @@ class GameState:
     played_songs: list[UUID] = field(default_factory=list)  # Songs played so far (in order)
     revealed_songs: list[UUID] = field(default_factory=list)  # Songs with titles revealed on player view
     current_pattern: PatternType = PatternType.FIVE_IN_A_ROW
+    custom_pattern: Optional[BingoPattern] = None  # Used when current_pattern is CUSTOM
+    stages: list[PatternType] = field(default_factory=list)  # Progressive game stage order
+    current_stage: int = 0  # Index into stages; current_pattern follows it
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
 
-    # Cards in this game (card_id -> CardData)
-    cards: dict[UUID, CardData] = field(default_factory=dict)
+    # Cards in this game (card_id -> CardData); a SharedCards view for games
+    # loaded with shared layouts (see card_layouts.py)
+    cards: MutableMapping[UUID, CardData] = field(default_factory=dict)
 
     # Registered cards (card_id -> registration dict with player_name and registered_at)
     registered_cards: dict[UUID, dict] = field(default_factory=dict)
@@ -207,13 +224,69 @@ class GameState:
     # Detected winners (list of winner dicts)
     detected_winners: list[dict] = field(default_factory=list)
 
+    # Lazily built song_id -> playlist index lookup (playlist is fixed per game)
+    _song_index: Optional[dict[UUID, int]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # Incremental near-win counters for registered cards (see near_win.py)
+    _near_win: Optional[NearWinTracker] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _near_win_pattern: Optional[BingoPattern] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # First-win call per card and pattern over the play log (see replay.py)
+    _replay: Optional[ReplayIndex] = field(default=None, init=False, repr=False, compare=False)
+    _replay_custom: Optional[BingoPattern] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # Completion of every stage pattern for registered cards (see stages.py)
+    _stage_tracker: Optional[StageTracker] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _stage_patterns: tuple[BingoPattern, ...] = field(
+        default=(), init=False, repr=False, compare=False
+    )
+
+    def get_pattern(self, pattern_type: Optional[PatternType] = None) -> BingoPattern:
+        """Get the pattern definition for a pattern type.
+
+        Args:
+            pattern_type: Pattern to look up (default: current pattern)
+
+        Returns:
+            Built-in pattern, or this game's custom pattern for CUSTOM
+
+        Raises:
+            ValueError: If CUSTOM is requested but no custom pattern is set
+        """
+        pattern_type = pattern_type or self.current_pattern
+        if pattern_type == PatternType.CUSTOM:
+            if self.custom_pattern is None:
+                raise ValueError("No custom pattern defined for this game")
+            return self.custom_pattern
+        return DEFAULT_PATTERNS[pattern_type]
+
+    def get_song_index(self) -> dict[UUID, int]:
+        """Get a song_id -> playlist position lookup.
+
+        Returns:
+            Dict mapping each playlist song_id to its index in the playlist
+        """
+        if self._song_index is None:
+            self._song_index = {song.song_id: i for i, song in enumerate(self.playlist)}
+        return self._song_index
+
     def add_played_song(self, song_id: UUID) -> None:
         """Record a song as played.
 
         Args:
             song_id: UUID of the song that was played
         """
-        if song_id not in [s.song_id for s in self.playlist]:
+        if song_id not in self.get_song_index():
             raise ValueError(f"Song {song_id} not in game playlist")
 
         if song_id not in self.played_songs:
@@ -241,7 +314,7 @@ class GameState:
         marked_positions = card.get_marked_positions(played_song_ids)
 
         # Check if marked positions form the current winning pattern
-        pattern = DEFAULT_PATTERNS[self.current_pattern]
+        pattern = self.get_pattern()
         is_winner = pattern.check_win(marked_positions)
 
         return (is_winner, self.current_pattern if is_winner else None, card.card_number)
@@ -280,88 +353,277 @@ class GameState:
         self.updated_at = datetime.now()
         return registration
 
+    def get_near_win_tracker(self) -> NearWinTracker:
+        """Get the near-win tracker, brought up to date with this game.
+
+        The tracker is rebuilt only when the pattern changes. Otherwise only
+        newly registered cards and played/unplayed songs since the last call
+        are applied, so callers never rescan every card.
+
+        Returns:
+            NearWinTracker covering all registered cards
+        """
+        pattern = self.get_pattern()
+        if self._near_win is None or self._near_win_pattern is not pattern:
+            self._near_win = NearWinTracker(pattern.lines)
+            self._near_win_pattern = pattern
+
+        tracker = self._near_win
+        tracked = tracker.card_ids()
+        registered = {card_id for card_id in self.registered_cards if card_id in self.cards}
+        for card_id in tracked - registered:
+            tracker.remove_card(card_id)
+        for card_id in registered - tracked:
+            card = self.cards[card_id]
+            tracker.add_card(card_id, card.card_number, card.song_positions)
+        tracker.sync_played(self.played_songs)
+        return tracker
+
+    def get_replay_index(self) -> ReplayIndex:
+        """Get the replay index, brought up to date with cards and played songs.
+
+        Returns:
+            ReplayIndex covering every card in the game and all patterns
+            (CUSTOM only when a custom pattern is set)
+        """
+        if self._replay is None or self._replay_custom is not self.custom_pattern:
+            pattern_lines = {
+                pattern_type: pattern.lines for pattern_type, pattern in DEFAULT_PATTERNS.items()
+            }
+            if self.custom_pattern is not None:
+                pattern_lines[PatternType.CUSTOM] = self.custom_pattern.lines
+            self._replay = ReplayIndex(pattern_lines)
+            self._replay_custom = self.custom_pattern
+
+        replay = self._replay
+        if len(replay.card_ids()) != len(self.cards):
+            for card_id in self.cards.keys() - replay.card_ids():
+                replay.add_card(card_id, self.cards[card_id].song_positions)
+        replay.sync(self.played_songs)
+        return replay
+
+    def get_first_win_calls(self, card_id: UUID) -> dict[PatternType, Optional[int]]:
+        """Get the call at which a card first completed each pattern.
+
+        Args:
+            card_id: UUID of the card
+
+        Returns:
+            Dict of pattern -> 1-based call index (None if not completed)
+
+        Raises:
+            ValueError: If card_id is not in this game
+        """
+        if card_id not in self.cards:
+            raise ValueError(f"Card {card_id} not found in game")
+
+        replay = self.get_replay_index()
+        return {
+            pattern: replay.first_win_call(card_id, pattern) for pattern in replay.pattern_lines
+        }
+
+    def get_winners_at_call(self, call: int, pattern: Optional[PatternType] = None) -> dict:
+        """Replay the game to a call and report who had won.
+
+        Args:
+            call: 1-based call index into played_songs
+            pattern: Pattern to check (default: current pattern)
+
+        Returns:
+            Dict with call, song_id, pattern, new_winners (first completed at
+            this call) and winners (completed at or before it), as card_id lists
+            sorted by card number
+
+        Raises:
+            ValueError: If call is out of range, or pattern is CUSTOM and no
+                custom pattern is set
+        """
+        if not 1 <= call <= len(self.played_songs):
+            raise ValueError(f"Call {call} out of range (1-{len(self.played_songs)})")
+
+        pattern = pattern or self.current_pattern
+        self.get_pattern(pattern)
+        replay = self.get_replay_index()
+
+        def by_number(card_ids: set[UUID]) -> list[UUID]:
+            return sorted(card_ids, key=lambda cid: self.cards[cid].card_number)
+
+        return {
+            "call": call,
+            "song_id": self.played_songs[call - 1],
+            "pattern": pattern,
+            "new_winners": by_number(replay.first_winners_at(call, pattern)),
+            "winners": by_number(replay.winners_by(call, pattern)),
+        }
+
+    def set_stages(self, stages: list[PatternType]) -> None:
+        """Set the ordered patterns of a progressive game and go to the first.
+
+        Args:
+            stages: Patterns in play order; an empty list ends staged play
+
+        Raises:
+            ValueError: If a stage is CUSTOM and no custom pattern is set
+        """
+        for pattern_type in stages:
+            self.get_pattern(pattern_type)
+        self.stages = list(stages)
+        self.current_stage = 0
+        if self.stages:
+            self.current_pattern = self.stages[0]
+        self.updated_at = datetime.now()
+
+    def advance_stage(self) -> int:
+        """Move to the next stage; earlier stage winners are kept.
+
+        Returns:
+            New current stage index
+
+        Raises:
+            ValueError: If the game has no stages or is on the last stage
+        """
+        if not self.stages:
+            raise ValueError("Game has no stages")
+        if self.current_stage + 1 >= len(self.stages):
+            raise ValueError("Already on the last stage")
+        self.current_stage += 1
+        self.current_pattern = self.stages[self.current_stage]
+        self.updated_at = datetime.now()
+        return self.current_stage
+
+    def get_stage_tracker(self) -> StageTracker:
+        """Get the stage tracker, brought up to date with this game.
+
+        Rebuilt only when the stage patterns change, so advancing a stage
+        costs nothing: every stage has been evaluated on each marked song.
+
+        Returns:
+            StageTracker covering all registered cards
+
+        Raises:
+            ValueError: If the game has no stages
+        """
+        if not self.stages:
+            raise ValueError("Game has no stages")
+
+        patterns = tuple(self.get_pattern(pattern_type) for pattern_type in self.stages)
+        if (
+            self._stage_tracker is None
+            or len(patterns) != len(self._stage_patterns)
+            or any(a is not b for a, b in zip(patterns, self._stage_patterns))
+        ):
+            self._stage_tracker = StageTracker([pattern.masks for pattern in patterns])
+            self._stage_patterns = patterns
+
+        tracker = self._stage_tracker
+        tracked = tracker.card_ids()
+        registered = {card_id for card_id in self.registered_cards if card_id in self.cards}
+        for card_id in tracked - registered:
+            tracker.remove_card(card_id)
+        for card_id in registered - tracked:
+            tracker.add_card(card_id, self.cards[card_id].song_positions)
+        tracker.sync_played(self.played_songs)
+        return tracker
+
     def check_registered_cards_for_winners(self) -> list[dict]:
         """Check all registered cards for new winners.
 
+        In a staged game, winners are per stage: a card that won an earlier
+        stage can win the current one too.
+
         Returns:
             List of NEW winners (not already in detected_winners).
-            Each winner dict includes: card_id, card_number, player_name, pattern, detected_at
+            Each winner dict includes: card_id, card_number, player_name, pattern,
+            detected_at, and stage for staged games
         """
+        if self.stages:
+            stage = self.current_stage
+            existing_winner_ids = {
+                w["card_id"] for w in self.detected_winners if w.get("stage") == stage
+            }
+            winner_ids = self.get_stage_tracker().winners(stage) - existing_winner_ids
+        else:
+            stage = None
+            existing_winner_ids = {w["card_id"] for w in self.detected_winners}
+            winner_ids = self.get_near_win_tracker().winners() - existing_winner_ids
+
         new_winners = []
-        existing_winner_ids = {w["card_id"] for w in self.detected_winners}
-
-        for card_id, registration in self.registered_cards.items():
-            # Skip if already a detected winner
-            if card_id in existing_winner_ids:
-                continue
-
-            # Get card and check for win
-            card = self.cards.get(card_id)
-            if card is None:
-                continue
-
-            is_winner, pattern, card_number = self.verify_card(card_id)
-            if is_winner:
-                new_winners.append({
-                    "card_id": card_id,
-                    "card_number": card_number,
-                    "player_name": registration["player_name"],
-                    "pattern": pattern,
-                    "detected_at": datetime.now(),
-                })
+        for card_id in sorted(winner_ids, key=lambda cid: self.cards[cid].card_number):
+            winner = {
+                "card_id": card_id,
+                "card_number": self.cards[card_id].card_number,
+                "player_name": self.registered_cards[card_id]["player_name"],
+                "pattern": self.current_pattern,
+                "detected_at": datetime.now(),
+            }
+            if stage is not None:
+                winner["stage"] = stage
+            new_winners.append(winner)
 
         return new_winners
 
+    def get_near_win_leaderboard(self, k: int = 10) -> dict:
+        """Get registered cards closest to completing the current pattern.
+
+        Args:
+            k: Maximum number of cards to list
+
+        Returns:
+            Dict with away_counts (songs away -> number of cards) and
+            closest (status dicts, nearest first)
+        """
+        tracker = self.get_near_win_tracker()
+        return {
+            "away_counts": tracker.away_counts(),
+            "closest": [self._card_status(card_id, tracker) for card_id in tracker.closest(k)],
+        }
+
     def get_card_statuses(self) -> list[dict]:
         """Get status info for all registered cards.
 
         Returns:
             List of status dicts with card progress info.
         """
-        statuses = []
-        played_song_ids = self.get_played_song_ids()
-        pattern = DEFAULT_PATTERNS[self.current_pattern]
-
-        # Calculate total needed based on pattern
+        tracker = self.get_near_win_tracker()
+        return [
+            self._card_status(card_id, tracker)
+            for card_id in self.registered_cards
+            if card_id in tracker
+        ]
+
+    def _card_status(self, card_id: UUID, tracker: NearWinTracker) -> dict:
+        """Build the status dict for one tracked card."""
         total_needed = self._get_total_needed_for_pattern(self.current_pattern)
+        # Matches never include the free space
+        matches = tracker.matches(card_id)
+        away = tracker.away(card_id)
+        is_winner = away == 0
+
+        return {
+            "card_id": card_id,
+            "card_number": self.cards[card_id].card_number,
+            "player_name": self.registered_cards[card_id]["player_name"],
+            "matches": matches,
+            "total_needed": total_needed,
+            "songs_away": away,
+            "is_winner": is_winner,
+            "progress": "WINNER" if is_winner else f"{matches}/{total_needed}",
+        }
 
-        for card_id, registration in self.registered_cards.items():
-            card = self.cards.get(card_id)
-            if card is None:
-                continue
-
-            # Count matches
-            marked_positions = card.get_marked_positions(played_song_ids)
-            # Don't count free space as a "match" for progress display
-            matches_without_free = len(marked_positions) - 1  # Subtract 1 for free space
-
-            # Check if winner
-            is_winner = pattern.check_win(marked_positions)
+    def _get_total_needed_for_pattern(self, pattern_type: PatternType) -> int:
+        """Get the number of matches needed to complete a pattern."""
+        return self.get_pattern(pattern_type).total_needed
 
-            progress = "WINNER" if is_winner else f"{matches_without_free}/{total_needed}"
 
-            statuses.append({
-                "card_id": card_id,
-                "card_number": card.card_number,
-                "player_name": registration["player_name"],
-                "matches": matches_without_free,
-                "total_needed": total_needed,
-                "is_winner": is_winner,
-                "progress": progress,
-            })
+@dataclass
+class GameGroup:
+    """Linked games (rooms) that share a playlist and are played together.
 
-        return statuses
+    Every member game uses the same song_id -> playlist index dict, so a
+    song is looked up once per call rather than once per room.
+    """
 
-    def _get_total_needed_for_pattern(self, pattern_type: PatternType) -> int:
-        """Get the number of matches needed to complete a pattern."""
-        if pattern_type in (PatternType.FIVE_IN_A_ROW, PatternType.ROW, PatternType.COLUMN, PatternType.DIAGONAL):
-            return 5
-        elif pattern_type == PatternType.FOUR_CORNERS:
-            return 4
-        elif pattern_type == PatternType.X_PATTERN:
-            return 9  # Both diagonals share center
-        elif pattern_type == PatternType.FULL_CARD:
-            return 24  # All squares except free space
-        elif pattern_type == PatternType.FRAME:
-            return 16  # All edge cells
-        return 5  # Default
+    group_id: UUID
+    game_ids: list[UUID]
+    song_index: dict[UUID, int]  # Shared by all member games
+    created_at: datetime = field(default_factory=datetime.now)
@@ -0,0 +1,177 @@
+"""Incremental "N away" tracking for registered cards.
+
+A winning pattern is a set of lines (rows, columns, diagonals, or a single
+shape such as the frame); a card wins when any line is fully marked. For
+each tracked card we keep how many positions of every line are still
+unmarked, so marking a song only touches the cards holding that song and
+the lines through its position. A card's "away" count is the minimum over
+its lines: the fewest unplayed songs it still needs.
+
+A line with a position the card has no song for can never complete, so it
+is ignored; a card with no completable line reports UNREACHABLE.
+
+Cards are also bucketed by away count, so "how many cards are one away"
+is a dict lookup and the closest-to-winning query walks buckets from 0
+and heap-selects within them instead of scanning every card.
+"""
+
+import heapq
+from collections import defaultdict
+from typing import Iterable, Optional
+from uuid import UUID
+
+FREE_SPACE = (2, 2)
+UNREACHABLE = 25  # more than any line needs; the card cannot win this pattern
+
+Position = tuple[int, int]
+
+
+class _CardProgress:
+    """Per-card counters (slotted, one per tracked card)."""
+
+    __slots__ = ("card_number", "song_positions", "remaining", "reachable", "matches", "away")
+
+    def __init__(
+        self,
+        card_number: int,
+        song_positions: dict[UUID, Position],
+        lines: list[frozenset[Position]],
+    ):
+        self.card_number = card_number
+        self.song_positions = song_positions
+        self.remaining = [len(line) for line in lines]
+        filled = set(song_positions.values())
+        self.reachable = [i for i, line in enumerate(lines) if line <= filled]
+        self.matches = 0
+        self.away = self.compute_away()
+
+    def compute_away(self) -> int:
+        return min((self.remaining[i] for i in self.reachable), default=UNREACHABLE)
+
+
+class NearWinTracker:
+    """Maintains each tracked card's distance to the current pattern."""
+
+    def __init__(self, lines: Iterable[Iterable[Position]]):
+        """Initialize tracker.
+
+        Args:
+            lines: Position sets for the pattern; completing any one wins.
+                The free space may be included and is treated as marked.
+        """
+        self.lines = [frozenset(line) - {FREE_SPACE} for line in lines]
+        self._lines_at: dict[Position, list[int]] = defaultdict(list)
+        for index, line in enumerate(self.lines):
+            for position in line:
+                self._lines_at[position].append(index)
+
+        self.played: set[UUID] = set()
+        self._cards: dict[UUID, _CardProgress] = {}
+        self._song_cards: dict[UUID, dict[UUID, Position]] = defaultdict(dict)
+        self._buckets: dict[int, set[UUID]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __contains__(self, card_id: UUID) -> bool:
+        return card_id in self._cards
+
+    def card_ids(self) -> set[UUID]:
+        """IDs of all tracked cards."""
+        return set(self._cards)
+
+    def add_card(
+        self, card_id: UUID, card_number: int, song_positions: dict[UUID, Position]
+    ) -> None:
+        """Start tracking a card, applying songs already played."""
+        if card_id in self._cards:
+            return
+        progress = _CardProgress(card_number, song_positions, self.lines)
+        self._cards[card_id] = progress
+        for song_id, position in song_positions.items():
+            self._song_cards[song_id][card_id] = position
+            if song_id in self.played:
+                self._apply(progress, position, -1)
+        progress.away = progress.compute_away()
+        self._buckets[progress.away].add(card_id)
+
+    def remove_card(self, card_id: UUID) -> None:
+        """Stop tracking a card."""
+        progress = self._cards.pop(card_id, None)
+        if progress is None:
+            return
+        for song_id in progress.song_positions:
+            self._song_cards[song_id].pop(card_id, None)
+        self._buckets[progress.away].discard(card_id)
+
+    def mark(self, song_id: UUID) -> None:
+        """Record a played song, updating only the cards that hold it."""
+        if song_id in self.played:
+            return
+        self.played.add(song_id)
+        self._update(song_id, -1)
+
+    def unmark(self, song_id: UUID) -> None:
+        """Undo a played song."""
+        if song_id not in self.played:
+            return
+        self.played.discard(song_id)
+        self._update(song_id, 1)
+
+    def sync_played(self, played_songs: Iterable[UUID]) -> None:
+        """Mark/unmark the difference between tracked and actual played songs."""
+        played = set(played_songs)
+        for song_id in self.played - played:
+            self.unmark(song_id)
+        for song_id in played - self.played:
+            self.mark(song_id)
+
+    def away(self, card_id: UUID) -> int:
+        """Fewest unplayed songs the card needs to win (0 = winner, UNREACHABLE = cannot win)."""
+        return self._cards[card_id].away
+
+    def matches(self, card_id: UUID) -> int:
+        """Number of the card's songs that have been played."""
+        return self._cards[card_id].matches
+
+    def winners(self) -> set[UUID]:
+        """Card IDs that currently complete the pattern."""
+        return set(self._buckets.get(0, ()))
+
+    def away_counts(self) -> dict[int, int]:
+        """Number of tracked cards at each away count, ascending."""
+        return {away: len(cards) for away, cards in sorted(self._buckets.items()) if cards}
+
+    def closest(self, k: int, max_away: Optional[int] = None) -> list[UUID]:
+        """Card IDs closest to winning, ordered by away count then card number.
+
+        Args:
+            k: Maximum number of cards to return
+            max_away: Optional cutoff; cards further away are excluded
+        """
+        result: list[UUID] = []
+        for away in sorted(self._buckets):
+            if len(result) >= k or (max_away is not None and away > max_away):
+                break
+            bucket = self._buckets[away]
+            result.extend(
+                heapq.nsmallest(
+                    k - len(result), bucket, key=lambda cid: self._cards[cid].card_number
+                )
+            )
+        return result
+
+    def _update(self, song_id: UUID, delta: int) -> None:
+        for card_id, position in self._song_cards.get(song_id, {}).items():
+            progress = self._cards[card_id]
+            self._apply(progress, position, delta)
+            away = progress.compute_away()
+            if away != progress.away:
+                self._buckets[progress.away].discard(card_id)
+                self._buckets[away].add(card_id)
+                progress.away = away
+
+    def _apply(self, progress: _CardProgress, position: Position, delta: int) -> None:
+        progress.matches -= delta
+        for index in self._lines_at.get(position, ()):
+            progress.remaining[index] += delta
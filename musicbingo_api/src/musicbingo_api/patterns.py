@@ -0,0 +1,214 @@
+"""Pattern definition language compiled to bitmask tables.
+
+A card's marked cells are a 25-bit mask (bit row*5+col; the free space is
+bit 12). A compiled pattern is a tuple of required-cell masks: the card
+wins if every cell of any one mask is marked. Built-in and custom patterns
+compile to the same form, so a win check always costs one AND/compare per
+mask.
+
+Definitions are plain JSON values:
+
+    "row"                              a built-in pattern by name
+    {"grid": ["X...X",                 grid art: X or # marks a required
+              ".X.X.",                 cell, . or - leaves it free
+              "..X..",
+              ".X.X.",
+              "X...X"]}
+    {"cells": [[0, 0], [4, 4]]}        required (row, col) cells
+    {"any_of": [def, ...]}             win with any alternative
+    {"all_of": [def, ...]}             complete every part together
+    {"at_least": 2, "of": def}         any 2 distinct alternatives of def
+                                       (e.g. "any two lines")
+
+Compiled mask sets are reduced (duplicates and supersets dropped, since
+completing a smaller mask already wins) and capped at MAX_MASKS.
+"""
+
+import math
+from itertools import combinations, product
+from typing import Any, Iterable, Union
+
+FREE_SPACE = (2, 2)
+FREE_BIT = 1 << (FREE_SPACE[0] * 5 + FREE_SPACE[1])
+ALL_CELLS = (1 << 25) - 1
+MAX_MASKS = 1024
+
+MARK_CHARS = "X#"
+BLANK_CHARS = ".-"
+
+Definition = Union[str, list, dict]
+
+
+def cell_bit(row: int, col: int) -> int:
+    """Bit for a grid cell."""
+    return 1 << (row * 5 + col)
+
+
+def positions_to_mask(positions: Iterable[tuple[int, int]]) -> int:
+    """Convert (row, col) positions to a cell mask."""
+    mask = 0
+    for row, col in positions:
+        mask |= cell_bit(row, col)
+    return mask
+
+
+def mask_to_positions(mask: int) -> frozenset[tuple[int, int]]:
+    """Convert a cell mask to a set of (row, col) positions."""
+    return frozenset(divmod(bit, 5) for bit in range(25) if mask >> bit & 1)
+
+
+def popcount(mask: int) -> int:
+    """Number of cells in a mask."""
+    return bin(mask).count("1")
+
+
+def _rows() -> list[int]:
+    return [positions_to_mask((row, col) for col in range(5)) for row in range(5)]
+
+
+def _columns() -> list[int]:
+    return [positions_to_mask((row, col) for row in range(5)) for col in range(5)]
+
+
+def _diagonals() -> list[int]:
+    return [
+        positions_to_mask((i, i) for i in range(5)),
+        positions_to_mask((i, 4 - i) for i in range(5)),
+    ]
+
+
+# Built-in pattern geometry (keys are PatternType values)
+BUILTIN_MASKS: dict[str, tuple[int, ...]] = {
+    "five_in_a_row": tuple(_rows() + _columns() + _diagonals()),
+    "row": tuple(_rows()),
+    "column": tuple(_columns()),
+    "diagonal": tuple(_diagonals()),
+    "four_corners": (positions_to_mask([(0, 0), (0, 4), (4, 0), (4, 4)]),),
+    "x_pattern": (_diagonals()[0] | _diagonals()[1],),
+    "full_card": (ALL_CELLS & ~FREE_BIT,),
+    "frame": (_rows()[0] | _rows()[4] | _columns()[0] | _columns()[4],),
+}
+
+
+def reduce_masks(masks: Iterable[int]) -> tuple[int, ...]:
+    """Drop duplicate masks and masks that contain another mask.
+
+    Returns:
+        Minimal masks, smallest first
+    """
+    result: list[int] = []
+    for mask in sorted(set(masks), key=lambda m: (popcount(m), m)):
+        if not any(kept & mask == kept for kept in result):
+            result.append(mask)
+    return tuple(result)
+
+
+def compile_pattern(definition: Definition) -> tuple[int, ...]:
+    """Compile a pattern definition to a minimal tuple of cell masks.
+
+    Args:
+        definition: Pattern definition (see module docstring)
+
+    Returns:
+        Masks; a card wins when all cells of any one mask are marked
+
+    Raises:
+        ValueError: If the definition is malformed, could be won without
+            calling any song, or compiles to more than MAX_MASKS masks
+    """
+    masks = reduce_masks(_compile(definition, path="pattern"))
+    if not masks:
+        raise ValueError("pattern: no winning shapes defined")
+    if any(mask & ~FREE_BIT == 0 for mask in masks):
+        raise ValueError("pattern: a shape needs no songs (only the free space)")
+    return masks
+
+
+def _check_size(masks: Iterable[int], path: str) -> tuple[int, ...]:
+    masks = reduce_masks(masks)
+    if len(masks) > MAX_MASKS:
+        raise ValueError(f"{path}: expands to {len(masks)} shapes (max {MAX_MASKS})")
+    return masks
+
+
+def _compile(definition: Any, path: str) -> tuple[int, ...]:
+    if isinstance(definition, str):
+        if definition not in BUILTIN_MASKS:
+            raise ValueError(f"{path}: unknown built-in pattern '{definition}'")
+        return BUILTIN_MASKS[definition]
+
+    if not isinstance(definition, dict) or not definition:
+        raise ValueError(f"{path}: expected a pattern name or object")
+
+    keys = set(definition)
+    if keys == {"grid"}:
+        return (_compile_grid(definition["grid"], f"{path}.grid"),)
+    if keys == {"cells"}:
+        return (_compile_cells(definition["cells"], f"{path}.cells"),)
+    if keys == {"any_of"}:
+        parts = _compile_parts(definition["any_of"], f"{path}.any_of")
+        return _check_size((mask for part in parts for mask in part), path)
+    if keys == {"all_of"}:
+        parts = _compile_parts(definition["all_of"], f"{path}.all_of")
+        combined = [0]
+        for part in parts:
+            combined = _check_size((a | b for a, b in product(combined, part)), path)
+        return tuple(combined)
+    if keys == {"at_least", "of"}:
+        count = definition["at_least"]
+        options = _compile(definition["of"], f"{path}.of")
+        if not isinstance(count, int) or isinstance(count, bool) or count < 1:
+            raise ValueError(f"{path}.at_least: must be a positive integer")
+        if count > len(options):
+            raise ValueError(
+                f"{path}.at_least: {count} exceeds the {len(options)} alternatives available"
+            )
+        if math.comb(len(options), count) > MAX_MASKS * 16:
+            raise ValueError(f"{path}: too many combinations")
+        merged = (_union(group) for group in combinations(options, count))
+        return _check_size(merged, path)
+
+    raise ValueError(f"{path}: unrecognised keys {sorted(keys)}")
+
+
+def _compile_parts(parts: Any, path: str) -> list[tuple[int, ...]]:
+    if not isinstance(parts, list) or not parts:
+        raise ValueError(f"{path}: expected a non-empty list")
+    return [_compile(part, f"{path}[{i}]") for i, part in enumerate(parts)]
+
+
+def _compile_grid(grid: Any, path: str) -> int:
+    if not isinstance(grid, list) or len(grid) != 5:
+        raise ValueError(f"{path}: expected 5 rows")
+    mask = 0
+    for row, line in enumerate(grid):
+        if not isinstance(line, str) or len(line) != 5:
+            raise ValueError(f"{path}[{row}]: expected a 5-character string")
+        for col, char in enumerate(line):
+            if char in MARK_CHARS:
+                mask |= cell_bit(row, col)
+            elif char not in BLANK_CHARS:
+                raise ValueError(f"{path}[{row}]: unexpected character '{char}'")
+    return mask
+
+
+def _compile_cells(cells: Any, path: str) -> int:
+    if not isinstance(cells, list) or not cells:
+        raise ValueError(f"{path}: expected a non-empty list of [row, col]")
+    mask = 0
+    for cell in cells:
+        if (
+            not isinstance(cell, (list, tuple))
+            or len(cell) != 2
+            or not all(isinstance(v, int) and 0 <= v < 5 for v in cell)
+        ):
+            raise ValueError(f"{path}: invalid cell {cell!r}")
+        mask |= cell_bit(*cell)
+    return mask
+
+
+def _union(masks: Iterable[int]) -> int:
+    result = 0
+    for mask in masks:
+        result |= mask
+    return result
@@ -0,0 +1,393 @@
+"""Runtime sampling profiler and slow request log.
+
+Both tools are built on sys._current_frames(), so they need no extra
+dependency and can run inside a live uvicorn process. They cost nothing
+until switched on: the profiler only exists while a profile is being
+taken, and the slow request middleware short-circuits on a single flag.
+"""
+
+import asyncio
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, Iterator, Optional
+
+from fastapi.routing import APIRoute
+
+# Environment variable holding the admin token for debug endpoints.
+# Debug endpoints are disabled entirely when it is unset.
+ADMIN_TOKEN_ENV = "MUSICBINGO_ADMIN_TOKEN"
+
+DEFAULT_INTERVAL_SECONDS = 0.005  # 200 Hz
+MAX_PROFILE_SECONDS = 60
+MAX_STACK_DEPTH = 128
+
+
+def get_admin_token() -> Optional[str]:
+    """Get the configured admin token, or None if debug endpoints are disabled."""
+    token = os.environ.get(ADMIN_TOKEN_ENV, "").strip()
+    return token or None
+
+
+def _frame_label(frame) -> str:
+    """Format a frame as 'function (file:line)' with a short file name."""
+    code = frame.f_code
+    filename = code.co_filename
+    # Trim site-packages / project prefixes to keep stacks readable
+    for marker in ("site-packages" + os.sep, "src" + os.sep):
+        idx = filename.rfind(marker)
+        if idx != -1:
+            filename = filename[idx + len(marker):]
+            break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def capture_stack(frame) -> tuple[str, ...]:
+    """Capture a stack as a root-first tuple of frame labels.
+
+    Args:
+        frame: Innermost frame of the stack
+
+    Returns:
+        Tuple of frame labels, outermost caller first
+    """
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+
+def capture_await_chain(coro) -> tuple[str, ...]:
+    """Capture the stack of a suspended coroutine by following what it awaits.
+
+    Args:
+        coro: Outermost coroutine (e.g. a task's coroutine)
+
+    Returns:
+        Tuple of frame labels, outermost coroutine first
+    """
+    labels = []
+    while coro is not None and len(labels) < MAX_STACK_DEPTH:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        labels.append(_frame_label(frame))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return tuple(labels)
+
+
+class SamplingProfiler:
+    """Statistical profiler sampling every thread's stack at a fixed interval.
+
+    Runs in a daemon thread, so the event loop keeps serving requests while
+    it is being profiled.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL_SECONDS):
+        """Initialize profiler.
+
+        Args:
+            interval: Seconds between samples
+        """
+        if interval <= 0:
+            raise ValueError("Sampling interval must be positive")
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        if self._thread is not None:
+            raise RuntimeError("Profiler already started")
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="musicbingo-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.started_at is not None:
+            self.duration = time.perf_counter() - self.started_at
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                self.samples[capture_stack(frame)] += 1
+            self.sample_count += 1
+
+    def to_collapsed(self) -> str:
+        """Render samples in collapsed-stack format (flamegraph.pl, speedscope).
+
+        Returns:
+            One 'frame;frame;frame count' line per distinct stack
+        """
+        lines = [
+            f"{';'.join(stack)} {count}"
+            for stack, count in sorted(self.samples.items(), key=lambda item: -item[1])
+        ]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def to_speedscope(self, name: str = "musicbingo-api") -> dict:
+        """Render samples as a speedscope 'sampled' profile.
+
+        Args:
+            name: Profile name shown in speedscope
+
+        Returns:
+            Dict matching https://www.speedscope.app/file-format-schema.json
+        """
+        frame_index: dict[str, int] = {}
+        frames = []
+        samples = []
+        weights = []
+
+        for stack, count in self.samples.items():
+            indices = []
+            for label in stack:
+                if label not in frame_index:
+                    frame_index[label] = len(frames)
+                    frames.append({"name": label})
+                indices.append(frame_index[label])
+            samples.append(indices)
+            weights.append(count * self.interval)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+            "name": name,
+            "exporter": "musicbingo_api.profiler",
+        }
+
+
+class SlowRequestLog:
+    """Captures stacks for requests running longer than a threshold.
+
+    A watchdog thread checks in-flight requests and snapshots the stack of
+    any request that crosses the threshold, so the log shows what the request
+    was doing *while* it was slow, not after:
+
+    - Sync handlers (see SlowRequestRoute): the worker thread running them.
+    - Async handlers running on the event loop: the loop thread.
+    - Async handlers suspended at an await, while the loop serves other
+      requests: the request task's await chain, since the loop thread's
+      stack then belongs to another task.
+    """
+
+    def __init__(self, max_entries: int = 100):
+        """Initialize slow request log (disabled).
+
+        Args:
+            max_entries: Maximum number of slow requests to keep
+        """
+        self.enabled = False
+        self.threshold = 0.0
+        self.entries: deque = deque(maxlen=max_entries)
+        self._in_flight: dict[int, dict] = {}
+        self._next_token = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def enable(self, threshold_ms: float) -> None:
+        """Start capturing requests slower than threshold_ms."""
+        if threshold_ms <= 0:
+            raise ValueError("Threshold must be positive")
+        self.threshold = threshold_ms / 1000.0
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._watch, name="musicbingo-slow-requests", daemon=True
+            )
+            self._thread.start()
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop capturing and shut down the watchdog thread."""
+        self.enabled = False
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            self._in_flight.clear()
+
+    def clear(self) -> None:
+        """Drop all captured entries."""
+        self.entries.clear()
+
+    def begin(self, method: str, path: str) -> int:
+        """Record the start of a request on the current thread.
+
+        Returns:
+            Token to pass to end()
+        """
+        with self._lock:
+            token = self._next_token
+            self._next_token += 1
+            self._in_flight[token] = {
+                "method": method,
+                "path": path,
+                "thread_id": threading.get_ident(),
+                "worker_thread_id": None,
+                "task": _current_task(),
+                "start": time.perf_counter(),
+                "stack": None,
+            }
+        return token
+
+    def set_worker_thread(self, token: int, thread_id: Optional[int]) -> None:
+        """Record the thread running a request's sync handler (None when it returns)."""
+        with self._lock:
+            request = self._in_flight.get(token)
+            if request is not None:
+                request["worker_thread_id"] = thread_id
+
+    def end(self, token: int) -> None:
+        """Record the end of a request, logging it if it was slow."""
+        with self._lock:
+            request = self._in_flight.pop(token, None)
+        if request is None:
+            return
+        elapsed = time.perf_counter() - request["start"]
+        if elapsed < self.threshold:
+            return
+        self.entries.append({
+            "method": request["method"],
+            "path": request["path"],
+            "duration_ms": round(elapsed * 1000, 3),
+            "finished_at": datetime.now().isoformat(),
+            "stack": list(request["stack"] or ()),
+        })
+
+    def _watch(self) -> None:
+        # Check a few times per threshold so stacks land inside the slow part
+        while not self._stop.wait(max(self.threshold / 4, 0.001)):
+            now = time.perf_counter()
+            with self._lock:
+                overdue = [
+                    r for r in self._in_flight.values()
+                    if r["stack"] is None and now - r["start"] >= self.threshold
+                ]
+            if not overdue:
+                continue
+            frames = sys._current_frames()
+            for request in overdue:
+                request["stack"] = _request_stack(request, frames)
+
+
+def _current_task() -> Optional[asyncio.Task]:
+    try:
+        return asyncio.current_task()
+    except RuntimeError:  # no running event loop
+        return None
+
+
+def _request_stack(request: dict, frames: dict) -> Optional[tuple[str, ...]]:
+    """Stack of an in-flight request (None if its thread is gone)."""
+    thread_id = request["worker_thread_id"]
+    task = request["task"]
+    if thread_id is None and task is not None and asyncio.current_task(task.get_loop()) is not task:
+        # Suspended at an await: the loop thread is running someone else
+        return capture_await_chain(task.get_coro())
+    frame = frames.get(thread_id or request["thread_id"])
+    return capture_stack(frame) if frame is not None else None
+
+
+# (log, token) of the request being served in the current context
+_current_request: ContextVar[Optional[tuple["SlowRequestLog", int]]] = ContextVar(
+    "musicbingo_slow_request", default=None
+)
+
+
+@contextmanager
+def _worker_thread() -> Iterator[None]:
+    current = _current_request.get()
+    if current is None:
+        yield
+        return
+    log, token = current
+    log.set_worker_thread(token, threading.get_ident())
+    try:
+        yield
+    finally:
+        log.set_worker_thread(token, None)
+
+
+class SlowRequestMiddleware:
+    """Pure ASGI middleware feeding the slow request log.
+
+    When the log is disabled this is one attribute check per request.
+    """
+
+    def __init__(self, app, log: "SlowRequestLog"):
+        self.app = app
+        self.log = log
+
+    async def __call__(self, scope, receive, send):
+        if not self.log.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = self.log.begin(scope["method"], scope["path"])
+        # Copied into threadpool workers, so sync handlers can find their request
+        current = _current_request.set((self.log, token))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_request.reset(current)
+            self.log.end(token)
+
+
+def _track_worker_thread(endpoint: Callable) -> Callable:
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        with _worker_thread():
+            return endpoint(*args, **kwargs)
+
+    return wrapper
+
+
+class SlowRequestRoute(APIRoute):
+    """Route class attributing sync endpoints' threadpool threads to their request.
+
+    FastAPI runs sync endpoints in a worker thread; without this the slow
+    request log would sample the event loop thread instead. Sync dependencies
+    are not covered.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if not asyncio.iscoroutinefunction(endpoint):
+            endpoint = _track_worker_thread(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+# Global slow request log shared by the middleware and debug endpoints
+slow_request_log = SlowRequestLog()
@@ -0,0 +1,154 @@
+"""First-win call index for replaying a game.
+
+For every card and pattern we store the call at which the card first
+completed that pattern, given the ordered play log. Each call gets a
+sequence number that never changes, so unmarking a song only affects the
+cards holding it; later calls keep their sequence numbers and simply move
+up one place in the log.
+
+A line completes at the latest call among its cells (the free space counts
+as call 0) and a card first wins at the earliest completing line. Cards are
+also bucketed by first-win sequence number, so "which cards first won at
+call k" is a dict lookup. "Which cards had won by call k" is not: it unions
+the buckets of the first k calls.
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Optional
+from uuid import UUID
+
+FREE_SPACE = (2, 2)
+NOT_PLAYED = float("inf")
+
+Position = tuple[int, int]
+Lines = list[frozenset[Position]]
+
+
+class ReplayIndex:
+    """Maintains each card's first-win call for every pattern."""
+
+    def __init__(self, pattern_lines: dict[str, Lines]):
+        """Initialize index.
+
+        Args:
+            pattern_lines: Pattern key -> lines; completing any line wins
+        """
+        self.pattern_lines = pattern_lines
+        self.log: list[int] = []  # sequence numbers in call order
+        self.songs: list[UUID] = []  # song for each log entry
+        self._seq_of_song: dict[UUID, int] = {}
+        self._next_seq = 1
+
+        self._positions: dict[UUID, dict[UUID, Position]] = {}
+        self._song_cards: dict[UUID, set[UUID]] = defaultdict(set)
+        self._first_win: dict[UUID, dict[str, float]] = {}
+        self._by_seq: dict[str, dict[int, set[UUID]]] = {
+            pattern: defaultdict(set) for pattern in pattern_lines
+        }
+
+    def __contains__(self, card_id: UUID) -> bool:
+        return card_id in self._positions
+
+    def card_ids(self) -> set[UUID]:
+        """IDs of all indexed cards."""
+        return set(self._positions)
+
+    def add_card(self, card_id: UUID, song_positions: dict[UUID, Position]) -> None:
+        """Index a card against the current play log."""
+        if card_id in self._positions:
+            return
+        self._positions[card_id] = song_positions
+        self._first_win[card_id] = {}
+        for song_id in song_positions:
+            self._song_cards[song_id].add(card_id)
+        self._recompute(card_id)
+
+    def mark(self, song_id: UUID) -> None:
+        """Append a song to the play log."""
+        if song_id in self._seq_of_song:
+            return
+        seq = self._next_seq
+        self._next_seq += 1
+        self.log.append(seq)
+        self.songs.append(song_id)
+        self._seq_of_song[song_id] = seq
+        for card_id in self._song_cards.get(song_id, ()):
+            self._recompute(card_id)
+
+    def unmark(self, song_id: UUID) -> None:
+        """Remove a song from the play log; later calls move up one place."""
+        seq = self._seq_of_song.pop(song_id, None)
+        if seq is None:
+            return
+        position = bisect_left(self.log, seq)
+        del self.log[position]
+        del self.songs[position]
+        for card_id in self._song_cards.get(song_id, ()):
+            self._recompute(card_id)
+
+    def sync(self, played_songs: list[UUID]) -> None:
+        """Bring the log in line with an ordered played-songs list.
+
+        Removed songs are unmarked and new songs appended. If the remaining
+        order differs (the list was rewritten), the log is rebuilt.
+        """
+        played = set(played_songs)
+        for song_id in [s for s in self.songs if s not in played]:
+            self.unmark(song_id)
+        if self.songs != played_songs[:len(self.songs)]:
+            for song_id in list(self.songs):
+                self.unmark(song_id)
+        for song_id in played_songs[len(self.songs):]:
+            self.mark(song_id)
+
+    def first_win_call(self, card_id: UUID, pattern: str) -> Optional[int]:
+        """1-based call index at which the card first completed the pattern.
+
+        Returns:
+            Call index, or None if the card has not completed the pattern
+        """
+        seq = self._first_win[card_id][pattern]
+        if seq == NOT_PLAYED:
+            return None
+        if seq == 0:
+            return 0
+        return bisect_left(self.log, seq) + 1
+
+    def first_winners_at(self, call: int, pattern: str) -> set[UUID]:
+        """Cards that first completed the pattern exactly at this call."""
+        if not 1 <= call <= len(self.log):
+            return set()
+        return set(self._by_seq[pattern].get(self.log[call - 1], ()))
+
+    def winners_by(self, call: int, pattern: str) -> set[UUID]:
+        """Cards that had completed the pattern at or before this call.
+
+        Unions the first-win buckets of calls 1..call, so this costs
+        O(call + winners) rather than the single lookup of first_winners_at.
+        """
+        call = min(call, len(self.log))
+        winners = set(self._by_seq[pattern].get(0, ()))
+        for seq in self.log[:call]:
+            winners |= self._by_seq[pattern].get(seq, set())
+        return winners
+
+    def _recompute(self, card_id: UUID) -> None:
+        cell_seq: dict[Position, float] = {FREE_SPACE: 0}
+        for song_id, position in self._positions[card_id].items():
+            cell_seq[position] = self._seq_of_song.get(song_id, NOT_PLAYED)
+
+        first_win = self._first_win[card_id]
+        for pattern, lines in self.pattern_lines.items():
+            seq = min(
+                (max(cell_seq.get(cell, NOT_PLAYED) for cell in line) for line in lines),
+                default=NOT_PLAYED,
+            )
+            previous = first_win.get(pattern, NOT_PLAYED)
+            if seq == previous and pattern in first_win:
+                continue
+            if previous != NOT_PLAYED:
+                self._by_seq[pattern][previous].discard(card_id)
+            if seq != NOT_PLAYED:
+                self._by_seq[pattern][seq].add(card_id)
+            first_win[pattern] = seq
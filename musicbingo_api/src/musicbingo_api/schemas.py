@@ -1,12 +1,12 @@
 """Pydantic schemas for API request/response models."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Literal, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from .models import GameStatus, PatternType
+from .models import GameStatus, JobStatus, PatternType
 
 
 class SongSchema(BaseModel):
@@ -82,6 +82,15 @@ class BulkAddCardsResponse(BaseModel):
     cards: list[dict] = Field(default_factory=list, description="List of added card info")
 
 
+class StreamAddCardsResponse(BaseModel):
+    """Response from streaming card ingestion."""
+
+    success: bool
+    game_id: UUID
+    cards_added: int
+    digest: str = Field(..., description="SHA-256 over the canonical binary card records")
+
+
 class StartGameRequest(BaseModel):
     """Request to start a game."""
 
@@ -139,6 +148,41 @@ class VerifyCardResponse(BaseModel):
     player_name: Optional[str] = None  # Included if card is registered
 
 
+class ReplayWinner(BaseModel):
+    """A card in a replay result."""
+
+    card_id: UUID
+    card_number: int
+    player_name: Optional[str] = None  # Included if card is registered
+
+
+class ReplayCallResponse(BaseModel):
+    """Who had won at a given call of the play log."""
+
+    game_id: UUID
+    call: int
+    song_id: UUID
+    pattern: PatternType
+    new_winners: list[ReplayWinner] = Field(
+        ..., description="Cards that first completed the pattern at this call"
+    )
+    winners: list[ReplayWinner] = Field(
+        ..., description="Cards that had completed the pattern at or before this call"
+    )
+
+
+class FirstWinResponse(BaseModel):
+    """Call at which a card first completed each pattern."""
+
+    game_id: UUID
+    card_id: UUID
+    card_number: int
+    played_count: int
+    first_win_calls: dict[PatternType, Optional[int]] = Field(
+        ..., description="Pattern -> 1-based call index (null if not completed)"
+    )
+
+
 class ErrorResponse(BaseModel):
     """Error response."""
 
@@ -239,6 +283,7 @@ class CardStatusInfo(BaseModel):
     player_name: str
     matches: int
     total_needed: int
+    songs_away: int = Field(0, description="Fewest unplayed songs needed to win (0 = winner)")
     is_winner: bool
     progress: str  # e.g., "4/5" or "WINNER"
 
@@ -252,6 +297,17 @@ class CardStatusesResponse(BaseModel):
     winners: list[CardStatusInfo]  # Just the winners for easy access
 
 
+class NearWinLeaderboardResponse(BaseModel):
+    """Registered cards closest to completing the current pattern."""
+
+    game_id: UUID
+    current_pattern: PatternType
+    away_counts: dict[int, int] = Field(
+        ..., description="Songs away -> number of registered cards (0 = winners)"
+    )
+    closest: list[CardStatusInfo]
+
+
 class DetectedWinner(BaseModel):
     """A detected winner."""
 
@@ -261,6 +317,73 @@ class DetectedWinner(BaseModel):
     pattern: PatternType
     detected_at: datetime
     song_id: Optional[UUID] = None
+    stage: Optional[int] = None  # Stage index in progressive games
+
+
+class CreateGroupRequest(BaseModel):
+    """Request to link games that share a playlist."""
+
+    group_id: UUID
+    game_ids: list[UUID] = Field(..., min_length=1)
+
+
+class GroupResponse(BaseModel):
+    """A group of linked games."""
+
+    group_id: UUID
+    game_ids: list[UUID]
+    playlist_size: int
+    created_at: datetime
+
+
+class GroupGameResult(BaseModel):
+    """Per-game result of a group call."""
+
+    game_id: UUID
+    total_played: int
+
+
+class GroupWinner(DetectedWinner):
+    """A winner detected in one game of a group."""
+
+    game_id: UUID
+
+
+class GroupSongResponse(BaseModel):
+    """Merged result of marking or revealing a song across a group."""
+
+    group_id: UUID
+    song_id: str
+    played: Optional[bool] = None  # None for reveals
+    games: list[GroupGameResult]
+    new_winners: list[GroupWinner] = []
+
+
+class SetStagesRequest(BaseModel):
+    """Request to set the stages of a progressive game."""
+
+    stages: list[PatternType] = Field(..., min_length=1, max_length=20)
+
+
+class StageInfo(BaseModel):
+    """One stage of a progressive game."""
+
+    index: int
+    pattern: PatternType
+    name: str
+    completed_count: int = Field(
+        ..., description="Registered cards that currently complete this stage's pattern"
+    )
+    winners: list[DetectedWinner] = Field(..., description="Winners detected during this stage")
+
+
+class StagesResponse(BaseModel):
+    """Stages of a progressive game."""
+
+    game_id: UUID
+    current_stage: int
+    stages: list[StageInfo]
+    new_winners: list[DetectedWinner] = []
 
 
 class SetPrizeRequest(BaseModel):
@@ -274,3 +397,96 @@ class SetPrizeResponse(BaseModel):
 
     game_id: UUID
     prize: str
+
+
+class CustomPatternRequest(BaseModel):
+    """Request to set a custom winning pattern."""
+
+    name: str = Field(..., min_length=1, max_length=100)
+    description: str = Field("", max_length=200)
+    definition: Any = Field(
+        ...,
+        description='Pattern definition, e.g. {"at_least": 2, "of": "five_in_a_row"}',
+    )
+
+
+class CustomPatternResponse(BaseModel):
+    """Response after setting a custom pattern."""
+
+    game_id: UUID
+    current_pattern: PatternType
+    name: str
+    description: str
+    shapes: int = Field(..., description="Number of distinct winning shapes")
+    total_needed: int = Field(..., description="Cells in the smallest winning shape")
+
+
+class SlowRequestLogRequest(BaseModel):
+    """Request to enable the slow request log."""
+
+    threshold_ms: float = Field(..., gt=0, description="Log requests slower than this")
+
+
+class SlowRequestEntry(BaseModel):
+    """A request that exceeded the slow request threshold."""
+
+    method: str
+    path: str
+    duration_ms: float
+    finished_at: datetime
+    stack: list[str] = Field(
+        default_factory=list, description="Root-first stack captured mid-request"
+    )
+
+
+class SlowRequestLogResponse(BaseModel):
+    """Slow request log state and captured entries."""
+
+    enabled: bool
+    threshold_ms: float
+    entries: list[SlowRequestEntry]
+
+
+class GenerationSongSchema(BaseModel):
+    """Song for a generation job (song_id defaults to the stable ID of title and artist)."""
+
+    title: str
+    artist: str
+    song_id: Optional[UUID] = None
+    album: Optional[str] = None
+    duration_seconds: Optional[int] = None
+
+
+class GenerateCardsRequest(BaseModel):
+    """Request to generate a new game's cards in the background."""
+
+    name: str = Field(..., min_length=1, max_length=100)
+    playlist: list[GenerationSongSchema] = Field(..., min_length=48)
+    num_cards: int = Field(50, ge=1, le=1000)
+    pattern: PatternType = PatternType.FIVE_IN_A_ROW
+    seed: Optional[int] = None
+    layout: Literal["single", "4up"] = "single"
+    strategy: Literal["weighted", "design"] = "weighted"
+    dj_contact: Optional[str] = Field(None, max_length=100)
+
+
+class GenerationJobResponse(BaseModel):
+    """State of a generation job."""
+
+    job_id: UUID
+    game_id: UUID
+    name: str
+    status: JobStatus
+    num_cards: int
+    cards_done: int
+    progress: float = Field(..., description="Fraction of cards generated and rendered (0-1)")
+    error: Optional[str] = None
+    pdf_url: Optional[str] = Field(None, description="PDF download path, once completed")
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+class GenerationJobListResponse(BaseModel):
+    """All generation jobs, newest first."""
+
+    jobs: list[GenerationJobResponse]
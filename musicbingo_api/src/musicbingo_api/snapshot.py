@@ -0,0 +1,210 @@
+"""Compact on-disk snapshots of evicted games.
+
+A snapshot holds everything needed to rebuild a GameState: the playlist,
+cards, runtime state (played/revealed songs, registrations, winners) and
+pattern settings. Cards use the binary card records from card_codec and
+songs are stored as playlist indices, so 1000 cards take 68 KB (about
+90 KB as base64) before gzip. Derived caches (near-win tracker, replay index) are not
+stored; they rebuild on first use.
+"""
+
+import base64
+import gzip
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from uuid import UUID
+
+from .card_codec import EMPTY_SLOT, POSITIONS, RECORD, card_to_indices, encode_record
+from .models import BingoPattern, CardData, GameState, GameStatus, PatternType, Song
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".snapshot.json.gz"
+
+
+def snapshot_path(directory: Path, game_id: UUID) -> Path:
+    """Path of a game's snapshot file."""
+    return directory / f"{game_id}{SNAPSHOT_SUFFIX}"
+
+
+def game_to_snapshot(game: GameState) -> dict:
+    """Convert a game to a JSON-serializable snapshot.
+
+    Raises:
+        ValueError: If the playlist is too large for binary card records, or
+            a card, played or revealed song is not in the playlist
+    """
+    if len(game.playlist) >= EMPTY_SLOT:
+        raise ValueError(f"Playlist too large to snapshot ({len(game.playlist)} songs)")
+    song_index = game.get_song_index()
+
+    def indices(song_ids: list[UUID], kind: str) -> list[int]:
+        unknown = [song_id for song_id in song_ids if song_id not in song_index]
+        if unknown:
+            raise ValueError(f"{kind} song {unknown[0]} not in game playlist")
+        return [song_index[song_id] for song_id in song_ids]
+
+    cards = b"".join(
+        encode_record(
+            card.card_id, card.card_number, card_to_indices(card.song_positions, song_index)
+        )
+        for card in game.cards.values()
+    )
+    custom = game.custom_pattern
+    return {
+        "version": SNAPSHOT_VERSION,
+        "game_id": str(game.game_id),
+        "status": game.status.value,
+        "pattern": game.current_pattern.value,
+        "custom_pattern": None if custom is None else {
+            "name": custom.name,
+            "description": custom.description,
+            "definition": custom.definition,
+        },
+        "stages": [stage.value for stage in game.stages],
+        "current_stage": game.current_stage,
+        "current_prize": game.current_prize,
+        "created_at": game.created_at.isoformat(),
+        "updated_at": game.updated_at.isoformat(),
+        "playlist": [
+            [str(s.song_id), s.title, s.artist, s.album, s.duration_seconds]
+            for s in game.playlist
+        ],
+        "played": indices(game.played_songs, "Played"),
+        "revealed": indices(game.revealed_songs, "Revealed"),
+        "cards": base64.b64encode(cards).decode("ascii"),
+        "registered": [
+            [str(card_id), reg["player_name"], reg["registered_at"].isoformat()]
+            for card_id, reg in game.registered_cards.items()
+        ],
+        "winners": [
+            {
+                **winner,
+                "card_id": str(winner["card_id"]),
+                "pattern": PatternType(winner["pattern"]).value,
+                "detected_at": winner["detected_at"].isoformat(),
+                "song_id": None if winner.get("song_id") is None else str(winner["song_id"]),
+            }
+            for winner in game.detected_winners
+        ],
+    }
+
+
+def game_from_snapshot(data: dict) -> GameState:
+    """Rebuild a game from a snapshot dict.
+
+    Raises:
+        ValueError: If the snapshot version is unsupported
+    """
+    if data.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {data.get('version')}")
+
+    game_id = UUID(data["game_id"])
+    playlist = [
+        Song(
+            song_id=UUID(song_id),
+            title=title,
+            artist=artist,
+            album=album,
+            duration_seconds=duration,
+        )
+        for song_id, title, artist, album, duration in data["playlist"]
+    ]
+    song_ids = [song.song_id for song in playlist]
+
+    game = GameState(
+        game_id=game_id,
+        status=GameStatus(data["status"]),
+        playlist=playlist,
+        played_songs=[song_ids[i] for i in data["played"]],
+        revealed_songs=[song_ids[i] for i in data["revealed"]],
+        current_pattern=PatternType(data["pattern"]),
+        current_prize=data["current_prize"],
+        created_at=datetime.fromisoformat(data["created_at"]),
+        updated_at=datetime.fromisoformat(data["updated_at"]),
+    )
+    custom = data.get("custom_pattern")
+    if custom is not None:
+        game.custom_pattern = BingoPattern.from_definition(
+            custom["definition"], custom["name"], custom["description"]
+        )
+    game.stages = [PatternType(stage) for stage in data["stages"]]
+    game.current_stage = data["current_stage"]
+
+    records = base64.b64decode(data["cards"])
+    for card_bytes, card_number, *indices in RECORD.iter_unpack(records):
+        game.cards[UUID(bytes=card_bytes)] = CardData(
+            card_id=UUID(bytes=card_bytes),
+            game_id=game_id,
+            card_number=card_number,
+            song_positions={
+                song_ids[index]: POSITIONS[slot]
+                for slot, index in enumerate(indices)
+                if index != EMPTY_SLOT
+            },
+        )
+
+    for card_id, player_name, registered_at in data["registered"]:
+        game.registered_cards[UUID(card_id)] = {
+            "player_name": player_name,
+            "registered_at": datetime.fromisoformat(registered_at),
+        }
+    for winner in data["winners"]:
+        game.detected_winners.append({
+            **winner,
+            "card_id": UUID(winner["card_id"]),
+            "pattern": PatternType(winner["pattern"]),
+            "detected_at": datetime.fromisoformat(winner["detected_at"]),
+            "song_id": None if winner.get("song_id") is None else UUID(winner["song_id"]),
+        })
+    return game
+
+
+def save_snapshot(game: GameState, directory: Path) -> Path:
+    """Write a game snapshot atomically.
+
+    Returns:
+        Path of the snapshot file
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    path = snapshot_path(directory, game.game_id)
+    tmp_path = path.with_name(path.name + ".tmp")
+    payload = json.dumps(game_to_snapshot(game), separators=(",", ":")).encode()
+    try:
+        with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return path
+
+
+def load_snapshot(directory: Path, game_id: UUID) -> Optional[GameState]:
+    """Load a game snapshot if one exists.
+
+    Returns:
+        GameState, or None if there is no snapshot for game_id
+    """
+    path = snapshot_path(directory, game_id)
+    try:
+        with gzip.open(path, "rb") as f:
+            data = json.loads(f.read())
+    except FileNotFoundError:
+        return None
+    return game_from_snapshot(data)
+
+
+def clear_snapshots(directory: Path) -> int:
+    """Delete all snapshots (and partial writes) in a directory.
+
+    Returns:
+        Number of files deleted
+    """
+    deleted = 0
+    for pattern in (f"*{SNAPSHOT_SUFFIX}", f"*{SNAPSHOT_SUFFIX}.tmp"):
+        for path in directory.glob(pattern):
+            path.unlink(missing_ok=True)
+            deleted += 1
+    return deleted
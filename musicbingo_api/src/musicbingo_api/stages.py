@@ -0,0 +1,133 @@
+"""Single-pass winner tracking for progressive multi-stage games.
+
+A progressive game plays an ordered list of patterns ("one line, then two
+lines, then full house") over the same play log. Every stage's masks are
+indexed by cell, so marking a song makes one pass over the cards holding it
+and tests only the masks through that card's cell, for all stages at once.
+Each card keeps its marked-cell mask and a bitset of completed stages, so
+moving to the next stage needs no recheck: its winners are already known.
+"""
+
+from collections import defaultdict
+from typing import Iterable, Sequence
+from uuid import UUID
+
+from .patterns import FREE_BIT, cell_bit
+
+Position = tuple[int, int]
+
+
+class _CardMarks:
+    """Per-card marked mask and completed-stage bits (slotted)."""
+
+    __slots__ = ("songs", "marked", "completed")
+
+    def __init__(self, songs: tuple[UUID, ...]):
+        self.songs = songs
+        self.marked = FREE_BIT
+        self.completed = 0
+
+
+class StageTracker:
+    """Tracks which cards have completed each stage pattern."""
+
+    def __init__(self, stage_masks: Sequence[Sequence[int]]):
+        """Initialize tracker.
+
+        Args:
+            stage_masks: Compiled masks for each stage, in stage order
+        """
+        self.stage_masks = [tuple(masks) for masks in stage_masks]
+        # bit index -> [(stage, mask)] for every mask containing that cell
+        self._masks_at: list[list[tuple[int, int]]] = [[] for _ in range(25)]
+        for stage, masks in enumerate(self.stage_masks):
+            for mask in masks:
+                for bit in range(25):
+                    if mask >> bit & 1:
+                        self._masks_at[bit].append((stage, mask))
+
+        self.played: set[UUID] = set()
+        self._cards: dict[UUID, _CardMarks] = {}
+        self._song_cards: dict[UUID, dict[UUID, int]] = defaultdict(dict)
+        self._winners: list[set[UUID]] = [set() for _ in self.stage_masks]
+
+    def __len__(self) -> int:
+        return len(self.stage_masks)
+
+    def __contains__(self, card_id: UUID) -> bool:
+        return card_id in self._cards
+
+    def card_ids(self) -> set[UUID]:
+        """IDs of all tracked cards."""
+        return set(self._cards)
+
+    def add_card(self, card_id: UUID, song_positions: dict[UUID, Position]) -> None:
+        """Start tracking a card, applying songs already played."""
+        if card_id in self._cards:
+            return
+        card = _CardMarks(tuple(song_positions))
+        self._cards[card_id] = card
+        for song_id, (row, col) in song_positions.items():
+            bit = cell_bit(row, col)
+            self._song_cards[song_id][card_id] = bit
+            if song_id in self.played:
+                card.marked |= bit
+        for stage, masks in enumerate(self.stage_masks):
+            if any(card.marked & mask == mask for mask in masks):
+                card.completed |= 1 << stage
+                self._winners[stage].add(card_id)
+
+    def remove_card(self, card_id: UUID) -> None:
+        """Stop tracking a card."""
+        card = self._cards.pop(card_id, None)
+        if card is None:
+            return
+        for song_id in card.songs:
+            self._song_cards[song_id].pop(card_id, None)
+        for winners in self._winners:
+            winners.discard(card_id)
+
+    def mark(self, song_id: UUID) -> None:
+        """Record a played song, checking every stage in one pass."""
+        if song_id in self.played:
+            return
+        self.played.add(song_id)
+        for card_id, bit in self._song_cards.get(song_id, {}).items():
+            card = self._cards[card_id]
+            card.marked |= bit
+            for stage, mask in self._masks_at[bit.bit_length() - 1]:
+                if not card.completed >> stage & 1 and card.marked & mask == mask:
+                    card.completed |= 1 << stage
+                    self._winners[stage].add(card_id)
+
+    def unmark(self, song_id: UUID) -> None:
+        """Undo a played song; cards may lose stages they had completed."""
+        if song_id not in self.played:
+            return
+        self.played.discard(song_id)
+        for card_id, bit in self._song_cards.get(song_id, {}).items():
+            card = self._cards[card_id]
+            card.marked &= ~bit
+            for stage, masks in enumerate(self.stage_masks):
+                if card.completed >> stage & 1 and not any(
+                    card.marked & mask == mask for mask in masks
+                ):
+                    card.completed &= ~(1 << stage)
+                    self._winners[stage].discard(card_id)
+
+    def sync_played(self, played_songs: Iterable[UUID]) -> None:
+        """Mark/unmark the difference between tracked and actual played songs."""
+        played = set(played_songs)
+        for song_id in self.played - played:
+            self.unmark(song_id)
+        for song_id in played - self.played:
+            self.mark(song_id)
+
+    def winners(self, stage: int) -> set[UUID]:
+        """Card IDs that currently complete a stage's pattern."""
+        return set(self._winners[stage])
+
+    def completed_stages(self, card_id: UUID) -> list[int]:
+        """Stage indexes a card currently completes."""
+        completed = self._cards[card_id].completed
+        return [stage for stage in range(len(self.stage_masks)) if completed >> stage & 1]
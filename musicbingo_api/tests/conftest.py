@@ -0,0 +1,49 @@
+"""Shared test fixtures."""
+
+import random
+from uuid import uuid4
+
+import pytest
+
+from musicbingo_api.models import CardData, GameState, GameStatus, Song
+
+# Card positions of a full card, in row order (the centre is free)
+POSITIONS = [(r, c) for r in range(5) for c in range(5) if (r, c) != (2, 2)]
+
+
+def build_game(
+    num_cards: int = 20, num_songs: int = 40, seed: int = 0, register: bool = True
+) -> GameState:
+    """Create an active game with full random cards.
+
+    Args:
+        num_cards: Number of cards, numbered from 1
+        num_songs: Playlist length (at least len(POSITIONS))
+        seed: Seed for the songs on each card
+        register: Register every card (to "Player <n>")
+
+    Returns:
+        The game
+    """
+    rng = random.Random(seed)
+    game_id = uuid4()
+    playlist = [Song(song_id=uuid4(), title=f"Song {i}", artist="Artist") for i in range(num_songs)]
+    game = GameState(game_id=game_id, status=GameStatus.ACTIVE, playlist=playlist)
+    for n in range(1, num_cards + 1):
+        songs = rng.sample(playlist, len(POSITIONS))
+        card = CardData(
+            card_id=uuid4(),
+            game_id=game_id,
+            card_number=n,
+            song_positions={s.song_id: pos for s, pos in zip(songs, POSITIONS)},
+        )
+        game.add_card(card)
+        if register:
+            game.register_card(card.card_id, f"Player {n}")
+    return game
+
+
+@pytest.fixture
+def make_game():
+    """Factory for games with full random cards (see build_game)."""
+    return build_game
@@ -0,0 +1,247 @@
+"""Tests for card layouts shared between worker processes."""
+
+import fcntl
+import json
+import multiprocessing
+import random
+from uuid import UUID, uuid4
+
+import pytest
+
+from musicbingo_api import card_layouts, game_loader
+from musicbingo_api.card_layouts import (
+    LOCK_NAME,
+    SHARED_DIR_ENV,
+    SHARED_LAYOUTS_ENV,
+    CardLayoutSegment,
+    SharedCards,
+    share_cards,
+    shared_layouts_enabled,
+    sweep_stale_segments,
+)
+from musicbingo_api.game_service import GameService
+from musicbingo_api.models import CardData, GameState, GameStatus, PatternType, Song
+
+from .conftest import POSITIONS
+
+
+def make_game_data(num_cards: int = 50, seed: int = 0) -> dict:
+    """Game file dict with random full cards."""
+    rng = random.Random(seed)
+    playlist = [
+        {"song_id": str(uuid4()), "title": f"Song {i}", "artist": "Artist"} for i in range(40)
+    ]
+    cards = []
+    for n in range(1, num_cards + 1):
+        songs = rng.sample(playlist, len(POSITIONS))
+        cards.append({
+            "card_id": str(uuid4()),
+            "card_number": n,
+            "song_positions": {s["song_id"]: list(p) for s, p in zip(songs, POSITIONS)},
+        })
+    return {"game_id": str(uuid4()), "playlist": playlist, "cards": cards}
+
+
+def share(data: dict, directory) -> SharedCards:
+    song_ids = [UUID(s["song_id"]) for s in data["playlist"]]
+    return share_cards(UUID(data["game_id"]), song_ids, data["cards"], directory)
+
+
+def test_shared_cards_match_parsed_cards(tmp_path):
+    """Test the segment view decodes every card exactly, in file order."""
+    data = make_game_data()
+    cards = share(data, tmp_path)
+
+    assert len(cards) == 50
+    assert [str(card_id) for card_id in cards] == [c["card_id"] for c in data["cards"]]
+    for card in data["cards"]:
+        decoded = cards[UUID(card["card_id"])]
+        assert decoded.card_number == card["card_number"]
+        positions = {str(s): list(p) for s, p in decoded.song_positions.items()}
+        assert positions == card["song_positions"]
+    assert uuid4() not in cards
+    assert "not-a-uuid" not in cards
+
+
+def test_workers_attach_to_one_segment(tmp_path):
+    """Test a second load reuses the existing segment file."""
+    data = make_game_data()
+    first = share(data, tmp_path)
+    mtime = first.segment.path.stat().st_mtime_ns
+    second = share(data, tmp_path)
+
+    assert second.segment.path == first.segment.path
+    assert second.segment.path.stat().st_mtime_ns == mtime
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def _card_number_in_child(path, card_id):
+    segment = CardLayoutSegment(path)
+    return segment.record(segment.find(card_id))[1]
+
+
+def test_segment_readable_from_another_process(tmp_path):
+    """Test another process maps the segment and finds cards."""
+    data = make_game_data(num_cards=5)
+    cards = share(data, tmp_path)
+    card = data["cards"][3]
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        number = pool.apply(_card_number_in_child, (cards.segment.path, UUID(card["card_id"])))
+    assert number == card["card_number"]
+
+
+def test_added_cards_stay_local(tmp_path):
+    """Test cards added after loading overlay the read-only segment."""
+    data = make_game_data(num_cards=3)
+    cards = share(data, tmp_path)
+    game_id = UUID(data["game_id"])
+    extra = CardData(card_id=uuid4(), game_id=game_id, card_number=4, song_positions={})
+
+    cards[extra.card_id] = extra
+    assert len(cards) == 4
+    assert cards[extra.card_id] is extra
+    del cards[extra.card_id]
+    with pytest.raises(TypeError):
+        del cards[UUID(data["cards"][0]["card_id"])]
+
+
+def test_invalid_cards_rejected(tmp_path):
+    """Test duplicate cards and unknown songs raise ValueError."""
+    data = make_game_data(num_cards=2)
+    data["cards"].append(data["cards"][0])
+    with pytest.raises(ValueError, match="Duplicate"):
+        share(data, tmp_path)
+
+    data = make_game_data(num_cards=1)
+    data["cards"][0]["song_positions"][str(uuid4())] = [2, 3]
+    with pytest.raises(ValueError):
+        share(data, tmp_path)
+
+
+@pytest.mark.parametrize("shared", ["0", "1"])
+def test_loader_rejects_unknown_songs_on_both_paths(tmp_path, monkeypatch, shared):
+    """Test a card song missing from the playlist fails the same way shared or not."""
+    data = make_game_data(num_cards=2)
+    data["cards"][1]["song_positions"][str(uuid4())] = [2, 3]
+    path = tmp_path / "night.json"
+    path.write_text(json.dumps(data))
+    monkeypatch.setenv(SHARED_LAYOUTS_ENV, shared)
+    monkeypatch.setenv(SHARED_DIR_ENV, str(tmp_path / "shm"))
+
+    with pytest.raises(ValueError, match="not in game playlist"):
+        game_loader.load_game_from_path(path)
+
+
+def test_decoded_cards_are_cached(tmp_path):
+    """Test repeated lookups reuse the decoded card, within the cache bound."""
+    data = make_game_data(num_cards=3)
+    cards = share(data, tmp_path)
+    cards.cache_size = 2
+    first, second, third = (UUID(c["card_id"]) for c in data["cards"])
+
+    card = cards[first]
+    assert cards[first] is card
+    _ = cards[second], cards[third]  # first is now least recently used
+    assert cards[first] is not card
+    assert cards[first] == card
+    assert len(cards._decoded) == 2
+
+
+def _shared_game(data: dict, directory) -> GameState:
+    game_id = UUID(data["game_id"])
+    playlist = [
+        Song(song_id=UUID(s["song_id"]), title=s["title"], artist=s["artist"])
+        for s in data["playlist"]
+    ]
+    game = GameState(game_id=game_id, status=GameStatus.SETUP, playlist=playlist)
+    game.cards = share(data, directory)
+    return game
+
+
+def test_trackers_touch_only_registered_cards(tmp_path, monkeypatch):
+    """Test tracker sync looks up registered cards without walking the segment."""
+    data = make_game_data(num_cards=200)
+    game = _shared_game(data, tmp_path)
+    game.set_stages([PatternType.ROW, PatternType.FULL_CARD])
+    for card in data["cards"][:2]:
+        game.register_card(UUID(card["card_id"]), "Player")
+
+    iterations = []
+    decodes = []
+    monkeypatch.setattr(SharedCards, "__iter__", lambda self: iterations.append(1) or iter(()))
+    record = game.cards.segment.record
+    monkeypatch.setattr(
+        game.cards.segment, "record", lambda number: decodes.append(number) or record(number)
+    )
+    for _ in range(3):
+        game.get_near_win_tracker()
+        game.get_stage_tracker()
+
+    assert iterations == []
+    assert len(decodes) == 2
+
+
+def test_segments_released_on_delete_and_evict(tmp_path):
+    """Test deleting or evicting a game unlinks its segment."""
+    service = GameService(snapshot_dir=tmp_path / "snapshots")
+    deleted = _shared_game(make_game_data(num_cards=3, seed=1), tmp_path / "shm")
+    evicted = _shared_game(make_game_data(num_cards=3, seed=2), tmp_path / "shm")
+    service.register_game(deleted)
+    service.register_game(evicted)
+    cards = dict(evicted.cards)
+
+    service.delete_game(deleted.game_id)
+    assert not deleted.cards.segment.path.exists()
+    assert service.evict_game(evicted.game_id)
+    assert not evicted.cards.segment.path.exists()
+    assert service.get_game(evicted.game_id).cards == cards
+    assert list((tmp_path / "shm").glob("*.layout")) == []
+
+
+def test_sweep_removes_segments_of_stopped_servers(tmp_path, monkeypatch):
+    """Test startup sweeps segments only when no other server holds the lock."""
+    monkeypatch.setattr(card_layouts, "_worker_locks", {})
+    stale = share(make_game_data(num_cards=2), tmp_path / "stale").segment.path
+    live = share(make_game_data(num_cards=2), tmp_path / "live").segment.path
+
+    assert sweep_stale_segments(tmp_path / "stale") == 1
+    assert not stale.exists()
+
+    with open(tmp_path / "live" / LOCK_NAME, "a") as other_server:
+        fcntl.flock(other_server, fcntl.LOCK_SH)
+        assert sweep_stale_segments(tmp_path / "live") == 0
+    assert live.exists()
+
+    for lock in card_layouts._worker_locks.values():
+        lock.close()
+
+
+def test_loader_uses_shared_layouts(tmp_path, monkeypatch):
+    """Test game files load into a shared view when enabled."""
+    data = make_game_data(num_cards=10)
+    games_dir = tmp_path / "games"
+    games_dir.mkdir()
+    (games_dir / "night.json").write_text(json.dumps(data))
+    monkeypatch.setattr(game_loader, "GAMES_DIR", games_dir)
+
+    monkeypatch.setenv(SHARED_LAYOUTS_ENV, "0")
+    plain = game_loader.load_game_from_file("night.json")
+    monkeypatch.setenv(SHARED_LAYOUTS_ENV, "1")
+    monkeypatch.setenv(SHARED_DIR_ENV, str(tmp_path / "shm"))
+    shared = game_loader.load_game_from_file("night.json")
+
+    assert isinstance(shared.cards, SharedCards)
+    assert dict(shared.cards) == plain.cards
+    card_id = next(iter(plain.cards))
+    assert shared.verify_card(card_id) == plain.verify_card(card_id)
+
+
+def test_enabled_by_worker_count(monkeypatch):
+    """Test sharing defaults on with multiple uvicorn workers."""
+    monkeypatch.delenv(SHARED_LAYOUTS_ENV, raising=False)
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    assert shared_layouts_enabled()
+    monkeypatch.setenv("WEB_CONCURRENCY", "1")
+    assert not shared_layouts_enabled()
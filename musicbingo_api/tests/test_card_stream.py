@@ -0,0 +1,245 @@
+"""Tests for streaming card ingestion."""
+
+import json
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from musicbingo_api.card_codec import (
+    BINARY_MAGIC,
+    BINARY_MEDIA_TYPE,
+    EMPTY_SLOT,
+    MAX_LINE_BYTES,
+    NDJSON_MEDIA_TYPE,
+    RECORD,
+    encode_cards,
+    encode_record,
+)
+from musicbingo_api.client import MusicBingoClient
+from musicbingo_api.main import app
+
+client = TestClient(app)
+
+
+def create_test_playlist(count: int = 30):
+    """Create a test playlist."""
+    return [
+        {"song_id": str(uuid4()), "title": f"Song {i}", "artist": f"Artist {i}"}
+        for i in range(count)
+    ]
+
+
+def create_full_cards(playlist, count: int):
+    """Create cards with a song in all 24 positions."""
+    positions = [(r, c) for r in range(5) for c in range(5) if (r, c) != (2, 2)]
+    return [
+        {
+            "card_id": str(uuid4()),
+            "card_number": n,
+            "song_positions": {
+                playlist[(n + i) % len(playlist)]["song_id"]: list(pos)
+                for i, pos in enumerate(positions)
+            },
+        }
+        for n in range(1, count + 1)
+    ]
+
+
+def start_game(playlist):
+    """Create a game and return its id."""
+    game_id = str(uuid4())
+    client.post("/api/game/start", json={"game_id": game_id, "playlist": playlist})
+    return game_id
+
+
+def ndjson(cards) -> bytes:
+    """Serialize cards as NDJSON."""
+    return b"".join(json.dumps(card).encode() + b"\n" for card in cards)
+
+
+def binary(cards, playlist) -> bytes:
+    """Serialize cards as compact binary records."""
+    return b"".join(encode_cards(cards, [s["song_id"] for s in playlist]))
+
+
+def test_stream_ndjson_cards():
+    """Test NDJSON upload adds every card and returns count and digest only."""
+    playlist = create_test_playlist()
+    game_id = start_game(playlist)
+    cards = create_full_cards(playlist, 50)
+
+    response = client.post(
+        f"/api/game/{game_id}/cards/stream",
+        content=ndjson(cards),
+        headers={"Content-Type": NDJSON_MEDIA_TYPE},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["cards_added"] == 50
+    assert len(data["digest"]) == 64
+    assert "cards" not in data
+    assert client.get(f"/api/game/{game_id}/state").json()["card_count"] == 50
+
+
+def test_stream_binary_matches_ndjson_digest():
+    """Test binary upload yields the same cards and digest as NDJSON."""
+    playlist = create_test_playlist()
+    cards = create_full_cards(playlist, 20)
+    ndjson_game = start_game(playlist)
+    binary_game = start_game(playlist)
+
+    ndjson_response = client.post(
+        f"/api/game/{ndjson_game}/cards/stream",
+        content=ndjson(cards),
+        headers={"Content-Type": NDJSON_MEDIA_TYPE},
+    )
+    binary_response = client.post(
+        f"/api/game/{binary_game}/cards/stream",
+        content=binary(cards, playlist),
+        headers={"Content-Type": BINARY_MEDIA_TYPE},
+    )
+
+    assert binary_response.status_code == 200
+    assert binary_response.json()["cards_added"] == 20
+    assert binary_response.json()["digest"] == ndjson_response.json()["digest"]
+
+    verify = client.get(f"/api/verify/{binary_game}/{cards[0]['card_id']}").json()
+    assert verify["card_number"] == 1
+
+
+def test_stream_partial_card_uses_empty_slots():
+    """Test cards without all 24 songs round-trip through the binary format."""
+    playlist = create_test_playlist()
+    game_id = start_game(playlist)
+    card = {
+        "card_id": str(uuid4()),
+        "card_number": 1,
+        "song_positions": {playlist[i]["song_id"]: [0, i] for i in range(5)},
+    }
+
+    payload = binary([card], playlist)
+    _, _, *indices = RECORD.unpack(payload[len(BINARY_MAGIC):])
+    assert indices.count(EMPTY_SLOT) == 19
+
+    response = client.post(
+        f"/api/game/{game_id}/cards/stream",
+        content=payload,
+        headers={"Content-Type": BINARY_MEDIA_TYPE},
+    )
+    assert response.status_code == 200
+    assert response.json()["cards_added"] == 1
+
+
+def test_stream_bad_line_reports_record():
+    """Test a malformed NDJSON line is rejected with its record number."""
+    playlist = create_test_playlist()
+    game_id = start_game(playlist)
+    cards = create_full_cards(playlist, 3)
+    body = ndjson(cards[:2]) + b"{not json}\n" + ndjson(cards[2:])
+
+    response = client.post(
+        f"/api/game/{game_id}/cards/stream",
+        content=body,
+        headers={"Content-Type": NDJSON_MEDIA_TYPE},
+    )
+
+    assert response.status_code == 400
+    assert "Record 3" in response.json()["detail"]
+    assert "2 cards added" in response.json()["detail"]
+
+
+def test_stream_line_length_limited():
+    """Test a line without a newline is rejected once it passes MAX_LINE_BYTES."""
+    playlist = create_test_playlist()
+    game_id = start_game(playlist)
+    body = ndjson(create_full_cards(playlist, 1)) + b" " * (MAX_LINE_BYTES + 1)
+
+    response = client.post(
+        f"/api/game/{game_id}/cards/stream",
+        content=iter([body[i:i + 1024] for i in range(0, len(body), 1024)]),
+        headers={"Content-Type": NDJSON_MEDIA_TYPE},
+    )
+
+    assert response.status_code == 400
+    assert "Record 2: line longer than" in response.json()["detail"]
+    assert "1 cards added" in response.json()["detail"]
+
+
+def test_stream_unknown_song_rejected():
+    """Test a card with a song outside the playlist is rejected."""
+    playlist = create_test_playlist()
+    game_id = start_game(playlist)
+    card = {"card_id": str(uuid4()), "card_number": 1, "song_positions": {str(uuid4()): [0, 0]}}
+
+    response = client.post(
+        f"/api/game/{game_id}/cards/stream",
+        content=ndjson([card]),
+        headers={"Content-Type": NDJSON_MEDIA_TYPE},
+    )
+
+    assert response.status_code == 400
+    assert "not in game playlist" in response.json()["detail"]
+
+
+@pytest.mark.parametrize(
+    "payload, message",
+    [
+        (b"XXXX", "missing MBC1 header"),
+        (BINARY_MAGIC + b"\x00" * 10, "truncated record"),
+        (BINARY_MAGIC + encode_record(uuid4(), 1, [999] + [EMPTY_SLOT] * 23), "out of range"),
+        (BINARY_MAGIC + encode_record(uuid4(), 1, [3, 3] + [EMPTY_SLOT] * 22), "repeats a song"),
+    ],
+)
+def test_stream_invalid_binary(payload, message):
+    """Test malformed binary uploads are rejected."""
+    game_id = start_game(create_test_playlist())
+
+    response = client.post(
+        f"/api/game/{game_id}/cards/stream",
+        content=payload,
+        headers={"Content-Type": BINARY_MEDIA_TYPE},
+    )
+
+    assert response.status_code == 400
+    assert message in response.json()["detail"]
+
+
+def test_stream_unsupported_media_type():
+    """Test unknown content types return 415."""
+    game_id = start_game(create_test_playlist())
+
+    response = client.post(
+        f"/api/game/{game_id}/cards/stream",
+        content=b"a,b,c",
+        headers={"Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == 415
+
+
+def test_stream_nonexistent_game():
+    """Test streaming into an unknown game returns 404."""
+    response = client.post(
+        f"/api/game/{uuid4()}/cards/stream",
+        content=b"",
+        headers={"Content-Type": NDJSON_MEDIA_TYPE},
+    )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("use_binary", [False, True])
+def test_client_stream_cards(use_binary):
+    """Test the client streams a generator of cards in either format."""
+    playlist = create_test_playlist()
+    game_id = start_game(playlist)
+    cards = create_full_cards(playlist, 10)
+    song_ids = [UUID(s["song_id"]) for s in playlist] if use_binary else None
+
+    api = MusicBingoClient(http_client=client, backoff=0)
+    result = api.stream_cards(game_id, (card for card in cards), playlist_song_ids=song_ids)
+
+    assert result.cards_added == 10
+    assert api.get_game_state(game_id).card_count == 10
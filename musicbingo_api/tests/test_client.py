@@ -0,0 +1,190 @@
+"""Tests for the Python API client."""
+
+import time
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from musicbingo_api import jobs
+from musicbingo_api.client import (
+    AsyncMusicBingoClient,
+    MusicBingoAPIError,
+    MusicBingoClient,
+)
+from musicbingo_api.main import app
+from musicbingo_api.schemas import GameStateResponse
+
+
+def create_test_playlist(count: int = 24):
+    """Create a test playlist."""
+    return [
+        {"song_id": str(uuid4()), "title": f"Song {i}", "artist": f"Artist {i}"}
+        for i in range(count)
+    ]
+
+
+def create_test_cards(playlist, count: int):
+    """Create cards using the first 5 songs as the top row."""
+    return [
+        {
+            "card_id": str(uuid4()),
+            "card_number": n,
+            "song_positions": {playlist[i]["song_id"]: [0, i] for i in range(5)},
+        }
+        for n in range(1, count + 1)
+    ]
+
+
+@pytest.fixture
+def client():
+    """Sync client bound to the app via TestClient."""
+    return MusicBingoClient(http_client=TestClient(app), backoff=0)
+
+
+def test_setup_game_and_play(client):
+    """Test scripted setup, marking and verification through the client."""
+    game_id = uuid4()
+    playlist = create_test_playlist()
+    cards = create_test_cards(playlist, 5)
+
+    state = client.setup_game(game_id, playlist, cards, pattern="row")
+
+    assert isinstance(state, GameStateResponse)
+    assert state.status == "active"
+    assert state.card_count == 5
+
+    for song in playlist[:5]:
+        client.mark_song(game_id, song["song_id"])
+
+    result = client.verify_card(game_id, cards[0]["card_id"])
+    assert result.winner is True
+    assert result.card_number == 1
+
+
+def test_bulk_add_cards_chunks(client):
+    """Test bulk upload is split into chunks and merged."""
+    game_id = uuid4()
+    playlist = create_test_playlist()
+    client.create_game(game_id, playlist)
+
+    response = client.bulk_add_cards(game_id, create_test_cards(playlist, 7), chunk_size=3)
+
+    assert response.cards_added == 7
+    assert len(response.cards) == 7
+    assert client.get_game_state(game_id).card_count == 7
+
+
+def test_error_raises_api_error(client):
+    """Test error responses raise MusicBingoAPIError with status and detail."""
+    with pytest.raises(MusicBingoAPIError) as exc_info:
+        client.get_game_state(uuid4())
+
+    assert exc_info.value.status_code == 404
+    assert "not found" in exc_info.value.detail
+
+
+def test_delete_group(client):
+    """Test a group can be unlinked, keeping its games."""
+    playlist = create_test_playlist()
+    game_ids = [uuid4(), uuid4()]
+    for game_id in game_ids:
+        client.create_game(game_id, playlist)
+    group_id = uuid4()
+    client.create_group(group_id, game_ids)
+
+    assert client.delete_group(group_id) is None
+    with pytest.raises(MusicBingoAPIError) as exc_info:
+        client.get_group(group_id)
+    assert exc_info.value.status_code == 404
+    assert client.get_game_state(game_ids[0]).status == "setup"
+
+
+def test_generation_job(tmp_path, monkeypatch):
+    """Test submitting a generation job, polling it and fetching the PDF."""
+    pytest.importorskip("musicbingo_cards")
+    manager = jobs.JobManager(tmp_path / "jobs", max_workers=1)
+    monkeypatch.setattr(jobs, "_job_manager", manager)
+    playlist = [{"title": f"Song {i}", "artist": f"Artist {i}"} for i in range(48)]
+
+    with TestClient(app) as http_client:
+        client = MusicBingoClient(http_client=http_client, backoff=0)
+        job = client.generate_cards("Quiz Night", playlist, num_cards=2, seed=1)
+        deadline = time.monotonic() + 60
+        while job.status not in ("completed", "failed") and time.monotonic() < deadline:
+            time.sleep(0.2)
+            job = client.get_job(job.job_id)
+
+        assert job.status == "completed"
+        assert [j.job_id for j in client.list_jobs().jobs] == [job.job_id]
+        assert client.get_job_pdf(job.job_id).startswith(b"%PDF")
+
+
+def test_retries_on_service_unavailable():
+    """Test 503 responses are retried with backoff."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) < 3:
+            return httpx.Response(503, json={"detail": "busy"})
+        return httpx.Response(200, json={"status": "healthy"})
+
+    http_client = httpx.Client(base_url="http://test", transport=httpx.MockTransport(handler))
+    client = MusicBingoClient(http_client=http_client, retries=3, backoff=0)
+
+    assert client.health() == {"status": "healthy"}
+    assert len(calls) == 3
+
+
+def test_retries_exhausted_raises():
+    """Test the last 503 is raised once retries run out."""
+    http_client = httpx.Client(
+        base_url="http://test",
+        transport=httpx.MockTransport(lambda request: httpx.Response(503, json={"detail": "busy"})),
+    )
+    client = MusicBingoClient(http_client=http_client, retries=1, backoff=0)
+
+    with pytest.raises(MusicBingoAPIError) as exc_info:
+        client.health()
+    assert exc_info.value.status_code == 503
+
+
+def test_subscribe_state_yields_changes(client):
+    """Test subscribe helper yields the initial state and then changes only."""
+    game_id = uuid4()
+    playlist = create_test_playlist()
+    client.setup_game(game_id, playlist, create_test_cards(playlist, 1))
+
+    states = client.subscribe_state(game_id, interval=0)
+    first = next(states)
+    client.mark_song(game_id, playlist[0]["song_id"])
+    second = next(states)
+
+    assert first.played_count == 0
+    assert second.played_count == 1
+
+
+async def test_async_client_parallel_setup():
+    """Test async client sets up several games concurrently."""
+    import asyncio
+
+    http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    async with AsyncMusicBingoClient(http_client=http_client, backoff=0) as client:
+        games = []
+        for _ in range(3):
+            playlist = create_test_playlist()
+            games.append((uuid4(), playlist, create_test_cards(playlist, 4)))
+
+        states = await asyncio.gather(
+            *(client.setup_game(g, p, c, chunk_size=2) for g, p, c in games)
+        )
+
+        assert [s.card_count for s in states] == [4, 4, 4]
+        assert all(s.status == "active" for s in states)
+
+        statuses = await client.get_card_statuses(games[0][0])
+        assert statuses.cards == []
+
+    await http_client.aclose()
@@ -0,0 +1,213 @@
+"""Tests for live-game eviction to snapshots and lazy rehydration."""
+
+from uuid import uuid4
+
+import pytest
+
+from musicbingo_api.game_service import GameService
+from musicbingo_api.models import BingoPattern, CardData, GameStatus, PatternType, Song
+from musicbingo_api.snapshot import game_from_snapshot, game_to_snapshot, snapshot_path
+
+from .conftest import POSITIONS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def service(tmp_path, clock):
+    return GameService(max_games=2, idle_ttl=60, snapshot_dir=tmp_path, clock=clock)
+
+
+def create_game(service: GameService, num_cards: int = 3):
+    """Create a game with cards, one registration, played songs and a winner."""
+    game_id = uuid4()
+    playlist = [Song(song_id=uuid4(), title=f"Song {i}", artist="Artist") for i in range(30)]
+    game = service.create_game(game_id, playlist, PatternType.ROW)
+    for n in range(num_cards):
+        songs = playlist[n:n + len(POSITIONS)]
+        service.add_card(
+            game_id,
+            CardData(
+                card_id=uuid4(),
+                game_id=game_id,
+                card_number=n + 1,
+                song_positions={s.song_id: p for s, p in zip(songs, POSITIONS)},
+            ),
+        )
+    first_card = next(iter(game.cards))
+    service.register_card(game_id, first_card, "Alice")
+    service.start_game(game_id)
+    for song in playlist[:5]:
+        service.toggle_song_played(game_id, str(song.song_id), True)
+    service.reveal_song(game_id, str(playlist[0].song_id))
+    return game
+
+
+def test_snapshot_round_trip(service):
+    """Test a snapshot rebuilds the full runtime state."""
+    game = create_game(service)
+    game.custom_pattern = BingoPattern.from_definition({"at_least": 2, "of": "row"}, "Two Rows")
+    game.set_stages([PatternType.ROW, PatternType.CUSTOM])
+    game.current_prize = "Pizza"
+
+    restored = game_from_snapshot(game_to_snapshot(game))
+
+    assert restored.cards == game.cards
+    assert restored.played_songs == game.played_songs
+    assert restored.revealed_songs == game.revealed_songs
+    assert restored.registered_cards == game.registered_cards
+    assert restored.detected_winners == game.detected_winners
+    assert restored.stages == game.stages
+    assert restored.custom_pattern.masks == game.custom_pattern.masks
+    assert restored.current_prize == "Pizza"
+    assert restored.status == GameStatus.ACTIVE
+    assert restored.get_card_statuses() == game.get_card_statuses()
+
+
+def test_capacity_eviction_and_rehydration(service, tmp_path):
+    """Test games beyond max_games go to disk and come back on access."""
+    first = create_game(service)
+    create_game(service)
+    create_game(service)
+
+    assert len(service.list_games()) == 2
+    assert first.game_id not in {g.game_id for g in service.list_games()}
+    assert snapshot_path(tmp_path, first.game_id).exists()
+
+    restored = service.get_game(first.game_id)
+    assert restored is not first
+    assert restored.played_songs == first.played_songs
+    assert len(restored.detected_winners) == 1
+    assert not snapshot_path(tmp_path, first.game_id).exists()
+    assert len(service.list_games()) == 2
+
+
+def test_completed_games_evicted_first(service):
+    """Test capacity eviction prefers completed games over older active ones."""
+    older = create_game(service)
+    done = create_game(service)
+    service.complete_game(done.game_id)
+    service.get_game(older.game_id)  # older is now the most recently used
+    create_game(service)
+
+    live = {g.game_id for g in service.list_games()}
+    assert done.game_id not in live
+    assert older.game_id in live
+
+
+def test_idle_games_evicted_after_ttl(service, clock):
+    """Test games idle longer than the TTL are evicted on the next access."""
+    idle = create_game(service)
+    clock.now += 30
+    busy = create_game(service)
+    clock.now += 31
+
+    assert service.get_game(busy.game_id) is busy
+    assert [g.game_id for g in service.list_games()] == [busy.game_id]
+    assert service.get_game(idle.game_id).played_songs == idle.played_songs
+
+
+def test_evicted_games_are_still_known(service):
+    """Test create/delete see evicted games."""
+    first = create_game(service)
+    create_game(service)
+    create_game(service)
+
+    with pytest.raises(ValueError, match="already exists"):
+        service.create_game(first.game_id, first.playlist)
+    service.delete_game(first.game_id)
+    assert service.get_game(first.game_id) is None
+    assert service.get_game(uuid4()) is None
+
+
+def test_unknown_song_ids_rejected(service):
+    """Test played and revealed songs must be in the playlist."""
+    game = create_game(service)
+
+    with pytest.raises(ValueError, match="not in game playlist"):
+        service.reveal_song(game.game_id, str(uuid4()))
+    with pytest.raises(ValueError, match="not in game playlist"):
+        service.toggle_song_played(game.game_id, str(uuid4()), True)
+    assert len(game.revealed_songs) == 1
+    assert len(game.played_songs) == 5
+
+
+def test_unsnapshottable_game_stays_in_memory(service, clock):
+    """Test a game that cannot be snapshotted never breaks other lookups."""
+    bad = create_game(service)
+    bad.revealed_songs.append(uuid4())  # e.g. state from before validation
+    with pytest.raises(ValueError, match="Revealed song"):
+        game_to_snapshot(bad)
+
+    create_game(service)
+    other = create_game(service)
+    clock.now += 61
+
+    # Idle eviction skips the bad game and still evicts and reloads the others
+    assert service.get_game(other.game_id).played_songs == other.played_songs
+    assert service.get_game(bad.game_id) is bad
+
+
+def test_group_larger_than_capacity_keeps_all_changes(service):
+    """Test games pinned by a group mark are not evicted mid-operation."""
+    playlist = [Song(song_id=uuid4(), title=f"Song {i}", artist="Artist") for i in range(30)]
+    game_ids = [uuid4() for _ in range(4)]
+    for game_id in game_ids:
+        service.create_game(game_id, playlist)
+    group_id = uuid4()
+    service.create_group(group_id, game_ids)
+
+    service.group_toggle_song_played(group_id, str(playlist[0].song_id), True)
+    service.group_reveal_song(group_id, str(playlist[1].song_id))
+
+    assert len(service.list_games()) == 2
+    for game_id in game_ids:
+        game = service.get_game(game_id)
+        assert game.played_songs == [playlist[0].song_id]
+        assert game.revealed_songs == [playlist[1].song_id]
+
+
+def test_pinned_game_not_evicted(service):
+    """Test a pinned game survives capacity pressure until unpinned."""
+    first = create_game(service)
+    with service.pin_games([first.game_id]) as [pinned]:
+        create_game(service)
+        create_game(service)
+        assert service.get_game(first.game_id) is pinned
+        assert service.evict_game(first.game_id) is False
+    assert len(service.list_games()) == 2
+
+
+def test_snapshots_do_not_outlive_service(tmp_path, clock):
+    """Test a new service ignores snapshots left by an earlier one."""
+    old = GameService(max_games=1, snapshot_dir=tmp_path, clock=clock)
+    first = create_game(old)
+    create_game(old)
+    assert snapshot_path(tmp_path, first.game_id).exists()
+
+    new = GameService(snapshot_dir=tmp_path, clock=clock)
+    assert new.get_game(first.game_id) is None
+    new.create_game(first.game_id, first.playlist)
+
+
+def test_default_snapshot_dir_is_private(clock):
+    """Test the default snapshot directory is per service and removed on close."""
+    service = GameService(max_games=1, clock=clock)
+    create_game(service)
+    create_game(service)
+    directory = service.snapshot_dir
+    assert directory != GameService(clock=clock).snapshot_dir
+
+    service.close()
+    assert not directory.exists()
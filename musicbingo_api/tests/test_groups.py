@@ -0,0 +1,143 @@
+"""Tests for linked multi-room game groups."""
+
+from uuid import UUID, uuid4
+
+from fastapi.testclient import TestClient
+
+from musicbingo_api.game_service import get_game_service
+from musicbingo_api.main import app
+
+from .conftest import POSITIONS
+
+client = TestClient(app)
+
+
+def make_playlist(size: int = 30) -> list[dict]:
+    return [
+        {"song_id": str(uuid4()), "title": f"Song {i}", "artist": "Artist"} for i in range(size)
+    ]
+
+
+def create_room(playlist: list[dict], offset: int) -> tuple[str, dict]:
+    """Create a game with one registered card built from playlist[offset:]."""
+    game_id = str(uuid4())
+    client.post("/api/game/start", json={"game_id": game_id, "playlist": playlist})
+    songs = playlist[offset:offset + len(POSITIONS)]
+    card = {
+        "card_id": str(uuid4()),
+        "card_number": 1,
+        "song_positions": {s["song_id"]: list(p) for s, p in zip(songs, POSITIONS)},
+    }
+    client.post(f"/api/game/{game_id}/card", json=card)
+    client.post(
+        f"/api/game/{game_id}/register-card",
+        json={"card_id": card["card_id"], "player_name": f"Room {offset}"},
+    )
+    client.post(f"/api/game/{game_id}/pattern", params={"pattern": "row"})
+    return game_id, card
+
+
+def create_group(game_ids: list[str]) -> str:
+    group_id = str(uuid4())
+    response = client.post("/api/groups", json={"group_id": group_id, "game_ids": game_ids})
+    assert response.status_code == 201
+    return group_id
+
+
+def test_group_shares_playlist_index():
+    """Test member games use one song index."""
+    playlist = make_playlist()
+    rooms = [create_room(playlist, offset)[0] for offset in (0, 5)]
+    group_id = create_group(rooms)
+
+    data = client.get(f"/api/groups/{group_id}").json()
+    assert data["game_ids"] == rooms
+    assert data["playlist_size"] == len(playlist)
+
+    service = get_game_service()
+    group = service.get_group_or_raise(UUID(group_id))
+    games = [service.get_game_or_raise(game_id) for game_id in group.game_ids]
+    assert games[0].get_song_index() is games[1].get_song_index()
+
+
+def test_group_mark_song_fans_out_and_merges_winners():
+    """Test one mark updates every room and merges winners by game."""
+    playlist = make_playlist()
+    (room_a, card_a), (room_b, card_b) = create_room(playlist, 0), create_room(playlist, 5)
+    group_id = create_group([room_a, room_b])
+
+    # Room A completes row 0 on call 5; room B (offset 5) on call 10
+    winners_by_call = {}
+    for call, song in enumerate(playlist[:10], 1):
+        data = client.post(
+            f"/api/groups/{group_id}/mark-song", json={"song_id": song["song_id"]}
+        ).json()
+        for winner in data["new_winners"]:
+            winners_by_call.setdefault(call, []).append((winner["game_id"], winner["card_id"]))
+    assert [g["total_played"] for g in data["games"]] == [10, 10]
+    assert winners_by_call == {
+        5: [(room_a, card_a["card_id"])],
+        10: [(room_b, card_b["card_id"])],
+    }
+
+    for game_id in (room_a, room_b):
+        state = client.get(f"/api/game/{game_id}/state").json()
+        assert len(state["played_songs"]) == 10
+        assert len(state["detected_winners"]) == 1
+
+    data = client.post(
+        f"/api/groups/{group_id}/mark-song",
+        json={"song_id": playlist[0]["song_id"], "played": False},
+    ).json()
+    assert data["played"] is False
+    assert [g["total_played"] for g in data["games"]] == [9, 9]
+
+
+def test_group_reveal_song():
+    """Test reveal applies to every room."""
+    playlist = make_playlist()
+    rooms = [create_room(playlist, offset)[0] for offset in (0, 3, 6)]
+    group_id = create_group(rooms)
+
+    response = client.post(f"/api/groups/{group_id}/reveal/{playlist[2]['song_id']}")
+    assert response.status_code == 200
+    assert response.json()["played"] is None
+    for game_id in rooms:
+        state = client.get(f"/api/game/{game_id}/state").json()
+        assert state["revealed_songs"] == [playlist[2]["song_id"]]
+
+
+def test_group_mark_is_all_or_nothing():
+    """Test an invalid song changes no room."""
+    playlist = make_playlist()
+    rooms = [create_room(playlist, offset)[0] for offset in (0, 5)]
+    group_id = create_group(rooms)
+
+    response = client.post(f"/api/groups/{group_id}/mark-song", json={"song_id": str(uuid4())})
+    assert response.status_code == 400
+    assert "not in group playlist" in response.json()["detail"]
+    for game_id in rooms:
+        assert client.get(f"/api/game/{game_id}/state").json()["played_count"] == 0
+
+
+def test_group_validation():
+    """Test groups need existing, ungrouped games with the same playlist."""
+    playlist = make_playlist()
+    room_a, _ = create_room(playlist, 0)
+    room_b, _ = create_room(make_playlist(), 0)
+
+    def post_group(game_ids):
+        return client.post("/api/groups", json={"group_id": str(uuid4()), "game_ids": game_ids})
+
+    response = post_group([room_a, room_b])
+    assert response.status_code == 400
+    assert "different playlist" in response.json()["detail"]
+
+    assert post_group([str(uuid4())]).status_code == 404
+
+    group_id = create_group([room_a])
+    assert post_group([room_a]).status_code == 400
+
+    assert client.delete(f"/api/groups/{group_id}").status_code == 204
+    assert client.get(f"/api/groups/{group_id}").status_code == 404
+    create_group([room_a])  # ungrouped again
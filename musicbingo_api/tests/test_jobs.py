@@ -0,0 +1,150 @@
+"""Tests for background card-generation jobs."""
+
+import time
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from musicbingo_api import jobs
+from musicbingo_api.jobs import JobManager, run_generation
+from musicbingo_api.main import app
+
+pytest.importorskip("musicbingo_cards")
+
+
+def make_playlist(count: int = 48):
+    return [{"title": f"Song {i}", "artist": f"Artist {i}"} for i in range(count)]
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Client with a running event loop and a job manager writing to tmp_path."""
+    manager = JobManager(tmp_path / "jobs", max_workers=1)
+    monkeypatch.setattr(jobs, "_job_manager", manager)
+    with TestClient(app) as test_client:
+        yield test_client
+    manager.shutdown()
+
+
+def wait_for(client, job_id, timeout: float = 60.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/jobs/{job_id}").json()
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.2)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def test_run_generation_writes_game_and_pdf(tmp_path):
+    """Test the worker function produces a loadable game file, PDF and progress."""
+    spec = {
+        "job_id": str(uuid4()), "game_id": str(uuid4()), "name": "Quiz Night",
+        "playlist": make_playlist(), "num_cards": 4, "pattern": "row", "seed": 1,
+        "layout": "4up", "strategy": "design", "dj_contact": None,
+    }
+    result = run_generation(spec, str(tmp_path))
+
+    game = jobs.load_game_from_path(result["game_path"])
+    assert str(game.game_id) == spec["game_id"]
+    assert len(game.cards) == 4
+    assert len(game.playlist) == 48
+    assert game.current_pattern.value == "row"
+    assert open(result["pdf_path"], "rb").read(4) == b"%PDF"
+    assert (tmp_path / f"{spec['job_id']}.progress").read_text() == "4"
+
+
+def test_job_registers_game_and_serves_pdf(client):
+    """Test a submitted job completes, registers its game and serves the PDF."""
+    response = client.post(
+        "/api/jobs/generate",
+        json={"name": "Friday Hits", "playlist": make_playlist(), "num_cards": 5, "seed": 7},
+    )
+    assert response.status_code == 202
+    submitted = response.json()
+    assert submitted["status"] == "queued"
+    assert submitted["pdf_url"] is None
+
+    job = wait_for(client, submitted["job_id"])
+    assert job["status"] == "completed", job["error"]
+    assert job["cards_done"] == 5
+    assert job["progress"] == 1.0
+
+    state = client.get(f"/api/game/{job['game_id']}/state")
+    assert state.status_code == 200
+    assert state.json()["playlist_size"] == 48
+
+    pdf = client.get(job["pdf_url"])
+    assert pdf.status_code == 200
+    assert pdf.headers["content-type"] == "application/pdf"
+    assert pdf.content.startswith(b"%PDF")
+    assert "Friday-Hits.pdf" in pdf.headers["content-disposition"]
+
+    listed = client.get("/api/jobs").json()["jobs"]
+    assert [j["job_id"] for j in listed] == [job["job_id"]]
+
+
+def test_failed_job_reports_error(client):
+    """Test a playlist the generator rejects fails the job with its message."""
+    playlist = make_playlist(47) + [{"title": "Song 0", "artist": "Artist 0"}]
+    response = client.post(
+        "/api/jobs/generate", json={"name": "Dupes", "playlist": playlist, "num_cards": 5}
+    )
+    job = wait_for(client, response.json()["job_id"])
+
+    assert job["status"] == "failed"
+    assert job["error"]
+    assert client.get(f"/api/jobs/{job['job_id']}/pdf").status_code == 400
+
+
+def test_invalid_requests(client):
+    """Test request validation and unknown jobs."""
+    too_small = client.post(
+        "/api/jobs/generate", json={"name": "Tiny", "playlist": make_playlist(24)}
+    )
+    assert too_small.status_code == 422
+
+    custom = client.post(
+        "/api/jobs/generate",
+        json={"name": "Custom", "playlist": make_playlist(), "pattern": "custom"},
+    )
+    assert custom.status_code == 400
+
+    assert client.get(f"/api/jobs/{uuid4()}").status_code == 404
+    assert client.get(f"/api/jobs/{uuid4()}/pdf").status_code == 404
+
+
+def test_submit_without_generator_package(client, monkeypatch):
+    """Test jobs are refused with 503 when musicbingo-cards is missing."""
+    monkeypatch.setattr(jobs, "generation_available", lambda: False)
+    response = client.post(
+        "/api/jobs/generate", json={"name": "Night", "playlist": make_playlist()}
+    )
+    assert response.status_code == 503
+
+
+def test_finished_jobs_expire(tmp_path, monkeypatch):
+    """Test finished jobs beyond the count limit or past the TTL are forgotten."""
+    manager = JobManager(tmp_path / "jobs", max_workers=1, max_finished=2)
+    monkeypatch.setattr(jobs, "_job_manager", manager)
+    with TestClient(app) as client:
+        job_ids = []
+        for i in range(3):
+            response = client.post(
+                "/api/jobs/generate",
+                json={"name": f"Game {i}", "playlist": make_playlist(), "num_cards": 2},
+            )
+            job_ids.append(response.json()["job_id"])
+            assert wait_for(client, job_ids[-1])["status"] == "completed"
+
+        listed = [job["job_id"] for job in client.get("/api/jobs").json()["jobs"]]
+        assert listed == job_ids[:0:-1]
+        assert client.get(f"/api/jobs/{job_ids[0]}").status_code == 404
+        assert not (tmp_path / "jobs" / f"{job_ids[0]}.pdf").exists()
+        assert (tmp_path / "jobs" / f"{job_ids[0]}.json").exists()
+
+        manager.finished_ttl = timedelta(0)
+        assert client.get("/api/jobs").json()["jobs"] == []
+    assert manager._executor is None  # shut down by the app's lifespan
@@ -0,0 +1,103 @@
+"""Tests for metrics collection and the /metrics endpoint."""
+
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from musicbingo_api.main import app
+from musicbingo_api.metrics import (
+    OPERATION_LATENCY,
+    REQUEST_COUNT,
+    Histogram,
+    MetricsRegistry,
+    timed,
+)
+
+client = TestClient(app)
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test histogram renders cumulative bucket counts, sum and count."""
+    histogram = Histogram("test_seconds", "Test", ("op",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "a")
+    histogram.observe(0.1, "a")  # Bucket bounds are inclusive
+    histogram.observe(0.5, "a")
+    histogram.observe(3.0, "a")
+
+    lines = histogram.collect()
+
+    assert 'test_seconds_bucket{op="a",le="0.1"} 2' in lines
+    assert 'test_seconds_bucket{op="a",le="1.0"} 3' in lines
+    assert 'test_seconds_bucket{op="a",le="+Inf"} 4' in lines
+    assert 'test_seconds_count{op="a"} 4' in lines
+    assert histogram.get_count("a") == 4
+
+
+def test_registry_render_includes_help_and_type():
+    """Test registry output includes HELP/TYPE headers."""
+    registry = MetricsRegistry()
+    counter = registry.counter("test_total", "A test counter", ("kind",))
+    counter.inc("x")
+    counter.inc("x")
+
+    output = registry.render()
+
+    assert "# HELP test_total A test counter" in output
+    assert "# TYPE test_total counter" in output
+    assert 'test_total{kind="x"} 2' in output
+
+
+def test_registry_returns_existing_metric():
+    """Test registering the same name twice returns the same metric."""
+    registry = MetricsRegistry()
+    first = registry.counter("dup_total", "Dup")
+    second = registry.counter("dup_total", "Dup")
+    assert first is second
+
+
+def test_label_values_are_escaped():
+    """Test quotes in label values are escaped."""
+    registry = MetricsRegistry()
+    registry.counter("esc_total", "Esc", ("name",)).inc('say "hi"')
+    assert 'esc_total{name="say \\"hi\\""} 1' in registry.render()
+
+
+def test_timed_decorator_records_operation():
+    """Test timed decorator records into the operation histogram."""
+
+    @timed("test_operation")
+    def work():
+        return 42
+
+    before = OPERATION_LATENCY.get_count("test_operation")
+    assert work() == 42
+    assert OPERATION_LATENCY.get_count("test_operation") == before + 1
+
+
+def test_metrics_endpoint_prometheus_format():
+    """Test /metrics returns Prometheus text format."""
+    client.get("/health")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE musicbingo_http_request_duration_seconds histogram" in response.text
+    assert 'route="/health"' in response.text
+
+
+def test_middleware_uses_route_template():
+    """Test requests are labelled by route template, not raw path."""
+    route = "/api/game/{game_id}/state"
+    before = REQUEST_COUNT.get("GET", route, "404")
+
+    client.get(f"/api/game/{uuid4()}/state")
+    client.get(f"/api/game/{uuid4()}/state")
+
+    assert REQUEST_COUNT.get("GET", route, "404") == before + 2
+
+
+def test_unmatched_paths_share_one_label():
+    """Test unknown paths don't create a series per path."""
+    before = REQUEST_COUNT.get("GET", "unmatched", "404")
+    client.get("/no/such/path")
+    assert REQUEST_COUNT.get("GET", "unmatched", "404") == before + 1
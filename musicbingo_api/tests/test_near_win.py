@@ -0,0 +1,169 @@
+"""Tests for incremental near-win tracking."""
+
+import random
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from musicbingo_api.main import app
+from musicbingo_api.models import DEFAULT_PATTERNS, GameState, PatternType
+from musicbingo_api.near_win import UNREACHABLE, NearWinTracker
+
+client = TestClient(app)
+
+
+def brute_force_away(game: GameState, card_id) -> int:
+    """Fewest unplayed songs needed, computed from scratch."""
+    marked = game.cards[card_id].get_marked_positions(game.get_played_song_ids())
+    return min(len(line - marked) for line in DEFAULT_PATTERNS[game.current_pattern].lines)
+
+
+def test_tracker_counts_remaining_per_line():
+    """Test away count drops as songs on a row are marked."""
+    tracker = NearWinTracker(DEFAULT_PATTERNS[PatternType.ROW].lines)
+    songs = [uuid4() for _ in range(5)]
+    card_id = uuid4()
+    tracker.add_card(card_id, 1, {song: (0, col) for col, song in enumerate(songs)})
+
+    assert tracker.away(card_id) == 5
+    for marked, song in enumerate(songs, start=1):
+        tracker.mark(song)
+        assert tracker.away(card_id) == 5 - marked
+    assert tracker.winners() == {card_id}
+
+    tracker.unmark(songs[0])
+    assert tracker.away(card_id) == 1
+    assert tracker.away_counts() == {1: 1}
+
+
+def test_tracker_free_space_counts_as_marked():
+    """Test lines through the center need one fewer song."""
+    tracker = NearWinTracker(DEFAULT_PATTERNS[PatternType.DIAGONAL].lines)
+    card_id = uuid4()
+    tracker.add_card(card_id, 1, {uuid4(): (i, i) for i in (0, 1, 3, 4)})
+
+    assert tracker.away(card_id) == 4
+
+
+def test_tracker_ignores_lines_card_cannot_complete():
+    """Test lines with empty positions are ignored for partial cards."""
+    tracker = NearWinTracker(DEFAULT_PATTERNS[PatternType.ROW].lines)
+    partial, empty = uuid4(), uuid4()
+    tracker.add_card(partial, 1, {uuid4(): (0, col) for col in range(5)})
+    tracker.add_card(empty, 2, {})
+
+    assert tracker.away(partial) == 5
+    assert tracker.away(empty) == UNREACHABLE
+
+
+def test_tracker_closest_orders_by_away_then_number():
+    """Test top-k returns nearest cards, ties broken by card number."""
+    tracker = NearWinTracker(DEFAULT_PATTERNS[PatternType.ROW].lines)
+    song = uuid4()
+    ids = [uuid4() for _ in range(4)]
+
+    def top_row(first_song):
+        return {first_song: (0, 0), **{uuid4(): (0, col) for col in range(1, 5)}}
+
+    tracker.add_card(ids[0], 4, top_row(uuid4()))
+    tracker.add_card(ids[1], 3, top_row(song))
+    tracker.add_card(ids[2], 2, top_row(uuid4()))
+    tracker.add_card(ids[3], 1, top_row(song))
+    tracker.mark(song)
+
+    assert tracker.closest(3) == [ids[3], ids[1], ids[2]]
+    assert tracker.closest(10, max_away=4) == [ids[3], ids[1]]
+
+
+@pytest.mark.parametrize("pattern", list(DEFAULT_PATTERNS))
+def test_tracker_matches_brute_force(make_game, pattern):
+    """Test incremental counts match a full rescan through marks and unmarks."""
+    game = make_game(seed=hash(pattern.value) % 1000)
+    game.current_pattern = pattern
+    rng = random.Random(1)
+
+    for step in range(60):
+        song = rng.choice(game.playlist).song_id
+        if song in game.played_songs and step % 3 == 0:
+            game.played_songs.remove(song)
+        elif song not in game.played_songs:
+            game.played_songs.append(song)
+
+        statuses = game.get_card_statuses()
+        for status in statuses:
+            card_id = status["card_id"]
+            assert status["songs_away"] == brute_force_away(game, card_id)
+            assert status["is_winner"] == game.verify_card(card_id)[0]
+
+
+def test_tracker_follows_pattern_change_and_reset(make_game):
+    """Test the tracker rebuilds on pattern change and clears on reset."""
+    game = make_game()
+    for song in game.playlist[:20]:
+        game.add_played_song(song.song_id)
+    game.get_card_statuses()
+
+    game.current_pattern = PatternType.FULL_CARD
+    for status in game.get_card_statuses():
+        assert status["songs_away"] == brute_force_away(game, status["card_id"])
+
+    game.played_songs = []
+    assert game.get_near_win_leaderboard()["away_counts"] == {24: 20}
+
+
+def test_new_winners_from_tracker(make_game):
+    """Test winner detection only reports cards not already detected."""
+    game = make_game()
+    for song in game.playlist:
+        game.add_played_song(song.song_id)
+
+    winners = game.check_registered_cards_for_winners()
+    assert [w["card_number"] for w in winners] == list(range(1, 21))
+
+    game.detected_winners.extend(winners)
+    assert game.check_registered_cards_for_winners() == []
+
+
+def test_near_wins_endpoint():
+    """Test the leaderboard endpoint reports counts and closest cards."""
+    game_id = str(uuid4())
+    playlist = [
+        {"song_id": str(uuid4()), "title": f"Song {i}", "artist": "Artist"} for i in range(24)
+    ]
+    client.post(
+        "/api/game/start", json={"game_id": game_id, "playlist": playlist, "pattern": "row"}
+    )
+    card_ids = []
+    for n in range(3):
+        card = {
+            "card_id": str(uuid4()),
+            "card_number": n + 1,
+            "song_positions": {playlist[n * 5 + i]["song_id"]: [0, i] for i in range(5)},
+        }
+        client.post(f"/api/game/{game_id}/card", json=card)
+        client.post(
+            f"/api/game/{game_id}/register-card",
+            json={"card_id": card["card_id"], "player_name": f"P{n}"},
+        )
+        card_ids.append(card["card_id"])
+
+    for i in range(4):
+        client.post(
+            f"/api/game/{game_id}/mark-song",
+            json={"song_id": playlist[i]["song_id"], "played": True},
+        )
+
+    response = client.get(f"/api/game/{game_id}/near-wins", params={"k": 2})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["away_counts"] == {"1": 1, "5": 2}
+    assert [c["card_id"] for c in data["closest"]] == card_ids[:2]
+    assert data["closest"][0]["songs_away"] == 1
+
+
+def test_near_wins_nonexistent_game():
+    """Test leaderboard for an unknown game returns 404."""
+    response = client.get(f"/api/game/{uuid4()}/near-wins")
+    assert response.status_code == 404
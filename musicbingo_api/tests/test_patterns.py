@@ -0,0 +1,218 @@
+"""Tests for the pattern definition language."""
+
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from musicbingo_api import game_loader
+from musicbingo_api.main import app
+from musicbingo_api.models import DEFAULT_PATTERNS, BingoPattern, GameState, PatternType
+from musicbingo_api.patterns import (
+    BUILTIN_MASKS,
+    MAX_MASKS,
+    compile_pattern,
+    mask_to_positions,
+    positions_to_mask,
+)
+
+from .conftest import POSITIONS
+
+client = TestClient(app)
+
+TWO_LINES = {"at_least": 2, "of": "five_in_a_row"}
+
+
+@pytest.mark.parametrize(
+    "pattern,expected",
+    [
+        (PatternType.FIVE_IN_A_ROW, 5),
+        (PatternType.ROW, 5),
+        (PatternType.COLUMN, 5),
+        (PatternType.DIAGONAL, 5),
+        (PatternType.FOUR_CORNERS, 4),
+        (PatternType.X_PATTERN, 9),
+        (PatternType.FULL_CARD, 24),
+        (PatternType.FRAME, 16),
+    ],
+)
+def test_builtin_total_needed(pattern, expected):
+    """Test derived cell counts match the published pattern sizes."""
+    assert DEFAULT_PATTERNS[pattern].total_needed == expected
+
+
+def test_builtin_masks_cover_every_pattern_type():
+    """Test every built-in pattern type has compiled geometry."""
+    assert set(BUILTIN_MASKS) == {p.value for p in PatternType if p != PatternType.CUSTOM}
+
+
+def test_mask_position_round_trip():
+    """Test masks and position sets convert both ways."""
+    positions = frozenset({(0, 0), (2, 3), (4, 4)})
+    assert mask_to_positions(positions_to_mask(positions)) == positions
+
+
+def test_compile_grid():
+    """Test grid art compiles to one shape."""
+    masks = compile_pattern({"grid": ["X...X", ".....", "..#..", ".....", "X---X"]})
+    assert len(masks) == 1
+    assert mask_to_positions(masks[0]) == {(0, 0), (0, 4), (2, 2), (4, 0), (4, 4)}
+
+
+def test_compile_cells_and_any_of():
+    """Test any_of keeps each alternative shape."""
+    masks = compile_pattern(
+        {"any_of": [{"cells": [[0, 0], [0, 1]]}, {"cells": [[4, 3], [4, 4]]}]}
+    )
+    assert {mask_to_positions(m) for m in masks} == {
+        frozenset({(0, 0), (0, 1)}),
+        frozenset({(4, 3), (4, 4)}),
+    }
+
+
+def test_compile_all_of_combines_parts():
+    """Test all_of requires a shape from every part."""
+    masks = compile_pattern({"all_of": ["four_corners", "diagonal"]})
+    assert len(masks) == 2
+    corners = BUILTIN_MASKS["four_corners"][0]
+    assert all(mask & corners == corners for mask in masks)
+
+
+def test_compile_at_least_two_lines():
+    """Test 'any two lines' compiles to every pair of the 12 lines."""
+    masks = compile_pattern(TWO_LINES)
+    assert len(masks) == 66
+    assert min(bin(m).count("1") for m in masks) == 9  # two lines crossing at a cell
+
+
+def test_superset_shapes_are_dropped():
+    """Test shapes containing a smaller shape are removed."""
+    masks = compile_pattern({"any_of": ["row", "full_card"]})
+    assert masks == BUILTIN_MASKS["row"]
+
+
+@pytest.mark.parametrize(
+    "definition,message",
+    [
+        ("zigzag", "unknown built-in"),
+        ({"grid": ["X...X"]}, "expected 5 rows"),
+        ({"grid": ["X...Y", ".....", ".....", ".....", "....."]}, "unexpected character"),
+        ({"cells": [[5, 0]]}, "invalid cell"),
+        ({"any_of": []}, "non-empty list"),
+        ({"at_least": 13, "of": "five_in_a_row"}, "exceeds"),
+        ({"at_least": 0, "of": "row"}, "positive integer"),
+        ({"cells": [[2, 2]]}, "needs no songs"),
+        ({"rows": [0]}, "unrecognised keys"),
+        ([1, 2], "expected a pattern name"),
+    ],
+)
+def test_invalid_definitions(definition, message):
+    """Test malformed definitions raise ValueError with the failing path."""
+    with pytest.raises(ValueError, match=message):
+        compile_pattern(definition)
+
+
+def test_expansion_is_capped():
+    """Test definitions that expand past MAX_MASKS are rejected."""
+    cells = {"any_of": [{"cells": [[r, c]]} for r, c in POSITIONS]}
+    with pytest.raises(ValueError, match="shapes|combinations"):
+        compile_pattern({"at_least": 3, "of": cells})  # C(24, 3) shapes
+    with pytest.raises(ValueError, match="combinations"):
+        compile_pattern({"at_least": 8, "of": cells})
+    assert len(compile_pattern({"at_least": 2, "of": cells})) <= MAX_MASKS
+
+
+def song_at(game: GameState, card_id, position):
+    """Song ID at a card position."""
+    positions = game.cards[card_id].song_positions
+    return next(song_id for song_id, pos in positions.items() if pos == position)
+
+
+def test_custom_pattern_in_game_state(make_game):
+    """Test verify, near-wins and replay use the custom pattern."""
+    game = make_game(num_cards=1, num_songs=30)
+    card_id = next(iter(game.cards))
+    game.custom_pattern = BingoPattern.from_definition(TWO_LINES, "Two Lines")
+    game.current_pattern = PatternType.CUSTOM
+
+    for col in range(5):
+        game.add_played_song(song_at(game, card_id, (0, col)))
+    assert game.verify_card(card_id)[0] is False
+    assert game.get_card_statuses()[0]["songs_away"] == 3  # a diagonal through the free space
+
+    for row in (1, 2, 3, 4):
+        game.add_played_song(song_at(game, card_id, (row, 0)))
+    assert game.verify_card(card_id) == (True, PatternType.CUSTOM, 1)
+    assert game.get_card_statuses()[0]["total_needed"] == 9
+    assert game.get_first_win_calls(card_id)[PatternType.CUSTOM] == 9
+
+
+def test_custom_pattern_required_for_custom_type(make_game):
+    """Test selecting CUSTOM without a definition fails."""
+    game = make_game(num_cards=1, num_songs=30)
+    with pytest.raises(ValueError, match="No custom pattern"):
+        game.get_pattern(PatternType.CUSTOM)
+    assert PatternType.CUSTOM not in game.get_first_win_calls(next(iter(game.cards)))
+
+
+def test_custom_pattern_endpoint():
+    """Test setting a custom pattern through the API."""
+    game_id = str(uuid4())
+    playlist = [
+        {"song_id": str(uuid4()), "title": f"Song {i}", "artist": "Artist"} for i in range(24)
+    ]
+    client.post("/api/game/start", json={"game_id": game_id, "playlist": playlist})
+
+    response = client.post(
+        f"/api/game/{game_id}/custom-pattern",
+        json={"name": "Two Lines", "definition": TWO_LINES},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["current_pattern"] == "custom"
+    assert data["shapes"] == 66
+    assert data["total_needed"] == 9
+
+    state = client.get(f"/api/game/{game_id}/state").json()
+    assert state["current_pattern"] == "custom"
+
+
+def test_custom_pattern_endpoint_errors():
+    """Test invalid definitions return 400 and unknown games 404."""
+    game_id = str(uuid4())
+    playlist = [
+        {"song_id": str(uuid4()), "title": f"Song {i}", "artist": "Artist"} for i in range(24)
+    ]
+    client.post("/api/game/start", json={"game_id": game_id, "playlist": playlist})
+
+    response = client.post(
+        f"/api/game/{game_id}/custom-pattern",
+        json={"name": "Bad", "definition": {"grid": ["X"]}},
+    )
+    assert response.status_code == 400
+    assert "expected 5 rows" in response.json()["detail"]
+
+    response = client.post(f"/api/game/{game_id}/pattern", params={"pattern": "custom"})
+    assert response.status_code == 400
+
+    response = client.post(
+        f"/api/game/{uuid4()}/custom-pattern", json={"name": "X", "definition": "row"}
+    )
+    assert response.status_code == 404
+
+
+def test_game_file_round_trips_custom_pattern(make_game, tmp_path, monkeypatch):
+    """Test saved games keep their custom pattern definition."""
+    monkeypatch.setattr(game_loader, "GAMES_DIR", tmp_path)
+    game = make_game(num_cards=1, num_songs=30)
+    game.custom_pattern = BingoPattern.from_definition(
+        {"grid": ["X...X", ".....", ".....", ".....", "X...X"]}, "Corners", "Four corners"
+    )
+    game.current_pattern = PatternType.CUSTOM
+
+    game_loader.save_game_to_file(game, "custom.json")
+    loaded = game_loader.load_game_from_file("custom.json")
+
+    assert loaded.current_pattern == PatternType.CUSTOM
+    assert loaded.custom_pattern.name == "Corners"
+    assert loaded.custom_pattern.masks == game.custom_pattern.masks
@@ -0,0 +1,199 @@
+"""Tests for the sampling profiler and slow request log."""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from musicbingo_api.main import app
+from musicbingo_api.profiler import (
+    ADMIN_TOKEN_ENV,
+    SamplingProfiler,
+    SlowRequestLog,
+    SlowRequestMiddleware,
+    SlowRequestRoute,
+    slow_request_log,
+)
+
+client = TestClient(app)
+ADMIN_HEADERS = {"X-Admin-Token": "secret"}
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    """Enable debug endpoints with a known admin token."""
+    monkeypatch.setenv(ADMIN_TOKEN_ENV, "secret")
+    yield
+    slow_request_log.disable()
+    slow_request_log.clear()
+
+
+def _busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_profiler_collects_samples():
+    """Test profiler samples other threads' stacks."""
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    _busy(0.05)
+    profiler.stop()
+
+    assert profiler.sample_count > 0
+    collapsed = profiler.to_collapsed()
+    assert "_busy" in collapsed
+    # Each line is 'stack count'
+    stack, count = collapsed.splitlines()[0].rsplit(" ", 1)
+    assert int(count) > 0
+
+
+def test_profiler_speedscope_format():
+    """Test speedscope output references frames by index."""
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    _busy(0.02)
+    profiler.stop()
+
+    profile = profiler.to_speedscope()
+    frames = profile["shared"]["frames"]
+    sampled = profile["profiles"][0]
+
+    assert sampled["type"] == "sampled"
+    assert len(sampled["samples"]) == len(sampled["weights"])
+    assert all(0 <= i < len(frames) for stack in sampled["samples"] for i in stack)
+
+
+def test_profiler_rejects_bad_interval():
+    """Test non-positive interval raises ValueError."""
+    with pytest.raises(ValueError, match="positive"):
+        SamplingProfiler(interval=0)
+
+
+def test_slow_request_log_captures_stack():
+    """Test slow requests are logged with a mid-request stack."""
+    log = SlowRequestLog()
+    log.enable(threshold_ms=10)
+    try:
+        token = log.begin("GET", "/slow")
+        _busy(0.05)
+        log.end(token)
+        token = log.begin("GET", "/fast")
+        log.end(token)
+    finally:
+        log.disable()
+
+    assert len(log.entries) == 1
+    entry = log.entries[0]
+    assert entry["path"] == "/slow"
+    assert entry["duration_ms"] >= 10
+    assert any("_busy" in frame for frame in entry["stack"])
+
+
+def test_slow_request_log_disabled_by_default():
+    """Test the global log does nothing until enabled."""
+    assert slow_request_log.enabled is False
+
+
+def test_debug_endpoints_hidden_without_token(monkeypatch):
+    """Test debug endpoints 404 when no admin token is configured."""
+    monkeypatch.delenv(ADMIN_TOKEN_ENV, raising=False)
+    response = client.get("/api/debug/slow-requests", headers=ADMIN_HEADERS)
+    assert response.status_code == 404
+
+
+def test_debug_endpoints_reject_wrong_token(admin_token):
+    """Test wrong admin token is rejected."""
+    response = client.get("/api/debug/slow-requests", headers={"X-Admin-Token": "nope"})
+    assert response.status_code == 403
+
+
+def test_profile_endpoint_collapsed(admin_token):
+    """Test profile endpoint returns collapsed stacks."""
+    response = client.post(
+        "/api/debug/profile",
+        params={"seconds": 0.05, "interval_ms": 1},
+        headers=ADMIN_HEADERS,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+
+def test_profile_endpoint_speedscope(admin_token):
+    """Test profile endpoint returns speedscope JSON."""
+    response = client.post(
+        "/api/debug/profile",
+        params={"seconds": 0.05, "interval_ms": 1, "format": "speedscope"},
+        headers=ADMIN_HEADERS,
+    )
+    assert response.status_code == 200
+    assert response.json()["profiles"][0]["type"] == "sampled"
+
+
+def test_profile_endpoint_limits_duration(admin_token):
+    """Test profile duration is bounded."""
+    response = client.post(
+        "/api/debug/profile", params={"seconds": 3600}, headers=ADMIN_HEADERS
+    )
+    assert response.status_code == 422
+
+
+def test_slow_request_endpoints(admin_token):
+    """Test enabling, reading and disabling the slow request log."""
+    response = client.post(
+        "/api/debug/slow-requests/enable",
+        json={"threshold_ms": 0.001},
+        headers=ADMIN_HEADERS,
+    )
+    assert response.status_code == 200
+    assert response.json()["enabled"] is True
+
+    client.get("/health")
+
+    response = client.get("/api/debug/slow-requests", headers=ADMIN_HEADERS)
+    assert any(e["path"] == "/health" for e in response.json()["entries"])
+
+    response = client.post("/api/debug/slow-requests/disable", headers=ADMIN_HEADERS)
+    assert response.json()["enabled"] is False
+    assert response.json()["entries"] == []
+
+
+def _slow_app(log: SlowRequestLog) -> FastAPI:
+    slow_app = FastAPI()
+    slow_app.router.route_class = SlowRequestRoute
+    slow_app.add_middleware(SlowRequestMiddleware, log=log)
+
+    @slow_app.get("/sync")
+    def sync_endpoint():
+        _busy(0.1)
+        return {}
+
+    @slow_app.get("/await")
+    async def await_endpoint():
+        await _awaited_sleep(0.1)
+        return {}
+
+    return slow_app
+
+
+async def _awaited_sleep(seconds: float) -> None:
+    await asyncio.sleep(seconds)
+
+
+@pytest.mark.parametrize("path,function", [("/sync", "_busy"), ("/await", "_awaited_sleep")])
+def test_slow_request_stack_belongs_to_request(path, function):
+    """Test sync handlers are sampled on their worker thread and suspended
+    async handlers through their await chain, not the event loop thread."""
+    log = SlowRequestLog()
+    log.enable(threshold_ms=20)
+    try:
+        with TestClient(_slow_app(log)) as slow_client:
+            assert slow_client.get(path).status_code == 200
+    finally:
+        log.disable()
+
+    assert len(log.entries) == 1
+    assert any(function in frame for frame in log.entries[0]["stack"])
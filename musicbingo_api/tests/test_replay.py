@@ -0,0 +1,156 @@
+"""Tests for the first-win replay index."""
+
+import random
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from musicbingo_api.main import app
+from musicbingo_api.models import DEFAULT_PATTERNS, GameState, PatternType
+
+client = TestClient(app)
+
+
+def brute_force_first_win(game: GameState, card_id, pattern: PatternType):
+    """Replay the log one call at a time with check_win."""
+    card = game.cards[card_id]
+    for call in range(1, len(game.played_songs) + 1):
+        marked = card.get_marked_positions(set(game.played_songs[:call]))
+        if DEFAULT_PATTERNS[pattern].check_win(marked):
+            return call
+    return None
+
+
+def test_first_win_calls_match_replay(make_game):
+    """Test indexed first-win calls match a call-by-call replay for all patterns."""
+    game = make_game(num_cards=15, register=False)
+    order = [song.song_id for song in game.playlist]
+    random.Random(1).shuffle(order)
+    for song_id in order:
+        game.add_played_song(song_id)
+
+    for card_id in game.cards:
+        calls = game.get_first_win_calls(card_id)
+        for pattern in DEFAULT_PATTERNS:
+            assert calls[pattern] == brute_force_first_win(game, card_id, pattern)
+
+
+def test_index_updates_on_unmark_and_remark(make_game):
+    """Test unmarking shifts later calls and re-marking appends at the end."""
+    game = make_game(num_cards=15, register=False, seed=2)
+    order = [song.song_id for song in game.playlist]
+    random.Random(3).shuffle(order)
+    for song_id in order[:30]:
+        game.add_played_song(song_id)
+    game.get_replay_index()
+
+    rng = random.Random(4)
+    for _ in range(10):
+        song_id = rng.choice(game.played_songs)
+        game.played_songs.remove(song_id)
+        if rng.random() < 0.5:
+            game.played_songs.append(song_id)
+
+        for card_id in list(game.cards)[:5]:
+            calls = game.get_first_win_calls(card_id)
+            for pattern in (PatternType.FIVE_IN_A_ROW, PatternType.FOUR_CORNERS):
+                assert calls[pattern] == brute_force_first_win(game, card_id, pattern)
+
+
+def test_winners_at_call_partitions_by_call(make_game):
+    """Test new winners at each call add up to the cumulative winners."""
+    game = make_game(num_cards=15, register=False, seed=5)
+    for song in game.playlist:
+        game.add_played_song(song.song_id)
+
+    seen = set()
+    for call in range(1, len(game.played_songs) + 1):
+        result = game.get_winners_at_call(call, PatternType.ROW)
+        assert not seen & set(result["new_winners"])
+        seen |= set(result["new_winners"])
+        assert set(result["winners"]) == seen
+        assert result["song_id"] == game.played_songs[call - 1]
+    assert seen == set(game.cards)
+
+
+def test_index_rebuilds_after_reset(make_game):
+    """Test a reset play log clears first-win calls."""
+    game = make_game(num_cards=15, register=False)
+    for song in game.playlist:
+        game.add_played_song(song.song_id)
+    card_id = next(iter(game.cards))
+    assert game.get_first_win_calls(card_id)[PatternType.FULL_CARD] is not None
+
+    game.played_songs = []
+    assert set(game.get_first_win_calls(card_id).values()) == {None}
+
+
+def test_winners_at_call_out_of_range(make_game):
+    """Test calls outside the log are rejected."""
+    game = make_game(num_cards=15, register=False)
+    with pytest.raises(ValueError, match="out of range"):
+        game.get_winners_at_call(1)
+
+
+def setup_api_game():
+    """Create a game with two row cards via the API and mark 5 songs."""
+    game_id = str(uuid4())
+    playlist = [
+        {"song_id": str(uuid4()), "title": f"Song {i}", "artist": "Artist"} for i in range(24)
+    ]
+    client.post(
+        "/api/game/start", json={"game_id": game_id, "playlist": playlist, "pattern": "row"}
+    )
+    cards = []
+    for n in range(2):
+        card = {
+            "card_id": str(uuid4()),
+            "card_number": n + 1,
+            "song_positions": {playlist[n + i]["song_id"]: [0, i] for i in range(5)},
+        }
+        client.post(f"/api/game/{game_id}/card", json=card)
+        cards.append(card)
+    client.post(
+        f"/api/game/{game_id}/register-card",
+        json={"card_id": cards[0]["card_id"], "player_name": "Alice"},
+    )
+    for i in range(6):
+        client.post(
+            f"/api/game/{game_id}/mark-song",
+            json={"song_id": playlist[i]["song_id"], "played": True},
+        )
+    return game_id, playlist, cards
+
+
+def test_replay_endpoint():
+    """Test replay endpoint reports who first won on each call."""
+    game_id, playlist, cards = setup_api_game()
+
+    response = client.get(f"/api/game/{game_id}/replay/5")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["song_id"] == playlist[4]["song_id"]
+    assert [w["card_id"] for w in data["new_winners"]] == [cards[0]["card_id"]]
+    assert data["new_winners"][0]["player_name"] == "Alice"
+
+    data = client.get(f"/api/game/{game_id}/replay/6").json()
+    assert [w["card_number"] for w in data["new_winners"]] == [2]
+    assert [w["card_number"] for w in data["winners"]] == [1, 2]
+
+    assert client.get(f"/api/game/{game_id}/replay/7").status_code == 400
+
+
+def test_first_win_endpoint():
+    """Test first-win endpoint returns the winning call per pattern."""
+    game_id, _, cards = setup_api_game()
+
+    response = client.get(f"/api/game/{game_id}/card/{cards[1]['card_id']}/first-win")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["played_count"] == 6
+    assert data["first_win_calls"]["row"] == 6
+    assert data["first_win_calls"]["full_card"] is None
+
+    assert client.get(f"/api/game/{game_id}/card/{uuid4()}/first-win").status_code == 404
@@ -0,0 +1,168 @@
+"""Tests for progressive multi-stage games."""
+
+import random
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from musicbingo_api.main import app
+from musicbingo_api.models import DEFAULT_PATTERNS, BingoPattern, GameState, PatternType
+from musicbingo_api.stages import StageTracker
+
+from .conftest import POSITIONS
+
+client = TestClient(app)
+
+STAGES = [PatternType.ROW, PatternType.X_PATTERN, PatternType.FULL_CARD]
+
+
+def brute_force_winners(game: GameState, pattern: BingoPattern) -> set:
+    """Cards completing a pattern, checked from scratch."""
+    played = game.get_played_song_ids()
+    return {
+        card_id
+        for card_id, card in game.cards.items()
+        if pattern.check_win(card.get_marked_positions(played))
+    }
+
+
+def test_tracker_matches_brute_force_through_marks_and_unmarks(make_game):
+    """Test every stage's winners stay exact as songs are marked and unmarked."""
+    game = make_game()
+    game.set_stages(STAGES)
+    rng = random.Random(2)
+    order = [song.song_id for song in game.playlist]
+    rng.shuffle(order)
+
+    for step, song_id in enumerate(order):
+        game.add_played_song(song_id)
+        if step % 7 == 6:
+            game.played_songs.remove(rng.choice(game.played_songs))
+        tracker = game.get_stage_tracker()
+        for index, stage in enumerate(STAGES):
+            assert tracker.winners(index) == brute_force_winners(game, DEFAULT_PATTERNS[stage])
+
+
+def test_tracker_checks_only_masks_through_marked_cell():
+    """Test a card completes several stages on the same call."""
+    tracker = StageTracker(
+        [DEFAULT_PATTERNS[PatternType.ROW].masks, DEFAULT_PATTERNS[PatternType.FRAME].masks]
+    )
+    songs = {uuid4(): (r, c) for r in range(5) for c in range(5) if r in (0, 4) or c in (0, 4)}
+    card_id = uuid4()
+    tracker.add_card(card_id, songs)
+
+    for song_id, position in songs.items():
+        if position != (0, 4):
+            tracker.mark(song_id)
+    assert tracker.completed_stages(card_id) == [0]  # row 4 is complete
+
+    corner = next(s for s, p in songs.items() if p == (0, 4))
+    tracker.mark(corner)
+    assert tracker.completed_stages(card_id) == [0, 1]
+    tracker.unmark(corner)
+    assert tracker.completed_stages(card_id) == [0]
+
+
+def test_advance_keeps_earlier_winners_and_detects_instantly(make_game):
+    """Test advancing reports cards already complete and keeps stage 0 winners."""
+    game = make_game()
+    game.set_stages(STAGES)
+    order = [song.song_id for song in game.playlist]
+    random.Random(3).shuffle(order)
+
+    for song_id in order[:30]:
+        game.add_played_song(song_id)
+    stage_zero = game.check_registered_cards_for_winners()
+    game.detected_winners.extend(stage_zero)
+    assert stage_zero and all(w["stage"] == 0 for w in stage_zero)
+
+    game.advance_stage()
+    assert game.current_pattern == PatternType.X_PATTERN
+    stage_one = game.check_registered_cards_for_winners()
+    expected = brute_force_winners(game, DEFAULT_PATTERNS[PatternType.X_PATTERN])
+    assert {w["card_id"] for w in stage_one} == expected
+    assert all(w["stage"] == 1 for w in stage_one)
+    assert [w for w in game.detected_winners if w["stage"] == 0] == stage_zero
+
+
+def test_stage_errors(make_game):
+    """Test invalid stage operations raise ValueError."""
+    game = make_game(num_cards=1)
+    with pytest.raises(ValueError, match="no stages"):
+        game.advance_stage()
+    with pytest.raises(ValueError, match="No custom pattern"):
+        game.set_stages([PatternType.ROW, PatternType.CUSTOM])
+
+    game.set_stages([PatternType.ROW])
+    with pytest.raises(ValueError, match="last stage"):
+        game.advance_stage()
+
+
+def setup_api_game():
+    """Create a game via the API with one registered card and row/frame stages."""
+    game_id = str(uuid4())
+    playlist = [
+        {"song_id": str(uuid4()), "title": f"Song {i}", "artist": "Artist"} for i in range(24)
+    ]
+    client.post("/api/game/start", json={"game_id": game_id, "playlist": playlist})
+    card = {
+        "card_id": str(uuid4()),
+        "card_number": 1,
+        "song_positions": {s["song_id"]: list(p) for s, p in zip(playlist, POSITIONS)},
+    }
+    client.post(f"/api/game/{game_id}/card", json=card)
+    client.post(
+        f"/api/game/{game_id}/register-card",
+        json={"card_id": card["card_id"], "player_name": "Alice"},
+    )
+    response = client.post(f"/api/game/{game_id}/stages", json={"stages": ["row", "frame"]})
+    assert response.status_code == 200
+    return game_id, playlist, card
+
+
+def test_stages_endpoints():
+    """Test stage winners are detected on mark and on advance."""
+    game_id, playlist, card = setup_api_game()
+
+    # The first 16 songs cover rows 0-2 (minus the centre) and part of row 3
+    for song in playlist[:16]:
+        client.post(
+            f"/api/game/{game_id}/mark-song",
+            json={"song_id": song["song_id"], "played": True},
+        )
+    data = client.get(f"/api/game/{game_id}/stages").json()
+    assert data["current_stage"] == 0
+    assert [w["card_id"] for w in data["stages"][0]["winners"]] == [card["card_id"]]
+    assert data["stages"][1]["completed_count"] == 0
+
+    frame = {p for p in POSITIONS if p[0] in (0, 4) or p[1] in (0, 4)}
+    for song, position in zip(playlist, POSITIONS):
+        if position in frame:
+            client.post(
+                f"/api/game/{game_id}/mark-song",
+                json={"song_id": song["song_id"], "played": True},
+            )
+
+    data = client.post(f"/api/game/{game_id}/stages/advance").json()
+    assert data["current_stage"] == 1
+    assert [w["card_id"] for w in data["new_winners"]] == [card["card_id"]]
+    assert len(data["stages"][0]["winners"]) == 1
+
+    state = client.get(f"/api/game/{game_id}/state").json()
+    assert state["current_pattern"] == "frame"
+    assert sorted(w["stage"] for w in state["detected_winners"]) == [0, 1]
+
+    response = client.post(f"/api/game/{game_id}/stages/advance")
+    assert response.status_code == 400
+
+
+def test_set_pattern_ends_staged_play():
+    """Test a single pattern replaces the stage list."""
+    game_id, _, _ = setup_api_game()
+    client.post(f"/api/game/{game_id}/pattern", params={"pattern": "diagonal"})
+
+    response = client.get(f"/api/game/{game_id}/stages")
+    assert response.status_code == 400
+    assert client.post(f"/api/game/{uuid4()}/stages/advance").status_code == 404
@@ -0,0 +1,298 @@
+"""Generate many games from one manifest across a process pool.
+
+A manifest is a JSON file listing games, with optional shared defaults:
+
+    {
+        "defaults": {"num_cards": 80, "layout": "4up", "dj_contact": "DJ Sam"},
+        "games": [
+            {"name": "Rock Monday", "playlist": "rock.txt", "seed": 1},
+            {"name": "90s Friday", "playlist": "90s.csv", "strategy": "design"}
+        ]
+    }
+
+Relative playlist and logo paths are resolved against the manifest's
+directory. Each game writes <slug>.pdf and <slug>.json (an API game file
+with playlist and cards, loadable by the API) to the output directory, and
+index.json lists every game.
+
+Workers are started once and import the generator and PDF stack up front
+(see _warm_up), so each game pays only for generation and rendering, not
+interpreter startup and imports. Games are scheduled largest first, which
+keeps one large game from finishing alone at the end.
+"""
+
+import json
+import os
+import re
+import time
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Callable, List, Optional, Union
+
+from .simulator import PATTERNS
+
+DEFAULT_NUM_CARDS = 50
+MAX_NUM_CARDS = 1000
+
+# Manifest field -> accepted JSON types (None allows null)
+_FIELD_TYPES = {
+    "name": (str,),
+    "playlist": (str,),
+    "num_cards": (int,),
+    "seed": (int, None),
+    "layout": (str,),
+    "strategy": (str,),
+    "max_overlap": (int, None),
+    "pattern": (str,),
+    "dj_contact": (str, None),
+    "venue_logo": (str, None),
+}
+
+
+class ManifestError(Exception):
+    """Exception raised when a batch manifest is invalid."""
+
+    pass
+
+
+@dataclass
+class BatchGame:
+    """One game of a batch.
+
+    Attributes:
+        name: Game name (PDF title; its slug names the output files)
+        playlist: Playlist file (CSV, JSON, or TXT)
+        num_cards: Number of cards (1-1000)
+        seed: Optional seed for reproducible cards
+        layout: PDF layout, "single" or "4up"
+        strategy: "weighted" (CardGenerator) or "design" (DesignCardGenerator)
+        max_overlap: Overlap bound for the design strategy
+        pattern: Winning pattern written to the game file
+        dj_contact: Optional contact line printed on the cards
+        venue_logo: Optional PNG/JPG logo
+    """
+
+    name: str
+    playlist: Path
+    num_cards: int = DEFAULT_NUM_CARDS
+    seed: Optional[int] = None
+    layout: str = "single"
+    strategy: str = "weighted"
+    max_overlap: Optional[int] = None
+    pattern: str = "five_in_a_row"
+    dj_contact: Optional[str] = None
+    venue_logo: Optional[Path] = None
+
+    @property
+    def slug(self) -> str:
+        """File name stem derived from the game name."""
+        return re.sub(r"[^a-z0-9]+", "-", self.name.lower()).strip("-") or "game"
+
+
+def load_manifest(path: Union[str, Path]) -> List[BatchGame]:
+    """Read and validate a batch manifest.
+
+    Args:
+        path: Manifest JSON file
+
+    Returns:
+        Games in manifest order
+
+    Raises:
+        ManifestError: If the manifest is malformed (including fields of the
+            wrong type), a playlist or logo is missing, or two games would
+            write the same files
+    """
+    path = Path(path)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as e:
+        raise ManifestError(f"Cannot read manifest {path}: {e}")
+    if not isinstance(data, dict) or not isinstance(data.get("games"), list) or not data["games"]:
+        raise ManifestError('Manifest must be an object with a non-empty "games" list')
+
+    known = {f.name for f in fields(BatchGame)}
+    defaults = data.get("defaults", {})
+    if not isinstance(defaults, dict):
+        raise ManifestError('"defaults" must be an object')
+    games = []
+    for number, entry in enumerate(data["games"], 1):
+        if not isinstance(entry, dict):
+            raise ManifestError(f"Game {number}: expected an object")
+        settings = {**defaults, **entry}
+        unknown = set(settings) - known
+        if unknown:
+            raise ManifestError(f"Game {number}: unknown fields {sorted(unknown)}")
+        if "name" not in settings or "playlist" not in settings:
+            raise ManifestError(f'Game {number}: "name" and "playlist" are required')
+        for key, value in settings.items():
+            if not _is_type(value, _FIELD_TYPES[key]):
+                raise ManifestError(f"Game {number}: invalid {key} {value!r}")
+        if not 1 <= settings.get("num_cards", DEFAULT_NUM_CARDS) <= MAX_NUM_CARDS:
+            raise ManifestError(
+                f"Game {number}: num_cards must be between 1 and {MAX_NUM_CARDS}"
+            )
+
+        game = BatchGame(**settings)
+        game.playlist = path.parent / game.playlist
+        if not game.playlist.exists():
+            raise ManifestError(f"Game {number}: playlist not found: {game.playlist}")
+        if game.venue_logo is not None:
+            game.venue_logo = path.parent / game.venue_logo
+            if not game.venue_logo.exists():
+                raise ManifestError(f"Game {number}: venue logo not found: {game.venue_logo}")
+        if game.layout not in ("single", "4up"):
+            raise ManifestError(f"Game {number}: invalid layout {game.layout!r}")
+        if game.strategy not in ("weighted", "design"):
+            raise ManifestError(f"Game {number}: invalid strategy {game.strategy!r}")
+        if game.pattern not in PATTERNS:
+            raise ManifestError(f"Game {number}: invalid pattern {game.pattern!r}")
+        games.append(game)
+
+    slugs = [game.slug for game in games]
+    duplicates = sorted({slug for slug in slugs if slugs.count(slug) > 1})
+    if duplicates:
+        raise ManifestError(f"Games share output names: {', '.join(duplicates)}")
+    return games
+
+
+def _is_type(value, types: tuple) -> bool:
+    if value is None:
+        return None in types
+    if isinstance(value, bool):  # bool is an int, but true is not a card count
+        return False
+    return isinstance(value, tuple(t for t in types if t is not None))
+
+
+def _warm_up() -> None:
+    """Import the generator and PDF stack (worker initializer)."""
+    from . import designs, exporter, pdf_generator, pipeline, playlist  # noqa: F401
+
+
+def generate_game(game: BatchGame, output_dir: Union[str, Path]) -> dict:
+    """Generate, render and export one game (runs in a worker process).
+
+    Never raises: failures are reported in the returned summary, so one bad
+    playlist does not stop the batch.
+
+    Args:
+        game: Game to generate
+        output_dir: Directory for <slug>.pdf and <slug>.json
+
+    Returns:
+        Summary: name, status ("ok" or "failed"), and for successful games
+        game_id, num_cards, pdf, game_file, average overlap and seconds
+    """
+    from .designs import DesignCardGenerator
+    from .exporter import CardExporter
+    from .generator import CardGenerator
+    from .pdf_generator import PDFCardGenerator
+    from .pipeline import run_pipeline
+    from .playlist import PlaylistParser
+
+    start = time.perf_counter()
+    output_dir = Path(output_dir)
+    pdf_path = output_dir / f"{game.slug}.pdf"
+    game_path = output_dir / f"{game.slug}.json"
+    try:
+        playlist = PlaylistParser.parse_file(game.playlist)
+        if game.strategy == "design":
+            generator = DesignCardGenerator(
+                playlist, random_seed=game.seed, max_overlap=game.max_overlap
+            )
+        else:
+            generator = CardGenerator(playlist, random_seed=game.seed)
+        cards = generator.iter_compact_cards(game.num_cards)
+
+        pdf_generator = PDFCardGenerator(
+            venue_logo_path=game.venue_logo, dj_contact=game.dj_contact
+        )
+        extra = {
+            "name": game.name,
+            "pattern": game.pattern,
+            "playlist": CardExporter.playlist_to_list(playlist.songs),
+        }
+        results = run_pipeline(cards, {
+            "pdf": lambda stream: pdf_generator.generate_pdf(
+                stream, pdf_path, title=game.name, layout=game.layout
+            ),
+            "json": lambda stream: CardExporter.save_json(stream, game_path, extra=extra),
+            "statistics": generator.get_statistics,
+        })
+        game_id = json.loads(game_path.read_text(encoding="utf-8"))["game_id"]
+    except Exception as e:
+        return {"name": game.name, "status": "failed", "error": str(e)}
+
+    stats = results["statistics"]
+    return {
+        "name": game.name,
+        "status": "ok",
+        "game_id": game_id,
+        "num_cards": stats["num_cards"],
+        "pdf": pdf_path.name,
+        "game_file": game_path.name,
+        "average_overlap": round(stats["overlap"]["average_percentage"], 1),
+        "seconds": round(time.perf_counter() - start, 2),
+    }
+
+
+def run_batch(
+    games: List[BatchGame],
+    output_dir: Union[str, Path],
+    workers: Optional[int] = None,
+    on_result: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """Generate every game, in parallel, and write index.json.
+
+    Args:
+        games: Games to generate (see load_manifest)
+        output_dir: Output directory
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+        on_result: Called with each game's summary as it finishes
+
+    Returns:
+        The index: game summaries in manifest order, plus totals
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    # Largest games first, so the last games to start are quick ones
+    order = sorted(range(len(games)), key=lambda i: games[i].num_cards, reverse=True)
+    workers = min(workers or os.cpu_count() or 1, len(games))
+    summaries: List[Optional[dict]] = [None] * len(games)
+
+    if workers == 1:
+        for i in order:
+            summaries[i] = generate_game(games[i], output_dir)
+            if on_result is not None:
+                on_result(summaries[i])
+    else:
+        # Imported here: multiprocessing is slow to import and only needed for pools
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_warm_up) as pool:
+            futures = {pool.submit(generate_game, games[i], output_dir): i for i in order}
+            for future in as_completed(futures):
+                summaries[futures[future]] = future.result()
+                if on_result is not None:
+                    on_result(future.result())
+
+    index = {
+        "games": [
+            {**summary, "playlist": str(game.playlist), "settings": _settings(game)}
+            for game, summary in zip(games, summaries)
+        ],
+        "workers": workers,
+        "seconds": round(time.perf_counter() - start, 2),
+    }
+    (output_dir / "index.json").write_text(json.dumps(index, indent=2), encoding="utf-8")
+    return index
+
+
+def _settings(game: BatchGame) -> dict:
+    settings = asdict(game)
+    for key in ("name", "playlist"):
+        settings.pop(key)
+    if settings["venue_logo"] is not None:
+        settings["venue_logo"] = str(settings["venue_logo"])
+    return settings
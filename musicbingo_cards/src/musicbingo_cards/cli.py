@@ -1,15 +1,21 @@
-"""Command-line interface for Music Bingo card generation."""
+"""Command-line interface for Music Bingo card generation.
 
+Only lightweight modules are imported here. Card generation, the PDF stack
+(ReportLab, Pillow, qrcode) and the simulator's process pool are imported
+inside the subcommands that use them, so commands like ``validate`` start
+quickly.
+"""
+
+import json
 import sys
 from pathlib import Path
 from typing import Optional
+from uuid import uuid4
 
 import click
 
-from .exporter import CardExporter
-from .generator import CardGenerator, CardGenerationError
-from .pdf_generator import PDFCardGenerator
 from .playlist import PlaylistError, PlaylistParser, validate_playlist_size
+from .simulator import PATTERNS
 
 
 @click.group()
@@ -58,7 +64,72 @@ def main():
     type=click.Path(),
     help="Export card data to JSON file (for API integration)",
 )
-def generate(playlist_file, num_cards, output, seed, venue_logo, dj_contact, layout, export_json):
+@click.option(
+    "--audit",
+    "audit_pattern",
+    type=click.Choice(PATTERNS),
+    help="Audit per-card win rates for this pattern; report is written beside the PDF",
+)
+@click.option(
+    "--regenerate-outliers",
+    is_flag=True,
+    help="With --audit, replace cards whose win rate is an outlier",
+)
+@click.option(
+    "--strategy",
+    type=click.Choice(["weighted", "design"]),
+    default="weighted",
+    show_default=True,
+    help="'weighted' random cards, or 'design' cards with a guaranteed overlap bound",
+)
+@click.option(
+    "--max-overlap",
+    type=int,
+    help="With --strategy design, most songs any two cards may share (default: from playlist size)",
+)
+@click.option(
+    "--registry",
+    "registry_dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Directory of issued-card registries; never reprint a card issued for this playlist",
+)
+@click.option(
+    "--cache",
+    "cache_dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Render cache directory; with --seed, reuse cards and PDFs from identical earlier runs",
+)
+@click.option(
+    "--pool",
+    "pool_dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Draw the cards from the playlist's pre-generated pool (see build-pool)",
+)
+@click.option(
+    "--pool-window",
+    type=click.IntRange(min=0),
+    default=28,
+    show_default=True,
+    help="With --pool, days before a drawn card may be drawn again",
+)
+def generate(
+    playlist_file,
+    num_cards,
+    output,
+    seed,
+    venue_logo,
+    dj_contact,
+    layout,
+    export_json,
+    audit_pattern,
+    regenerate_outliers,
+    strategy,
+    max_overlap,
+    registry_dir,
+    cache_dir,
+    pool_dir,
+    pool_window,
+):
     """Generate bingo cards from a playlist.
 
     PLAYLIST_FILE: Path to playlist file (CSV, JSON, or TXT format)
@@ -69,6 +140,11 @@ def generate(playlist_file, num_cards, output, seed, venue_logo, dj_contact, lay
     - JSON: [{"title": "...", "artist": "..."}, ...]
     - TXT: Title - Artist (one per line)
     """
+    from .exporter import CardExporter
+    from .generator import CardGenerationError, CardGenerator
+    from .pdf_generator import PDFCardGenerator
+    from .pipeline import PipelineError, run_pipeline
+
     click.echo(f"📋 Loading playlist from {playlist_file}...")
 
     # Parse playlist
@@ -104,30 +180,8 @@ def generate(playlist_file, num_cards, output, seed, venue_logo, dj_contact, lay
     if seed is not None:
         click.echo(f"🎲 Random seed: {seed}")
 
-    # Generate cards
-    click.echo(f"\n🎲 Generating {num_cards} unique bingo cards...")
-
-    try:
-        generator = CardGenerator(playlist, random_seed=seed)
-        cards = generator.generate_cards(num_cards)
-        click.secho(f"✓ Generated {len(cards)} unique cards", fg="green")
-
-        # Show statistics
-        stats = generator.get_statistics(cards)
-        if stats.get("num_cards", 0) > 0 and "overlap" in stats:
-            avg_overlap = stats["overlap"]["average_percentage"]
-            click.echo(f"  Average overlap: {avg_overlap:.1f}%")
-            click.echo(f"  Target range: 30-40%")
-
-            if 30 <= avg_overlap <= 40:
-                click.secho("  ✓ Overlap within target range!", fg="green")
-            elif avg_overlap < 30:
-                click.secho("  ⚠ Overlap slightly low", fg="yellow")
-            else:
-                click.secho("  ⚠ Overlap slightly high", fg="yellow")
-
-    except CardGenerationError as e:
-        click.secho(f"\n✗ Card generation failed: {e}", fg="red", err=True)
+    if regenerate_outliers and not audit_pattern:
+        click.secho("✗ --regenerate-outliers requires --audit", fg="red", err=True)
         sys.exit(1)
 
     # Validate venue logo if provided
@@ -142,7 +196,123 @@ def generate(playlist_file, num_cards, output, seed, venue_logo, dj_contact, lay
             )
             sys.exit(1)
 
-    # Generate PDF
+    if max_overlap is not None and strategy != "design":
+        click.secho("✗ --max-overlap requires --strategy design", fg="red", err=True)
+        sys.exit(1)
+
+    if pool_dir is not None and registry_dir is not None:
+        click.secho("✗ --pool and --registry cannot be combined", fg="red", err=True)
+        sys.exit(1)
+
+    pool = None
+    if pool_dir is not None:
+        from datetime import timedelta
+
+        from .pool import CardPool, CardPoolError
+
+        try:
+            pool = CardPool.load(pool_dir, playlist, window=timedelta(days=pool_window))
+        except CardPoolError as e:
+            click.secho(f"✗ {e} (run build-pool first)", fg="red", err=True)
+            sys.exit(1)
+        click.echo(f"🗂 Card pool: {len(pool)} cards")
+
+    registry = None
+    if registry_dir is not None:
+        from .registry import CardRegistry
+
+        try:
+            registry = CardRegistry.for_playlist(
+                registry_dir, (song.song_id for song in playlist.songs)
+            )
+        except (OSError, ValueError) as e:
+            click.secho(f"✗ Cannot open card registry: {e}", fg="red", err=True)
+            sys.exit(1)
+        click.echo(f"🗂 Card registry: {len(registry)} cards already issued for this playlist")
+
+    # Generate cards lazily; they are rendered, exported and counted as they arrive
+    click.echo(f"\n🎲 Generating {num_cards} unique bingo cards...")
+    game_id = str(uuid4())
+    if strategy == "design":
+        from .designs import DesignCardGenerator
+
+        try:
+            generator = DesignCardGenerator(
+                playlist, random_seed=seed, registry=registry, max_overlap=max_overlap
+            )
+        except CardGenerationError as e:
+            click.secho(f"✗ {e}", fg="red", err=True)
+            sys.exit(1)
+        click.echo(f"  Design: any two cards share at most {generator.max_overlap} songs")
+    else:
+        generator = CardGenerator(playlist, random_seed=seed, registry=registry)
+
+    # Seeded runs are reproducible, so their cards and PDFs can be cached
+    cache = None
+    cached_cards = None
+    if cache_dir is not None:
+        if seed is None or audit_pattern or registry is not None or pool is not None:
+            click.secho(
+                "⚠ --cache needs --seed and no --audit, --registry or --pool; not caching",
+                fg="yellow",
+            )
+        else:
+            from .render_cache import RenderCache, cards_key, render_key
+
+            cache = RenderCache(cache_dir)
+            set_key = cards_key(
+                playlist, seed, num_cards, strategy, getattr(generator, "max_overlap", None)
+            )
+            pdf_key = render_key(set_key, layout, venue_logo_path, dj_contact)
+            cached_cards = cache.load_cards(set_key, playlist)
+
+    try:
+        if pool is not None:
+            try:
+                cards = pool.draw(num_cards, game_id, seed=seed)
+            except CardPoolError as e:
+                click.secho(f"\n✗ {e}", fg="red", err=True)
+                sys.exit(1)
+        elif cached_cards is not None:
+            click.echo("  ♻ Cards found in render cache; skipping generation")
+            cards = cached_cards
+            game_id = str(cards[0].game_id)
+        else:
+            cards = generator.iter_compact_cards(num_cards, game_id)
+
+        # Fairness audit needs the full set (and may replace cards) before rendering
+        fairness_report = None
+        if audit_pattern:
+            from .fairness import audit_cards
+            from .fairness import regenerate_outliers as regenerate
+
+            cards = list(cards)
+            click.echo(f"\n⚖ Auditing card fairness ({audit_pattern})...")
+            if regenerate_outliers:
+                fairness_report = regenerate(cards, generator, audit_pattern, seed=seed)
+            else:
+                song_ids = [song.song_id for song in playlist.songs]
+                fairness_report = audit_cards(cards, audit_pattern, song_ids, seed=seed)
+    except CardGenerationError as e:
+        click.secho(f"\n✗ Card generation failed: {e}", fg="red", err=True)
+        sys.exit(1)
+
+    if fairness_report is not None:
+        click.echo(
+            f"  {fairness_report.trials} simulated games, "
+            f"first winner after {fairness_report.mean_calls:.1f} songs on average"
+        )
+        if fairness_report.regenerated:
+            click.secho(
+                f"  ↻ Regenerated cards: {', '.join(map(str, fairness_report.regenerated))}",
+                fg="yellow",
+            )
+        if fairness_report.flagged:
+            numbers = ", ".join(str(card.card_number) for card in fairness_report.flagged)
+            click.secho(f"  ⚠ Outlier cards: {numbers}", fg="yellow")
+        else:
+            click.secho("  ✓ No outlier cards", fg="green")
+
     click.echo(f"\n📄 Creating PDF: {output}")
     if layout == "4up":
         import math
@@ -151,57 +321,199 @@ def generate(playlist_file, num_cards, output, seed, venue_logo, dj_contact, lay
     else:
         click.echo(f"  Layout: single ({num_cards} pages)")
 
+    pdf_generator = PDFCardGenerator(
+        venue_logo_path=venue_logo_path,
+        dj_contact=dj_contact,
+    )
+    output_path = Path(output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    json_path = Path(export_json) if export_json else None
+    pdf_cached = cached_cards is not None and cache.has_pdf(pdf_key)
+    json_cached = json_path is not None and cache is not None and cache.json_path(set_key).exists()
+
+    if pdf_cached:
+        import shutil
+
+        click.echo("  ♻ PDF found in render cache")
+        shutil.copyfile(cache.pdf_path(pdf_key), output_path)
+        results = {"statistics": generator.get_statistics(cards)}
+        if json_path is not None:
+            if json_cached:
+                json_path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(cache.json_path(set_key), json_path)
+                results["json"] = len(cards)
+            else:
+                results["json"] = CardExporter.save_json(cards, json_path)
+    else:
+        stages = {
+            "pdf": lambda stream: pdf_generator.generate_pdf(stream, output_path, layout=layout),
+            "statistics": generator.get_statistics,
+        }
+        if json_path is not None:
+            stages["json"] = lambda stream: CardExporter.save_json(stream, json_path)
+        if cache is not None and cached_cards is None:
+            stages["cache"] = lambda stream: cache.store_cards(set_key, stream, expected=num_cards)
+
+        try:
+            results = run_pipeline(cards, stages)
+        except CardGenerationError as e:
+            click.secho(f"\n✗ Card generation failed: {e}", fg="red", err=True)
+            sys.exit(1)
+        except PipelineError as e:
+            step = {"pdf": "PDF generation", "json": "JSON export"}.get(e.stage, e.stage)
+            click.secho(f"\n✗ {step} failed: {e.error}", fg="red", err=True)
+            sys.exit(1)
+
+    if cache is not None:
+        if not pdf_cached:
+            cache.store_file(output_path, cache.pdf_path(pdf_key))
+        if json_path is not None and not json_cached:
+            cache.store_file(json_path, cache.json_path(set_key))
+
+    # Cards are issued: record them so later games never reprint them
+    if registry is not None:
+        registry.flush()
+    if pool is not None:
+        pool.record_draw(cards)
+
+    # Show statistics
+    stats = results["statistics"]
+    click.secho(f"✓ Generated {stats['num_cards']} unique cards", fg="green")
+    if stats.get("num_cards", 0) > 0 and "overlap" in stats:
+        avg_overlap = stats["overlap"]["average_percentage"]
+        click.echo(f"  Average overlap: {avg_overlap:.1f}%")
+        click.echo(f"  Target range: 30-40%")
+
+        if 30 <= avg_overlap <= 40:
+            click.secho("  ✓ Overlap within target range!", fg="green")
+        elif avg_overlap < 30:
+            click.secho("  ⚠ Overlap slightly low", fg="yellow")
+        else:
+            click.secho("  ⚠ Overlap slightly high", fg="yellow")
+
+    # Check file size
+    file_size_mb = output_path.stat().st_size / (1024 * 1024)
+    click.secho(f"✓ PDF created successfully ({file_size_mb:.2f} MB)", fg="green")
+
+    if fairness_report is not None:
+        report_path = output_path.with_suffix(".fairness.json")
+        fairness_report.save_json(report_path)
+        click.echo(f"  Fairness report: {report_path}")
+
+    if export_json:
+        click.secho(f"✓ JSON export successful", fg="green")
+        click.echo(f"  Game ID: {game_id}")
+        click.echo(f"  Cards exported: {results['json']}")
+        click.echo(f"  File: {json_path.absolute()}")
+        click.echo("\nℹ Use this JSON file to load cards into the API:")
+        click.echo(f"  POST /api/game/{{game_id}}/cards/bulk")
+
+    # Summary
+    click.echo("\n✨ Generation complete!")
+    click.echo(f"  Cards: {stats['num_cards']}")
+    click.echo(f"  Output: {output_path.absolute()}")
+
+    if venue_logo or dj_contact:
+        click.echo("\n✓ Custom branding applied:")
+        if venue_logo:
+            click.secho(f"  Logo: {venue_logo}", fg="green")
+        if dj_contact:
+            click.secho(f"  Contact: {dj_contact}", fg="green")
+
+
+@main.command("build-pool")
+@click.argument("playlist_file", type=click.Path(exists=True))
+@click.option(
+    "--pool",
+    "pool_dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    required=True,
+    help="Directory to store the pool in",
+)
+@click.option(
+    "--size",
+    "-n",
+    type=int,
+    default=1000,
+    show_default=True,
+    help="Number of unique cards in the pool (1-10000)",
+)
+@click.option("--seed", "-s", type=int, help="Random seed for a reproducible pool")
+def build_pool(playlist_file, pool_dir, size, seed):
+    """Pre-generate a card pool for a playlist.
+
+    `generate --pool` then draws cards from the pool in milliseconds instead
+    of generating them. Rebuilding replaces the pool and its draw history.
+
+    PLAYLIST_FILE: Path to playlist file (CSV, JSON, or TXT format)
+    """
+    from .generator import CardGenerationError
+    from .pool import CardPool, CardPoolError
+
     try:
-        pdf_generator = PDFCardGenerator(
-            venue_logo_path=venue_logo_path,
-            dj_contact=dj_contact,
-        )
-        output_path = Path(output)
+        playlist = PlaylistParser.parse_file(playlist_file)
+    except PlaylistError as e:
+        click.secho(f"✗ Error loading playlist: {e}", fg="red", err=True)
+        sys.exit(1)
 
-        # Create parent directory if needed
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+    click.echo(f"🎲 Generating a pool of {size} cards for {len(playlist)} songs...")
+    try:
+        pool = CardPool.build(pool_dir, playlist, size=size, seed=seed)
+    except (CardPoolError, CardGenerationError) as e:
+        click.secho(f"✗ Pool generation failed: {e}", fg="red", err=True)
+        sys.exit(1)
+
+    size_kb = pool.pool_path.stat().st_size / 1024
+    click.secho(f"✓ Pool saved: {pool.pool_path} ({size_kb:.0f} KB)", fg="green")
 
-        # Generate PDF with selected layout
-        pdf_generator.generate_pdf(cards, output_path, layout=layout)
 
-        # Check file size
-        file_size_mb = output_path.stat().st_size / (1024 * 1024)
-        click.secho(f"✓ PDF created successfully ({file_size_mb:.2f} MB)", fg="green")
+@main.command()
+@click.argument("manifest_file", type=click.Path(exists=True))
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False, path_type=Path),
+    required=True,
+    help="Directory for the PDFs, game files and index.json",
+)
+@click.option("--workers", "-w", type=int, help="Worker processes (default: CPU count)")
+def batch(manifest_file, output_dir, workers):
+    """Generate every game in a manifest, in parallel.
 
-        # Summary
-        click.echo("\n✨ Generation complete!")
-        click.echo(f"  Cards: {len(cards)}")
-        click.echo(f"  Output: {output_path.absolute()}")
+    Each game writes <name>.pdf and a <name>.json game file; index.json
+    summarizes the batch.
 
-        if venue_logo or dj_contact:
-            click.echo("\n✓ Custom branding applied:")
-            if venue_logo:
-                click.secho(f"  Logo: {venue_logo}", fg="green")
-            if dj_contact:
-                click.secho(f"  Contact: {dj_contact}", fg="green")
+    MANIFEST_FILE: JSON manifest with a "games" list and optional "defaults"
+    """
+    from .batch import ManifestError, load_manifest, run_batch
 
-    except Exception as e:
-        click.secho(f"\n✗ PDF generation failed: {e}", fg="red", err=True)
+    try:
+        games = load_manifest(manifest_file)
+    except ManifestError as e:
+        click.secho(f"✗ {e}", fg="red", err=True)
         sys.exit(1)
 
-    # Export JSON if requested
-    if export_json:
-        click.echo(f"\n📤 Exporting card data to JSON: {export_json}")
-        try:
-            json_path = Path(export_json)
-            CardExporter.save_json(cards, json_path)
-
-            summary = CardExporter.get_summary(cards)
-            click.secho(f"✓ JSON export successful", fg="green")
-            click.echo(f"  Game ID: {summary['game_id']}")
-            click.echo(f"  Cards exported: {summary['card_count']}")
-            click.echo(f"  File: {json_path.absolute()}")
-            click.echo("\nℹ Use this JSON file to load cards into the API:")
-            click.echo(f"  POST /api/game/{{game_id}}/cards/bulk")
-
-        except Exception as e:
-            click.secho(f"\n✗ JSON export failed: {e}", fg="red", err=True)
-            sys.exit(1)
+    click.echo(f"🎲 Generating {len(games)} games...")
+
+    def report(summary):
+        if summary["status"] == "ok":
+            click.secho(
+                f"  ✓ {summary['name']}: {summary['num_cards']} cards ({summary['seconds']}s)",
+                fg="green",
+            )
+        else:
+            click.secho(f"  ✗ {summary['name']}: {summary['error']}", fg="red", err=True)
+
+    index = run_batch(games, output_dir, workers, on_result=report)
+    failed = sum(1 for game in index["games"] if game["status"] != "ok")
+    click.echo(
+        f"\n{len(games) - failed}/{len(games)} games in {index['seconds']}s "
+        f"with {index['workers']} workers"
+    )
+    click.echo(f"Index: {Path(output_dir) / 'index.json'}")
+    if failed:
+        sys.exit(1)
 
 
 @main.command()
@@ -293,5 +605,132 @@ def import_csv(csv_file: Path, name: str, output: Optional[Path]):
         raise SystemExit(1)
 
 
+@main.command()
+@click.argument("cards_file", type=click.Path(exists=True))
+@click.option("--trials", "-t", type=int, default=2000, help="Number of random games to play")
+@click.option(
+    "--pattern",
+    "-p",
+    "patterns",
+    multiple=True,
+    type=click.Choice(PATTERNS),
+    help="Pattern to simulate (repeatable; default: all)",
+)
+@click.option(
+    "--num-songs",
+    type=int,
+    help="Songs in the call pool (for card exports without a playlist)",
+)
+@click.option("--seed", "-s", type=int, help="Random seed for reproducible results")
+@click.option("--workers", "-w", type=int, help="Worker processes (default: CPU count)")
+@click.option(
+    "--output", "-o", type=click.Path(), help="Write full results (with histograms) to JSON"
+)
+def simulate(cards_file, trials, patterns, num_songs, seed, workers, output):
+    """Estimate how many songs it takes to get a first winner.
+
+    CARDS_FILE: Card export (generate --export-json) or game JSON file
+
+    Plays random call orders against the cards and reports, per pattern,
+    the distribution of calls until the first winner and how often more
+    than one card wins on that call.
+    """
+    from .simulator import CardSet
+    from .simulator import simulate as run_simulation
+
+    try:
+        card_set = CardSet.load(cards_file, num_songs)
+    except (ValueError, KeyError, json.JSONDecodeError) as e:
+        click.secho(f"✗ Cannot read cards: {e}", fg="red", err=True)
+        sys.exit(1)
+
+    if trials < 1:
+        click.secho("✗ --trials must be at least 1", fg="red", err=True)
+        sys.exit(1)
+
+    click.echo(
+        f"🎲 Simulating {trials} games: {card_set.num_cards} cards, "
+        f"{len(card_set.song_ids)} songs"
+    )
+    results = run_simulation(card_set, list(patterns) or None, trials, seed, workers)
+
+    click.echo(f"\n{'Pattern':<15}{'min':>5}{'p10':>6}{'median':>8}{'mean':>8}{'p90':>6}"
+               f"{'max':>6}{'ties':>8}")
+    for stats in results.values():
+        summary = stats.to_dict()
+        if not stats.won:
+            click.echo(f"{stats.pattern:<15}  no winners")
+            continue
+        click.echo(
+            f"{stats.pattern:<15}{summary['min']:>5}{summary['p10']:>6}{summary['median']:>8}"
+            f"{summary['mean']:>8.1f}{summary['p90']:>6}{summary['max']:>6}"
+            f"{stats.simultaneous_rate:>8.1%}"
+        )
+        if stats.no_winner:
+            click.secho(f"  ⚠ {stats.no_winner} games had no winner", fg="yellow")
+    click.echo("\nties = games where more than one card won on the first winning call")
+
+    if output:
+        report = {
+            "cards_file": str(cards_file),
+            "num_cards": card_set.num_cards,
+            "num_songs": len(card_set.song_ids),
+            "trials": trials,
+            "seed": seed,
+            "patterns": [stats.to_dict() for stats in results.values()],
+        }
+        Path(output).write_text(json.dumps(report, indent=2))
+        click.secho(f"✓ Results written to {output}", fg="green")
+
+
+@main.command()
+@click.argument("cards_file", type=click.Path(exists=True))
+@click.option(
+    "--pattern",
+    "-p",
+    type=click.Choice(PATTERNS),
+    default="five_in_a_row",
+    help="Winning pattern to audit",
+)
+@click.option("--trials", "-t", type=int, help="Random games (default: 20 per card, min 2000)")
+@click.option("--num-songs", type=int, help="Songs in the call pool (for card exports)")
+@click.option("--seed", "-s", type=int, help="Random seed for reproducible results")
+@click.option("--workers", "-w", type=int, help="Worker processes (default: CPU count)")
+@click.option("--output", "-o", type=click.Path(), help="Write the report to JSON")
+def audit(cards_file, pattern, trials, num_songs, seed, workers, output):
+    """Flag cards that are favoured or disadvantaged for a pattern.
+
+    CARDS_FILE: Card export (generate --export-json) or game JSON file
+    """
+    from .fairness import audit_card_set
+    from .simulator import CardSet
+
+    try:
+        with open(cards_file) as f:
+            data = json.load(f)
+        card_set = CardSet.from_json_dict(data, num_songs)
+        card_ids = [str(card.get("card_id", "")) for card in data["cards"]]
+        report = audit_card_set(card_set, card_ids, pattern, trials, seed, workers)
+    except (ValueError, KeyError) as e:
+        click.secho(f"✗ Cannot audit cards: {e}", fg="red", err=True)
+        sys.exit(1)
+
+    click.echo(f"⚖ {card_set.num_cards} cards, {report.trials} simulated games ({pattern})")
+    click.echo(f"  Expected win rate per card: {report.expected_rate:.3%}")
+    for card in report.flagged:
+        direction = "favoured" if card.z_score > 0 else "disadvantaged"
+        click.secho(
+            f"  ⚠ Card {card.card_number}: {card.win_rate:.3%} "
+            f"({direction}, z={card.z_score:+.1f})",
+            fg="yellow",
+        )
+    if not report.flagged:
+        click.secho("  ✓ No outlier cards", fg="green")
+
+    if output:
+        report.save_json(output)
+        click.secho(f"✓ Report written to {output}", fg="green")
+
+
 if __name__ == "__main__":
     main()
@@ -11,17 +11,15 @@ Exportify (https://exportify.net) exports playlists with columns:
 """
 
 import csv
-import hashlib
 from pathlib import Path
 from typing import Optional
 
+from .models import stable_song_id
 
-def generate_song_id(title: str, artist: str) -> str:
-    """Generate a unique song ID from title and artist."""
-    # Normalize and combine
-    combined = f"{title.lower().strip()}|{artist.lower().strip()}"
-    # Create short hash
-    return hashlib.sha256(combined.encode()).hexdigest()[:12]
+
+def generate_song_id(title: str, artist: str, isrc: Optional[str] = None) -> str:
+    """Generate a stable song ID from ISRC, or title and artist (see stable_song_id)."""
+    return str(stable_song_id(title, artist, isrc))
 
 
 def parse_exportify_csv(csv_path: Path) -> list[dict]:
@@ -73,8 +71,9 @@ def parse_exportify_csv(csv_path: Path) -> list[dict]:
             if not title or not artist:
                 continue  # Skip rows without title or artist
 
+            isrc = (row.get(isrc_col) or '').strip() if isrc_col else ''
             song = {
-                'song_id': generate_song_id(title, artist),
+                'song_id': generate_song_id(title, artist, isrc),
                 'title': title,
                 'artist': artist,
             }
@@ -89,8 +88,8 @@ def parse_exportify_csv(csv_path: Path) -> list[dict]:
                 except ValueError:
                     pass
 
-            if isrc_col and row.get(isrc_col):
-                song['isrc'] = row[isrc_col].strip()
+            if isrc:
+                song['isrc'] = isrc
 
             songs.append(song)
 
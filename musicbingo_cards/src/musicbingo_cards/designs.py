@@ -0,0 +1,177 @@
+"""Card generation from a greedy packing design with a hard overlap bound.
+
+CardGenerator draws songs at random (weighted by usage) and retries until a
+card is unique, so pairwise overlap and song frequencies are only right on
+average. DesignCardGenerator builds each card deterministically from the
+cards before it:
+
+- Songs are taken least-used first (random among equal counts), so song
+  frequencies never differ by more than the overlap bound forces.
+- A song is admissible only if no earlier card that contains it already
+  shares max_overlap songs with the card being built. No two cards can
+  therefore share more than max_overlap songs, and since max_overlap < 24
+  every card is unique.
+
+There are no retries: if fewer than 24 songs are admissible the bound is
+too tight for this many cards, and CardGenerationError says so.
+
+Overlap counters for all earlier cards are kept bit-sliced: plane i holds
+bit i of every card's overlap count, one bit per card in a Python int. Adding
+a song is then a ripple-carry add of that song's card mask over a few planes,
+and "cards at the bound" is a handful of ANDs, whatever the number of cards.
+"""
+
+import math
+from typing import Iterator, List, Optional
+from uuid import UUID
+
+from .generator import CardGenerationError, CardGenerator
+from .models import AnyCard, BingoCard, CompactCard
+from .playlist import Playlist
+from .registry import CardRegistry
+
+SONGS_PER_CARD = 24
+
+
+def default_max_overlap(num_songs: int) -> int:
+    """Overlap bound the greedy design meets for up to 1000 cards.
+
+    Two random cards share 24*24/num_songs songs on average (mu); the bound
+    leaves 2*sqrt(mu) + 1 songs of slack above that.
+
+    Args:
+        num_songs: Songs in the playlist
+
+    Returns:
+        Maximum pairwise overlap (1-23 songs)
+    """
+    mu = SONGS_PER_CARD * SONGS_PER_CARD / num_songs
+    return min(SONGS_PER_CARD - 1, math.ceil(mu + 2 * math.sqrt(mu) + 1))
+
+
+class _Design:
+    """Cards built so far, as one card bitmask per song."""
+
+    def __init__(self, num_songs: int):
+        self.num_cards = 0
+        self.cards_with = [0] * num_songs
+        self.frequency = [0] * num_songs
+
+    def add(self, indices: List[int]) -> None:
+        bit = 1 << self.num_cards
+        for index in indices:
+            self.cards_with[index] |= bit
+            self.frequency[index] += 1
+        self.num_cards += 1
+
+
+class DesignCardGenerator(CardGenerator):
+    """Generates cards with a guaranteed maximum pairwise overlap.
+
+    Drop-in replacement for CardGenerator (see the module docstring).
+    """
+
+    def __init__(
+        self,
+        playlist: Playlist,
+        random_seed: int = None,
+        registry: Optional[CardRegistry] = None,
+        max_overlap: Optional[int] = None,
+    ):
+        """Initialize design generator.
+
+        Args:
+            playlist: Playlist to generate cards from
+            random_seed: Optional seed for reproducible randomness
+            registry: Optional registry of previously issued cards (see CardGenerator)
+            max_overlap: Most songs any two cards may share (1-23, default
+                from default_max_overlap)
+
+        Raises:
+            CardGenerationError: If max_overlap is out of range
+        """
+        super().__init__(playlist, random_seed=random_seed, registry=registry)
+        if max_overlap is None:
+            max_overlap = default_max_overlap(max(len(self.songs), 1))
+        if not 1 <= max_overlap < SONGS_PER_CARD:
+            raise CardGenerationError(
+                f"Invalid max overlap: {max_overlap}. Must be 1-{SONGS_PER_CARD - 1}."
+            )
+        self.max_overlap = max_overlap
+
+    def _iter_unique_cards(self, num_cards: int, game_id: UUID) -> Iterator[CompactCard]:
+        """Yield cards of a new design for a validated request."""
+        design = _Design(len(self.songs))
+        for i in range(num_cards):
+            selected = self._pack(design)
+            design.add(selected)
+            card = self._place(selected, game_id)
+            if not self._register(card):
+                raise CardGenerationError(
+                    f"Card {i + 1}/{num_cards} was issued in an earlier game; use another seed"
+                )
+            yield card
+
+    def generate_replacement(self, existing_cards: List[AnyCard]) -> BingoCard:
+        """Generate one new card within the overlap bound of every existing card.
+
+        Raises:
+            CardGenerationError: If no admissible card exists
+        """
+        if not existing_cards:
+            raise CardGenerationError("Cannot generate a replacement without existing cards")
+
+        design = _Design(len(self.songs))
+        for card in existing_cards:
+            design.add([self._song_index[song.song_id] for song in card.iter_songs()])
+        card = self._place(self._pack(design), existing_cards[0].game_id)
+        if not self._register(card):
+            raise CardGenerationError("Replacement card was issued in an earlier game")
+        return card.to_bingo_card()
+
+    def _place(self, selected: List[int], game_id: UUID) -> CompactCard:
+        """Shuffle selected songs into grid positions and count their use."""
+        self.rng.shuffle(selected)
+        for index in selected:
+            self.song_usage_count[self.songs[index].song_id] += 1
+        return CompactCard(self._playlist, selected, game_id=game_id)
+
+    def _pack(self, design: _Design) -> List[int]:
+        """Pick 24 songs, least used first, keeping every overlap within the bound.
+
+        Raises:
+            CardGenerationError: If fewer than 24 songs are admissible
+        """
+        bound = self.max_overlap
+        num_planes = bound.bit_length()
+        planes = [0] * num_planes
+        at_bound = 0
+        cards_with = design.cards_with
+        frequency = design.frequency
+        rng = self.rng
+
+        order = sorted(range(len(self.songs)), key=lambda s: (frequency[s], rng.random()))
+        selected: List[int] = []
+        for index in order:
+            if cards_with[index] & at_bound:
+                continue
+            selected.append(index)
+            if len(selected) == SONGS_PER_CARD:
+                return selected
+
+            # Add 1 to the overlap of every card holding this song
+            carry = cards_with[index]
+            for plane in range(num_planes):
+                if not carry:
+                    break
+                planes[plane], carry = planes[plane] ^ carry, planes[plane] & carry
+
+            # Cards whose overlap now equals the bound
+            at_bound = (1 << design.num_cards) - 1
+            for plane in range(num_planes):
+                at_bound &= planes[plane] if bound >> plane & 1 else ~planes[plane]
+
+        raise CardGenerationError(
+            f"Max overlap {bound} is too tight for {design.num_cards + 1} cards from "
+            f"{len(self.songs)} songs; allow a larger overlap or generate fewer cards"
+        )
@@ -1,17 +1,19 @@
 """Export card data for API integration."""
 
+import itertools
 import json
+import textwrap
 from pathlib import Path
-from typing import List, Union
+from typing import Iterable, List, Optional, Union
 
-from .models import BingoCard
+from .models import AnyCard, Song
 
 
 class CardExporter:
     """Export generated cards to various formats for API integration."""
 
     @staticmethod
-    def to_json_dict(cards: List[BingoCard]) -> dict:
+    def to_json_dict(cards: List[AnyCard]) -> dict:
         """Convert cards to JSON-serializable dictionary.
 
         Format matches API CardData schema:
@@ -41,23 +43,10 @@ class CardExporter:
         # All cards should have the same game_id
         game_id = str(cards[0].game_id)
 
-        card_data = []
-        for idx, card in enumerate(cards):
-            # Build song_positions map
-            song_positions = {}
-            for row in range(5):
-                for col in range(5):
-                    if row == 2 and col == 2:  # Skip center free space
-                        continue
-                    song = card.grid.get_song(row, col)
-                    if song:
-                        song_positions[str(song.song_id)] = [row, col]
-
-            card_data.append({
-                "card_id": str(card.card_id),
-                "card_number": idx + 1,  # 1-indexed card numbers
-                "song_positions": song_positions
-            })
+        card_data = [
+            CardExporter.card_to_dict(card, card_number)
+            for card_number, card in enumerate(cards, 1)
+        ]
 
         return {
             "game_id": game_id,
@@ -65,7 +54,28 @@ class CardExporter:
         }
 
     @staticmethod
-    def to_json_string(cards: List[BingoCard], indent: int = 2) -> str:
+    def card_to_dict(card: AnyCard, card_number: int) -> dict:
+        """Convert one card to its entry in the export "cards" list.
+
+        Args:
+            card: BingoCard to convert
+            card_number: 1-indexed position of the card in the export
+
+        Returns:
+            Dictionary with card_id, card_number and song_positions
+        """
+        song_positions = {
+            str(song.song_id): [row, col] for (row, col), song in card.cells()
+        }
+
+        return {
+            "card_id": str(card.card_id),
+            "card_number": card_number,
+            "song_positions": song_positions
+        }
+
+    @staticmethod
+    def to_json_string(cards: List[AnyCard], indent: int = 2) -> str:
         """Convert cards to JSON string.
 
         Args:
@@ -79,24 +89,88 @@ class CardExporter:
         return json.dumps(data, indent=indent)
 
     @staticmethod
-    def save_json(cards: List[BingoCard], file_path: Union[str, Path], indent: int = 2) -> None:
+    def playlist_to_list(songs: Iterable[Song]) -> List[dict]:
+        """Convert songs to the "playlist" list of an API game file.
+
+        Args:
+            songs: Songs in playlist order
+
+        Returns:
+            List of dicts with song_id, title, artist, album and duration_seconds
+        """
+        return [
+            {
+                "song_id": str(song.song_id),
+                "title": song.title,
+                "artist": song.artist,
+                "album": song.album,
+                "duration_seconds": song.duration_seconds,
+            }
+            for song in songs
+        ]
+
+    @staticmethod
+    def save_json(
+        cards: Iterable[AnyCard],
+        file_path: Union[str, Path],
+        indent: Optional[int] = 2,
+        extra: Optional[dict] = None,
+    ) -> int:
         """Save cards to JSON file.
 
+        Cards are written as they are read, so a lazy iterator such as
+        CardGenerator.iter_cards is never held in memory. The file is the same
+        as json.dump(to_json_dict(cards), indent=indent), with any extra keys
+        between "game_id" and "cards".
+
         Args:
-            cards: List of BingoCard objects
+            cards: BingoCard objects (list or iterator)
             file_path: Path to output file
             indent: JSON indentation level
+            extra: Additional top-level fields, e.g. name and playlist for an
+                API game file (see load_game_from_file in musicbingo_api)
+
+        Returns:
+            Number of cards written
+
+        Raises:
+            ValueError: If there are no cards
         """
-        data = CardExporter.to_json_dict(cards)
+        cards = iter(cards)
+        first = next(cards, None)
+        if first is None:
+            raise ValueError("Cannot export empty card list")
+
+        fields = {"game_id": str(first.game_id), **(extra or {})}
+        if indent is None:
+            head = "{" + "".join(f"{json.dumps(k)}: {json.dumps(v)}, " for k, v in fields.items())
+            head, separator, tail = head + '"cards": [', ", ", "]}"
+        else:
+            pad = " " * indent
+            head = "{\n" + "".join(
+                f"{pad}{json.dumps(k)}: "
+                + textwrap.indent(json.dumps(v, indent=indent), pad).lstrip(" ")
+                + ",\n"
+                for k, v in fields.items()
+            )
+            head += f'{pad}"cards": [\n'
+            separator, tail = ",\n", f"\n{pad}]\n}}"
 
         file_path = Path(file_path)
         file_path.parent.mkdir(parents=True, exist_ok=True)
 
         with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=indent)
+            f.write(head)
+            for count, card in enumerate(itertools.chain([first], cards), 1):
+                entry = json.dumps(CardExporter.card_to_dict(card, count), indent=indent)
+                if indent is not None:
+                    entry = textwrap.indent(entry, pad * 2)
+                f.write(entry if count == 1 else separator + entry)
+            f.write(tail)
+        return count
 
     @staticmethod
-    def get_summary(cards: List[BingoCard]) -> dict:
+    def get_summary(cards: List[AnyCard]) -> dict:
         """Get summary statistics about exported cards.
 
         Args:
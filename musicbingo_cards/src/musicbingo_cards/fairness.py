@@ -0,0 +1,255 @@
+"""Per-card fairness audit.
+
+Every full card has the same chance of completing a pattern by call k on
+its own, but its chance of being a first winner depends on how its songs
+overlap with the other cards. A card built from songs that are rarely
+shared, or that shares whole lines with other cards, can end up favoured
+or disadvantaged.
+
+The audit plays random call orders (see simulator) and counts how often
+each card is among the winners on the first winning call. Each card's win
+count is compared with the set-wide average as a binomial z-score; cards
+beyond the threshold are flagged and can be regenerated.
+"""
+
+import json
+import math
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Union
+
+from .exporter import CardExporter
+from .generator import CardGenerator
+from .models import BingoCard
+from .simulator import PATTERN_LINES, CardSet, run_chunks
+
+DEFAULT_Z_THRESHOLD = 4.0  # keeps chance flags rare even for 1000-card sets
+MIN_TRIALS = 2000
+TRIALS_PER_CARD = 20
+
+
+@dataclass
+class CardFairness:
+    """Audit result for one card.
+
+    Attributes:
+        card_number: 1-indexed position in the card set
+        card_id: Card identifier
+        wins: Games in which this card was among the first winners
+        win_rate: wins / trials
+        z_score: Deviation of wins from the set average in standard deviations
+        flagged: True if |z_score| exceeds the audit threshold
+    """
+
+    card_number: int
+    card_id: str
+    wins: int
+    win_rate: float
+    z_score: float
+    flagged: bool = False
+
+
+@dataclass
+class FairnessReport:
+    """Fairness audit of a card set for one pattern.
+
+    Attributes:
+        pattern: Pattern name
+        trials: Number of simulated games
+        expected_rate: Average per-card win rate across the set
+        z_threshold: |z| above which a card is flagged
+        mean_calls: Mean calls until the first winner
+        cards: Per-card results in card order
+        regenerated: Card numbers replaced by regeneration
+    """
+
+    pattern: str
+    trials: int
+    expected_rate: float
+    z_threshold: float
+    mean_calls: float
+    cards: list[CardFairness] = field(default_factory=list)
+    regenerated: list[int] = field(default_factory=list)
+
+    @property
+    def flagged(self) -> list[CardFairness]:
+        """Cards whose win rate is an outlier."""
+        return [card for card in self.cards if card.flagged]
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "pattern": self.pattern,
+            "trials": self.trials,
+            "num_cards": len(self.cards),
+            "expected_win_rate": round(self.expected_rate, 6),
+            "z_threshold": self.z_threshold,
+            "mean_calls_to_first_win": round(self.mean_calls, 2),
+            "flagged": [card.card_number for card in self.flagged],
+            "regenerated": self.regenerated,
+            "cards": [
+                {
+                    "card_number": card.card_number,
+                    "card_id": card.card_id,
+                    "wins": card.wins,
+                    "win_rate": round(card.win_rate, 6),
+                    "z_score": round(card.z_score, 3),
+                    "flagged": card.flagged,
+                }
+                for card in self.cards
+            ],
+        }
+
+    def save_json(self, file_path: Union[str, Path]) -> None:
+        """Write the report as JSON."""
+        Path(file_path).write_text(json.dumps(self.to_dict(), indent=2))
+
+
+def _audit_chunk(
+    card_set: CardSet, pattern: str, trials: int, seed: int
+) -> tuple[list[int], int, int]:
+    rng = random.Random(seed)
+    order = list(range(len(card_set.song_ids)))
+    wins = [0] * card_set.num_cards
+    won = 0
+    total_calls = 0
+    for _ in range(trials):
+        rng.shuffle(order)
+        result = card_set.first_winners(order, pattern)
+        if result is None:
+            continue
+        calls, winners = result
+        won += 1
+        total_calls += calls
+        while winners:
+            lowest = winners & -winners
+            wins[lowest.bit_length() - 1] += 1
+            winners ^= lowest
+    return wins, won, total_calls
+
+
+def audit_card_set(
+    card_set: CardSet,
+    card_ids: list[str],
+    pattern: str = "five_in_a_row",
+    trials: Optional[int] = None,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    z_threshold: float = DEFAULT_Z_THRESHOLD,
+) -> FairnessReport:
+    """Estimate each card's first-win rate and flag outliers.
+
+    Args:
+        card_set: Cards to audit
+        card_ids: Card identifiers in card_set order
+        pattern: Pattern name
+        trials: Random games to play (default: max(2000, 20 per card))
+        seed: Random seed for reproducible results
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+        z_threshold: |z| above which a card is flagged
+
+    Returns:
+        FairnessReport
+
+    Raises:
+        ValueError: If the pattern is unknown or trials < 1
+    """
+    if pattern not in PATTERN_LINES:
+        raise ValueError(f"Unknown pattern: {pattern}")
+    if trials is None:
+        trials = max(MIN_TRIALS, TRIALS_PER_CARD * card_set.num_cards)
+    if trials < 1:
+        raise ValueError("trials must be at least 1")
+
+    partials = run_chunks(_audit_chunk, (card_set, pattern), trials, seed, workers)
+
+    wins = [sum(counts) for counts in zip(*(p[0] for p in partials))]
+    won = sum(p[1] for p in partials)
+    total_calls = sum(p[2] for p in partials)
+
+    expected_rate = sum(wins) / (trials * card_set.num_cards)
+    spread = math.sqrt(trials * expected_rate * (1 - expected_rate)) or 1.0
+
+    report = FairnessReport(
+        pattern=pattern,
+        trials=trials,
+        expected_rate=expected_rate,
+        z_threshold=z_threshold,
+        mean_calls=total_calls / won if won else 0.0,
+    )
+    for index, (card_id, card_wins) in enumerate(zip(card_ids, wins)):
+        z_score = (card_wins - trials * expected_rate) / spread
+        report.cards.append(
+            CardFairness(
+                card_number=index + 1,
+                card_id=card_id,
+                wins=card_wins,
+                win_rate=card_wins / trials,
+                z_score=z_score,
+                flagged=abs(z_score) > z_threshold,
+            )
+        )
+    return report
+
+
+def audit_cards(
+    cards: List[BingoCard],
+    pattern: str = "five_in_a_row",
+    playlist_song_ids: Optional[list] = None,
+    **kwargs,
+) -> FairnessReport:
+    """Audit generated cards (see audit_card_set for keyword arguments).
+
+    Args:
+        cards: Generated cards
+        pattern: Pattern name
+        playlist_song_ids: Full playlist, so songs on no card still take calls
+    """
+    data = CardExporter.to_json_dict(cards)
+    if playlist_song_ids is not None:
+        data["playlist"] = [{"song_id": str(song_id)} for song_id in playlist_song_ids]
+    card_set = CardSet.from_json_dict(data)
+    card_ids = [card["card_id"] for card in data["cards"]]
+    return audit_card_set(card_set, card_ids, pattern, **kwargs)
+
+
+def regenerate_outliers(
+    cards: List[BingoCard],
+    generator: CardGenerator,
+    pattern: str = "five_in_a_row",
+    max_rounds: int = 3,
+    **kwargs,
+) -> FairnessReport:
+    """Audit cards and replace flagged ones in place until none are flagged.
+
+    Replacements keep the flagged card's position, so card numbers are
+    stable. Each round re-audits the whole set because a new card changes
+    the odds of the cards it overlaps.
+
+    Args:
+        cards: Cards to audit; modified in place
+        generator: Generator that produced the cards
+        pattern: Pattern name
+        max_rounds: Maximum regenerate-and-reaudit rounds
+        **kwargs: Passed to audit_card_set (trials, seed, workers, z_threshold)
+
+    Returns:
+        Report for the final card set, with regenerated card numbers
+    """
+    song_ids = [song.song_id for song in generator.songs]
+    seed = kwargs.pop("seed", None)
+    regenerated: set[int] = set()
+
+    report = audit_cards(cards, pattern, song_ids, seed=seed, **kwargs)
+    for round_number in range(1, max_rounds + 1):
+        if not report.flagged:
+            break
+        for flagged in report.flagged:
+            cards[flagged.card_number - 1] = generator.generate_replacement(cards)
+            regenerated.add(flagged.card_number)
+        round_seed = None if seed is None else seed + round_number
+        report = audit_cards(cards, pattern, song_ids, seed=round_seed, **kwargs)
+
+    report.regenerated = sorted(regenerated)
+    return report
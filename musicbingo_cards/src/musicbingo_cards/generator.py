@@ -1,11 +1,16 @@
 """Card generation algorithm for Music Bingo."""
 
 import random
-from typing import List, Set
-from uuid import uuid4
+from array import array
+from typing import Iterable, Iterator, List, Optional, Set
+from uuid import UUID, uuid4
 
-from .models import BingoCard, Song
+from .models import AnyCard, BingoCard, CompactCard
 from .playlist import Playlist
+from .registry import CardRegistry, card_fingerprint
+
+# Part of render cache keys (see render_cache); bump when a seed yields different cards
+GENERATOR_VERSION = 1
 
 
 class CardGenerationError(Exception):
@@ -24,17 +29,30 @@ class CardGenerator:
     - Songs are distributed fairly across cards
     """
 
-    def __init__(self, playlist: Playlist, random_seed: int = None):
+    def __init__(
+        self,
+        playlist: Playlist,
+        random_seed: int = None,
+        registry: Optional[CardRegistry] = None,
+    ):
         """Initialize card generator.
 
         Args:
             playlist: Playlist to generate cards from
             random_seed: Optional seed for reproducible randomness
+            registry: Optional registry of cards issued in earlier games for
+                this playlist. Cards in it are skipped and new cards are added
+                to it (the caller flushes it once the cards are issued).
         """
         self.playlist = playlist
+        self.registry = registry
         self.songs = list(playlist.songs)
         self.rng = random.Random(random_seed)
 
+        # Shared by every CompactCard this generator makes
+        self._playlist = tuple(self.songs)
+        self._song_index = {song.song_id: i for i, song in enumerate(self.songs)}
+
         # Track how many times each song has been used
         self.song_usage_count = {song.song_id: 0 for song in self.songs}
 
@@ -51,18 +69,57 @@ class CardGenerator:
         Raises:
             CardGenerationError: If generation fails
         """
+        return list(self.iter_cards(num_cards, game_id))
+
+    def iter_cards(self, num_cards: int, game_id: str = None) -> Iterator[BingoCard]:
+        """Generate unique bingo cards lazily, one at a time.
+
+        Same as iter_compact_cards, with each card adapted to a BingoCard.
+
+        Args:
+            num_cards: Number of cards to generate (1-1000)
+            game_id: Optional game identifier (auto-generated if not provided)
+
+        Returns:
+            Iterator of unique BingoCard objects
+
+        Raises:
+            CardGenerationError: If the inputs are invalid (immediately) or a
+                unique card cannot be generated (during iteration)
+        """
+        return map(CompactCard.to_bingo_card, self.iter_compact_cards(num_cards, game_id))
+
+    def iter_compact_cards(
+        self, num_cards: int, game_id: str = None, max_cards: int = 1000
+    ) -> Iterator[CompactCard]:
+        """Generate unique compact cards lazily, one at a time.
+
+        Inputs are validated when this is called, before any card is made.
+        Only a 48-byte key of each card is kept for the uniqueness check, so
+        a consumer that handles cards as they arrive never holds the whole set.
+
+        Args:
+            num_cards: Number of cards to generate (1-max_cards)
+            game_id: Optional game identifier (auto-generated if not provided)
+            max_cards: Largest accepted num_cards (card pools allow more than
+                one game's worth)
+
+        Returns:
+            Iterator of unique CompactCard objects sharing this playlist
+
+        Raises:
+            CardGenerationError: If the inputs are invalid (immediately) or a
+                unique card cannot be generated (during iteration)
+        """
         # Validate inputs
-        if num_cards < 1 or num_cards > 1000:
-            raise CardGenerationError(f"Invalid card count: {num_cards}. Must be 1-1000.")
+        if num_cards < 1 or num_cards > max_cards:
+            raise CardGenerationError(f"Invalid card count: {num_cards}. Must be 1-{max_cards}.")
 
         # Warn if outside recommended range (for production use)
         if num_cards < 50:
             pass  # Allow for testing, but production should use 50-200
 
-        if len(self.songs) < 48:
-            raise CardGenerationError(
-                f"Playlist too small: {len(self.songs)} songs. Need at least 48."
-            )
+        self.check_playlist_size()
 
         # Check if we have reasonable song-to-card ratio
         # For good overlap variety, we want at least: playlist >= 24 + (num_cards / 10)
@@ -73,35 +130,77 @@ class CardGenerator:
             pass  # Could add logging here if needed
 
         # Generate game ID if not provided
-        if game_id is None:
-            game_id = str(uuid4())
-        else:
-            from uuid import UUID
-            game_id = str(UUID(game_id))
+        game_id = uuid4() if game_id is None else UUID(game_id)
+
+        return self._iter_unique_cards(num_cards, game_id)
 
-        cards = []
+    def check_playlist_size(self) -> None:
+        """Raise CardGenerationError if the playlist cannot fill varied cards."""
+        if len(self.songs) < 48:
+            raise CardGenerationError(
+                f"Playlist too small: {len(self.songs)} songs. Need at least 48."
+            )
+
+    def _iter_unique_cards(self, num_cards: int, game_id: UUID) -> Iterator[CompactCard]:
+        """Yield unique cards for a validated request (see iter_compact_cards)."""
         card_hashes = set()  # Track card uniqueness
 
         for i in range(num_cards):
             max_attempts = 100
             for attempt in range(max_attempts):
                 try:
-                    card = self._generate_single_card(game_id)
+                    card = self._generate_compact_card(game_id)
                     card_hash = self._hash_card(card)
 
-                    if card_hash not in card_hashes:
-                        cards.append(card)
+                    if card_hash not in card_hashes and self._register(card):
                         card_hashes.add(card_hash)
+                        yield card
                         break
                 except Exception as e:
                     if attempt == max_attempts - 1:
                         raise CardGenerationError(
                             f"Failed to generate unique card {i + 1}/{num_cards}: {e}"
                         )
+            else:
+                raise CardGenerationError(
+                    f"Failed to generate unique card {i + 1}/{num_cards}: "
+                    f"every attempt duplicated an existing card"
+                )
+
+    def generate_replacement(self, existing_cards: List[AnyCard]) -> BingoCard:
+        """Generate one new card that duplicates none of the existing cards.
+
+        Args:
+            existing_cards: Cards already in the set (game_id is taken from the first)
+
+        Returns:
+            A new unique BingoCard
+
+        Raises:
+            CardGenerationError: If no unique card could be generated
+        """
+        if not existing_cards:
+            raise CardGenerationError("Cannot generate a replacement without existing cards")
+
+        game_id = existing_cards[0].game_id
+        card_hashes = {self._hash_card(card) for card in existing_cards}
+        for _ in range(100):
+            card = self._generate_compact_card(game_id)
+            if card.key() not in card_hashes and self._register(card):
+                return card.to_bingo_card()
+        raise CardGenerationError("Failed to generate a unique replacement card")
 
-        return cards
+    def _register(self, card: AnyCard) -> bool:
+        """Add a card to the registry, if there is one.
+
+        Returns:
+            False if the card was issued before (it is not added again)
+        """
+        if self.registry is None:
+            return True
+        return self.registry.add(card_fingerprint(song.song_id for song in card.iter_songs()))
 
-    def _generate_single_card(self, game_id: str) -> BingoCard:
+    def _generate_compact_card(self, game_id: UUID) -> CompactCard:
         """Generate a single bingo card.
 
         Uses weighted random selection to balance song distribution.
@@ -110,35 +209,22 @@ class CardGenerator:
             game_id: Game identifier
 
         Returns:
-            A BingoCard with 24 songs
+            A CompactCard with 24 songs
         """
-        from uuid import UUID
-
-        card = BingoCard(game_id=UUID(game_id))
-
         # Select 24 songs using weighted selection
         # Songs with lower usage count are more likely to be selected
-        selected_songs = self._select_songs_weighted(24)
-
-        # Shuffle songs for random placement
-        self.rng.shuffle(selected_songs)
+        selected = self._select_songs_weighted(24)
 
-        # Fill the card grid (skip center position 2,2)
-        song_idx = 0
-        for row in range(5):
-            for col in range(5):
-                if row == 2 and col == 2:  # Skip center (free space)
-                    continue
-                card.add_song(row, col, selected_songs[song_idx])
-                song_idx += 1
+        # Shuffle songs for random placement (row-major, skipping the free space)
+        self.rng.shuffle(selected)
 
         # Update usage counts
-        for song in selected_songs:
-            self.song_usage_count[song.song_id] += 1
+        for index in selected:
+            self.song_usage_count[self.songs[index].song_id] += 1
 
-        return card
+        return CompactCard(self._playlist, selected, game_id=game_id)
 
-    def _select_songs_weighted(self, count: int) -> List[Song]:
+    def _select_songs_weighted(self, count: int) -> List[int]:
         """Select songs using weighted random selection.
 
         Songs with lower usage counts are weighted higher to ensure
@@ -148,7 +234,7 @@ class CardGenerator:
             count: Number of songs to select
 
         Returns:
-            List of selected songs
+            Playlist indices of the selected songs
         """
         if count > len(self.songs):
             raise CardGenerationError(
@@ -167,7 +253,7 @@ class CardGenerator:
 
         # Select songs without replacement
         selected = self.rng.choices(
-            population=self.songs,
+            population=range(len(self.songs)),
             weights=weights,
             k=count * 2  # Get more than needed
         )
@@ -175,35 +261,36 @@ class CardGenerator:
         # Remove duplicates while preserving order
         seen = set()
         unique_selected = []
-        for song in selected:
-            if song.song_id not in seen:
-                seen.add(song.song_id)
-                unique_selected.append(song)
+        for index in selected:
+            if index not in seen:
+                seen.add(index)
+                unique_selected.append(index)
                 if len(unique_selected) == count:
                     break
 
         # If we didn't get enough unique songs (rare), sample directly
         if len(unique_selected) < count:
             remaining = count - len(unique_selected)
-            available = [s for s in self.songs if s.song_id not in seen]
+            available = [i for i in range(len(self.songs)) if i not in seen]
             unique_selected.extend(self.rng.sample(available, remaining))
 
         return unique_selected
 
-    def _hash_card(self, card: BingoCard) -> str:
-        """Create a hash of a card's song composition for uniqueness checking.
+    def _hash_card(self, card: AnyCard) -> bytes:
+        """Create a key of a card's song composition for uniqueness checking.
 
         Args:
-            card: Card to hash
+            card: Card to hash (its songs must come from this playlist)
 
         Returns:
-            Hash string representing the card's songs
+            Sorted playlist indices of the card's songs, as bytes
         """
-        # Sort song IDs to create consistent hash
-        song_ids = sorted(str(song.song_id) for song in card.get_songs())
-        return "|".join(song_ids)
+        if isinstance(card, CompactCard):
+            return card.key()
+        indices = sorted(self._song_index[song.song_id] for song in card.iter_songs())
+        return array("H", indices).tobytes()
 
-    def calculate_overlap(self, card1: BingoCard, card2: BingoCard) -> float:
+    def calculate_overlap(self, card1: AnyCard, card2: AnyCard) -> float:
         """Calculate the overlap percentage between two cards.
 
         Args:
@@ -213,12 +300,12 @@ class CardGenerator:
         Returns:
             Overlap percentage (0.0 to 1.0)
         """
-        songs1 = {song.song_id for song in card1.get_songs()}
-        songs2 = {song.song_id for song in card2.get_songs()}
+        songs1 = {song.song_id for song in card1.iter_songs()}
+        songs2 = {song.song_id for song in card2.iter_songs()}
         common = songs1.intersection(songs2)
         return len(common) / 24.0
 
-    def calculate_average_overlap(self, cards: List[BingoCard]) -> float:
+    def calculate_average_overlap(self, cards: List[AnyCard]) -> float:
         """Calculate the average overlap across all card pairs.
 
         Args:
@@ -240,41 +327,73 @@ class CardGenerator:
 
         return total_overlap / comparisons if comparisons > 0 else 0.0
 
-    def get_statistics(self, cards: List[BingoCard]) -> dict:
+    def get_statistics(self, cards: Iterable[AnyCard]) -> dict:
         """Get statistics about the generated cards.
 
+        Cards are read once, so this also works on a lazy stream of cards.
+
         Args:
-            cards: List of generated cards
+            cards: Generated cards (list or iterator)
 
         Returns:
             Dictionary with statistics
         """
-        if not cards:
-            return {"num_cards": 0}
-
-        # Calculate song usage distribution
-        song_usage = {}
+        stats = CardStatistics(len(self.songs))
         for card in cards:
-            for song in card.get_songs():
-                song_usage[song.song_id] = song_usage.get(song.song_id, 0) + 1
+            stats.add(card)
+        return stats.to_dict()
+
+
+class CardStatistics:
+    """Running statistics over a stream of cards.
+
+    Keeps per-song usage counts and the first card's songs (overlap is
+    sampled between the first card and the next OVERLAP_SAMPLES cards), not
+    the cards themselves.
+    """
+
+    OVERLAP_SAMPLES = 10
 
-        usage_counts = list(song_usage.values())
+    def __init__(self, songs_in_playlist: int):
+        """Initialize empty statistics.
+
+        Args:
+            songs_in_playlist: Number of songs in the source playlist
+        """
+        self.songs_in_playlist = songs_in_playlist
+        self.num_cards = 0
+        self.song_usage = {}
+        self._first_songs: Optional[Set] = None
+        self._overlaps: List[float] = []
+
+    def add(self, card: AnyCard) -> None:
+        """Include one card in the statistics."""
+        song_ids = [song.song_id for song in card.iter_songs()]
+        for song_id in song_ids:
+            self.song_usage[song_id] = self.song_usage.get(song_id, 0) + 1
+
+        if self._first_songs is None:
+            self._first_songs = set(song_ids)
+        elif len(self._overlaps) < self.OVERLAP_SAMPLES:
+            common = self._first_songs.intersection(song_ids)
+            self._overlaps.append(len(common) / 24.0)
+        self.num_cards += 1
+
+    def to_dict(self) -> dict:
+        """Statistics in the format of CardGenerator.get_statistics."""
+        if not self.num_cards:
+            return {"num_cards": 0}
+
+        usage_counts = list(self.song_usage.values())
         avg_usage = sum(usage_counts) / len(usage_counts) if usage_counts else 0
         min_usage = min(usage_counts) if usage_counts else 0
         max_usage = max(usage_counts) if usage_counts else 0
-
-        # Sample overlap calculations (compare first card with others)
-        overlaps = []
-        if len(cards) > 1:
-            for i in range(1, min(len(cards), 11)):  # Sample up to 10 comparisons
-                overlap = self.calculate_overlap(cards[0], cards[i])
-                overlaps.append(overlap)
-
+        overlaps = self._overlaps
         avg_overlap = sum(overlaps) / len(overlaps) if overlaps else 0.0
 
         return {
-            "num_cards": len(cards),
-            "songs_in_playlist": len(self.songs),
+            "num_cards": self.num_cards,
+            "songs_in_playlist": self.songs_in_playlist,
             "songs_per_card": 24,
             "song_usage": {
                 "average": avg_usage,
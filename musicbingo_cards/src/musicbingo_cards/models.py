@@ -1,9 +1,46 @@
 """Data models for Music Bingo card generation."""
 
+import hashlib
+import re
+import unicodedata
+from array import array
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
-from uuid import UUID, uuid4
+from typing import Iterable, Iterator, Optional, Sequence, Union
+from uuid import UUID, uuid4, uuid5
+
+# Grid cells that hold songs, in row-major order (the centre is free space)
+CARD_POSITIONS = tuple((row, col) for row in range(5) for col in range(5) if (row, col) != (2, 2))
+_POSITION_SLOT = {position: slot for slot, position in enumerate(CARD_POSITIONS)}
+
+# Namespace for stable song IDs. Fixed forever: changing it changes every song ID.
+SONG_ID_NAMESPACE = UUID("e2307e8d-97ad-5ed6-8260-2c1fee98ca9e")
+
+
+def normalize_song_text(text: str) -> str:
+    """Normalize a title or artist for identity: NFKC, case-folded, single spaces."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip().casefold()
+
+
+def stable_song_id(title: str, artist: str, isrc: Optional[str] = None) -> UUID:
+    """Deterministic song ID (UUIDv5), the same on every parse of the same song.
+
+    The ISRC identifies the recording when present; otherwise the normalized
+    title and artist do, so "Take On Me" and "take on  me" by "a-ha" match.
+
+    Args:
+        title: Song title
+        artist: Artist name
+        isrc: International Standard Recording Code (optional)
+
+    Returns:
+        UUID derived from the song's identity
+    """
+    if isrc and isrc.strip():
+        name = "isrc:" + isrc.replace("-", "").strip().upper()
+    else:
+        name = f"song:{normalize_song_text(title)}\x1f{normalize_song_text(artist)}"
+    return uuid5(SONG_ID_NAMESPACE, name)
 
 
 @dataclass(frozen=True)
@@ -123,28 +160,54 @@ class CardGrid:
         return len(self.get_all_songs()) == 24
 
 
-@dataclass
 class QRCodeData:
     """Data encoded in the QR code for card verification.
 
+    The checksum is computed on first access when not supplied, so cards
+    that are never rendered or verified do not pay for the hash.
+
     Attributes:
         card_id: Unique identifier for this card
         game_id: Identifier for the game/playlist this card belongs to
         checksum: Hash for validation (prevents tampering)
     """
 
-    card_id: UUID
-    game_id: UUID
-    checksum: str = ""
-
-    def __post_init__(self):
-        """Generate checksum if not provided."""
-        if not self.checksum:
-            # Simple checksum: combine IDs and hash
-            import hashlib
-
-            data = f"{self.card_id}:{self.game_id}"
-            self.checksum = hashlib.sha256(data.encode()).hexdigest()[:16]
+    __slots__ = ("card_id", "game_id", "_checksum")
+
+    def __init__(self, card_id: UUID, game_id: UUID, checksum: str = ""):
+        self.card_id = card_id
+        self.game_id = game_id
+        self._checksum = checksum
+
+    @property
+    def checksum(self) -> str:
+        """Supplied checksum, or the expected one computed on first access."""
+        if not self._checksum:
+            self._checksum = self.compute_checksum(self.card_id, self.game_id)
+        return self._checksum
+
+    @checksum.setter
+    def checksum(self, value: str) -> None:
+        self._checksum = value
+
+    @staticmethod
+    def compute_checksum(card_id: UUID, game_id: UUID) -> str:
+        """Expected checksum for a card: truncated SHA-256 of both IDs."""
+        data = f"{card_id}:{game_id}"
+        return hashlib.sha256(data.encode()).hexdigest()[:16]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, QRCodeData):
+            return NotImplemented
+        return (self.card_id, self.game_id, self.checksum) == (
+            other.card_id, other.game_id, other.checksum
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"QRCodeData(card_id={self.card_id!r}, game_id={self.game_id!r}, "
+            f"checksum={self.checksum!r})"
+        )
 
     def to_string(self) -> str:
         """Encode QR data as a compact string.
@@ -188,8 +251,7 @@ class QRCodeData:
         Returns:
             True if checksum matches the calculated value
         """
-        expected = QRCodeData(card_id=self.card_id, game_id=self.game_id)
-        return self.checksum == expected.checksum
+        return self.checksum == self.compute_checksum(self.card_id, self.game_id)
 
 
 @dataclass
@@ -243,6 +305,22 @@ class BingoCard:
         """
         return self.grid.get_all_songs()
 
+    def song_at(self, row: int, col: int) -> Optional[Song]:
+        """Song at a grid position (None for the free space or an empty cell)."""
+        return self.grid.get_song(row, col)
+
+    def iter_songs(self) -> Iterator[Song]:
+        """Iterate the card's songs in row-major order without building a list."""
+        return (song for _, song in self.cells())
+
+    def cells(self) -> Iterator[tuple[tuple[int, int], Song]]:
+        """Iterate ((row, col), song) for filled cells in row-major order."""
+        rows = self.grid.songs
+        for row, col in CARD_POSITIONS:
+            song = rows[row][col]
+            if song is not None:
+                yield (row, col), song
+
     def validate(self) -> bool:
         """Validate the card structure and QR code.
 
@@ -259,3 +337,102 @@ class BingoCard:
         if not self.qr_data.is_valid():
             raise ValueError("Card QR code checksum is invalid")
         return True
+
+
+class CompactCard:
+    """A bingo card stored as 24 song indices into a shared playlist.
+
+    Songs are held once by the playlist; the card keeps only an array of
+    indices in CARD_POSITIONS order plus its IDs, with no grid, timestamp or
+    metadata. The QR data (and its checksum) is created on first access.
+    Cards are read-only: use to_bingo_card() where the full object model is
+    needed.
+
+    Attributes:
+        card_id: Unique identifier for this card
+        game_id: Identifier for the game/playlist
+        playlist: Songs the indices refer to (shared by all cards of a game)
+        indices: array('H') of 24 playlist indices
+    """
+
+    __slots__ = ("card_id", "game_id", "playlist", "indices", "_qr_data")
+
+    def __init__(
+        self,
+        playlist: Sequence[Song],
+        indices: Iterable[int],
+        card_id: Optional[UUID] = None,
+        game_id: Optional[UUID] = None,
+    ):
+        """Create a compact card.
+
+        Args:
+            playlist: Songs the indices refer to
+            indices: 24 playlist indices in CARD_POSITIONS order
+            card_id: Card identifier (auto-generated if not provided)
+            game_id: Game identifier (auto-generated if not provided)
+
+        Raises:
+            ValueError: If there are not exactly 24 indices
+        """
+        self.playlist = playlist
+        self.indices = array("H", indices)
+        if len(self.indices) != len(CARD_POSITIONS):
+            raise ValueError(
+                f"A card needs {len(CARD_POSITIONS)} song indices, got {len(self.indices)}"
+            )
+        self.card_id = card_id if card_id is not None else uuid4()
+        self.game_id = game_id if game_id is not None else uuid4()
+        self._qr_data: Optional[QRCodeData] = None
+
+    @property
+    def qr_data(self) -> QRCodeData:
+        """QR code data for verification, created on first access."""
+        if self._qr_data is None:
+            self._qr_data = QRCodeData(card_id=self.card_id, game_id=self.game_id)
+        return self._qr_data
+
+    def song_at(self, row: int, col: int) -> Optional[Song]:
+        """Song at a grid position (None for the free space).
+
+        Raises:
+            ValueError: If position is invalid
+        """
+        if not (0 <= row < 5 and 0 <= col < 5):
+            raise ValueError(f"Invalid position: ({row}, {col})")
+        slot = _POSITION_SLOT.get((row, col))
+        return None if slot is None else self.playlist[self.indices[slot]]
+
+    def iter_songs(self) -> Iterator[Song]:
+        """Iterate the card's songs in row-major order without building a list."""
+        playlist = self.playlist
+        return (playlist[index] for index in self.indices)
+
+    def cells(self) -> Iterator[tuple[tuple[int, int], Song]]:
+        """Iterate ((row, col), song) in row-major order."""
+        return zip(CARD_POSITIONS, self.iter_songs())
+
+    def get_songs(self) -> list[Song]:
+        """Get all songs on this card (a new list; prefer iter_songs)."""
+        return list(self.iter_songs())
+
+    def index_view(self) -> memoryview:
+        """Read-only view of the song indices, without copying."""
+        return memoryview(self.indices).toreadonly()
+
+    def key(self) -> bytes:
+        """Order-independent key of the card's songs, for uniqueness checks."""
+        return array("H", sorted(self.indices)).tobytes()
+
+    def to_bingo_card(self) -> BingoCard:
+        """Build the equivalent BingoCard (same IDs, songs and QR data)."""
+        grid = CardGrid()
+        for (row, col), song in self.cells():
+            grid.songs[row][col] = song
+        return BingoCard(
+            card_id=self.card_id, game_id=self.game_id, grid=grid, qr_data=self.qr_data
+        )
+
+
+# Either card type; rendering, export and statistics accept both
+AnyCard = Union[BingoCard, CompactCard]
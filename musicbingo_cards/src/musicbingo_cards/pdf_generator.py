@@ -1,20 +1,24 @@
 """PDF generation for Music Bingo cards."""
 
 import io
-import math
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import BinaryIO, Iterable, List, Optional, Union
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import Frame, Table, TableStyle, Paragraph, Spacer, Image
+from reportlab.platypus.doctemplate import LayoutError
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER
 
-from .models import BingoCard
+from .models import AnyCard
 from .qr_code import QRCodeGenerator
 
+# Part of render cache keys (see render_cache); bump when the same cards render differently
+RENDERER_VERSION = 1
+
 
 class PDFCardGenerator:
     """Generates printable PDF documents containing bingo cards."""
@@ -78,15 +82,18 @@ class PDFCardGenerator:
 
     def generate_pdf(
         self,
-        cards: List[BingoCard],
+        cards: Iterable[AnyCard],
         output_path: Union[str, Path],
         title: Optional[str] = None,
         layout: str = "single",
     ) -> None:
         """Generate a PDF file with multiple bingo cards.
 
+        Pages are drawn as cards are read, so cards may be a lazy iterator
+        (e.g. CardGenerator.iter_cards) that is never held in memory.
+
         Args:
-            cards: List of BingoCard objects to include
+            cards: BingoCard objects to include (list or iterator)
             output_path: Path to save PDF file
             title: Optional title for the document
             layout: "single" (1 card/page) or "4up" (4 cards/page)
@@ -95,63 +102,68 @@ class PDFCardGenerator:
             self._generate_4up_pdf(cards, output_path)
             return
 
-        doc = SimpleDocTemplate(
-            str(output_path),
-            pagesize=self.page_size,
-            leftMargin=self.margin,
-            rightMargin=self.margin,
-            topMargin=self.margin,
-            bottomMargin=self.margin,
-        )
-
-        story = []
-
-        for i, card in enumerate(cards):
-            # Add card to story
-            card_elements = self._create_card_elements(card, card_number=i + 1)
-            story.extend(card_elements)
-
-            # Add page break after each card (except last)
-            if i < len(cards) - 1:
-                story.append(PageBreak())
-
-        doc.build(story)
+        self._draw_single_pages(cards, str(output_path))
 
     def generate_pdf_bytes(
         self,
-        cards: List[BingoCard],
+        cards: Iterable[AnyCard],
         title: Optional[str] = None,
     ) -> bytes:
         """Generate PDF as bytes (for in-memory operations).
 
         Args:
-            cards: List of BingoCard objects
+            cards: BingoCard objects (list or iterator)
             title: Optional title
 
         Returns:
             PDF file content as bytes
         """
         buffer = io.BytesIO()
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=self.page_size,
-            leftMargin=self.margin,
-            rightMargin=self.margin,
-            topMargin=self.margin,
-            bottomMargin=self.margin,
-        )
+        self._draw_single_pages(cards, buffer)
+        return buffer.getvalue()
 
-        story = []
-        for i, card in enumerate(cards):
-            card_elements = self._create_card_elements(card, card_number=i + 1)
-            story.extend(card_elements)
+    def _draw_single_pages(
+        self,
+        cards: Iterable[AnyCard],
+        output: Union[str, BinaryIO],
+    ) -> None:
+        """Draw one card per page, flowing each card's elements into a page frame.
 
-            if i < len(cards) - 1:
-                from reportlab.platypus import PageBreak
-                story.append(PageBreak())
+        Equivalent to building a SimpleDocTemplate story with a PageBreak
+        between cards, but each card's flowables are dropped once drawn
+        instead of the whole story being built up front.
 
-        doc.build(story)
-        return buffer.getvalue()
+        Args:
+            cards: BingoCard objects to draw
+            output: File path or binary file object
+
+        Raises:
+            LayoutError: If a card's elements do not fit on a page
+        """
+        c = Canvas(output, pagesize=self.page_size, invariant=True)
+        page_width, page_height = self.page_size
+
+        for i, card in enumerate(cards):
+            if i:
+                c.showPage()
+            elements = self._create_card_elements(card, card_number=i + 1)
+            while True:
+                remaining = len(elements)
+                frame = Frame(
+                    self.margin,
+                    self.margin,
+                    page_width - 2 * self.margin,
+                    page_height - 2 * self.margin,
+                    id="normal",
+                )
+                frame.addFromList(elements, c)
+                if not elements:
+                    break
+                if len(elements) == remaining:
+                    raise LayoutError(f"Card {i + 1} does not fit on a page")
+                c.showPage()
+
+        c.save()
 
     def _create_branding_header(self) -> List:
         """Create header branding elements (logo and DJ contact) for single-card layout.
@@ -238,7 +250,7 @@ class PDFCardGenerator:
 
         return elements
 
-    def _create_card_elements(self, card: BingoCard, card_number: int) -> List:
+    def _create_card_elements(self, card: AnyCard, card_number: int) -> List:
         """Create PDF elements for a single bingo card.
 
         Args:
@@ -273,7 +285,7 @@ class PDFCardGenerator:
                         self.cell_style
                     )
                 else:
-                    song = card.grid.get_song(row, col)
+                    song = card.song_at(row, col)
                     if song:
                         # Format: Title / Artist
                         text = f"<b>{song.title}</b><br/><i>{song.artist}</i>"
@@ -331,7 +343,7 @@ class PDFCardGenerator:
 
     def generate_single_card_pdf(
         self,
-        card: BingoCard,
+        card: AnyCard,
         output_path: Union[str, Path],
     ) -> None:
         """Generate a PDF with a single card.
@@ -344,7 +356,7 @@ class PDFCardGenerator:
 
     def _generate_4up_pdf(
         self,
-        cards: List[BingoCard],
+        cards: Iterable[AnyCard],
         output_path: Union[str, Path],
     ) -> None:
         """Generate a PDF with 4 cards per page (2x2 grid).
@@ -355,13 +367,11 @@ class PDFCardGenerator:
         - Grid: 2 columns x 2 rows per page
 
         Args:
-            cards: List of BingoCard objects
+            cards: BingoCard objects (list or iterator)
             output_path: Path to save PDF file
         """
-        from reportlab.pdfgen import canvas
-
         output_path = Path(output_path)
-        c = canvas.Canvas(str(output_path), pagesize=self.page_size)
+        c = Canvas(str(output_path), pagesize=self.page_size, invariant=True)
         page_width, page_height = self.page_size
 
         # Layout constants for 4-up
@@ -386,25 +396,12 @@ class PDFCardGenerator:
             (x_offset + card_width + gutter, y_offset),  # Bottom-right
         ]
 
-        # Process cards in groups of 4
-        num_pages = math.ceil(len(cards) / 4)
-        for page_num in range(num_pages):
-            # No page-level branding for 4-up - branding is per-card
-
-            # Draw up to 4 cards on this page
-            start_idx = page_num * 4
-            for i, pos_idx in enumerate(range(4)):
-                card_idx = start_idx + i
-                if card_idx >= len(cards):
-                    break
-
-                card = cards[card_idx]
-                x, y = positions[pos_idx]
-                self._draw_mini_card(c, card, x, y, card_width, card_height, card_idx + 1)
-
-            # Add new page if not the last
-            if page_num < num_pages - 1:
+        # Start a new page before every 4th card
+        for card_idx, card in enumerate(cards):
+            if card_idx and card_idx % 4 == 0:
                 c.showPage()
+            x, y = positions[card_idx % 4]
+            self._draw_mini_card(c, card, x, y, card_width, card_height, card_idx + 1)
 
         c.save()
 
@@ -604,7 +601,7 @@ class PDFCardGenerator:
     def _draw_mini_card(
         self,
         canvas,
-        card: BingoCard,
+        card: AnyCard,
         x: float,
         y: float,
         width: float,
@@ -741,7 +738,7 @@ class PDFCardGenerator:
                     )
                 else:
                     # Draw song info with word wrapping
-                    song = card.grid.get_song(row, col)
+                    song = card.song_at(row, col)
                     if song:
                         canvas.setFillColor(colors.black)
 
@@ -0,0 +1,108 @@
+"""Feed one stream of cards to several consumers concurrently.
+
+run_pipeline reads cards from a source iterator once and hands each card
+to every stage (e.g. PDF rendering, JSON export, statistics). Each stage
+runs in its own thread and reads from a small bounded queue, so the source
+blocks when a stage falls behind. At most buffer_size cards per stage are
+in flight, and peak memory does not grow with the number of cards.
+
+A stage is any callable that takes an iterable of cards and returns a
+result, such as ``CardExporter.save_json`` with its path bound.
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from .models import AnyCard
+
+Stage = Callable[[Iterable[AnyCard]], Any]
+
+DEFAULT_BUFFER_SIZE = 8
+
+_END = object()
+
+
+class PipelineError(Exception):
+    """Exception raised when a pipeline stage fails.
+
+    Attributes:
+        stage: Name of the stage that failed
+        error: Exception raised by the stage
+    """
+
+    def __init__(self, stage: str, error: BaseException):
+        super().__init__(f"{stage}: {error}")
+        self.stage = stage
+        self.error = error
+
+
+class _StageThread(threading.Thread):
+    """Runs one stage over the cards put on its queue."""
+
+    def __init__(self, stage: str, func: Stage, buffer_size: int):
+        super().__init__(name=f"card-pipeline-{stage}", daemon=True)
+        self.stage = stage
+        self.func = func
+        self.queue: queue.Queue = queue.Queue(maxsize=buffer_size)
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+    def _cards(self) -> Iterator[AnyCard]:
+        while True:
+            card = self.queue.get()
+            if card is _END:
+                return
+            yield card
+
+    def run(self) -> None:
+        cards = self._cards()
+        try:
+            self.result = self.func(cards)
+        except BaseException as e:  # re-raised by run_pipeline
+            self.error = e
+        # Keep draining so the source never blocks on a stage that stopped early
+        for _ in cards:
+            pass
+
+
+def run_pipeline(
+    cards: Iterable[AnyCard],
+    stages: Dict[str, Stage],
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> Dict[str, Any]:
+    """Run every stage over the same stream of cards.
+
+    Args:
+        cards: Card source, read once (e.g. CardGenerator.iter_cards)
+        stages: Stage name -> callable taking an iterable of cards
+        buffer_size: Cards each stage may hold in its queue
+
+    Returns:
+        Stage name -> value returned by that stage
+
+    Raises:
+        PipelineError: If a stage raised (the source stops at the next card)
+        Exception: Any exception from the source itself, after every stage
+            has finished with the cards produced so far
+    """
+    threads = [_StageThread(stage, func, buffer_size) for stage, func in stages.items()]
+    for thread in threads:
+        thread.start()
+
+    try:
+        for card in cards:
+            for thread in threads:
+                thread.queue.put(card)
+            if any(thread.error is not None for thread in threads):
+                break
+    finally:
+        for thread in threads:
+            thread.queue.put(_END)
+        for thread in threads:
+            thread.join()
+
+    for thread in threads:
+        if thread.error is not None:
+            raise PipelineError(thread.stage, thread.error) from thread.error
+    return {thread.stage: thread.result for thread in threads}
@@ -1,11 +1,15 @@
-"""Playlist parsing and validation for Music Bingo."""
+"""Playlist parsing and validation for Music Bingo.
+
+Every parser assigns stable song IDs (see models.stable_song_id) unless the
+file supplies one, so parsing the same playlist twice gives the same IDs.
+"""
 
 import csv
 import json
 from pathlib import Path
 from typing import List, Optional, Union
 
-from .models import Song
+from .models import Song, stable_song_id
 
 
 class PlaylistError(Exception):
@@ -80,6 +84,15 @@ class Playlist:
                 f"{', '.join(duplicates[:3])}{'...' if len(duplicates) > 3 else ''}"
             )
 
+        # Stable IDs also match on ISRC and spacing, so check IDs separately
+        ids = {}
+        for song in self.songs:
+            other = ids.setdefault(song.song_id, song)
+            if other is not song:
+                raise PlaylistValidationError(
+                    f"Songs share an ID ({song.song_id}): {other} and {song}"
+                )
+
     def __len__(self) -> int:
         """Return number of songs in playlist."""
         return len(self.songs)
@@ -131,7 +144,7 @@ class PlaylistParser:
         """Parse CSV playlist file.
 
         Expected format:
-        - Header row: title,artist[,album][,duration]
+        - Header row: title,artist[,album][,duration][,isrc]
         - Data rows: song data
 
         Args:
@@ -161,12 +174,15 @@ class PlaylistParser:
                         album = row.get("album", "").strip() or None
                         duration_str = row.get("duration", "").strip()
                         duration = int(duration_str) if duration_str else None
+                        isrc = (row.get("isrc") or "").strip() or None
 
                         song = Song(
                             title=title,
                             artist=artist,
+                            song_id=stable_song_id(title, artist, isrc),
                             album=album,
                             duration_seconds=duration,
+                            metadata={"isrc": isrc} if isrc else {},
                         )
                         songs.append(song)
                     except (ValueError, KeyError) as e:
@@ -235,14 +251,18 @@ class PlaylistParser:
                     if not title or not artist:
                         raise ValueError("Missing required fields (title, artist)")
 
-                    # Build kwargs - only include song_id if present in JSON
                     from uuid import UUID
+                    metadata = item.get("metadata", {})
+                    isrc = item.get("isrc") or metadata.get("isrc")
+                    if item.get("isrc"):
+                        metadata = {**metadata, "isrc": item["isrc"]}
                     kwargs = {
                         "title": title,
                         "artist": artist,
+                        "song_id": stable_song_id(title, artist, isrc),
                         "album": item.get("album"),
                         "duration_seconds": item.get("duration"),
-                        "metadata": item.get("metadata", {}),
+                        "metadata": metadata,
                     }
 
                     # Preserve existing song_id if present in JSON
@@ -250,7 +270,7 @@ class PlaylistParser:
                         try:
                             kwargs["song_id"] = UUID(item["song_id"])
                         except (ValueError, TypeError):
-                            pass  # Invalid UUID, will auto-generate
+                            pass  # Invalid UUID, keep the stable ID
 
                     song = Song(**kwargs)
                     songs.append(song)
@@ -315,7 +335,9 @@ class PlaylistParser:
                     if not title or not artist:
                         raise PlaylistError(f"Line {i}: Title or artist is empty")
 
-                    song = Song(title=title, artist=artist)
+                    song = Song(
+                        title=title, artist=artist, song_id=stable_song_id(title, artist)
+                    )
                     songs.append(song)
 
         except FileNotFoundError:
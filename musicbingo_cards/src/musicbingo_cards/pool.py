@@ -0,0 +1,286 @@
+"""Pre-generated card pools for playlists that are played again and again.
+
+A pool is a large set of unique cards generated once for a playlist and
+stored compactly on disk, keyed like the card registry by the playlist's
+song set (see registry.playlist_key):
+
+    <key>.pool        header, the sorted song IDs, then 24 uint16 song ranks per card
+    <key>.draws.json  every draw: game ID, time and the pool cards issued
+
+Song ranks index the sorted song IDs, so the pool survives reordering of
+the playlist file. A draw picks n cards that were not issued within the
+reuse window, greedily preferring cards whose songs have been used least
+so far in the draw, which keeps song coverage even and overlap close to the
+pool average. Drawing from a 1000-card pool takes milliseconds.
+"""
+
+import json
+import os
+import random
+import struct
+import tempfile
+from array import array
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+from uuid import UUID, uuid4
+
+from .models import CARD_POSITIONS, CompactCard
+from .playlist import Playlist
+from .registry import playlist_key
+
+POOL_MAGIC = b"MBPOOL01"
+POOL_HEADER = struct.Struct("<8sII")  # magic, songs, cards
+SONGS_PER_CARD = len(CARD_POSITIONS)
+
+DEFAULT_POOL_SIZE = 1000
+MAX_POOL_SIZE = 10_000
+DEFAULT_WINDOW = timedelta(days=28)
+DRAW_CANDIDATES = 8  # cards compared per pick; more = better balance, slower
+
+
+class CardPoolError(Exception):
+    """Exception raised when a pool cannot be built, loaded or drawn from."""
+
+    pass
+
+
+class CardPool:
+    """Unique cards pre-generated for one playlist, with a log of draws.
+
+    Attributes:
+        directory: Pool directory
+        songs: Playlist songs, in the playlist's own order
+        window: Cards drawn within this time are not drawn again
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        playlist: Playlist,
+        ranks: array,
+        window: timedelta = DEFAULT_WINDOW,
+    ):
+        """Wrap pool cards for a playlist (use build or load to create one).
+
+        Args:
+            directory: Pool directory
+            playlist: Playlist the pool was built for
+            ranks: Song ranks (indices into the sorted song IDs), 24 per card
+            window: Reuse window for draws
+        """
+        self.directory = Path(directory)
+        self.songs = tuple(playlist.songs)
+        self.window = window
+        self.key = playlist_key(song.song_id for song in self.songs)
+        by_id = sorted(range(len(self.songs)), key=lambda i: self.songs[i].song_id.bytes)
+        self._rank_to_index = by_id
+        self._ranks = ranks
+        self._pool_ids: Dict[bytes, int] = {
+            self._card_key(n): n for n in range(len(self))
+        }
+
+    @property
+    def pool_path(self) -> Path:
+        """Pool file for this playlist."""
+        return self.directory / f"{self.key}.pool"
+
+    @property
+    def draws_path(self) -> Path:
+        """Draw log for this playlist."""
+        return self.directory / f"{self.key}.draws.json"
+
+    def __len__(self) -> int:
+        return len(self._ranks) // SONGS_PER_CARD
+
+    def _card_ranks(self, number: int) -> array:
+        return self._ranks[number * SONGS_PER_CARD:(number + 1) * SONGS_PER_CARD]
+
+    def _card_key(self, number: int) -> bytes:
+        return array("H", sorted(self._card_ranks(number))).tobytes()
+
+    @classmethod
+    def build(
+        cls,
+        directory: Path,
+        playlist: Playlist,
+        size: int = DEFAULT_POOL_SIZE,
+        seed: Optional[int] = None,
+        window: timedelta = DEFAULT_WINDOW,
+    ) -> "CardPool":
+        """Generate a pool of unique cards and save it (replacing any pool and draw log).
+
+        Args:
+            directory: Pool directory
+            playlist: Playlist to build the pool for
+            size: Number of cards (1-10000)
+            seed: Optional seed for reproducible pools
+            window: Reuse window for draws
+
+        Raises:
+            CardPoolError: If size is invalid
+            CardGenerationError: If the playlist cannot produce the cards
+        """
+        from .generator import CardGenerator
+
+        if not 1 <= size <= MAX_POOL_SIZE:
+            raise CardPoolError(f"Invalid pool size: {size}. Must be 1-{MAX_POOL_SIZE}.")
+
+        generator = CardGenerator(playlist, random_seed=seed)
+        cards = generator.iter_compact_cards(size, max_cards=MAX_POOL_SIZE)
+        songs = generator.songs
+        rank = {i: r for r, i in enumerate(
+            sorted(range(len(songs)), key=lambda i: songs[i].song_id.bytes)
+        )}
+        ranks = array("H")
+        for card in cards:
+            ranks.extend(rank[i] for i in card.indices)
+
+        pool = cls(directory, playlist, ranks, window=window)
+        pool.save()
+        return pool
+
+    @classmethod
+    def load(
+        cls, directory: Path, playlist: Playlist, window: timedelta = DEFAULT_WINDOW
+    ) -> "CardPool":
+        """Load the pool built for a playlist's song set.
+
+        Raises:
+            CardPoolError: If there is no pool for the playlist or it is unreadable
+        """
+        song_ids = sorted(song.song_id.bytes for song in playlist.songs)
+        path = Path(directory) / f"{playlist_key(song.song_id for song in playlist.songs)}.pool"
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            raise CardPoolError(f"No card pool for this playlist in {directory}")
+
+        if len(data) < POOL_HEADER.size:
+            raise CardPoolError(f"Not a card pool: {path}")
+        magic, num_songs, num_cards = POOL_HEADER.unpack_from(data)
+        ids_end = POOL_HEADER.size + 16 * num_songs
+        stored_ids = [data[i:i + 16] for i in range(POOL_HEADER.size, ids_end, 16)]
+        ranks = array("H")
+        ranks.frombytes(data[ids_end:])
+        if magic != POOL_MAGIC or len(ranks) != num_cards * SONGS_PER_CARD:
+            raise CardPoolError(f"Not a card pool: {path}")
+        if stored_ids != song_ids:
+            raise CardPoolError(f"Card pool {path} was built for different songs")
+        return cls(directory, playlist, ranks, window=window)
+
+    def save(self) -> None:
+        """Write the pool file and start an empty draw log."""
+        song_ids = b"".join(sorted(song.song_id.bytes for song in self.songs))
+        header = POOL_HEADER.pack(POOL_MAGIC, len(self.songs), len(self))
+        self._write(self.pool_path, header + song_ids + self._ranks.tobytes())
+        self._write(self.draws_path, b"[]")
+
+    def _write(self, path: Path, data: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+
+    def draws(self) -> List[dict]:
+        """Draw log entries (game_id, drawn_at, cards), oldest first."""
+        try:
+            return json.loads(self.draws_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return []
+
+    def recently_drawn(self, now: Optional[datetime] = None) -> Set[int]:
+        """Pool card numbers issued within the reuse window."""
+        cutoff = (now or datetime.now(timezone.utc)) - self.window
+        return {
+            number
+            for entry in self.draws()
+            if datetime.fromisoformat(entry["drawn_at"]) > cutoff
+            for number in entry["cards"]
+        }
+
+    def draw(
+        self,
+        num_cards: int,
+        game_id: Optional[str] = None,
+        seed: Optional[int] = None,
+        now: Optional[datetime] = None,
+    ) -> List[CompactCard]:
+        """Pick cards for a game from those not issued within the window.
+
+        The draw is not logged until record_draw is called with the cards
+        that were actually issued.
+
+        Args:
+            num_cards: Number of cards to draw
+            game_id: Optional game identifier (auto-generated if not provided)
+            seed: Optional seed for reproducible draws
+            now: Time of the draw (defaults to now)
+
+        Returns:
+            Cards with fresh card IDs, in draw order
+
+        Raises:
+            CardPoolError: If too few cards are available
+        """
+        excluded = self.recently_drawn(now)
+        available = [n for n in range(len(self)) if n not in excluded]
+        if not 1 <= num_cards <= len(available):
+            raise CardPoolError(
+                f"Cannot draw {num_cards} cards: {len(available)} of {len(self)} pool cards "
+                f"not issued in the last {self.window.days} days"
+            )
+
+        rng = random.Random(seed)
+        usage = [0] * len(self.songs)
+        chosen = []
+        for _ in range(num_cards):
+            candidates = rng.sample(range(len(available)), min(DRAW_CANDIDATES, len(available)))
+            best = min(
+                candidates,
+                key=lambda c: sum(map(usage.__getitem__, self._card_ranks(available[c]))),
+            )
+            number = available[best]
+            available[best] = available[-1]
+            available.pop()
+            for song_rank in self._card_ranks(number):
+                usage[song_rank] += 1
+            chosen.append(number)
+
+        game_uuid = uuid4() if game_id is None else UUID(game_id)
+        to_index = self._rank_to_index
+        return [
+            CompactCard(self.songs, (to_index[r] for r in self._card_ranks(n)), game_id=game_uuid)
+            for n in chosen
+        ]
+
+    def record_draw(self, cards: Iterable[CompactCard], now: Optional[datetime] = None) -> None:
+        """Log issued cards so they are not drawn again within the window.
+
+        Args:
+            cards: Cards issued from a draw (cards not in the pool, such as
+                regenerated outliers or cards with songs outside the pool's
+                playlist, are ignored)
+            now: Time of the draw (defaults to now)
+        """
+        rank_of = {self.songs[i].song_id: rank for rank, i in enumerate(self._rank_to_index)}
+        numbers = []
+        game_id = None
+        for card in cards:
+            ranks = [rank_of.get(song.song_id) for song in card.iter_songs()]
+            if None in ranks:
+                continue
+            key = array("H", sorted(ranks)).tobytes()
+            if key in self._pool_ids:
+                numbers.append(self._pool_ids[key])
+                game_id = str(card.game_id)
+        if not numbers:
+            return
+        entry = {
+            "game_id": game_id,
+            "drawn_at": (now or datetime.now(timezone.utc)).isoformat(),
+            "cards": numbers,
+        }
+        log = self.draws() + [entry]
+        self._write(self.draws_path, json.dumps(log).encode("utf-8"))
@@ -7,7 +7,7 @@ from typing import Optional, Union
 import qrcode
 from PIL import Image
 
-from .models import BingoCard, QRCodeData
+from .models import AnyCard, QRCodeData
 
 
 class QRCodeGenerator:
@@ -78,7 +78,7 @@ class QRCodeGenerator:
 
     def generate_qr_for_card(
         self,
-        card: BingoCard,
+        card: AnyCard,
         fill_color: str = "black",
         back_color: str = "white",
     ) -> Image.Image:
@@ -114,7 +114,7 @@ class QRCodeGenerator:
 
     def generate_and_save(
         self,
-        card: BingoCard,
+        card: AnyCard,
         file_path: Union[str, Path],
         format: str = "PNG",
         fill_color: str = "black",
@@ -138,7 +138,7 @@ class QRCodeGenerator:
 
     def get_qr_bytes(
         self,
-        card: BingoCard,
+        card: AnyCard,
         format: str = "PNG",
         fill_color: str = "black",
         back_color: str = "white",
@@ -175,7 +175,7 @@ def decode_qr_string(qr_string: str) -> QRCodeData:
     return QRCodeData.from_string(qr_string)
 
 
-def verify_card_qr(card: BingoCard, scanned_data: str) -> bool:
+def verify_card_qr(card: AnyCard, scanned_data: str) -> bool:
     """Verify that scanned QR data matches a card.
 
     Args:
@@ -0,0 +1,248 @@
+"""Persistent registry of issued card fingerprints, one per playlist.
+
+Players keep cards between nights, so a new set should not reprint a
+layout that was issued before. Each card is reduced to a 128-bit
+fingerprint of its song IDs (song IDs are stable, see stable_song_id), and
+every playlist gets a registry in a directory:
+
+    <key>.fp     exact store: 8-byte header, then 16-byte fingerprints (append-only)
+    <key>.bloom  Bloom filter over the exact store: header, then the bit array
+
+Lookups check the Bloom filter first. A "no" is final and costs a few
+bit tests, so generation never touches the exact store while it produces
+new layouts. Only a "maybe" (a real repeat or a ~0.1% false positive)
+loads the exact fingerprints, once, to confirm. The Bloom file is rebuilt
+from the exact store when it is missing, stale or over capacity.
+"""
+
+import hashlib
+import math
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+from uuid import UUID
+
+FINGERPRINT_SIZE = 16
+FP_MAGIC = b"MBFP0001"
+BLOOM_HEADER = struct.Struct("<8sQIQ")  # magic, bits, hashes, fingerprints covered
+BLOOM_MAGIC = b"MBBLOOM1"
+
+DEFAULT_CAPACITY = 16_384
+DEFAULT_ERROR_RATE = 0.001
+
+
+def card_fingerprint(song_ids: Iterable[UUID]) -> bytes:
+    """128-bit fingerprint of a card's songs, independent of their placement.
+
+    Args:
+        song_ids: IDs of the songs on the card
+
+    Returns:
+        16-byte BLAKE2b digest of the sorted song IDs
+    """
+    digest = hashlib.blake2b(digest_size=FINGERPRINT_SIZE)
+    for song_bytes in sorted(song_id.bytes for song_id in song_ids):
+        digest.update(song_bytes)
+    return digest.digest()
+
+
+def playlist_key(song_ids: Iterable[UUID]) -> str:
+    """Registry name for a playlist: hash of its song set (order ignored)."""
+    return card_fingerprint(song_ids).hex()
+
+
+class BloomFilter:
+    """Bloom filter keyed by fingerprints, which are already uniform hashes.
+
+    Bit positions use double hashing over the two 64-bit halves of the
+    fingerprint, so no further hashing is needed.
+    """
+
+    def __init__(self, num_bits: int, num_hashes: int, bits: Optional[bytearray] = None):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float) -> "BloomFilter":
+        """Size a filter for capacity fingerprints at the given false-positive rate."""
+        num_bits = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    @property
+    def capacity(self) -> int:
+        """Fingerprints the filter holds at its designed error rate."""
+        return int(self.num_bits * math.log(2) / self.num_hashes)
+
+    def _positions(self, fingerprint: bytes):
+        h1 = int.from_bytes(fingerprint[:8], "little")
+        h2 = int.from_bytes(fingerprint[8:16], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, fingerprint: bytes) -> None:
+        """Set the fingerprint's bits."""
+        for position in self._positions(fingerprint):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, fingerprint: bytes) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(fingerprint)
+        )
+
+
+class CardRegistry:
+    """Fingerprints of every card issued for one playlist.
+
+    Additions are buffered until flush(). Use as a context manager to flush
+    on successful exit.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        key: str,
+        capacity: int = DEFAULT_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+    ):
+        """Open (or start) a registry.
+
+        Args:
+            directory: Registry directory (created on first flush)
+            key: Registry name, usually playlist_key(song_ids)
+            capacity: Initial Bloom filter capacity (grows as needed)
+            error_rate: Bloom filter false-positive rate
+
+        Raises:
+            ValueError: If the fingerprint file is not a registry
+        """
+        self.directory = Path(directory)
+        self.fp_path = self.directory / f"{key}.fp"
+        self.bloom_path = self.directory / f"{key}.bloom"
+        self.error_rate = error_rate
+        self._stored = self._stored_count()
+        self._pending: List[bytes] = []
+        self._exact: Optional[Set[bytes]] = None
+        self._bloom = self._load_bloom()
+        if self._bloom is None:
+            self._bloom = BloomFilter.for_capacity(max(capacity, 2 * self._stored), error_rate)
+            for fingerprint in self._exact_set():
+                self._bloom.add(fingerprint)
+            self._bloom_dirty = self._stored > 0
+        else:
+            self._bloom_dirty = False
+
+    @classmethod
+    def for_playlist(cls, directory: Path, song_ids: Iterable[UUID], **kwargs) -> "CardRegistry":
+        """Open the registry for a playlist's song set."""
+        return cls(directory, playlist_key(song_ids), **kwargs)
+
+    def _stored_count(self) -> int:
+        try:
+            size = self.fp_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+        with open(self.fp_path, "rb") as f:
+            if f.read(len(FP_MAGIC)) != FP_MAGIC:
+                raise ValueError(f"Not a card registry: {self.fp_path}")
+        # A torn final record from an interrupted append is ignored
+        return (size - len(FP_MAGIC)) // FINGERPRINT_SIZE
+
+    def _load_bloom(self) -> Optional[BloomFilter]:
+        """Saved filter, or None if missing or not covering exactly the stored fingerprints."""
+        try:
+            data = self.bloom_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        if len(data) < BLOOM_HEADER.size:
+            return None
+        magic, num_bits, num_hashes, covered = BLOOM_HEADER.unpack_from(data)
+        bits = bytearray(data[BLOOM_HEADER.size:])
+        if magic != BLOOM_MAGIC or covered != self._stored or len(bits) != (num_bits + 7) // 8:
+            return None
+        return BloomFilter(num_bits, num_hashes, bits)
+
+    def _exact_set(self) -> Set[bytes]:
+        """Stored and pending fingerprints, read from disk on first use."""
+        if self._exact is None:
+            exact: Set[bytes] = set()
+            if self._stored:
+                with open(self.fp_path, "rb") as f:
+                    f.seek(len(FP_MAGIC))
+                    data = f.read(self._stored * FINGERPRINT_SIZE)
+                exact.update(
+                    data[i:i + FINGERPRINT_SIZE] for i in range(0, len(data), FINGERPRINT_SIZE)
+                )
+            exact.update(self._pending)
+            self._exact = exact
+        return self._exact
+
+    def __len__(self) -> int:
+        return self._stored + len(self._pending)
+
+    def __contains__(self, fingerprint: bytes) -> bool:
+        if fingerprint not in self._bloom:
+            return False
+        return fingerprint in self._exact_set()
+
+    def add(self, fingerprint: bytes) -> bool:
+        """Record a fingerprint.
+
+        Returns:
+            False if it was already registered
+        """
+        if fingerprint in self:
+            return False
+        if len(self) + 1 > self._bloom.capacity:
+            self._grow()
+        self._pending.append(fingerprint)
+        if self._exact is not None:
+            self._exact.add(fingerprint)
+        self._bloom.add(fingerprint)
+        self._bloom_dirty = True
+        return True
+
+    def _grow(self) -> None:
+        bloom = BloomFilter.for_capacity(2 * self._bloom.capacity, self.error_rate)
+        for fingerprint in self._exact_set():
+            bloom.add(fingerprint)
+        self._bloom = bloom
+
+    def flush(self) -> None:
+        """Append pending fingerprints to the exact store and save the Bloom filter."""
+        if not self._pending and not self._bloom_dirty:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self._pending:
+            if self.fp_path.exists():
+                with open(self.fp_path, "r+b") as f:
+                    # Cut any torn record, or later fingerprints would be misaligned
+                    f.truncate(len(FP_MAGIC) + self._stored * FINGERPRINT_SIZE)
+                    f.seek(0, os.SEEK_END)
+                    f.write(b"".join(self._pending))
+            else:
+                with open(self.fp_path, "wb") as f:
+                    f.write(FP_MAGIC)
+                    f.write(b"".join(self._pending))
+            self._stored += len(self._pending)
+            self._pending = []
+
+        bloom = self._bloom
+        header = BLOOM_HEADER.pack(BLOOM_MAGIC, bloom.num_bits, bloom.num_hashes, self._stored)
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(bloom.bits)
+        os.replace(tmp_name, self.bloom_path)
+        self._bloom_dirty = False
+
+    def __enter__(self) -> "CardRegistry":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
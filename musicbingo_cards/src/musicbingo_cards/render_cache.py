@@ -0,0 +1,201 @@
+"""Content-addressed cache of generated card sets and their renderings.
+
+Entries are keyed by hashes of everything that determines the output, and
+never by wall-clock time or random IDs:
+
+    cards key   playlist content (in order), seed, card count, strategy and
+                overlap bound, GENERATOR_VERSION
+    render key  cards key, layout, venue logo bytes, DJ contact, RENDERER_VERSION
+
+A card set is stored with its game and card IDs, so a reprint carries the
+same QR codes as the original. Files live under the cache directory:
+
+    cards/<cards key>.cards  game ID, then card ID + 24 uint16 song indices per card
+    cards/<cards key>.json   JSON export of the cards
+    pdf/<render key>.pdf     rendered PDF (rendering is deterministic, see
+                             PDFCardGenerator)
+
+A render hit copies the stored PDF; a cards hit (e.g. the other layout)
+skips generation and only renders.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import struct
+import tempfile
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+from uuid import UUID
+
+from .generator import GENERATOR_VERSION
+from .models import CARD_POSITIONS, CompactCard
+from .pdf_generator import RENDERER_VERSION
+from .playlist import Playlist
+
+CARDS_MAGIC = b"MBCARDS1"
+CARDS_HEADER = struct.Struct("<8sI16s")  # magic, cards, game ID
+CARD_RECORD = struct.Struct(f"<16s{len(CARD_POSITIONS)}H")  # card ID, song indices
+
+
+def _digest(parts: dict) -> str:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def cards_key(
+    playlist: Playlist,
+    seed: int,
+    num_cards: int,
+    strategy: str = "weighted",
+    max_overlap: Optional[int] = None,
+) -> str:
+    """Key of the card set a seeded generation run produces.
+
+    Args:
+        playlist: Source playlist (song order matters to the generator)
+        seed: Random seed
+        num_cards: Number of cards
+        strategy: Generation strategy ("weighted" or "design")
+        max_overlap: Overlap bound of the design strategy
+
+    Returns:
+        Hex SHA-256 key
+    """
+    songs = [
+        [str(s.song_id), s.title, s.artist, s.album, s.duration_seconds] for s in playlist.songs
+    ]
+    return _digest({
+        "songs": songs,
+        "seed": seed,
+        "num_cards": num_cards,
+        "strategy": strategy,
+        "max_overlap": max_overlap,
+        "generator": GENERATOR_VERSION,
+    })
+
+
+def render_key(
+    cards: str,
+    layout: str,
+    venue_logo: Optional[Path] = None,
+    dj_contact: Optional[str] = None,
+) -> str:
+    """Key of a card set rendered with a layout and branding.
+
+    Args:
+        cards: Key of the card set (see cards_key)
+        layout: PDF layout
+        venue_logo: Logo file; its content is hashed, not its path
+        dj_contact: DJ contact text
+
+    Returns:
+        Hex SHA-256 key
+    """
+    logo = hashlib.sha256(Path(venue_logo).read_bytes()).hexdigest() if venue_logo else None
+    return _digest({
+        "cards": cards,
+        "layout": layout,
+        "logo": logo,
+        "dj_contact": dj_contact,
+        "renderer": RENDERER_VERSION,
+    })
+
+
+class RenderCache:
+    """Directory of cached card sets, JSON exports and PDFs."""
+
+    def __init__(self, directory: Path):
+        """Initialize cache (directories are created on first store).
+
+        Args:
+            directory: Cache directory
+        """
+        self.directory = Path(directory)
+
+    def _cards_path(self, key: str) -> Path:
+        return self.directory / "cards" / f"{key}.cards"
+
+    def json_path(self, key: str) -> Path:
+        """Cached JSON export of a card set."""
+        return self.directory / "cards" / f"{key}.json"
+
+    def pdf_path(self, key: str) -> Path:
+        """Cached PDF of a render key."""
+        return self.directory / "pdf" / f"{key}.pdf"
+
+    def has_cards(self, key: str) -> bool:
+        """True if the card set is cached."""
+        return self._cards_path(key).exists()
+
+    def has_pdf(self, key: str) -> bool:
+        """True if the rendering is cached."""
+        return self.pdf_path(key).exists()
+
+    def load_cards(self, key: str, playlist: Playlist) -> Optional[List[CompactCard]]:
+        """Cached card set, or None on a miss.
+
+        Args:
+            key: Cards key
+            playlist: The playlist the key was computed from
+
+        Returns:
+            Cards with their original IDs, sharing one playlist tuple
+        """
+        try:
+            data = self._cards_path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+        if len(data) < CARDS_HEADER.size:
+            return None
+        magic, count, game_id = CARDS_HEADER.unpack_from(data)
+        if magic != CARDS_MAGIC or len(data) != CARDS_HEADER.size + count * CARD_RECORD.size:
+            return None
+        songs = tuple(playlist.songs)
+        game_uuid = UUID(bytes=game_id)
+        return [
+            CompactCard(songs, indices, card_id=UUID(bytes=card_id), game_id=game_uuid)
+            for card_id, *indices in CARD_RECORD.iter_unpack(data[CARDS_HEADER.size:])
+        ]
+
+    def store_cards(
+        self, key: str, cards: Iterable[CompactCard], expected: Optional[int] = None
+    ) -> int:
+        """Store a card set (cards may be a stream; they are written as read).
+
+        Args:
+            key: Cards key
+            cards: Cards to store
+            expected: Number of cards in a complete set. A stream that ends
+                early (e.g. generation failed midway) is not stored.
+
+        Returns:
+            Number of cards read
+        """
+        path = self._cards_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        count = 0
+        game_id = bytes(16)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(CARDS_HEADER.pack(CARDS_MAGIC, 0, game_id))
+                for card in cards:
+                    game_id = card.game_id.bytes
+                    f.write(CARD_RECORD.pack(card.card_id.bytes, *card.indices))
+                    count += 1
+                f.seek(0)
+                f.write(CARDS_HEADER.pack(CARDS_MAGIC, count, game_id))
+            if count and (expected is None or count == expected):
+                os.replace(tmp_name, path)
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
+        return count
+
+    def store_file(self, source: Union[str, Path], target: Path) -> None:
+        """Copy an output file into the cache (atomically)."""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        os.close(fd)
+        shutil.copyfile(source, tmp_name)
+        os.replace(tmp_name, target)
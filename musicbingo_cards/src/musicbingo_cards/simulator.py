@@ -0,0 +1,417 @@
+"""Monte Carlo game-length simulation for a card set.
+
+Answers "how many songs until the first winner?" for each winning pattern
+by playing thousands of random call orders against a generated card set.
+
+Cards are stored transposed (bit-sliced): for every grid cell there is one
+integer whose bit c is set when card c has that cell marked. Calling a song
+ORs a precomputed card bitset into the cells it appears in, and a pattern
+line is complete for every card in the AND of its cells' bitsets. One call
+therefore costs a handful of big-int operations no matter how many cards
+are in play, instead of a check_win loop per card.
+
+Pattern names and geometry match musicbingo_api's PatternType.
+"""
+
+import json
+import os
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+FREE_CELL = 2 * 5 + 2
+CHUNK_TRIALS = 250  # trials per work unit; fixed so results don't depend on worker count
+
+
+def _cell(row: int, col: int) -> int:
+    return row * 5 + col
+
+
+_ROWS = [tuple(_cell(r, c) for c in range(5)) for r in range(5)]
+_COLUMNS = [tuple(_cell(r, c) for r in range(5)) for c in range(5)]
+_DIAGONALS = [tuple(_cell(i, i) for i in range(5)), tuple(_cell(i, 4 - i) for i in range(5))]
+
+# Pattern name -> lines (cell tuples); completing any line wins
+PATTERN_LINES: dict[str, list[tuple[int, ...]]] = {
+    "five_in_a_row": _ROWS + _COLUMNS + _DIAGONALS,
+    "row": _ROWS,
+    "column": _COLUMNS,
+    "diagonal": _DIAGONALS,
+    "four_corners": [(_cell(0, 0), _cell(0, 4), _cell(4, 0), _cell(4, 4))],
+    "x_pattern": [tuple(sorted(set(_DIAGONALS[0]) | set(_DIAGONALS[1])))],
+    "full_card": [tuple(range(25))],
+    "frame": [tuple(sorted(set(_ROWS[0] + _ROWS[4] + _COLUMNS[0] + _COLUMNS[4])))],
+}
+PATTERNS = list(PATTERN_LINES)
+
+
+def _lines_by_cell(lines: list[tuple[int, ...]]) -> dict[int, list[tuple[int, ...]]]:
+    by_cell: dict[int, list[tuple[int, ...]]] = {}
+    for line in lines:
+        for cell in line:
+            by_cell.setdefault(cell, []).append(line)
+    return by_cell
+
+
+# Pattern -> cell -> lines through that cell (only these can complete on a call)
+_LINES_BY_CELL = {pattern: _lines_by_cell(lines) for pattern, lines in PATTERN_LINES.items()}
+
+
+def _popcount(value: int) -> int:
+    return bin(value).count("1")
+
+
+class CardSet:
+    """Cards x songs incidence, bit-sliced by grid cell.
+
+    Attributes:
+        song_ids: Songs that can be called (playlist order when known)
+        num_cards: Number of cards
+        song_cells: For each song index, (cell, card bitset) pairs
+    """
+
+    def __init__(self, song_ids: list[str], cards: list[dict]):
+        """Build the incidence from export-format cards.
+
+        Args:
+            song_ids: Songs that can be called; songs on cards but not in this
+                list are added
+            cards: Card dicts with song_positions {song_id: [row, col]}
+
+        Raises:
+            ValueError: If there are no cards or a position is invalid
+        """
+        if not cards:
+            raise ValueError("Card set has no cards")
+
+        self.song_ids = list(song_ids)
+        index = {song_id: i for i, song_id in enumerate(self.song_ids)}
+        cells: list[dict[int, int]] = [{} for _ in self.song_ids]
+
+        for card_bit, card in enumerate(cards):
+            for song_id, (row, col) in card["song_positions"].items():
+                if not (0 <= row < 5 and 0 <= col < 5) or (row, col) == (2, 2):
+                    raise ValueError(f"Invalid position ({row}, {col}) on card {card_bit + 1}")
+                song_id = str(song_id)
+                if song_id not in index:
+                    index[song_id] = len(self.song_ids)
+                    self.song_ids.append(song_id)
+                    cells.append({})
+                cell = _cell(row, col)
+                by_cell = cells[index[song_id]]
+                by_cell[cell] = by_cell.get(cell, 0) | (1 << card_bit)
+
+        self.num_cards = len(cards)
+        self.all_cards = (1 << self.num_cards) - 1
+        self.song_cells = [tuple(by_cell.items()) for by_cell in cells]
+        self._song_lines: dict[str, list[tuple[tuple[int, ...], ...]]] = {}
+
+    @classmethod
+    def from_json_dict(cls, data: dict, num_songs: Optional[int] = None) -> "CardSet":
+        """Build from a card export or game JSON dict.
+
+        Game JSON includes the playlist, so songs that are on no card still
+        take up calls. A bare card export only has the songs on cards; pass
+        num_songs to pad the call pool to the real playlist length.
+
+        Args:
+            data: Dict with "cards" and optionally "playlist"
+            num_songs: Total songs in the call pool
+
+        Raises:
+            ValueError: If the data has no cards or num_songs is too small
+        """
+        if not data.get("cards"):
+            raise ValueError("JSON has no cards")
+        song_ids = [str(song["song_id"]) for song in data.get("playlist", [])]
+        card_set = cls(song_ids, data["cards"])
+
+        if num_songs is not None:
+            if num_songs < len(card_set.song_ids):
+                raise ValueError(
+                    f"num_songs ({num_songs}) is less than the {len(card_set.song_ids)} "
+                    "songs on the cards"
+                )
+            padding = num_songs - len(card_set.song_ids)
+            card_set.song_ids.extend(f"unused-{i}" for i in range(padding))
+            card_set.song_cells.extend(() for _ in range(padding))
+            card_set._song_lines.clear()
+        return card_set
+
+    @classmethod
+    def load(cls, path: Union[str, Path], num_songs: Optional[int] = None) -> "CardSet":
+        """Load from a card export or game JSON file."""
+        with open(path) as f:
+            return cls.from_json_dict(json.load(f), num_songs)
+
+    def first_wins(
+        self, call_order: list[int], patterns: list[str]
+    ) -> dict[str, Optional[tuple[int, int]]]:
+        """Play one call order and find when each pattern is first won.
+
+        Args:
+            call_order: Song indices in call order
+            patterns: Pattern names from PATTERNS
+
+        Returns:
+            Pattern -> (calls until first winner, winners on that call), or
+            None if nobody wins before the calls run out
+        """
+        marked = self._new_marks()
+        song_lines = {pattern: self.song_lines(pattern) for pattern in patterns}
+        results: dict[str, Optional[tuple[int, int]]] = {pattern: None for pattern in patterns}
+        pending = list(patterns)
+
+        for calls, song in enumerate(call_order, start=1):
+            touched = self.song_cells[song]
+            if not touched:
+                continue
+            for cell, cards in touched:
+                marked[cell] |= cards
+
+            for pattern in list(pending):
+                winners = _completed(marked, song_lines[pattern][song])
+                if winners:
+                    results[pattern] = (calls, _popcount(winners))
+                    pending.remove(pattern)
+            if not pending:
+                break
+
+        return results
+
+    def first_winners(self, call_order: list[int], pattern: str) -> Optional[tuple[int, int]]:
+        """Play one call order and return the first winning call for one pattern.
+
+        Args:
+            call_order: Song indices in call order
+            pattern: Pattern name from PATTERNS
+
+        Returns:
+            (calls until first winner, bitset of winning cards), or None if
+            nobody wins before the calls run out
+        """
+        marked = self._new_marks()
+        song_lines = self.song_lines(pattern)
+        for calls, song in enumerate(call_order, start=1):
+            touched = self.song_cells[song]
+            if not touched:
+                continue
+            for cell, cards in touched:
+                marked[cell] |= cards
+            winners = _completed(marked, song_lines[song])
+            if winners:
+                return calls, winners
+        return None
+
+    def song_lines(self, pattern: str) -> list[tuple[tuple[int, ...], ...]]:
+        """For each song, the distinct pattern lines through any cell it occupies.
+
+        These are the only lines that can complete when that song is called.
+        """
+        if pattern not in self._song_lines:
+            by_cell = _LINES_BY_CELL[pattern]
+            self._song_lines[pattern] = [
+                tuple({line: None for cell, _ in touched for line in by_cell.get(cell, ())})
+                for touched in self.song_cells
+            ]
+        return self._song_lines[pattern]
+
+    def _new_marks(self) -> list[int]:
+        marked = [0] * 25
+        marked[FREE_CELL] = self.all_cards
+        return marked
+
+
+def _completed(marked: list[int], lines: tuple[tuple[int, ...], ...]) -> int:
+    """Bitset of cards with any of the given lines fully marked."""
+    winners = 0
+    for line in lines:
+        complete = marked[line[0]]
+        for cell in line[1:]:
+            complete &= marked[cell]
+        winners |= complete
+    return winners
+
+
+@dataclass
+class PatternStats:
+    """Distribution of calls-to-first-winner for one pattern.
+
+    Attributes:
+        pattern: Pattern name
+        trials: Number of simulated games
+        calls: Histogram of calls until first winner -> number of games
+        simultaneous: Games where more than one card won on the first winning call
+        winners_total: Sum of winners on the first winning call across games
+        no_winner: Games where nobody won before the calls ran out
+    """
+
+    pattern: str
+    trials: int = 0
+    calls: dict[int, int] = field(default_factory=dict)
+    simultaneous: int = 0
+    winners_total: int = 0
+    no_winner: int = 0
+
+    def add(self, result: Optional[tuple[int, int]]) -> None:
+        """Record one game's (calls, winners) result."""
+        self.trials += 1
+        if result is None:
+            self.no_winner += 1
+            return
+        calls, winners = result
+        self.calls[calls] = self.calls.get(calls, 0) + 1
+        self.winners_total += winners
+        if winners > 1:
+            self.simultaneous += 1
+
+    def merge(self, other: "PatternStats") -> None:
+        """Fold another partial result for the same pattern into this one."""
+        self.trials += other.trials
+        for calls, count in other.calls.items():
+            self.calls[calls] = self.calls.get(calls, 0) + count
+        self.simultaneous += other.simultaneous
+        self.winners_total += other.winners_total
+        self.no_winner += other.no_winner
+
+    @property
+    def won(self) -> int:
+        """Games that produced a winner."""
+        return self.trials - self.no_winner
+
+    @property
+    def mean(self) -> float:
+        """Mean calls until first winner (over games with a winner)."""
+        if not self.won:
+            return 0.0
+        return sum(calls * count for calls, count in self.calls.items()) / self.won
+
+    def percentile(self, pct: float) -> int:
+        """Calls until first winner at the given percentile (0-100)."""
+        if not self.won:
+            return 0
+        target = pct / 100 * self.won
+        seen = 0
+        for calls in sorted(self.calls):
+            seen += self.calls[calls]
+            if seen >= target:
+                return calls
+        return max(self.calls)
+
+    @property
+    def simultaneous_rate(self) -> float:
+        """Fraction of won games with more than one winner on the winning call."""
+        return self.simultaneous / self.won if self.won else 0.0
+
+    @property
+    def mean_winners(self) -> float:
+        """Mean winners on the first winning call."""
+        return self.winners_total / self.won if self.won else 0.0
+
+    def to_dict(self) -> dict:
+        """Summary suitable for JSON output."""
+        return {
+            "pattern": self.pattern,
+            "trials": self.trials,
+            "min": min(self.calls) if self.calls else None,
+            "p10": self.percentile(10),
+            "median": self.percentile(50),
+            "mean": round(self.mean, 2),
+            "p90": self.percentile(90),
+            "max": max(self.calls) if self.calls else None,
+            "simultaneous_winner_rate": round(self.simultaneous_rate, 4),
+            "mean_winners": round(self.mean_winners, 3),
+            "no_winner": self.no_winner,
+            "histogram": {str(calls): self.calls[calls] for calls in sorted(self.calls)},
+        }
+
+
+def _simulate_chunk(
+    card_set: CardSet, patterns: list[str], trials: int, seed: int
+) -> dict[str, PatternStats]:
+    rng = random.Random(seed)
+    order = list(range(len(card_set.song_ids)))
+    stats = {pattern: PatternStats(pattern) for pattern in patterns}
+    for _ in range(trials):
+        rng.shuffle(order)
+        for pattern, result in card_set.first_wins(order, patterns).items():
+            stats[pattern].add(result)
+    return stats
+
+
+def run_chunks(
+    func: Callable, args: tuple, trials: int, seed: Optional[int], workers: Optional[int]
+) -> list:
+    """Run func(*args, chunk_trials, chunk_seed) over fixed-size seeded chunks.
+
+    Each chunk's seed is derived from seed and the chunk number, so a given
+    seed gives the same results with any worker count.
+
+    Args:
+        func: Picklable module-level function
+        args: Leading arguments for func
+        trials: Total trials
+        seed: Base seed (random if None)
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+
+    Returns:
+        func results in chunk order
+    """
+    base_seed = seed if seed is not None else random.SystemRandom().randrange(2**32)
+    chunks = [
+        (min(CHUNK_TRIALS, trials - start), base_seed * 1_000_003 + number)
+        for number, start in enumerate(range(0, trials, CHUNK_TRIALS))
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+
+    if workers == 1:
+        return [func(*args, n, chunk_seed) for n, chunk_seed in chunks]
+
+    # Imported here: multiprocessing is slow to import and only needed for pools
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(func, *args, n, chunk_seed) for n, chunk_seed in chunks]
+        return [future.result() for future in futures]
+
+
+def simulate(
+    card_set: CardSet,
+    patterns: Optional[list[str]] = None,
+    trials: int = 1000,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> dict[str, PatternStats]:
+    """Simulate random call orders and collect first-winner statistics.
+
+    Trials run in seeded chunks (see run_chunks), so a given seed gives the
+    same result with any worker count.
+
+    Args:
+        card_set: Cards to simulate
+        patterns: Pattern names (default: all)
+        trials: Number of random games
+        seed: Random seed for reproducible results
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+
+    Returns:
+        Pattern -> PatternStats
+
+    Raises:
+        ValueError: If trials < 1 or a pattern is unknown
+    """
+    patterns = list(patterns or PATTERNS)
+    unknown = [p for p in patterns if p not in PATTERN_LINES]
+    if unknown:
+        raise ValueError(f"Unknown pattern(s): {', '.join(unknown)}")
+    if trials < 1:
+        raise ValueError("trials must be at least 1")
+
+    partials = run_chunks(_simulate_chunk, (card_set, patterns), trials, seed, workers)
+
+    totals = {pattern: PatternStats(pattern) for pattern in patterns}
+    for partial in partials:
+        for pattern, stats in partial.items():
+            totals[pattern].merge(stats)
+    return totals
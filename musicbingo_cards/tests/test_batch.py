@@ -0,0 +1,133 @@
+"""Tests for batch generation from a manifest."""
+
+import json
+
+import pytest
+
+from musicbingo_cards.batch import BatchGame, ManifestError, load_manifest, run_batch
+
+
+@pytest.fixture
+def manifest_dir(tmp_path):
+    for name in ("rock", "pop"):
+        lines = [f"{name} song {i} - {name} artist {i}" for i in range(60)]
+        (tmp_path / f"{name}.txt").write_text("\n".join(lines))
+    return tmp_path
+
+
+def write_manifest(directory, data):
+    path = directory / "manifest.json"
+    path.write_text(json.dumps(data))
+    return path
+
+
+class TestLoadManifest:
+    """Tests for load_manifest."""
+
+    def test_defaults_and_relative_paths(self, manifest_dir):
+        """Test defaults apply per game and playlists resolve next to the manifest."""
+        path = write_manifest(manifest_dir, {
+            "defaults": {"num_cards": 30, "layout": "4up"},
+            "games": [
+                {"name": "Rock Monday", "playlist": "rock.txt", "seed": 1},
+                {"name": "Pop Friday", "playlist": "pop.txt", "num_cards": 20},
+            ],
+        })
+
+        games = load_manifest(path)
+
+        assert [game.num_cards for game in games] == [30, 20]
+        assert all(game.layout == "4up" for game in games)
+        assert games[0].playlist == manifest_dir / "rock.txt"
+        assert games[0].slug == "rock-monday"
+
+    @pytest.mark.parametrize("data,message", [
+        ({"games": []}, "non-empty"),
+        ({"games": [{"name": "A"}]}, "required"),
+        ({"games": [{"name": "A", "playlist": "rock.txt", "colour": "red"}]}, "unknown fields"),
+        ({"games": [{"name": "A", "playlist": "missing.txt"}]}, "playlist not found"),
+        ({"games": [{"name": "A", "playlist": "rock.txt", "layout": "9up"}]}, "invalid layout"),
+        ({"games": [{"name": "A", "playlist": "rock.txt", "pattern": "star"}]}, "invalid pattern"),
+        ({"games": [{"name": "A", "playlist": 5}]}, "invalid playlist"),
+        ({"games": [{"name": ["A"], "playlist": "rock.txt"}]}, "invalid name"),
+        (
+            {"games": [{"name": "A", "playlist": "rock.txt", "num_cards": "80"}]},
+            "invalid num_cards",
+        ),
+        (
+            {"games": [{"name": "A", "playlist": "rock.txt", "num_cards": True}]},
+            "invalid num_cards",
+        ),
+        ({"games": [{"name": "A", "playlist": "rock.txt", "num_cards": 0}]}, "between 1 and"),
+        ({"games": [{"name": "A", "playlist": "rock.txt", "num_cards": 1001}]}, "between 1 and"),
+        ({"games": [{"name": "A", "playlist": "rock.txt", "seed": 1.5}]}, "invalid seed"),
+        ({"defaults": [], "games": [{"name": "A", "playlist": "rock.txt"}]}, '"defaults"'),
+        (
+            {"games": [
+                {"name": "Rock!", "playlist": "rock.txt"},
+                {"name": "rock", "playlist": "pop.txt"},
+            ]},
+            "share output names",
+        ),
+    ])
+    def test_invalid_manifest(self, manifest_dir, data, message):
+        """Test invalid manifests are rejected before anything is generated."""
+        with pytest.raises(ManifestError, match=message):
+            load_manifest(write_manifest(manifest_dir, data))
+
+
+class TestRunBatch:
+    """Tests for run_batch."""
+
+    def test_writes_games_and_index(self, manifest_dir, tmp_path):
+        """Test each game gets a PDF and a game file, indexed in manifest order."""
+        games = [
+            BatchGame("Rock", manifest_dir / "rock.txt", num_cards=5, seed=1),
+            BatchGame("Pop", manifest_dir / "pop.txt", num_cards=8, strategy="design"),
+        ]
+        output = tmp_path / "out"
+
+        finished = []
+        index = run_batch(games, output, workers=1, on_result=finished.append)
+
+        assert [game["name"] for game in index["games"]] == ["Rock", "Pop"]
+        assert [summary["name"] for summary in finished] == ["Pop", "Rock"]  # largest first
+        assert json.loads((output / "index.json").read_text()) == index
+        for summary in index["games"]:
+            assert summary["status"] == "ok"
+            assert (output / summary["pdf"]).read_bytes().startswith(b"%PDF")
+            game_file = json.loads((output / summary["game_file"]).read_text())
+            assert game_file["game_id"] == summary["game_id"]
+            assert len(game_file["playlist"]) == 60
+            assert len(game_file["cards"]) == summary["num_cards"]
+
+    def test_failed_game_does_not_stop_batch(self, manifest_dir, tmp_path):
+        """Test a failing game is reported while the others still complete."""
+        games = [
+            BatchGame("Too Many", manifest_dir / "rock.txt", num_cards=5000),
+            BatchGame("Fine", manifest_dir / "pop.txt", num_cards=3),
+        ]
+
+        index = run_batch(games, tmp_path / "out", workers=1)
+
+        assert index["games"][0]["status"] == "failed"
+        assert index["games"][0]["error"]
+        assert index["games"][1]["status"] == "ok"
+
+    def test_process_pool_matches_in_process(self, manifest_dir, tmp_path):
+        """Test seeded games come out the same from the process pool."""
+        games = [
+            BatchGame(f"Game {i}", manifest_dir / "rock.txt", num_cards=4, seed=i)
+            for i in range(3)
+        ]
+
+        serial = run_batch(games, tmp_path / "serial", workers=1)
+        parallel = run_batch(games, tmp_path / "parallel", workers=2)
+
+        assert parallel["workers"] == 2
+        for a, b in zip(serial["games"], parallel["games"]):
+            cards_a = json.loads((tmp_path / "serial" / a["game_file"]).read_text())["cards"]
+            cards_b = json.loads((tmp_path / "parallel" / b["game_file"]).read_text())["cards"]
+            assert [c["song_positions"] for c in cards_a] == [
+                c["song_positions"] for c in cards_b
+            ]
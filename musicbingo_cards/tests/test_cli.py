@@ -1,5 +1,8 @@
 """Tests for CLI functionality."""
 
+import json
+import subprocess
+import sys
 import tempfile
 from pathlib import Path
 
@@ -123,6 +126,105 @@ def test_generate_with_seed(sample_playlist_file):
         assert "Generated 50 unique cards" in result.output
 
 
+def test_generate_records_cards_in_registry(sample_playlist_file):
+    """Test --registry records issued cards and reports them on the next run."""
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        registry_dir = Path(tmpdir) / "registry"
+        args = ["generate", sample_playlist_file, "-n", "5", "-s", "42",
+                "-o", str(Path(tmpdir) / "cards.pdf"), "--registry", str(registry_dir)]
+
+        first = runner.invoke(main, args)
+        second = runner.invoke(main, args)
+
+        assert first.exit_code == 0
+        assert "0 cards already issued" in first.output
+        assert second.exit_code == 0
+        assert "5 cards already issued" in second.output
+        assert len(list(registry_dir.glob("*.fp"))) == 1
+
+
+def test_generate_draws_from_pool(sample_playlist_file):
+    """Test build-pool then generate --pool draws cards and logs the draw."""
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pool_dir = Path(tmpdir) / "pool"
+        output_path = Path(tmpdir) / "cards.pdf"
+
+        built = runner.invoke(
+            main, ["build-pool", sample_playlist_file, "--pool", str(pool_dir), "-n", "60"]
+        )
+        drawn = runner.invoke(
+            main,
+            ["generate", sample_playlist_file, "-n", "50", "-o", str(output_path),
+             "--pool", str(pool_dir)],
+        )
+        exhausted = runner.invoke(
+            main,
+            ["generate", sample_playlist_file, "-n", "50", "-o", str(output_path),
+             "--pool", str(pool_dir)],
+        )
+
+        assert built.exit_code == 0
+        assert "Pool saved" in built.output
+        assert drawn.exit_code == 0
+        assert "Card pool: 60 cards" in drawn.output
+        assert "Generated 50 unique cards" in drawn.output
+        assert exhausted.exit_code == 1
+        assert "10 of 60 pool cards" in exhausted.output
+
+
+def test_generate_with_design_strategy(sample_playlist_file):
+    """Test --strategy design reports its overlap bound."""
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = Path(tmpdir) / "cards.pdf"
+        result = runner.invoke(
+            main,
+            ["generate", sample_playlist_file, "-n", "20", "-o", str(output_path),
+             "--strategy", "design", "--max-overlap", "14"],
+        )
+
+        assert result.exit_code == 0
+        assert "share at most 14 songs" in result.output
+        assert "Generated 20 unique cards" in result.output
+
+
+def test_generate_max_overlap_requires_design(sample_playlist_file):
+    """Test --max-overlap is rejected with the weighted strategy."""
+    runner = CliRunner()
+    result = runner.invoke(main, ["generate", sample_playlist_file, "--max-overlap", "10"])
+    assert result.exit_code == 1
+    assert "--max-overlap requires --strategy design" in result.output
+
+
+def test_generate_reuses_render_cache(sample_playlist_file):
+    """Test seeded reruns come from the cache with identical output."""
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+
+        def run(name, layout="single"):
+            args = ["generate", sample_playlist_file, "-n", "6", "-s", "9",
+                    "-o", str(tmp / f"{name}.pdf"), "-j", str(tmp / f"{name}.json"),
+                    "--layout", layout, "--cache", str(tmp / "cache")]
+            result = runner.invoke(main, args)
+            assert result.exit_code == 0, result.output
+            return result.output
+
+        first = run("first")
+        second = run("second")
+        four_up = run("four", layout="4up")
+
+        assert "render cache" not in first
+        assert "PDF found in render cache" in second
+        assert (tmp / "first.pdf").read_bytes() == (tmp / "second.pdf").read_bytes()
+        assert (tmp / "first.json").read_bytes() == (tmp / "second.json").read_bytes()
+        assert "Cards found in render cache" in four_up
+        assert "PDF found" not in four_up
+        assert (tmp / "four.json").read_bytes() == (tmp / "first.json").read_bytes()
+
+
 def test_generate_invalid_card_count(sample_playlist_file):
     """Test generate command with invalid card count."""
     runner = CliRunner()
@@ -176,3 +278,168 @@ def test_validate_command_shows_samples(sample_playlist_file):
     assert result.exit_code == 0
     assert "Sample songs:" in result.output
     assert "Song 0 - Artist 0" in result.output
+
+
+def test_simulate_command(sample_playlist_file):
+    """Test simulate command reports per-pattern statistics."""
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        json_path = Path(tmpdir) / "cards.json"
+        results_path = Path(tmpdir) / "sim.json"
+        runner.invoke(
+            main,
+            [
+                "generate", sample_playlist_file, "-n", "20",
+                "-o", str(Path(tmpdir) / "cards.pdf"), "-j", str(json_path),
+            ],
+        )
+
+        result = runner.invoke(
+            main,
+            [
+                "simulate", str(json_path), "-t", "200", "-s", "1", "-w", "1",
+                "--num-songs", "60", "-p", "row", "-p", "four_corners",
+                "-o", str(results_path),
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "row" in result.output
+        assert "four_corners" in result.output
+        report = json.loads(results_path.read_text())
+        assert report["num_songs"] == 60
+        assert [p["pattern"] for p in report["patterns"]] == ["row", "four_corners"]
+
+
+def test_simulate_invalid_file():
+    """Test simulate command rejects files without cards."""
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        bad_path = Path(tmpdir) / "empty.json"
+        bad_path.write_text('{"cards": []}')
+
+        result = runner.invoke(main, ["simulate", str(bad_path)])
+
+        assert result.exit_code != 0
+        assert "Cannot read cards" in result.output
+
+
+def test_generate_with_audit_writes_report(sample_playlist_file):
+    """Test generate --audit writes a fairness report beside the PDF."""
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = Path(tmpdir) / "cards.pdf"
+
+        result = runner.invoke(
+            main,
+            [
+                "generate", sample_playlist_file, "-n", "20", "-s", "1",
+                "-o", str(output_path), "--audit", "row", "--regenerate-outliers",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Auditing card fairness" in result.output
+        report = json.loads((Path(tmpdir) / "cards.fairness.json").read_text())
+        assert report["pattern"] == "row"
+        assert report["num_cards"] == 20
+
+
+def test_generate_regenerate_requires_audit(sample_playlist_file):
+    """Test --regenerate-outliers without --audit is rejected."""
+    runner = CliRunner()
+    result = runner.invoke(
+        main, ["generate", sample_playlist_file, "--regenerate-outliers", "-o", "x.pdf"]
+    )
+
+    assert result.exit_code != 0
+    assert "requires --audit" in result.output
+
+
+def test_audit_command(sample_playlist_file):
+    """Test audit command on an exported card set."""
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        json_path = Path(tmpdir) / "cards.json"
+        runner.invoke(
+            main,
+            [
+                "generate", sample_playlist_file, "-n", "20",
+                "-o", str(Path(tmpdir) / "cards.pdf"), "-j", str(json_path),
+            ],
+        )
+
+        result = runner.invoke(
+            main,
+            ["audit", str(json_path), "-p", "row", "-t", "500", "-w", "1", "--num-songs", "60"],
+        )
+
+        assert result.exit_code == 0
+        assert "20 cards, 500 simulated games" in result.output
+
+
+# Heavy dependencies that must only load for commands that render cards
+HEAVY_MODULES = ("reportlab", "PIL", "qrcode", "multiprocessing")
+# Cumulative import time of musicbingo_cards.cli (it was ~250 ms with ReportLab)
+IMPORT_BUDGET_US = 150_000
+
+
+def run_python(code: str, *args: str) -> subprocess.CompletedProcess:
+    """Run code in a fresh interpreter, so no modules are already imported."""
+    return subprocess.run(
+        [sys.executable, *args, "-c", code], capture_output=True, text=True, check=True
+    )
+
+
+def test_validate_does_not_import_pdf_stack(sample_playlist_file):
+    """Test validate runs without loading ReportLab, Pillow, qrcode or multiprocessing."""
+    code = (
+        "import sys\n"
+        "from musicbingo_cards.cli import main\n"
+        f"main(['validate', {sample_playlist_file!r}], standalone_mode=False)\n"
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])\n"
+    )
+    result = run_python(code)
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_cli_import_time_budget():
+    """Test importing the CLI stays within the startup budget (best of 3)."""
+    timings = []
+    for _ in range(3):
+        result = run_python("import musicbingo_cards.cli", "-X", "importtime")
+        line = next(
+            line for line in result.stderr.splitlines()
+            if line.rstrip().endswith("| musicbingo_cards.cli")
+        )
+        timings.append(int(line.split("|")[1]))
+    assert min(timings) < IMPORT_BUDGET_US
+
+
+def test_batch_command(sample_playlist_file):
+    """Test batch generates every manifest game and fails if any game fails."""
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manifest = Path(tmpdir) / "manifest.json"
+        output_dir = Path(tmpdir) / "out"
+        manifest.write_text(json.dumps({
+            "defaults": {"num_cards": 4, "playlist": sample_playlist_file},
+            "games": [{"name": "Monday", "seed": 1}, {"name": "Tuesday", "seed": 2}],
+        }))
+
+        result = runner.invoke(main, ["batch", str(manifest), "-o", str(output_dir), "-w", "1"])
+        index = json.loads((output_dir / "index.json").read_text())
+
+        short = Path(tmpdir) / "short.txt"
+        short.write_text("Only Song - Only Artist")
+        manifest.write_text(json.dumps({
+            "games": [{"name": "Short", "playlist": str(short), "num_cards": 4}],
+        }))
+        failed = runner.invoke(main, ["batch", str(manifest), "-o", str(output_dir), "-w", "1"])
+
+        assert result.exit_code == 0
+        assert "2/2 games" in result.output
+        assert [game["pdf"] for game in index["games"]] == ["monday.pdf", "tuesday.pdf"]
+        assert (output_dir / "monday.json").exists()
+        assert failed.exit_code == 1
+        assert "0/1 games" in failed.output
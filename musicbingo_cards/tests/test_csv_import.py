@@ -31,6 +31,23 @@ class TestGenerateSongId:
         id2 = generate_song_id("Song B", "Artist 2")
         assert id1 != id2
 
+    def test_isrc_takes_precedence(self):
+        """The ISRC identifies the recording regardless of title spelling."""
+        id1 = generate_song_id("Take On Me", "a-ha", "NOA-W-85-00001")
+        id2 = generate_song_id("Take on Me (Remastered)", "A-ha", "noaw8500001")
+        assert id1 == id2
+        assert id1 != generate_song_id("Take On Me", "a-ha")
+
+    def test_matches_playlist_parser_ids(self, tmp_path):
+        """Imported games and parsed playlists agree on song IDs."""
+        from musicbingo_cards.playlist import PlaylistParser
+
+        txt_file = tmp_path / "playlist.txt"
+        txt_file.write_text("\n".join(f"Song {i} - Artist {i}" for i in range(48)))
+        playlist = PlaylistParser.parse_file(txt_file)
+
+        assert str(playlist.songs[5].song_id) == generate_song_id("Song 5", "Artist 5")
+
 
 class TestParseExportifyCsv:
     def test_basic_import(self, tmp_path):
@@ -0,0 +1,87 @@
+"""Tests for the combinatorial-design card generator."""
+
+import itertools
+import time
+
+import pytest
+
+from musicbingo_cards.designs import DesignCardGenerator, default_max_overlap
+from musicbingo_cards.generator import CardGenerationError
+from musicbingo_cards.models import Song
+from musicbingo_cards.playlist import Playlist
+
+
+def make_playlist(num_songs):
+    return Playlist([Song(title=f"Song {i}", artist=f"Artist {i}") for i in range(num_songs)])
+
+
+def song_sets(cards):
+    return [frozenset(song.song_id for song in card.iter_songs()) for card in cards]
+
+
+class TestDesignCardGenerator:
+    """Tests for DesignCardGenerator."""
+
+    @pytest.mark.parametrize("num_songs,num_cards", [(48, 200), (60, 300), (75, 150)])
+    def test_overlap_never_exceeds_bound(self, num_songs, num_cards):
+        """Test every pair of cards shares at most max_overlap songs."""
+        generator = DesignCardGenerator(make_playlist(num_songs), random_seed=1)
+        sets = song_sets(generator.iter_compact_cards(num_cards))
+
+        worst = max(len(a & b) for a, b in itertools.combinations(sets, 2))
+        assert worst <= generator.max_overlap
+        assert len(set(sets)) == num_cards
+        assert all(len(s) == 24 for s in sets)
+
+    def test_song_frequencies_near_equal(self):
+        """Test songs are used almost equally often."""
+        generator = DesignCardGenerator(make_playlist(60), random_seed=2)
+        stats = generator.get_statistics(generator.iter_compact_cards(100))
+
+        assert stats["song_usage"]["max"] - stats["song_usage"]["min"] <= 2
+
+    def test_reproducible_with_seed(self):
+        """Test the same seed gives the same cards."""
+        playlist = make_playlist(60)
+        first = DesignCardGenerator(playlist, random_seed=5).generate_cards(20)
+        second = DesignCardGenerator(playlist, random_seed=5).generate_cards(20)
+        assert [card.grid for card in first] == [card.grid for card in second]
+
+    def test_custom_bound(self):
+        """Test an explicit max_overlap is honoured."""
+        generator = DesignCardGenerator(make_playlist(200), random_seed=3, max_overlap=5)
+        sets = song_sets(generator.iter_compact_cards(100))
+        assert max(len(a & b) for a, b in itertools.combinations(sets, 2)) <= 5
+
+    def test_bound_too_tight_fails_without_retrying(self):
+        """Test an infeasible bound raises CardGenerationError."""
+        generator = DesignCardGenerator(make_playlist(48), random_seed=1, max_overlap=12)
+        with pytest.raises(CardGenerationError, match="too tight"):
+            generator.generate_cards(200)
+
+    def test_invalid_bound(self):
+        """Test max_overlap must leave cards distinct."""
+        with pytest.raises(CardGenerationError, match="Invalid max overlap"):
+            DesignCardGenerator(make_playlist(60), max_overlap=24)
+
+    def test_replacement_respects_bound(self):
+        """Test a replacement card stays within the bound of the existing cards."""
+        generator = DesignCardGenerator(make_playlist(60), random_seed=4)
+        cards = generator.generate_cards(50)
+        replacement = generator.generate_replacement(cards)
+
+        new = song_sets([replacement])[0]
+        assert all(len(new & s) <= generator.max_overlap for s in song_sets(cards))
+
+    def test_default_bound(self):
+        """Test the default bound shrinks as playlists grow."""
+        assert default_max_overlap(48) > default_max_overlap(75) > default_max_overlap(200)
+        assert default_max_overlap(1) == 23
+
+    def test_large_design_is_fast(self):
+        """Test 1000 cards from 1000 songs are built in seconds."""
+        generator = DesignCardGenerator(make_playlist(1000), random_seed=6)
+        start = time.perf_counter()
+        cards = generator.generate_cards(1000)
+        assert len(cards) == 1000
+        assert time.perf_counter() - start < 10
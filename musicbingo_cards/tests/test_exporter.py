@@ -89,6 +89,41 @@ def test_save_json(sample_cards, tmp_path):
     assert len(data["cards"]) == 3
 
 
+@pytest.mark.parametrize("indent", [2, 4, None])
+def test_save_json_streams_same_output(sample_cards, tmp_path, indent):
+    """Test save_json on an iterator writes exactly what json.dump would."""
+    output_file = tmp_path / "cards.json"
+
+    count = CardExporter.save_json(iter(sample_cards), output_file, indent=indent)
+
+    assert count == 3
+    expected = json.dumps(CardExporter.to_json_dict(sample_cards), indent=indent)
+    assert output_file.read_text() == expected
+
+
+@pytest.mark.parametrize("indent", [2, None])
+def test_save_json_extra_fields(sample_cards, tmp_path, indent):
+    """Test extra fields are written between game_id and cards, as json.dump would."""
+    output_file = tmp_path / "game.json"
+    songs = list(sample_cards[0].get_songs())[:2]
+    extra = {"name": "Quiz", "playlist": CardExporter.playlist_to_list(songs)}
+
+    CardExporter.save_json(iter(sample_cards), output_file, indent=indent, extra=extra)
+
+    data = CardExporter.to_json_dict(sample_cards)
+    expected = {"game_id": data["game_id"], **extra, "cards": data["cards"]}
+    assert output_file.read_text() == json.dumps(expected, indent=indent)
+    assert json.loads(output_file.read_text())["playlist"][0]["title"] == songs[0].title
+
+
+def test_save_json_empty_iterator_raises(tmp_path):
+    """Test an empty stream is rejected before a file is written."""
+    output_file = tmp_path / "cards.json"
+    with pytest.raises(ValueError, match="Cannot export empty card list"):
+        CardExporter.save_json(iter([]), output_file)
+    assert not output_file.exists()
+
+
 def test_get_summary(sample_cards):
     """Test getting summary of cards."""
     summary = CardExporter.get_summary(sample_cards)
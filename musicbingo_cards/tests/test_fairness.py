@@ -0,0 +1,94 @@
+"""Tests for the per-card fairness audit."""
+
+import json
+
+import pytest
+
+from musicbingo_cards.exporter import CardExporter
+from musicbingo_cards.fairness import audit_card_set, audit_cards, regenerate_outliers
+from musicbingo_cards.generator import CardGenerator
+from musicbingo_cards.models import Song
+from musicbingo_cards.playlist import Playlist
+from musicbingo_cards.simulator import CardSet
+
+
+class TestFairnessAudit:
+    """Test suite for fairness auditing."""
+
+    @pytest.fixture
+    def playlist(self):
+        """Create a 60-song playlist."""
+        return Playlist(
+            name="Audit", songs=[Song(title=f"Song {i}", artist=f"Artist {i}") for i in range(60)]
+        )
+
+    @pytest.fixture
+    def generator(self, playlist):
+        """Create a seeded generator."""
+        return CardGenerator(playlist, random_seed=3)
+
+    def test_generated_cards_have_no_outliers(self, playlist, generator):
+        """Test a normally generated set has no flagged cards."""
+        cards = generator.generate_cards(40)
+        report = audit_cards(
+            cards, "row", [s.song_id for s in playlist.songs], trials=2000, seed=1, workers=1
+        )
+
+        assert report.trials == 2000
+        assert len(report.cards) == 40
+        assert report.flagged == []
+        assert report.expected_rate == pytest.approx(
+            sum(c.wins for c in report.cards) / (2000 * 40)
+        )
+
+    def test_partial_card_is_flagged(self, generator):
+        """Test a card that can only win on one row is flagged as disadvantaged."""
+        data = CardExporter.to_json_dict(generator.generate_cards(20))
+        top_row = {s: p for s, p in data["cards"][0]["song_positions"].items() if p[0] == 0}
+        data["cards"].append({"card_id": "partial", "song_positions": top_row})
+        card_set = CardSet.from_json_dict(data)
+        card_ids = [card["card_id"] for card in data["cards"]]
+
+        report = audit_card_set(card_set, card_ids, "five_in_a_row", trials=3000, seed=2, workers=1)
+
+        assert [card.card_id for card in report.flagged] == ["partial"]
+        assert report.flagged[0].z_score < 0
+
+    def test_reproducible_with_seed(self, playlist, generator):
+        """Test the same seed gives the same per-card counts."""
+        cards = generator.generate_cards(10)
+        first = audit_cards(cards, "row", trials=500, seed=9, workers=1)
+        second = audit_cards(cards, "row", trials=500, seed=9, workers=1)
+
+        assert [c.wins for c in first.cards] == [c.wins for c in second.cards]
+
+    def test_unknown_pattern(self, generator):
+        """Test unknown patterns are rejected."""
+        with pytest.raises(ValueError, match="Unknown pattern"):
+            audit_cards(generator.generate_cards(5), "zigzag")
+
+    def test_regenerate_outliers_replaces_in_place(self, generator):
+        """Test flagged cards are replaced at the same position with unique cards."""
+        cards = generator.generate_cards(10)
+        original_ids = [card.card_id for card in cards]
+
+        # A threshold of -1 flags every card on the first round
+        report = regenerate_outliers(
+            cards, generator, "row", max_rounds=1, trials=300, seed=1, workers=1, z_threshold=-1
+        )
+
+        assert report.regenerated == list(range(1, 11))
+        assert len(cards) == 10
+        assert not set(original_ids) & {card.card_id for card in cards}
+        assert len({generator._hash_card(card) for card in cards}) == 10
+
+    def test_report_json(self, generator, tmp_path):
+        """Test the report is written as JSON with per-card entries."""
+        report = audit_cards(generator.generate_cards(5), "row", trials=200, seed=1, workers=1)
+        path = tmp_path / "report.json"
+        report.save_json(path)
+
+        data = json.loads(path.read_text())
+        assert data["num_cards"] == 5
+        assert data["cards"][0]["card_number"] == 1
+        assert "z_score" in data["cards"][0]
@@ -5,6 +5,7 @@ import pytest
 from musicbingo_cards.generator import CardGenerator, CardGenerationError
 from musicbingo_cards.models import Song
 from musicbingo_cards.playlist import Playlist
+from musicbingo_cards.registry import CardRegistry
 
 
 class TestCardGenerator:
@@ -143,6 +144,13 @@ class TestCardGenerator:
         with pytest.raises(CardGenerationError, match="Invalid card count"):
             generator.generate_cards(1001)
 
+    def test_max_cards_raises_the_limit(self, medium_playlist):
+        """Test max_cards lets callers such as card pools ask for more cards."""
+        generator = CardGenerator(medium_playlist)
+        generator.iter_compact_cards(1001, max_cards=2000)  # validated, not generated
+        with pytest.raises(CardGenerationError, match="Must be 1-2000"):
+            generator.iter_compact_cards(2001, max_cards=2000)
+
     def test_playlist_too_small(self):
         """Test that playlist < 48 songs raises error."""
         from musicbingo_cards.playlist import PlaylistValidationError
@@ -192,6 +200,23 @@ class TestCardGenerator:
         songs2 = {s.song_id for s in cards2[0].get_songs()}
         assert songs1 != songs2, "Different seeds produced identical cards"
 
+    def test_generate_replacement_is_unique(self, medium_playlist):
+        """Test replacement cards join the same game and duplicate no existing card."""
+        generator = CardGenerator(medium_playlist, random_seed=42)
+        cards = generator.generate_cards(20)
+
+        replacement = generator.generate_replacement(cards)
+
+        assert replacement.game_id == cards[0].game_id
+        assert replacement.is_complete()
+        assert generator._hash_card(replacement) not in {generator._hash_card(c) for c in cards}
+
+    def test_generate_replacement_requires_cards(self, medium_playlist):
+        """Test replacement needs an existing card set."""
+        generator = CardGenerator(medium_playlist)
+        with pytest.raises(CardGenerationError):
+            generator.generate_replacement([])
+
     def test_calculate_overlap(self, medium_playlist):
         """Test overlap calculation between two cards."""
         generator = CardGenerator(medium_playlist, random_seed=42)
@@ -240,6 +265,60 @@ class TestCardGenerator:
         stats = generator.get_statistics([])
         assert stats["num_cards"] == 0
 
+    def test_iter_cards_matches_generate_cards(self, medium_playlist):
+        """Test the lazy iterator yields the same cards as generate_cards."""
+        game_id = "12345678-1234-5678-1234-567812345678"
+        listed = CardGenerator(medium_playlist, random_seed=7).generate_cards(20, game_id)
+        streamed = CardGenerator(medium_playlist, random_seed=7).iter_cards(20, game_id)
+
+        assert [card.get_songs() for card in streamed] == [card.get_songs() for card in listed]
+
+    def test_iter_cards_is_lazy_and_validates_eagerly(self, medium_playlist):
+        """Test inputs are checked on the call, cards are made on demand."""
+        generator = CardGenerator(medium_playlist, random_seed=1)
+        with pytest.raises(CardGenerationError):
+            generator.iter_cards(0)
+
+        cards = generator.iter_cards(100)
+        assert sum(generator.song_usage_count.values()) == 0
+        next(cards)
+        assert sum(generator.song_usage_count.values()) == 24
+
+    def test_compact_cards_share_playlist(self, medium_playlist):
+        """Test compact cards reference one playlist and match iter_cards."""
+        game_id = "12345678-1234-5678-1234-567812345678"
+        generator = CardGenerator(medium_playlist, random_seed=9)
+        compact = list(generator.iter_compact_cards(10, game_id))
+        cards = list(CardGenerator(medium_playlist, random_seed=9).iter_cards(10, game_id))
+
+        assert len({id(card.playlist) for card in compact}) == 1
+        assert [c.get_songs() for c in compact] == [c.get_songs() for c in cards]
+        assert all(str(card.game_id) == game_id for card in compact)
+
+    def test_statistics_from_stream(self, medium_playlist):
+        """Test statistics over an iterator equal statistics over a list."""
+        cards = CardGenerator(medium_playlist, random_seed=3).generate_cards(30)
+        generator = CardGenerator(medium_playlist)
+
+        assert generator.get_statistics(iter(cards)) == generator.get_statistics(cards)
+
+    def test_registry_prevents_reprints(self, medium_playlist, tmp_path):
+        """Test a second game with the same seed skips cards already issued."""
+        def compositions(cards):
+            return {frozenset(s.song_id for s in card.get_songs()) for card in cards}
+
+        with CardRegistry(tmp_path, "night") as registry:
+            generator = CardGenerator(medium_playlist, random_seed=42, registry=registry)
+            first = compositions(generator.generate_cards(50))
+        assert len(registry) == 50
+
+        registry = CardRegistry(tmp_path, "night")
+        generator = CardGenerator(medium_playlist, random_seed=42, registry=registry)
+        second = compositions(generator.generate_cards(50))
+        assert len(second) == 50
+        assert not first & second
+        assert len(registry) == 100
+
     def test_custom_game_id(self, medium_playlist):
         """Test generating cards with custom game ID."""
         from uuid import uuid4
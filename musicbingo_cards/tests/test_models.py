@@ -3,7 +3,16 @@
 import pytest
 from uuid import UUID, uuid4
 
-from musicbingo_cards.models import Song, CardGrid, QRCodeData, BingoCard
+from musicbingo_cards.models import (
+    CARD_POSITIONS,
+    BingoCard,
+    CardGrid,
+    CompactCard,
+    QRCodeData,
+    Song,
+    normalize_song_text,
+    stable_song_id,
+)
 
 
 class TestSong:
@@ -56,6 +65,24 @@ class TestSong:
             song.title = "Changed"
 
 
+class TestStableSongId:
+    """Tests for deterministic song IDs."""
+
+    def test_normalization(self):
+        """Test case, spacing and Unicode form do not change the ID."""
+        assert normalize_song_text("  Caf\u00e9   DEL  Mar ") == "caf\u00e9 del mar"
+        assert stable_song_id("Cafe\u0301 del Mar", "Energy 52") == stable_song_id(
+            "CAF\u00c9 DEL MAR", "energy  52"
+        )
+
+    def test_is_uuid5(self):
+        """Test IDs are version-5 UUIDs and differ by artist."""
+        song_id = stable_song_id("Hello", "Adele")
+        assert song_id.version == 5
+        assert song_id != stable_song_id("Hello", "Lionel Richie")
+        assert stable_song_id("Hello", "Adele", " ") == song_id  # blank ISRC ignored
+
+
 class TestCardGrid:
     """Tests for CardGrid model."""
 
@@ -190,6 +217,13 @@ class TestQRCodeData:
         qr_bad = QRCodeData(card_id=card_id, game_id=game_id, checksum="tampered123")
         assert not qr_bad.is_valid()
 
+    def test_checksum_is_lazy(self):
+        """Test the checksum is only computed when first read."""
+        qr = QRCodeData(card_id=uuid4(), game_id=uuid4())
+        assert qr._checksum == ""
+        assert qr.checksum == QRCodeData.compute_checksum(qr.card_id, qr.game_id)
+        assert qr == QRCodeData(card_id=qr.card_id, game_id=qr.game_id)
+
     def test_qr_round_trip(self):
         """Test encoding and decoding QR data maintains validity."""
         qr1 = QRCodeData(card_id=uuid4(), game_id=uuid4())
@@ -278,3 +312,62 @@ class TestBingoCard:
         assert card1.card_id != card2.card_id  # Cards should have unique IDs
         assert card1.qr_data.game_id == game_id
         assert card2.qr_data.game_id == game_id
+
+
+class TestCompactCard:
+    """Tests for CompactCard model."""
+
+    @pytest.fixture
+    def playlist(self):
+        return tuple(Song(title=f"Song {i}", artist=f"Artist {i}") for i in range(30))
+
+    @pytest.fixture
+    def card(self, playlist):
+        return CompactCard(playlist, range(29, 5, -1))
+
+    def test_stores_indices_not_songs(self, card):
+        """Test the card is slotted and holds a fixed index array."""
+        assert not hasattr(card, "__dict__")
+        assert card.indices.itemsize == 2
+        assert list(card.index_view()) == list(range(29, 5, -1))
+        with pytest.raises(TypeError):
+            card.index_view()[0] = 1
+
+    def test_requires_24_indices(self, playlist):
+        """Test a card must fill every non-free cell."""
+        with pytest.raises(ValueError, match="24 song indices"):
+            CompactCard(playlist, range(23))
+
+    def test_views(self, card, playlist):
+        """Test song_at, iter_songs and cells read through the playlist."""
+        assert card.song_at(0, 0) is playlist[29]
+        assert card.song_at(2, 2) is None
+        assert card.song_at(4, 4) is playlist[6]
+        with pytest.raises(ValueError, match="Invalid position"):
+            card.song_at(5, 0)
+        assert list(card.iter_songs()) == [playlist[i] for i in range(29, 5, -1)]
+        assert [position for position, _ in card.cells()] == list(CARD_POSITIONS)
+
+    def test_qr_data_created_on_access(self, card):
+        """Test QR data is built lazily and matches the card."""
+        assert card._qr_data is None
+        assert card.qr_data.card_id == card.card_id
+        assert card.qr_data.is_valid()
+        assert card.qr_data is card.qr_data
+
+    def test_key_ignores_placement(self, playlist):
+        """Test cards with the same songs in a different order share a key."""
+        first = CompactCard(playlist, range(24))
+        second = CompactCard(playlist, reversed(range(24)))
+        other = CompactCard(playlist, range(1, 25))
+        assert first.key() == second.key()
+        assert first.key() != other.key()
+
+    def test_to_bingo_card(self, card):
+        """Test the adapter builds an equivalent BingoCard."""
+        adapted = card.to_bingo_card()
+        assert adapted.card_id == card.card_id
+        assert adapted.game_id == card.game_id
+        assert adapted.get_songs() == card.get_songs()
+        assert list(adapted.cells()) == list(card.cells())
+        assert adapted.validate()
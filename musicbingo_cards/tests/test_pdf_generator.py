@@ -211,6 +211,24 @@ class TestPDFIntegration:
             reader = PdfReader(output_file)
             assert len(reader.pages) == 10
 
+    @pytest.mark.parametrize("layout,pages", [("single", 50), ("4up", 13)])
+    def test_pdf_from_card_iterator(self, generated_cards, tmp_path, layout, pages):
+        """Test cards can be streamed from an iterator in both layouts."""
+        output_file = tmp_path / f"{layout}.pdf"
+
+        PDFCardGenerator().generate_pdf(iter(generated_cards), output_file, layout=layout)
+
+        assert len(PdfReader(output_file).pages) == pages
+
+    @pytest.mark.parametrize("layout", ["single", "4up"])
+    def test_pdf_output_is_deterministic(self, generated_cards, tmp_path, layout):
+        """Test the same cards render to identical bytes (no timestamps or random IDs)."""
+        first, second = tmp_path / "first.pdf", tmp_path / "second.pdf"
+        PDFCardGenerator().generate_pdf(generated_cards[:4], first, layout=layout)
+        PDFCardGenerator().generate_pdf(generated_cards[:4], second, layout=layout)
+
+        assert first.read_bytes() == second.read_bytes()
+
     def test_pdf_file_size_reasonable(self, generated_cards, tmp_path):
         """Test that PDF file size is reasonable."""
         pdf_gen = PDFCardGenerator()
@@ -0,0 +1,115 @@
+"""Tests for the streaming card pipeline."""
+
+import time
+
+import pytest
+
+from musicbingo_cards.exporter import CardExporter
+from musicbingo_cards.generator import CardGenerator
+from musicbingo_cards.models import Song
+from musicbingo_cards.pipeline import PipelineError, run_pipeline
+from musicbingo_cards.playlist import Playlist
+
+
+@pytest.fixture
+def generator():
+    songs = [Song(title=f"Song {i}", artist=f"Artist {i}") for i in range(60)]
+    return CardGenerator(Playlist(songs, name="Pipeline"), random_seed=5)
+
+
+def test_stages_see_every_card_in_order(generator):
+    """Test every stage consumes the same stream."""
+    cards = generator.generate_cards(40)
+
+    results = run_pipeline(
+        iter(cards),
+        {
+            "ids": lambda stream: [card.card_id for card in stream],
+            "statistics": generator.get_statistics,
+        },
+    )
+
+    assert results["ids"] == [card.card_id for card in cards]
+    assert results["statistics"] == generator.get_statistics(cards)
+
+
+def test_pipeline_writes_json_from_generator(generator, tmp_path):
+    """Test a lazily generated stream feeds the JSON export."""
+    output_file = tmp_path / "cards.json"
+
+    results = run_pipeline(
+        generator.iter_cards(25),
+        {"json": lambda stream: CardExporter.save_json(stream, output_file)},
+    )
+
+    assert results == {"json": 25}
+    assert output_file.exists()
+
+
+def test_buffer_bounds_cards_in_flight(generator):
+    """Test the source waits for a slow stage instead of running ahead."""
+    produced = []
+    max_ahead = []
+
+    def source():
+        for card in generator.iter_cards(30):
+            produced.append(card)
+            yield card
+
+    def slow(stream):
+        consumed = 0
+        for _ in stream:
+            time.sleep(0.005)
+            consumed += 1
+            max_ahead.append(len(produced) - consumed)
+        return consumed
+
+    results = run_pipeline(
+        source(), {"slow": slow, "fast": lambda s: sum(1 for _ in s)}, buffer_size=2
+    )
+
+    assert results == {"slow": 30, "fast": 30}
+    # Queue of 2 plus the card being put and the one the stage holds
+    assert max(max_ahead) <= 3
+
+
+def test_stage_error_stops_source(generator):
+    """Test a failing stage is reported and the source stops early."""
+    produced = []
+
+    def source():
+        for card in generator.iter_cards(200):
+            produced.append(card)
+            yield card
+
+    def failing(stream):
+        for number, _ in enumerate(stream, 1):
+            if number == 3:
+                raise OSError("disk full")
+
+    with pytest.raises(PipelineError) as excinfo:
+        run_pipeline(
+            source(), {"json": failing, "count": lambda s: sum(1 for _ in s)}, buffer_size=1
+        )
+
+    assert excinfo.value.stage == "json"
+    assert isinstance(excinfo.value.error, OSError)
+    assert len(produced) < 200
+
+
+def test_source_error_propagates_after_stages_finish(generator):
+    """Test an exception from the source is raised once stages have ended."""
+    finished = []
+
+    def source():
+        yield from generator.iter_cards(3)
+        raise ValueError("source failed")
+
+    def stage(stream):
+        count = sum(1 for _ in stream)
+        time.sleep(0.01)
+        finished.append(count)
+
+    with pytest.raises(ValueError, match="source failed"):
+        run_pipeline(source(), {"stage": stage})
+    assert finished == [3]
@@ -6,7 +6,7 @@ from pathlib import Path
 
 import pytest
 
-from musicbingo_cards.models import Song
+from musicbingo_cards.models import Song, stable_song_id
 from musicbingo_cards.playlist import (
     Playlist,
     PlaylistError,
@@ -260,6 +260,63 @@ class TestPlaylistParserTXT:
             PlaylistParser.parse_txt(txt_file)
 
 
+class TestStableSongIds:
+    """Tests for deterministic song IDs across parses and formats."""
+
+    def test_reparse_gives_same_ids(self, tmp_path):
+        """Test parsing the same file twice yields identical IDs."""
+        txt_file = tmp_path / "playlist.txt"
+        txt_file.write_text("\n".join(f"Song {i} - Artist {i}" for i in range(50)))
+
+        first = PlaylistParser.parse_file(txt_file)
+        second = PlaylistParser.parse_file(txt_file)
+
+        assert [s.song_id for s in first] == [s.song_id for s in second]
+
+    def test_formats_agree(self, tmp_path):
+        """Test TXT, CSV and JSON give a song the same ID."""
+        txt_file = tmp_path / "playlist.txt"
+        txt_file.write_text("\n".join(f"Song {i} - Artist {i}" for i in range(50)))
+        csv_file = tmp_path / "playlist.csv"
+        csv_file.write_text(
+            "title,artist\n" + "\n".join(f"song  {i},ARTIST {i}" for i in range(50))
+        )
+        json_file = tmp_path / "playlist.json"
+        json_file.write_text(
+            json.dumps([{"title": f"Song {i}", "artist": f"Artist {i}"} for i in range(50)])
+        )
+
+        ids = [
+            [s.song_id for s in PlaylistParser.parse_file(path)]
+            for path in (txt_file, csv_file, json_file)
+        ]
+        assert ids[0] == ids[1] == ids[2]
+
+    def test_isrc_column_and_explicit_ids(self, tmp_path):
+        """Test ISRC feeds the ID and an explicit JSON song_id is kept."""
+        songs = [{"title": f"Song {i}", "artist": f"Artist {i}"} for i in range(50)]
+        songs[0]["isrc"] = "GBAYE0601498"
+        songs[1]["song_id"] = "12345678-1234-5678-1234-567812345678"
+        json_file = tmp_path / "playlist.json"
+        json_file.write_text(json.dumps(songs))
+
+        playlist = PlaylistParser.parse_file(json_file)
+
+        assert playlist.songs[0].song_id == stable_song_id("x", "y", "GBAYE0601498")
+        assert playlist.songs[0].metadata["isrc"] == "GBAYE0601498"
+        assert str(playlist.songs[1].song_id) == songs[1]["song_id"]
+
+    def test_shared_id_rejected(self):
+        """Test two entries resolving to one ID fail validation."""
+        songs = [
+            Song(title=f"Song {i}", artist=f"Artist {i}", song_id=stable_song_id(f"{i}", "a"))
+            for i in range(50)
+        ]
+        songs.append(Song(title="Other", artist="Artist", song_id=songs[0].song_id))
+        with pytest.raises(PlaylistValidationError, match="share an ID"):
+            Playlist(songs)
+
+
 class TestPlaylistParserAutoDetect:
     """Tests for automatic format detection."""
 
@@ -0,0 +1,108 @@
+"""Tests for pre-generated card pools."""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from musicbingo_cards.models import CompactCard, Song
+from musicbingo_cards.playlist import Playlist
+from musicbingo_cards.pool import CardPool, CardPoolError
+
+NOW = datetime(2026, 10, 1, 20, 0, tzinfo=timezone.utc)
+
+
+class TestCardPool:
+    """Tests for CardPool."""
+
+    @pytest.fixture
+    def playlist(self):
+        songs = [Song(title=f"Song {i}", artist=f"Artist {i}") for i in range(60)]
+        return Playlist(songs, name="Weekly")
+
+    @pytest.fixture
+    def pool(self, playlist, tmp_path):
+        return CardPool.build(tmp_path, playlist, size=200, seed=1)
+
+    def test_build_stores_unique_cards(self, pool):
+        """Test the pool holds the requested number of unique cards compactly."""
+        assert len(pool) == 200
+        assert len(pool._pool_ids) == 200
+        assert pool.pool_path.stat().st_size < 200 * 24 * 2 + 60 * 16 + 64
+
+    def test_load_survives_playlist_reordering(self, pool, playlist, tmp_path):
+        """Test a reordered playlist loads the same pool with the same cards."""
+        songs = list(playlist.songs)
+        random.Random(0).shuffle(songs)
+        reordered = CardPool.load(tmp_path, Playlist(songs))
+
+        def compositions(cards):
+            return {frozenset(s.song_id for s in card.iter_songs()) for card in cards}
+
+        original = compositions(pool.draw(200, seed=3, now=NOW))
+        assert compositions(reordered.draw(200, seed=3, now=NOW)) == original
+
+    def test_load_without_pool(self, playlist, tmp_path):
+        """Test loading a playlist that has no pool raises CardPoolError."""
+        with pytest.raises(CardPoolError, match="No card pool"):
+            CardPool.load(tmp_path, playlist)
+
+    def test_draw_returns_valid_cards(self, pool):
+        """Test drawn cards are distinct pool cards with fresh IDs."""
+        game_id = "12345678-1234-5678-1234-567812345678"
+        cards = pool.draw(50, game_id=game_id, seed=7, now=NOW)
+
+        assert len(cards) == 50
+        assert len({card.key() for card in cards}) == 50
+        assert len({card.card_id for card in cards}) == 50
+        assert all(str(card.game_id) == game_id for card in cards)
+
+    def test_draw_balances_song_usage(self, pool):
+        """Test a draw spreads songs more evenly than a random subset."""
+        def usage_spread(cards):
+            usage = {}
+            for card in cards:
+                for song in card.iter_songs():
+                    usage[song.song_id] = usage.get(song.song_id, 0) + 1
+            return max(usage.values()) - min(usage.values())
+
+        balanced = usage_spread(pool.draw(50, seed=7, now=NOW))
+        random_subset = random.Random(7).sample(pool.draw(200, seed=7, now=NOW), 50)
+        assert balanced < usage_spread(random_subset)
+
+    def test_recorded_cards_are_not_redrawn_within_window(self, pool, playlist, tmp_path):
+        """Test cards issued last week are excluded until the window passes."""
+        first = pool.draw(150, seed=1, now=NOW)
+        pool.record_draw(first, now=NOW)
+
+        later = CardPool.load(tmp_path, playlist, window=timedelta(days=28))
+        next_week = NOW + timedelta(days=7)
+        assert len(later.recently_drawn(next_week)) == 150
+        second = later.draw(50, seed=2, now=next_week)
+        assert not {c.key() for c in first} & {c.key() for c in second}
+        with pytest.raises(CardPoolError, match="Cannot draw 51 cards"):
+            later.draw(51, now=next_week)
+
+        assert len(later.draw(200, now=NOW + timedelta(days=29))) == 200
+
+    def test_cards_with_unknown_songs_are_not_recorded(self, pool):
+        """Test a card with a song outside the pool is not taken for a pool card."""
+        first = min(pool.songs, key=lambda song: song.song_id.bytes)  # song rank 0
+        card = next(
+            card for card in pool.draw(200, seed=4, now=NOW) if first in card.iter_songs()
+        )
+        stranger = Song(title="Stranger", artist="Nobody")
+        songs = [stranger if song is first else song for song in card.iter_songs()]
+        other = CompactCard(songs, range(len(songs)), game_id=card.game_id)
+
+        pool.record_draw([other], now=NOW)
+        assert pool.draws() == []
+        pool.record_draw([card], now=NOW)
+        assert len(pool.draws()) == 1
+
+    def test_rebuild_resets_draw_log(self, pool, playlist, tmp_path):
+        """Test rebuilding a pool clears its draw history."""
+        pool.record_draw(pool.draw(10, now=NOW), now=NOW)
+        assert len(pool.draws()) == 1
+        rebuilt = CardPool.build(tmp_path, playlist, size=100)
+        assert rebuilt.draws() == []
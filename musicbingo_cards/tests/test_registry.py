@@ -0,0 +1,145 @@
+"""Tests for the issued-card fingerprint registry."""
+
+from uuid import uuid4
+
+import pytest
+
+from musicbingo_cards.registry import (
+    BloomFilter,
+    CardRegistry,
+    card_fingerprint,
+    playlist_key,
+)
+
+
+def fingerprints(count):
+    return [card_fingerprint(uuid4() for _ in range(24)) for _ in range(count)]
+
+
+class TestFingerprints:
+    """Tests for card and playlist fingerprints."""
+
+    def test_fingerprint_ignores_song_order(self):
+        """Test the same songs in another layout share a fingerprint."""
+        song_ids = [uuid4() for _ in range(24)]
+        fingerprint = card_fingerprint(song_ids)
+        assert len(fingerprint) == 16
+        assert card_fingerprint(reversed(song_ids)) == fingerprint
+        assert card_fingerprint(song_ids[:23] + [uuid4()]) != fingerprint
+
+    def test_playlist_key_ignores_order(self):
+        """Test a reordered playlist maps to the same registry."""
+        song_ids = [uuid4() for _ in range(60)]
+        assert playlist_key(song_ids) == playlist_key(sorted(song_ids))
+
+
+class TestBloomFilter:
+    """Tests for BloomFilter."""
+
+    def test_no_false_negatives(self):
+        """Test every added fingerprint is reported present."""
+        bloom = BloomFilter.for_capacity(1000, 0.001)
+        added = fingerprints(1000)
+        for fingerprint in added:
+            bloom.add(fingerprint)
+        assert all(fingerprint in bloom for fingerprint in added)
+
+    def test_false_positive_rate(self):
+        """Test the false-positive rate at capacity is near the design rate."""
+        bloom = BloomFilter.for_capacity(1000, 0.01)
+        for fingerprint in fingerprints(1000):
+            bloom.add(fingerprint)
+        false_positives = sum(fingerprint in bloom for fingerprint in fingerprints(5000))
+        assert false_positives < 5000 * 0.03
+
+
+class TestCardRegistry:
+    """Tests for CardRegistry."""
+
+    def test_add_and_contains(self, tmp_path):
+        """Test added fingerprints are found and not added twice."""
+        registry = CardRegistry(tmp_path, "night")
+        first, second = fingerprints(2)
+        assert first not in registry
+        assert registry.add(first)
+        assert not registry.add(first)
+        assert first in registry
+        assert second not in registry
+        assert len(registry) == 1
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test flushed fingerprints are found by a later registry."""
+        added = fingerprints(100)
+        with CardRegistry(tmp_path, "night") as registry:
+            for fingerprint in added:
+                registry.add(fingerprint)
+
+        reopened = CardRegistry(tmp_path, "night")
+        assert len(reopened) == 100
+        assert all(fingerprint in reopened for fingerprint in added)
+        assert len(CardRegistry(tmp_path, "other")) == 0
+
+    def test_unflushed_fingerprints_are_discarded(self, tmp_path):
+        """Test nothing is written until flush (cards never issued)."""
+        with pytest.raises(RuntimeError):
+            with CardRegistry(tmp_path, "night") as registry:
+                registry.add(fingerprints(1)[0])
+                raise RuntimeError("PDF failed")
+        assert len(CardRegistry(tmp_path, "night")) == 0
+
+    def test_new_cards_skip_exact_store(self, tmp_path):
+        """Test lookups of new fingerprints are answered by the Bloom filter alone."""
+        with CardRegistry(tmp_path, "night") as registry:
+            for fingerprint in fingerprints(1000):
+                registry.add(fingerprint)
+
+        reopened = CardRegistry(tmp_path, "night")
+        for fingerprint in fingerprints(100):
+            reopened.add(fingerprint)
+        assert reopened._exact is None
+
+    def test_stale_bloom_file_is_rebuilt(self, tmp_path):
+        """Test fingerprints appended by another run are not missed."""
+        first, second = fingerprints(2)
+        with CardRegistry(tmp_path, "night") as registry:
+            registry.add(first)
+        bloom_bytes = (tmp_path / "night.bloom").read_bytes()
+        with CardRegistry(tmp_path, "night") as registry:
+            registry.add(second)
+        (tmp_path / "night.bloom").write_bytes(bloom_bytes)
+
+        reopened = CardRegistry(tmp_path, "night")
+        assert first in reopened
+        assert second in reopened
+
+    def test_torn_record_is_overwritten(self, tmp_path):
+        """Test a flush after an interrupted append keeps fingerprints aligned."""
+        first, second = fingerprints(2)
+        with CardRegistry(tmp_path, "night") as registry:
+            registry.add(first)
+        with open(tmp_path / "night.fp", "ab") as f:
+            f.write(b"torn!!!")
+
+        with CardRegistry(tmp_path, "night") as registry:
+            assert len(registry) == 1
+            registry.add(second)
+
+        reopened = CardRegistry(tmp_path, "night")
+        assert len(reopened) == 2
+        assert first in reopened
+        assert second in reopened
+
+    def test_grows_past_capacity(self, tmp_path):
+        """Test the Bloom filter is resized instead of filling up."""
+        registry = CardRegistry(tmp_path, "night", capacity=64)
+        added = fingerprints(1000)
+        for fingerprint in added:
+            registry.add(fingerprint)
+        assert registry._bloom.capacity >= 1000
+        assert all(fingerprint in registry for fingerprint in added)
+
+    def test_rejects_foreign_file(self, tmp_path):
+        """Test a file that is not a registry raises ValueError."""
+        (tmp_path / "night.fp").write_bytes(b"not a registry")
+        with pytest.raises(ValueError, match="Not a card registry"):
+            CardRegistry(tmp_path, "night")
@@ -0,0 +1,61 @@
+"""Tests for the content-addressed render cache."""
+
+import pytest
+
+from musicbingo_cards.generator import CardGenerator
+from musicbingo_cards.models import Song
+from musicbingo_cards.playlist import Playlist
+from musicbingo_cards.render_cache import RenderCache, cards_key, render_key
+
+
+class TestRenderCache:
+    """Tests for cache keys and RenderCache."""
+
+    @pytest.fixture
+    def playlist(self):
+        songs = [Song(title=f"Song {i}", artist=f"Artist {i}") for i in range(60)]
+        return Playlist(songs, name="Cached")
+
+    def test_cards_key_is_deterministic(self, playlist):
+        """Test keys depend only on the inputs that shape the cards."""
+        key = cards_key(playlist, seed=1, num_cards=50)
+        assert key == cards_key(playlist, seed=1, num_cards=50)
+        assert key != cards_key(playlist, seed=2, num_cards=50)
+        assert key != cards_key(playlist, seed=1, num_cards=51)
+        assert key != cards_key(playlist, seed=1, num_cards=50, strategy="design", max_overlap=12)
+
+        reordered = Playlist(list(reversed(playlist.songs)))
+        assert key != cards_key(reordered, seed=1, num_cards=50)
+
+    def test_render_key_hashes_logo_content(self, tmp_path):
+        """Test the logo is keyed by content, not path."""
+        first, second = tmp_path / "a.png", tmp_path / "b.png"
+        first.write_bytes(b"logo")
+        second.write_bytes(b"logo")
+        assert render_key("k", "single", first) == render_key("k", "single", second)
+        second.write_bytes(b"new logo")
+        assert render_key("k", "single", first) != render_key("k", "single", second)
+        assert render_key("k", "single") != render_key("k", "4up")
+        assert render_key("k", "single") != render_key("k", "single", dj_contact="DJ")
+
+    def test_cards_round_trip(self, playlist, tmp_path):
+        """Test stored cards load with the same songs and IDs."""
+        cache = RenderCache(tmp_path)
+        cards = list(CardGenerator(playlist, random_seed=3).iter_compact_cards(20))
+
+        assert cache.load_cards("key", playlist) is None
+        assert cache.store_cards("key", iter(cards), expected=20) == 20
+        loaded = cache.load_cards("key", playlist)
+
+        assert [c.card_id for c in loaded] == [c.card_id for c in cards]
+        assert [c.game_id for c in loaded] == [c.game_id for c in cards]
+        assert [list(c.indices) for c in loaded] == [list(c.indices) for c in cards]
+
+    def test_incomplete_stream_not_stored(self, playlist, tmp_path):
+        """Test a stream shorter than expected leaves no cache entry."""
+        cache = RenderCache(tmp_path)
+        cards = CardGenerator(playlist, random_seed=3).iter_compact_cards(5)
+
+        assert cache.store_cards("key", cards, expected=10) == 5
+        assert not cache.has_cards("key")
+        assert list((tmp_path / "cards").iterdir()) == []
@@ -0,0 +1,148 @@
+"""Tests for the Monte Carlo game-length simulator."""
+
+import random
+
+import pytest
+
+from musicbingo_cards.exporter import CardExporter
+from musicbingo_cards.generator import CardGenerator
+from musicbingo_cards.models import Song
+from musicbingo_cards.playlist import Playlist
+from musicbingo_cards.simulator import PATTERN_LINES, PATTERNS, CardSet, PatternStats, simulate
+
+
+def naive_first_win(cards: list[dict], song_ids: list[str], order: list[int], pattern: str):
+    """Reference implementation: check every card after every call."""
+    lines = [{divmod(cell, 5) for cell in line} for line in PATTERN_LINES[pattern]]
+    played = set()
+    for calls, index in enumerate(order, start=1):
+        played.add(song_ids[index])
+        winners = 0
+        for card in cards:
+            marked = {tuple(pos) for song, pos in card["song_positions"].items() if song in played}
+            marked.add((2, 2))
+            if any(line <= marked for line in lines):
+                winners += 1
+        if winners:
+            return calls, winners
+    return None
+
+
+class TestCardSet:
+    """Test suite for the bit-sliced card incidence."""
+
+    @pytest.fixture
+    def card_export(self):
+        """Generate 30 cards from a 60-song playlist and export them."""
+        playlist = Playlist(
+            name="Sim", songs=[Song(title=f"Song {i}", artist=f"Artist {i}") for i in range(60)]
+        )
+        cards = CardGenerator(playlist, random_seed=7).generate_cards(30)
+        data = CardExporter.to_json_dict(cards)
+        data["playlist"] = [{"song_id": str(s.song_id)} for s in playlist.songs]
+        return data
+
+    def test_from_json_uses_playlist_order(self, card_export):
+        """Test playlist songs (including ones on no card) form the call pool."""
+        card_set = CardSet.from_json_dict(card_export)
+
+        assert card_set.num_cards == 30
+        assert card_set.song_ids == [s["song_id"] for s in card_export["playlist"]]
+
+    def test_num_songs_pads_call_pool(self, card_export):
+        """Test a bare card export can be padded to the real playlist size."""
+        del card_export["playlist"]
+        card_set = CardSet.from_json_dict(card_export, num_songs=100)
+
+        assert len(card_set.song_ids) == 100
+        assert card_set.song_cells[-1] == ()
+
+    def test_num_songs_too_small(self, card_export):
+        """Test num_songs below the songs on the cards is rejected."""
+        with pytest.raises(ValueError, match="num_songs"):
+            CardSet.from_json_dict(card_export, num_songs=10)
+
+    def test_no_cards(self):
+        """Test empty card sets are rejected."""
+        with pytest.raises(ValueError, match="no cards"):
+            CardSet.from_json_dict({"cards": []})
+
+    @pytest.mark.parametrize("pattern", PATTERNS)
+    def test_first_wins_matches_naive(self, card_export, pattern):
+        """Test bitset results match a per-card check for random call orders."""
+        card_set = CardSet.from_json_dict(card_export)
+        rng = random.Random(pattern)
+
+        for _ in range(5):
+            order = list(range(len(card_set.song_ids)))
+            rng.shuffle(order)
+            expected = naive_first_win(card_export["cards"], card_set.song_ids, order, pattern)
+            assert card_set.first_wins(order, [pattern])[pattern] == expected
+
+
+class TestSimulate:
+    """Test suite for the simulation driver."""
+
+    @pytest.fixture
+    def card_set(self):
+        """Small card set: 3 cards sharing the same top row."""
+        shared = [f"s{i}" for i in range(5)]
+        cards = []
+        for n in range(3):
+            positions = {song: [0, col] for col, song in enumerate(shared)}
+            others = [(r, c) for r in range(1, 5) for c in range(5) if (r, c) != (2, 2)]
+            positions.update({f"c{n}-{i}": list(pos) for i, pos in enumerate(others)})
+            cards.append({"song_positions": positions})
+        return CardSet([], cards)
+
+    def test_reproducible_across_worker_counts(self, card_set):
+        """Test the same seed gives identical results in-process and in a pool."""
+        single = simulate(card_set, ["row"], trials=600, seed=5, workers=1)
+        pooled = simulate(card_set, ["row"], trials=600, seed=5, workers=2)
+
+        assert single["row"].to_dict() == pooled["row"].to_dict()
+        assert single["row"].trials == 600
+
+    def test_shared_row_reports_simultaneous_winners(self, card_set):
+        """Test a win on the shared row counts as a three-way tie."""
+        stats = simulate(card_set, ["row"], trials=300, seed=1, workers=1)["row"]
+
+        assert stats.won == 300
+        assert 0 < stats.simultaneous_rate <= 1
+        assert stats.mean_winners > 1
+
+    def test_full_card_bounds(self, card_set):
+        """Test full card can't finish before 24 calls or after all songs."""
+        stats = simulate(card_set, ["full_card"], trials=100, seed=2, workers=1)["full_card"]
+
+        assert min(stats.calls) >= 24
+        assert max(stats.calls) <= len(card_set.song_ids)
+
+    def test_unknown_pattern(self, card_set):
+        """Test unknown patterns are rejected."""
+        with pytest.raises(ValueError, match="Unknown pattern"):
+            simulate(card_set, ["zigzag"])
+
+    def test_invalid_trials(self, card_set):
+        """Test trials must be positive."""
+        with pytest.raises(ValueError, match="trials"):
+            simulate(card_set, trials=0)
+
+
+class TestPatternStats:
+    """Test suite for result aggregation."""
+
+    def test_percentiles_and_merge(self):
+        """Test percentile lookup over a merged histogram."""
+        first, second = PatternStats("row"), PatternStats("row")
+        for calls in (10, 20, 30):
+            first.add((calls, 1))
+        second.add((40, 2))
+        second.add(None)
+        first.merge(second)
+
+        assert first.trials == 5
+        assert first.no_winner == 1
+        assert first.percentile(50) == 20
+        assert first.mean == 25
+        assert first.simultaneous_rate == 0.25